@@ -0,0 +1,410 @@
+# cython: embedsignature=True, language_level=3, cdivision=True
+# cython: linetrace=True
+cimport cython
+from cython.parallel cimport prange
+from libc.math cimport fabs, sqrt, isfinite
+
+# Nodes of the curvilinear mesh are stored in an (n_nodes, dim) array, ordered
+# with x changing fastest, so the node (i, j, k) is at i + nx * (j + ny * k).
+# Corners of a cell are labeled as in discretize.utils.index_cube:
+#   A (0, 0, 0), B (0, 1, 0), C (1, 1, 0), D (1, 0, 0),
+#   E (0, 0, 1), F (0, 1, 1), G (1, 1, 1), H (1, 0, 1)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline double _tet_volume(double* p, int a, int b, int c, int d) nogil:
+    # p holds the 8 corners of a cell as [x0, y0, z0, x1, y1, z1, ...]
+    cdef double ad0 = p[3 * a] - p[3 * d]
+    cdef double ad1 = p[3 * a + 1] - p[3 * d + 1]
+    cdef double ad2 = p[3 * a + 2] - p[3 * d + 2]
+    cdef double bd0 = p[3 * b] - p[3 * d]
+    cdef double bd1 = p[3 * b + 1] - p[3 * d + 1]
+    cdef double bd2 = p[3 * b + 2] - p[3 * d + 2]
+    cdef double cd0 = p[3 * c] - p[3 * d]
+    cdef double cd1 = p[3 * c + 1] - p[3 * d + 1]
+    cdef double cd2 = p[3 * c + 2] - p[3 * d + 2]
+    return fabs(
+        (bd0 * cd1 - bd1 * cd0) * ad2
+        - (bd0 * cd2 - bd2 * cd0) * ad1
+        + (bd1 * cd2 - bd2 * cd1) * ad0
+    ) / 6
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline void _quad_info(double* p, double* area, double* normal) nogil:
+    # p holds the 4 corners a, b, c, d of a quadrilateral (in 3D). As in
+    # discretize.utils.face_info, the area is the mean of the four corner
+    # parallelograms, and the normal is the normalized mean of their normals.
+    cdef double e[12]
+    cdef double m0, m1, m2, length
+    cdef int v, w, j
+    for v in range(4):
+        w = (v + 1) % 4
+        for j in range(3):
+            e[3 * v + j] = p[3 * w + j] - p[3 * v + j]
+    area[0] = 0
+    for j in range(3):
+        normal[j] = 0
+    for v in range(4):
+        # the normal at a corner is the cross product of the edge leaving it
+        # with the edge arriving at it, e.g. AB x DA at corner A
+        w = (v + 3) % 4
+        m0 = e[3 * v + 1] * e[3 * w + 2] - e[3 * v + 2] * e[3 * w + 1]
+        m1 = e[3 * v + 2] * e[3 * w] - e[3 * v] * e[3 * w + 2]
+        m2 = e[3 * v] * e[3 * w + 1] - e[3 * v + 1] * e[3 * w]
+        area[0] += sqrt(m0 * m0 + m1 * m1 + m2 * m2)
+        normal[0] += m0
+        normal[1] += m1
+        normal[2] += m2
+    area[0] = area[0] / 4
+    length = sqrt(normal[0] * normal[0] + normal[1] * normal[1] + normal[2] * normal[2])
+    for j in range(3):
+        normal[j] = normal[j] / length
+
+
+# The local arrays of these helpers are private to each call (and therefore
+# to each thread).
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline double _cell_volume(
+    const double[:, :] nodes, Py_ssize_t a, Py_ssize_t* shift
+) nogil:
+    cdef double p[24]
+    cdef double normal[3]
+    cdef double area, vol1, vol2
+    cdef Py_ssize_t v, d
+    if nodes.shape[1] == 2:
+        for v in range(4):
+            p[3 * v] = nodes[a + shift[v], 0]
+            p[3 * v + 1] = nodes[a + shift[v], 1]
+            p[3 * v + 2] = 0
+        _quad_info(p, &area, normal)
+        return area
+    for v in range(8):
+        for d in range(3):
+            p[3 * v + d] = nodes[a + shift[v], d]
+    # A=0, B=1, C=2, D=3, E=4, F=5, G=6, H=7
+    vol1 = (
+        _tet_volume(p, 0, 1, 3, 4)
+        + _tet_volume(p, 1, 4, 5, 6)
+        + _tet_volume(p, 1, 3, 4, 6)
+        + _tet_volume(p, 1, 2, 3, 6)
+        + _tet_volume(p, 3, 4, 6, 7)
+    )
+    vol2 = (
+        _tet_volume(p, 0, 5, 1, 2)
+        + _tet_volume(p, 0, 4, 5, 7)
+        + _tet_volume(p, 0, 7, 5, 2)
+        + _tet_volume(p, 2, 7, 3, 0)
+        + _tet_volume(p, 2, 6, 7, 5)
+    )
+    return (vol1 + vol2) / 2
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline void _face_info(
+    const double[:, :] nodes, Py_ssize_t a, Py_ssize_t* corner,
+    double[:] areas, double[:, :] normals, Py_ssize_t f,
+) nogil:
+    cdef double p[12]
+    cdef double normal[3]
+    cdef double area
+    cdef Py_ssize_t d
+    for d in range(12):
+        p[d] = nodes[a + corner[d // 3], d % 3]
+    _quad_info(p, &area, normal)
+    areas[f] = area
+    for d in range(3):
+        normals[f, d] = normal[d]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline void _edge_info(
+    const double[:, :] nodes, Py_ssize_t a, Py_ssize_t s,
+    double[:] lengths, double[:, :] tangents, Py_ssize_t e,
+) nogil:
+    cdef double t[3]
+    cdef double length = 0
+    cdef Py_ssize_t d, dim = nodes.shape[1]
+    for d in range(dim):
+        t[d] = nodes[a + s, d] - nodes[a, d]
+        length = length + t[d] * t[d]
+    length = sqrt(length)
+    lengths[e] = length
+    for d in range(dim):
+        tangents[e, d] = t[d] / length
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.linetrace(False)
+def _cell_volumes(
+    const double[:, :] nodes, Py_ssize_t nx, Py_ssize_t ny, Py_ssize_t nz,
+    double[:] out, int n_threads=1,
+):
+    """Volumes (areas in 2D) of the cells of a curvilinear mesh.
+
+    ``nx, ny, nz`` are the numbers of nodes along each dimension, with
+    ``nz == 1`` for a 2D mesh. In 3D, each cell is split into five tetrahedra
+    in the two possible ways and the two volumes are averaged. The cells are
+    handled on `n_threads` threads.
+    """
+    cdef:
+        Py_ssize_t cx = nx - 1, cy = ny - 1
+        Py_ssize_t cz = nz - 1 if nodes.shape[1] == 3 else 1
+        Py_ssize_t c, a, n_cells = cx * cy * cz
+        Py_ssize_t shift[8]
+
+    shift[0] = 0
+    shift[1] = nx
+    shift[2] = nx + 1
+    shift[3] = 1
+    shift[4] = nx * ny
+    shift[5] = nx * ny + nx
+    shift[6] = nx * ny + nx + 1
+    shift[7] = nx * ny + 1
+    for c in prange(n_cells, nogil=True, num_threads=max(n_threads, 1)):
+        a = c % cx + nx * ((c // cx) % cy + ny * (c // (cx * cy)))
+        out[c] = _cell_volume(nodes, a, shift)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.linetrace(False)
+def _face_areas_normals(
+    const double[:, :] nodes, Py_ssize_t nx, Py_ssize_t ny,
+    Py_ssize_t fx, Py_ssize_t fy, Py_ssize_t fz,
+    Py_ssize_t s1, Py_ssize_t s2,
+    double[:] areas, double[:, :] normals, int n_threads=1,
+):
+    """Areas and unit normals of one orientation of faces of a 3D mesh.
+
+    ``nx, ny`` are the numbers of nodes along x and y, and ``fx, fy, fz`` the
+    shape of the grid of faces. The corners of the face with first node ``a``
+    are ``a, a + s1, a + s1 + s2, a + s2``, in this order. The faces are
+    handled on `n_threads` threads.
+    """
+    cdef:
+        Py_ssize_t f, a, n_faces = fx * fy * fz
+        Py_ssize_t corner[4]
+
+    corner[0] = 0
+    corner[1] = s1
+    corner[2] = s1 + s2
+    corner[3] = s2
+    for f in prange(n_faces, nogil=True, num_threads=max(n_threads, 1)):
+        a = f % fx + nx * ((f // fx) % fy + ny * (f // (fx * fy)))
+        _face_info(nodes, a, corner, areas, normals, f)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.linetrace(False)
+def _edge_lengths_tangents(
+    const double[:, :] nodes, Py_ssize_t nx, Py_ssize_t ny,
+    Py_ssize_t ex, Py_ssize_t ey, Py_ssize_t ez, Py_ssize_t s,
+    double[:] lengths, double[:, :] tangents, int n_threads=1,
+):
+    """Lengths and unit tangents of one orientation of edges.
+
+    ``nx, ny`` are the numbers of nodes along x and y, and ``ex, ey, ez`` the
+    shape of the grid of edges (``ez == 1`` in 2D). The edge with first node
+    ``a`` ends at node ``a + s``. The edges are handled on `n_threads`
+    threads.
+    """
+    cdef Py_ssize_t e, a, n_edges = ex * ey * ez
+    for e in prange(n_edges, nogil=True, num_threads=max(n_threads, 1)):
+        a = e % ex + nx * ((e // ex) % ey + ny * (e // (ex * ey)))
+        _edge_info(nodes, a, s, lengths, tangents, e)
+
+
+# Point location. Within a cell, the reference coordinates (u, v, w) of a
+# point are in [0, 1]. The corner with bits (b0, b1, b2), i.e. the node
+# (i + b0, j + b1, k + b2), has the trilinear shape function
+# (b0 ? u : 1 - u) * (b1 ? v : 1 - v) * (b2 ? w : 1 - w).
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline void _trilinear_map(
+    double* p, int dim, double* ref, double* x, double* jac
+) nogil:
+    # position x and jacobian jac[d, r] = dx_d / dref_r at ref, for the
+    # 2**dim corners p (stored as [x0, y0, z0, x1, ...]) of a cell
+    cdef int c, d, r, q
+    cdef double shape, dshape
+    for d in range(dim):
+        x[d] = 0
+        for r in range(dim):
+            jac[d * dim + r] = 0
+    for c in range(1 << dim):
+        shape = 1
+        for r in range(dim):
+            shape = shape * (ref[r] if (c >> r) & 1 else 1 - ref[r])
+        for d in range(dim):
+            x[d] = x[d] + shape * p[3 * c + d]
+        for r in range(dim):
+            dshape = 1 if (c >> r) & 1 else -1
+            for q in range(dim):
+                if q != r:
+                    dshape = dshape * (ref[q] if (c >> q) & 1 else 1 - ref[q])
+            for d in range(dim):
+                jac[d * dim + r] = jac[d * dim + r] + dshape * p[3 * c + d]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline bint _solve_local(double* jac, int dim, double* rhs) nogil:
+    # overwrite rhs with jac^-1 @ rhs, return False if jac is singular
+    cdef double det, t0, t1, t2
+    if dim == 2:
+        det = jac[0] * jac[3] - jac[1] * jac[2]
+        if det == 0:
+            return False
+        t0 = (jac[3] * rhs[0] - jac[1] * rhs[1]) / det
+        t1 = (jac[0] * rhs[1] - jac[2] * rhs[0]) / det
+        rhs[0] = t0
+        rhs[1] = t1
+        return True
+    det = (
+        jac[0] * (jac[4] * jac[8] - jac[5] * jac[7])
+        - jac[1] * (jac[3] * jac[8] - jac[5] * jac[6])
+        + jac[2] * (jac[3] * jac[7] - jac[4] * jac[6])
+    )
+    if det == 0:
+        return False
+    t0 = (
+        (jac[4] * jac[8] - jac[5] * jac[7]) * rhs[0]
+        + (jac[2] * jac[7] - jac[1] * jac[8]) * rhs[1]
+        + (jac[1] * jac[5] - jac[2] * jac[4]) * rhs[2]
+    ) / det
+    t1 = (
+        (jac[5] * jac[6] - jac[3] * jac[8]) * rhs[0]
+        + (jac[0] * jac[8] - jac[2] * jac[6]) * rhs[1]
+        + (jac[2] * jac[3] - jac[0] * jac[5]) * rhs[2]
+    ) / det
+    t2 = (
+        (jac[3] * jac[7] - jac[4] * jac[6]) * rhs[0]
+        + (jac[1] * jac[6] - jac[0] * jac[7]) * rhs[1]
+        + (jac[0] * jac[4] - jac[1] * jac[3]) * rhs[2]
+    ) / det
+    rhs[0] = t0
+    rhs[1] = t1
+    rhs[2] = t2
+    return True
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline bint _locate_point(
+    const double[:, :] locs, const double[:, :] nodes,
+    Py_ssize_t* n_nodes, Py_ssize_t i_loc, Py_ssize_t cell,
+    Py_ssize_t[:] cells, double[:, :] refs, double[:, :, :] jacs,
+) nogil:
+    # walk from cell to the cell containing the point i_loc, return whether
+    # the point is inside the grid
+    cdef:
+        int dim = nodes.shape[1]
+        int c, d, it
+        Py_ssize_t ijk[3]
+        Py_ssize_t n_cells[3]
+        Py_ssize_t a, step, max_steps
+        bint inside = False, moved
+        double p[24]
+        double ref[3]
+        double x[3]
+        double res[3]
+        double jac[9]
+        double tol = 1e-8
+    n_cells[2] = 1
+    max_steps = 2
+    for d in range(dim):
+        n_cells[d] = n_nodes[d] - 1
+        max_steps = max_steps + 2 * n_cells[d]
+    ijk[0] = cell % n_cells[0]
+    ijk[1] = (cell // n_cells[0]) % n_cells[1]
+    ijk[2] = cell // (n_cells[0] * n_cells[1])
+    for step in range(max_steps):
+        a = ijk[0] + n_nodes[0] * (ijk[1] + n_nodes[1] * ijk[2])
+        for c in range(1 << dim):
+            for d in range(dim):
+                p[3 * c + d] = nodes[
+                    a + (c & 1) + ((c >> 1) & 1) * n_nodes[0]
+                    + ((c >> 2) & 1) * n_nodes[0] * n_nodes[1],
+                    d
+                ]
+        # Newton iterations for the reference coordinates of the point
+        for d in range(dim):
+            ref[d] = 0.5
+        for it in range(50):
+            _trilinear_map(p, dim, ref, x, jac)
+            for d in range(dim):
+                res[d] = locs[i_loc, d] - x[d]
+            if not _solve_local(jac, dim, res):
+                break
+            for d in range(dim):
+                ref[d] = ref[d] + res[d]
+            if fabs(res[0]) + fabs(res[1]) + (fabs(res[2]) if dim == 3 else 0) < 1e-13:
+                break
+        inside = True
+        moved = False
+        for d in range(dim):
+            if not isfinite(ref[d]):
+                ref[d] = 0.5
+            elif ref[d] < -tol:
+                inside = False
+                if ijk[d] > 0:
+                    ijk[d] -= 1
+                    moved = True
+            elif ref[d] > 1 + tol:
+                inside = False
+                if ijk[d] < n_cells[d] - 1:
+                    ijk[d] += 1
+                    moved = True
+        if inside or not moved:
+            break
+    # points outside take the nearest values of the last cell
+    for d in range(dim):
+        ref[d] = min(max(ref[d], 0), 1)
+    _trilinear_map(p, dim, ref, x, jac)
+    cells[i_loc] = ijk[0] + n_cells[0] * (ijk[1] + n_cells[1] * ijk[2])
+    for d in range(dim):
+        refs[i_loc, d] = ref[d]
+        for c in range(dim):
+            jacs[i_loc, d, c] = jac[d * dim + c]
+    return inside
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.linetrace(False)
+def _locate_points(
+    const double[:, :] locs, const Py_ssize_t[:] seeds,
+    const double[:, :] nodes, Py_ssize_t nx, Py_ssize_t ny, Py_ssize_t nz,
+    Py_ssize_t[:] cells, double[:, :] refs, double[:, :, :] jacs,
+    unsigned char[:] inside, int n_threads=1,
+):
+    """Find the cells of a structured grid that contain each location.
+
+    Starting from the cell ``seeds[i]``, walk through the grid of
+    ``nx * ny * nz`` nodes (``nz == 1`` in 2D) towards the cell containing
+    ``locs[i]``, by inverting the trilinear map of each cell visited. Fills
+    the cell, the reference coordinates of the location in that cell and the
+    jacobian of the map there. Locations outside of the grid are assigned to
+    a cell on its boundary, with their reference coordinates clipped to the
+    cell, and are flagged in `inside`. The walks run on `n_threads` threads.
+    """
+    cdef:
+        Py_ssize_t i, n_locs = locs.shape[0]
+        Py_ssize_t n_nodes[3]
+    n_nodes[0] = nx
+    n_nodes[1] = ny
+    n_nodes[2] = nz
+    for i in prange(n_locs, nogil=True, num_threads=max(n_threads, 1)):
+        inside[i] = _locate_point(
+            locs, nodes, n_nodes, i, seeds[i], cells, refs, jacs
+        )
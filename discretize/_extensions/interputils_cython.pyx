@@ -3,6 +3,8 @@
 import numpy as np
 import cython
 cimport numpy as np
+from cython.parallel cimport prange
+from libc.math cimport M_PI, atan2, fmod, sqrt
 import scipy.sparse as sp
 
 def _interp_point_1D(np.ndarray[np.float64_t, ndim=1] x, float xr_i):
@@ -328,3 +330,155 @@ def _volume_avg_weights(np.float64_t[:] x1, np.float64_t[:] x2):
     ix1 = ix1[:ii]
     ix2 = ix2[:ii]
     return hs, ix1, ix2
+
+
+cdef struct CylStencil:
+    # two radial sides, each interpolated between two azimuthal positions
+    np.int64_t ir[2]
+    np.int64_t it[4]
+    np.float64_t w[4]
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef void _periodic_inds_ws(
+    np.float64_t[:] t, np.float64_t tp, np.int64_t* i, np.float64_t* w
+) nogil:
+    # the positions in t are increasing and lie within one period after t[0]
+    cdef np.int64_t nt = t.shape[0]
+    cdef np.float64_t period = 2 * M_PI
+    cdef np.float64_t t_next
+    tp = t[0] + fmod(fmod(tp - t[0], period) + period, period)
+    i[0] = max(_bisect_right(t, tp) - 1, 0)
+    if i[0] + 1 < nt:
+        i[1] = i[0] + 1
+        t_next = t[i[1]]
+    else:
+        i[1] = 0
+        t_next = t[0] + period
+    w[0] = (t_next - tp) / (t_next - t[i[0]])
+    w[1] = 1 - w[0]
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef void _cyl_stencil(
+    np.float64_t[:] r, np.float64_t[:] t, np.float64_t rp, np.float64_t tp,
+    np.float64_t axis_sign, CylStencil* s
+) nogil:
+    cdef IIFF rs
+    cdef np.float64_t wr[2]
+    cdef np.float64_t wt[2]
+    if rp < r[0] and r[0] > 0:
+        # interpolate through the axis, between the first radial positions
+        # on this side and on the opposite side of it
+        s.ir[0] = 0
+        s.ir[1] = 0
+        wr[0] = (r[0] + rp) / (2 * r[0])
+        wr[1] = axis_sign * (r[0] - rp) / (2 * r[0])
+        _periodic_inds_ws(t, tp, &s.it[0], &wt[0])
+        s.w[0] = wr[0] * wt[0]
+        s.w[1] = wr[0] * wt[1]
+        _periodic_inds_ws(t, tp + M_PI, &s.it[2], &wt[0])
+        s.w[2] = wr[1] * wt[0]
+        s.w[3] = wr[1] * wt[1]
+    else:
+        _get_inds_ws(r, rp, &rs)
+        s.ir[0] = rs.i1
+        s.ir[1] = rs.i2
+        _periodic_inds_ws(t, tp, &s.it[0], &wt[0])
+        s.it[2] = s.it[0]
+        s.it[3] = s.it[1]
+        s.w[0] = rs.w1 * wt[0]
+        s.w[1] = rs.w1 * wt[1]
+        s.w[2] = rs.w2 * wt[0]
+        s.w[3] = rs.w2 * wt[1]
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef void _cyl_point_3D(
+    np.float64_t[:] r, np.float64_t[:] t, np.float64_t[:] z,
+    np.float64_t rp, np.float64_t tp, np.float64_t zp,
+    np.int64_t offset, bint axis_node, np.float64_t axis_sign,
+    np.int64_t layer, np.int64_t* indices, np.float64_t* data
+) nogil:
+    # fills the 8 indices and weights of one location, the stencils are local
+    # so that locations can be handled on separate threads
+    cdef np.int64_t nr = r.shape[0]
+    cdef np.int64_t j, k, ir, in_layer
+    cdef CylStencil s
+    cdef IIFF zs
+    cdef np.int64_t iz[2]
+    cdef np.float64_t wz[2]
+    _cyl_stencil(r, t, rp, tp, axis_sign, &s)
+    _get_inds_ws(z, zp, &zs)
+    iz[0] = zs.i1
+    iz[1] = zs.i2
+    wz[0] = zs.w1
+    wz[1] = zs.w2
+    for k in range(2):
+        for j in range(4):
+            ir = s.ir[j // 2]
+            if axis_node and ir == 0:
+                in_layer = 0
+            elif axis_node:
+                in_layer = ir + (nr - 1) * s.it[j]
+            else:
+                in_layer = ir + nr * s.it[j]
+            indices[4 * k + j] = offset + in_layer + layer * iz[k]
+            data[4 * k + j] = s.w[j] * wz[k]
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def _interp_cyl_3D(
+    const np.float64_t[:, :] locs,
+    np.float64_t[:] r,
+    np.float64_t[:] t,
+    np.float64_t[:] z,
+    np.int64_t offset,
+    bint axis_node,
+    np.float64_t axis_sign,
+    bint cartesian,
+    np.float64_t x0,
+    np.float64_t y0,
+    np.int64_t[:] indices,
+    np.float64_t[:] data,
+    int n_threads=1,
+):
+    """Trilinear interpolation on a periodic (r, theta, z) grid.
+
+    Fills the 8 column indices and weights of each location into `indices`
+    and `data`. Indices are ordered with `r` changing fastest, and shifted by
+    `offset`. If `axis_node`, the grid positions on the axis (``r[0] == 0``)
+    are a single item per `z` position. Locations closer to the axis than
+    ``r[0] > 0`` are interpolated along the diameter through the axis, with
+    the values on the opposite side multiplied by `axis_sign` (-1 for radial
+    and azimuthal vector components). Locations are given in cylindrical
+    coordinates, or in cartesian coordinates relative to (x0, y0). The
+    locations are handled on `n_threads` threads.
+    """
+    cdef np.int64_t n = locs.shape[0]
+    cdef np.int64_t nr = r.shape[0]
+    cdef np.int64_t nt = t.shape[0]
+    cdef np.int64_t i, layer
+    cdef np.float64_t rp, tp, dx, dy
+    if axis_node:
+        layer = 1 + (nr - 1) * nt
+    else:
+        layer = nr * nt
+
+    for i in prange(n, nogil=True, num_threads=max(n_threads, 1)):
+        if cartesian:
+            dx = locs[i, 0] - x0
+            dy = locs[i, 1] - y0
+            rp = sqrt(dx * dx + dy * dy)
+            tp = atan2(dy, dx)
+        else:
+            rp = locs[i, 0]
+            tp = locs[i, 1]
+        _cyl_point_3D(
+            r, t, z, rp, tp, locs[i, 2], offset, axis_node, axis_sign, layer,
+            &indices[8 * i], &data[8 * i]
+        )
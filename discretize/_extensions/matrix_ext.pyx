@@ -0,0 +1,210 @@
+# cython: embedsignature=True, language_level=3, cdivision=True
+# cython: linetrace=True
+cimport cython
+import numpy as np
+from cython.parallel cimport prange, threadid
+
+cdef extern from *:
+    """
+    #ifdef _OPENMP
+    #define DISCRETIZE_OPENMP 1
+    #else
+    #define DISCRETIZE_OPENMP 0
+    #endif
+    """
+    bint DISCRETIZE_OPENMP
+
+ctypedef fused scalar:
+    float
+    double
+    float complex
+    double complex
+
+
+def _openmp_enabled():
+    """Whether the extensions were compiled with OpenMP."""
+    return bool(DISCRETIZE_OPENMP)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.linetrace(False)
+def _count_threads(int n_threads):
+    """Count the distinct threads running a prange loop over `n_threads` items."""
+    cdef:
+        int i, n = max(n_threads, 1)
+        int[:] ids = np.zeros(n, dtype=np.intc)
+    for i in prange(n, nogil=True, num_threads=n, schedule="static", chunksize=1):
+        ids[i] = threadid()
+    return len(np.unique(ids))
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.linetrace(False)
+def _inverse_2x2_elements(
+    const scalar[:] a11, const scalar[:] a12,
+    const scalar[:] a21, const scalar[:] a22,
+    scalar[:] b11, scalar[:] b12,
+    scalar[:] b21, scalar[:] b22,
+    int n_threads=1,
+):
+    """Invert 2x2 matrices stored as vectors of their elements.
+
+    The outputs may be the same arrays as the inputs. The matrices are
+    inverted on `n_threads` threads.
+    """
+    cdef:
+        Py_ssize_t i, n = a11.shape[0]
+        scalar m11, m12, m21, m22, det_inv
+
+    for i in prange(n, nogil=True, num_threads=max(n_threads, 1)):
+        m11 = a11[i]
+        m12 = a12[i]
+        m21 = a21[i]
+        m22 = a22[i]
+        det_inv = 1 / (m11 * m22 - m21 * m12)
+        b11[i] = m22 * det_inv
+        b12[i] = -m12 * det_inv
+        b21[i] = -m21 * det_inv
+        b22[i] = m11 * det_inv
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.linetrace(False)
+def _inverse_3x3_elements(
+    const scalar[:] a11, const scalar[:] a12, const scalar[:] a13,
+    const scalar[:] a21, const scalar[:] a22, const scalar[:] a23,
+    const scalar[:] a31, const scalar[:] a32, const scalar[:] a33,
+    scalar[:] b11, scalar[:] b12, scalar[:] b13,
+    scalar[:] b21, scalar[:] b22, scalar[:] b23,
+    scalar[:] b31, scalar[:] b32, scalar[:] b33,
+    int n_threads=1,
+):
+    """Invert 3x3 matrices stored as vectors of their elements.
+
+    The outputs may be the same arrays as the inputs. The matrices are
+    inverted on `n_threads` threads.
+    """
+    cdef:
+        Py_ssize_t i, n = a11.shape[0]
+        scalar m11, m12, m13, m21, m22, m23, m31, m32, m33
+        scalar c11, c12, c13, det_inv
+
+    for i in prange(n, nogil=True, num_threads=max(n_threads, 1)):
+        m11 = a11[i]
+        m12 = a12[i]
+        m13 = a13[i]
+        m21 = a21[i]
+        m22 = a22[i]
+        m23 = a23[i]
+        m31 = a31[i]
+        m32 = a32[i]
+        m33 = a33[i]
+        c11 = m22 * m33 - m23 * m32
+        c12 = m13 * m32 - m12 * m33
+        c13 = m12 * m23 - m13 * m22
+        det_inv = 1 / (m11 * c11 + m21 * c12 + m31 * c13)
+        b11[i] = c11 * det_inv
+        b12[i] = c12 * det_inv
+        b13[i] = c13 * det_inv
+        b21[i] = (m31 * m23 - m21 * m33) * det_inv
+        b22[i] = (m11 * m33 - m31 * m13) * det_inv
+        b23[i] = (m21 * m13 - m11 * m23) * det_inv
+        b31[i] = (m21 * m32 - m31 * m22) * det_inv
+        b32[i] = (m31 * m12 - m11 * m32) * det_inv
+        b33[i] = (m11 * m22 - m21 * m12) * det_inv
+
+
+cdef inline void _invert_local(scalar* m, Py_ssize_t dim) nogil:
+    # invert the row major (dim, dim) block m in place
+    cdef scalar t[9]
+    cdef scalar det_inv
+    cdef Py_ssize_t j
+    if dim == 2:
+        det_inv = 1 / (m[0] * m[3] - m[2] * m[1])
+        t[0] = m[3]
+        m[3] = m[0] * det_inv
+        m[0] = t[0] * det_inv
+        m[1] = -m[1] * det_inv
+        m[2] = -m[2] * det_inv
+    else:
+        t[0] = m[4] * m[8] - m[5] * m[7]
+        t[1] = m[2] * m[7] - m[1] * m[8]
+        t[2] = m[1] * m[5] - m[2] * m[4]
+        t[3] = m[6] * m[5] - m[3] * m[8]
+        t[4] = m[0] * m[8] - m[6] * m[2]
+        t[5] = m[3] * m[2] - m[0] * m[5]
+        t[6] = m[3] * m[7] - m[6] * m[4]
+        t[7] = m[6] * m[1] - m[0] * m[7]
+        t[8] = m[0] * m[4] - m[3] * m[1]
+        det_inv = 1 / (m[0] * t[0] + m[3] * t[1] + m[6] * t[2])
+        for j in range(9):
+            m[j] = t[j] * det_inv
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline void _invert_block(
+    const scalar[:, :, :] A, scalar[:, :, :] B, Py_ssize_t i
+) nogil:
+    # the local block is private to each call (and therefore to each thread)
+    cdef scalar m[9]
+    cdef Py_ssize_t j, k, dim = A.shape[1]
+    for j in range(dim):
+        for k in range(dim):
+            m[j * dim + k] = A[i, j, k]
+    _invert_local(m, dim)
+    for j in range(dim):
+        for k in range(dim):
+            B[i, j, k] = m[j * dim + k]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline void _solve_block(
+    const scalar[:, :, :] A, const scalar[:, :] b, scalar[:, :] x, Py_ssize_t i
+) nogil:
+    cdef scalar m[9]
+    cdef scalar rhs[3]
+    cdef scalar total
+    cdef Py_ssize_t j, k, dim = A.shape[1]
+    for j in range(dim):
+        rhs[j] = b[i, j]
+        for k in range(dim):
+            m[j * dim + k] = A[i, j, k]
+    _invert_local(m, dim)
+    for j in range(dim):
+        total = 0
+        for k in range(dim):
+            total = total + m[j * dim + k] * rhs[k]
+        x[i, j] = total
+
+
+@cython.linetrace(False)
+def _invert_blocks(
+    const scalar[:, :, :] A, scalar[:, :, :] B, int n_threads=1
+):
+    """Invert a stack of 2x2 or 3x3 blocks on `n_threads` threads.
+
+    `B` may be the same array as `A`.
+    """
+    cdef Py_ssize_t i, n = A.shape[0]
+    for i in prange(n, nogil=True, num_threads=max(n_threads, 1)):
+        _invert_block(A, B, i)
+
+
+@cython.linetrace(False)
+def _solve_blocks(
+    const scalar[:, :, :] A, const scalar[:, :] b, scalar[:, :] x,
+    int n_threads=1,
+):
+    """Solve ``A[i] @ x[i] = b[i]`` for a stack of 2x2 or 3x3 blocks.
+
+    The inverse of each block is only formed locally, `x` may be the same
+    array as `b`. The blocks are solved on `n_threads` threads.
+    """
+    cdef Py_ssize_t i, n = A.shape[0]
+    for i in prange(n, nogil=True, num_threads=max(n_threads, 1)):
+        _solve_block(A, b, x, i)
@@ -9,6 +9,7 @@ cimport cython
 cimport numpy as np
 from cython cimport view
 from libc.math cimport sqrt
+from cython.parallel cimport prange, threadid
 
 cdef extern from "triplet.h":
     cdef cppclass triplet[T, U, V]:
@@ -30,6 +31,12 @@ ctypedef fused pointers:
     np.int32_t
     np.int64_t
 
+ctypedef fused indices:
+    np.int32_t
+    np.int64_t
+
+# _build_faces_edges and _build_adjacency are the serial reference
+# implementations of _build_topology.
 @cython.boundscheck(False)
 def _build_faces_edges(ints[:, :] simplices):
     # the node index in each simplex must be in increasing order
@@ -199,95 +206,442 @@ def _build_adjacency(ints[:, :] simplex_faces, n_faces):
     return neighbors
 
 @cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+@cython.linetrace(False)
+cdef void _group_owner(
+    Py_ssize_t o,
+    indices[:] ptr,
+    indices[:] order,
+    indices[:, :] key_tab,
+    indices[:] key_cols,
+    indices[:, :] marks,
+    Py_ssize_t t,
+    indices[:] rep,
+    indices[:] neighbors,
+    bint adjacency,
+) nogil:
+    # every item of owner `o` is handled by a single thread, using its own
+    # row of `marks` as a direct addressed table of the keys
+    cdef:
+        Py_ssize_t p, s, k, first
+        Py_ssize_t n_cols = key_cols.shape[0]
+
+    for p in range(ptr[o], ptr[o + 1]):
+        s = order[p]
+        k = key_tab[s // n_cols, key_cols[s % n_cols]]
+        first = marks[t, k]
+        if first == -1:
+            marks[t, k] = s
+            rep[s] = s
+        else:
+            rep[s] = first
+            if adjacency:
+                neighbors[first] = s // n_cols
+                neighbors[s] = first // n_cols
+    for p in range(ptr[o], ptr[o + 1]):
+        s = order[p]
+        marks[t, key_tab[s // n_cols, key_cols[s % n_cols]]] = -1
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
 @cython.linetrace(False)
-cdef void _compute_bary_coords(
-    np.float64_t[:] point,
-    np.float64_t[:, :] Tinv,
-    np.float64_t[:] shift,
+def _group_items(
+    indices[:, :] owner_tab,
+    indices[:] owner_cols,
+    indices[:, :] key_tab,
+    indices[:] key_cols,
+    Py_ssize_t n_owners,
+    Py_ssize_t n_keys,
+    indices[:] neighbors,
+    int n_threads=1,
+):
+    """Number the unique ``(owner, key)`` items of a table of slots.
+
+    Slot ``s = i * n_cols + j`` holds the item
+    ``(owner_tab[i, owner_cols[j]], key_tab[i, key_cols[j]])``. The slots are
+    bucketed by owner with a counting sort, then the keys of each owner are
+    deduplicated in parallel with a direct addressed table per thread. Unique
+    items are numbered in the order of their first slot.
+
+    If `neighbors` is not empty, it is filled with the row of the other slot
+    sharing each item (items are expected to be shared by at most two slots).
+
+    Returns
+    -------
+    ids : numpy.ndarray of int
+        The item number of every slot.
+    first : numpy.ndarray of int
+        The first slot of every unique item.
+    """
+    cdef:
+        Py_ssize_t i, j, s, o, n
+        Py_ssize_t n_rows = owner_tab.shape[0], n_cols = owner_cols.shape[0]
+        Py_ssize_t n_slots = n_rows * n_cols
+        bint adjacency = neighbors.shape[0] > 0
+        indices[:] ptr, pos, order, rep, first
+        indices[:, :] marks
+
+    if indices is np.int32_t:
+        int_type = np.int32
+    else:
+        int_type = np.int64
+    n_threads = max(n_threads, 1)
+
+    ptr = np.zeros(n_owners + 1, dtype=int_type)
+    order = np.empty(n_slots, dtype=int_type)
+    rep = np.empty(n_slots, dtype=int_type)
+    first = np.empty(n_slots, dtype=int_type)
+    marks = np.full((n_threads, n_keys), -1, dtype=int_type)
+
+    with nogil:
+        # counting sort of the slots by owner, slots stay increasing per owner
+        for i in range(n_rows):
+            for j in range(n_cols):
+                ptr[owner_tab[i, owner_cols[j]] + 1] += 1
+        for o in range(n_owners):
+            ptr[o + 1] += ptr[o]
+    pos = np.array(ptr[:n_owners])
+    with nogil:
+        s = 0
+        for i in range(n_rows):
+            for j in range(n_cols):
+                o = owner_tab[i, owner_cols[j]]
+                order[pos[o]] = s
+                pos[o] += 1
+                s += 1
+
+        for o in prange(n_owners, num_threads=n_threads, schedule="guided"):
+            _group_owner(
+                o, ptr, order, key_tab, key_cols, marks, threadid(),
+                rep, neighbors, adjacency
+            )
+
+        # the first slot of an item always comes before the others, so its
+        # number is known by the time the later slots are reached
+        n = 0
+        for s in range(n_slots):
+            if rep[s] == s:
+                rep[s] = n
+                first[n] = s
+                n += 1
+            else:
+                rep[s] = rep[rep[s]]
+    return np.asarray(rep), np.asarray(first[:n])
+
+def _build_topology(simplices, n_nodes, n_threads=1):
+    """Build the edges, faces, and adjacency of a simplex mesh.
+
+    The items are numbered identically to :func:`_build_faces_edges` and
+    :func:`_build_adjacency`, but all tables are stored as 32 bit integers
+    whenever they fit, and the deduplication runs on `n_threads` threads.
+
+    Parameters
+    ----------
+    simplices : (n_cells, dim + 1) numpy.ndarray of int
+        The node indices of each simplex, sorted along each row.
+    n_nodes : int
+        The number of nodes of the mesh.
+    n_threads : int, optional
+        The number of threads used for the deduplication.
+
+    Returns
+    -------
+    simplex_faces, faces, simplex_edges, edges, face_edges, neighbors
+        The face (edge) indices of each simplex, the nodes of each face
+        (edge), the edges of each face, and the neighbors of each simplex.
+        In 2D the faces are the edges, and `face_edges` is ``None``.
+    """
+    n_cells, n_vert = simplices.shape
+    dim = n_vert - 1
+    n_local = 3 if dim == 2 else 6
+    if max(n_cells * n_local, n_nodes) <= np.iinfo(np.int32).max:
+        int_type = np.int32
+    else:
+        int_type = np.int64
+    simplices = np.require(simplices, dtype=int_type, requirements="C")
+    no_adjacency = np.empty(0, dtype=int_type)
+    neighbors = np.full((n_cells, n_vert), -1, dtype=int_type)
+
+    # edges are owned by their first node, and keyed by their second
+    edge_pairs = np.array(
+        [[1, 2], [0, 2], [0, 1], [0, 3], [1, 3], [2, 3]], dtype=int_type
+    )[:n_local]
+    ids, first = _group_items(
+        simplices,
+        np.ascontiguousarray(edge_pairs[:, 0]),
+        simplices,
+        np.ascontiguousarray(edge_pairs[:, 1]),
+        n_nodes,
+        n_nodes,
+        neighbors.reshape(-1) if dim == 2 else no_adjacency,
+        n_threads,
+    )
+    simplex_edges = ids.reshape(n_cells, n_local)
+    rows = first // n_local
+    edges = simplices[rows[:, None], edge_pairs[first % n_local]]
+    if dim == 2:
+        return simplex_edges, edges, simplex_edges, edges, None, neighbors
+
+    # faces are owned by the edge of their first two nodes, and keyed by
+    # their last node. The i'th face is opposite the i'th node.
+    local_nodes = np.array([[1, 2, 3], [0, 2, 3], [0, 1, 3], [0, 1, 2]])
+    local_edges = np.array([[5, 4, 0], [5, 3, 1], [4, 3, 2], [0, 1, 2]])
+    ids, first = _group_items(
+        simplex_edges,
+        np.array([0, 1, 2, 2], dtype=int_type),
+        simplices,
+        np.array([3, 3, 3, 2], dtype=int_type),
+        len(edges),
+        n_nodes,
+        neighbors.reshape(-1),
+        n_threads,
+    )
+    simplex_faces = ids.reshape(n_cells, 4)
+    rows = first // 4
+    faces = simplices[rows[:, None], local_nodes[first % 4]]
+    face_edges = simplex_edges[rows[:, None], local_edges[first % 4]]
+    return simplex_faces, faces, simplex_edges, edges, face_edges, neighbors
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+@cython.linetrace(False)
+cdef np.uint64_t _point_key(
+    const np.float64_t[:, :] points,
+    Py_ssize_t i,
+    const np.float64_t[:] lower,
+    np.float64_t scale,
+    int n_bits,
+) nogil:
+    # Skilling's transform of the quantized coordinates to the transposed
+    # Hilbert index, which is then interleaved into a single key.
+    cdef:
+        int dim = points.shape[1]
+        int j, bit
+        np.uint64_t X[3]
+        np.uint64_t M = (<np.uint64_t> 1) << (n_bits - 1)
+        np.uint64_t P, Q, t, key = 0
+
+    for j in range(dim):
+        X[j] = <np.uint64_t> ((points[i, j] - lower[j]) * scale)
+    # inverse undo
+    Q = M
+    while Q > 1:
+        P = Q - 1
+        for j in range(dim):
+            if X[j] & Q:
+                X[0] ^= P
+            else:
+                t = (X[0] ^ X[j]) & P
+                X[0] ^= t
+                X[j] ^= t
+        Q >>= 1
+    # gray encode
+    for j in range(1, dim):
+        X[j] ^= X[j - 1]
+    t = 0
+    Q = M
+    while Q > 1:
+        if X[dim - 1] & Q:
+            t ^= Q - 1
+        Q >>= 1
+    for j in range(dim):
+        X[j] ^= t
+    for bit in range(n_bits - 1, -1, -1):
+        for j in range(dim):
+            key = (key << 1) | ((X[j] >> bit) & 1)
+    return key
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.linetrace(False)
+def _hilbert_keys(const np.float64_t[:, :] points, int n_threads=1):
+    """Compute the distance of each point along a Hilbert curve.
+
+    The curve fills the bounding box of the points, with ``63 // dim`` bits
+    of resolution along each axis.
+
+    Returns
+    -------
+    (n_points) numpy.ndarray of numpy.uint64
+    """
+    cdef:
+        Py_ssize_t i, n = points.shape[0]
+        int n_bits = 63 // points.shape[1]
+        np.float64_t scale, width
+        np.float64_t[:] lower
+        np.uint64_t[:] keys = np.empty(n, dtype=np.uint64)
+
+    if n == 0:
+        return np.asarray(keys)
+    lower = np.min(points, axis=0)
+    width = np.max(np.ptp(points, axis=0))
+    # keep the aspect ratio, and stay just below 2**n_bits
+    scale = ((1 << n_bits) - 1) / width if width > 0 else 0.0
+    for i in prange(n, nogil=True, num_threads=max(n_threads, 1)):
+        keys[i] = _point_key(points, i, lower, scale, n_bits)
+    return np.asarray(keys)
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.linetrace(False)
+cdef inline void _compute_bary_coords(
+    const np.float64_t[:, :] locs,
+    Py_ssize_t i_loc,
+    const np.float64_t[:, :, :] transform,
+    const np.float64_t[:, :] shift,
+    Py_ssize_t i_simp,
     np.float64_t * bary
 ) nogil:
     cdef:
-        int dim = point.shape[0]
+        int dim = locs.shape[1]
         int i, j
 
     bary[dim] = 1.0
     for i in range(dim):
         bary[i] = 0.0
         for j in range(dim):
-            bary[i] += Tinv[i, j] * (point[j] - shift[j])
+            bary[i] += transform[i_simp, i, j] * (locs[i_loc, j] - shift[i_simp, j])
         bary[dim] -= bary[i]
 
 @cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.linetrace(False)
+cdef np.int64_t _walk(
+    const np.float64_t[:, :] locs,
+    Py_ssize_t i_loc,
+    np.int64_t i_simp,
+    indices[:, :] neighbors,
+    const np.float64_t[:, :, :] transform,
+    const np.float64_t[:, :] shift,
+    np.float64_t eps,
+    bint zeros_outside,
+    np.float64_t[:, :] all_barys,
+    bint return_bary,
+) nogil:
+    # walk from i_simp to the simplex containing locs[i_loc], the local
+    # barycentric coordinates are private to each call (and thread)
+    cdef:
+        int j, dim = locs.shape[1]
+        int max_directed = 1 + neighbors.shape[0] // 4
+        int i_directed = 0
+        bint is_inside
+        np.float64_t barys[4]
+
+    while i_directed < max_directed:
+        _compute_bary_coords(locs, i_loc, transform, shift, i_simp, barys)
+        j = 0
+        is_inside = True
+        while j <= dim:
+            if barys[j] < -eps:
+                is_inside = False
+                # if not -1, move towards neighbor
+                if neighbors[i_simp, j] != -1:
+                    i_simp = neighbors[i_simp, j]
+                    break
+            j += 1
+        # If inside, I found my container
+        if is_inside:
+            break
+        # Else, if I cycled through every bary
+        # without breaking out of the above loop, that means I'm completely outside
+        elif j == dim + 1:
+            if zeros_outside:
+                i_simp = -1
+            break
+        i_directed += 1
+
+    if i_directed == max_directed:
+        # made it through the whole loop without breaking out
+        # Mark as failed
+        i_simp = -2
+    if return_bary:
+        for j in range(dim + 1):
+            all_barys[i_loc, j] = barys[j]
+    return i_simp
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.linetrace(False)
 def _directed_search(
-    np.float64_t[:, :] locs,
+    const np.float64_t[:, :] locs,
     pointers[:] nearest_cc,
-    np.float64_t[:, :] nodes,
-    ints[:, :] simplex_nodes,
-    np.int64_t[:, :] neighbors,
-    np.float64_t[:, :, :] transform,
-    np.float64_t[:, :] shift,
+    indices[:, :] neighbors,
+    const np.float64_t[:, :, :] transform,
+    const np.float64_t[:, :] shift,
     np.float64_t eps=1E-15,
     bint zeros_outside=False,
-    bint return_bary=True
+    bint return_bary=True,
+    int n_threads=1,
+    Py_ssize_t chunk_size=0,
 ):
+    """Find the simplices containing each location by walking the neighbors.
+
+    Without a `chunk_size`, the walk for ``locs[i]`` starts at the simplex
+    ``nearest_cc[i]``. Otherwise, the locations are split in contiguous
+    chunks of `chunk_size`; the walk for the first location of chunk ``c``
+    starts at ``nearest_cc[c]``, and every following location of that chunk
+    starts where the previous one was found. The walks run on `n_threads`
+    threads without the GIL.
+    """
     cdef:
-        int i, j
-        pointers i_simp
-        int n_locs = locs.shape[0], dim = locs.shape[1]
-        int max_directed = 1 + simplex_nodes.shape[0] // 4
-        int i_directed
-        bint is_inside
-        np.int64_t[:] inds = np.full(len(locs), -1, dtype=np.int64)
+        Py_ssize_t i, c, start, end, n_chunks
+        Py_ssize_t n_locs = locs.shape[0], dim = locs.shape[1]
+        np.int64_t i_simp, seed
+        np.int64_t[:] inds = np.full(n_locs, -1, dtype=np.int64)
         np.float64_t[:, :] all_barys = np.empty((1, 1), dtype=np.float64)
-        np.float64_t barys[4]
-        np.float64_t[:] loc
-        np.float64_t[:, :] Tinv
-        np.float64_t[:] rD
     if return_bary:
-        all_barys = np.empty((len(locs), dim+1), dtype=np.float64)
-
-    for i in range(n_locs):
-        loc = locs[i]
-
-        i_simp = nearest_cc[i]  # start at the nearest cell center
-        i_directed = 0
-        while i_directed < max_directed:
-            Tinv = transform[i_simp]
-            rD = shift[i_simp]
-            _compute_bary_coords(loc, Tinv, rD, barys)
-            j = 0
-            is_inside = True
-            while j <= dim:
-                if barys[j] < -eps:
-                    is_inside = False
-                    # if not -1, move towards neighbor
-                    if neighbors[i_simp, j] != -1:
-                        i_simp = neighbors[i_simp, j]
-                        break
-                j += 1
-            # If inside, I found my container
-            if is_inside:
-                break
-            # Else, if I cycled through every bary
-            # without breaking out of the above loop, that means I'm completely outside
-            elif j == dim + 1:
-                if zeros_outside:
-                    i_simp = -1
-                break
-            i_directed += 1
-
-        if i_directed == max_directed:
-            # made it through the whole loop without breaking out
-            # Mark as failed
-            i_simp = -2
-        inds[i] = i_simp
-        if return_bary:
-            for j in range(dim+1):
-                all_barys[i, j] = barys[j]
+        all_barys = np.empty((n_locs, dim + 1), dtype=np.float64)
+    n_threads = max(n_threads, 1)
+
+    if chunk_size <= 0:
+        for i in prange(n_locs, nogil=True, num_threads=n_threads):
+            inds[i] = _walk(
+                locs, i, nearest_cc[i], neighbors, transform, shift, eps,
+                zeros_outside, all_barys, return_bary
+            )
+    else:
+        n_chunks = (n_locs + chunk_size - 1) // chunk_size
+        for c in prange(n_chunks, nogil=True, num_threads=n_threads):
+            _walk_chunk(
+                locs, c * chunk_size, min((c + 1) * chunk_size, n_locs),
+                nearest_cc[c], neighbors, transform, shift, eps,
+                zeros_outside, all_barys, return_bary, inds
+            )
 
     if return_bary:
-        return np.array(inds), np.array(all_barys)
-    return np.array(inds)
+        return np.asarray(inds), np.asarray(all_barys)
+    return np.asarray(inds)
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.linetrace(False)
+cdef void _walk_chunk(
+    const np.float64_t[:, :] locs,
+    Py_ssize_t start,
+    Py_ssize_t end,
+    np.int64_t seed,
+    indices[:, :] neighbors,
+    const np.float64_t[:, :, :] transform,
+    const np.float64_t[:, :] shift,
+    np.float64_t eps,
+    bint zeros_outside,
+    np.float64_t[:, :] all_barys,
+    bint return_bary,
+    np.int64_t[:] inds,
+) nogil:
+    cdef Py_ssize_t i
+    cdef np.int64_t i_simp
+    for i in range(start, end):
+        i_simp = _walk(
+            locs, i, seed, neighbors, transform, shift, eps,
+            zeros_outside, all_barys, return_bary
+        )
+        inds[i] = i_simp
+        # locations that were outside (or not found) do not move the seed
+        if i_simp >= 0:
+            seed = i_simp
 
 @cython.boundscheck(False)
 @cython.cdivision(True)
@@ -308,6 +308,12 @@ cdef int _evaluate_func(void* function, c_Cell* cell) with gil:
     val = func(pycell)
     return <int> func(pycell)
 
+def _compact_indices(inds, n):
+    # store index tables as 32 bit integers whenever they can hold them
+    if n <= np.iinfo(np.int32).max:
+        return inds.astype(np.int32)
+    return inds
+
 cdef class _TreeMesh:
     cdef c_Tree *tree
     cdef PyWrapper *wrapper
@@ -332,6 +338,7 @@ cdef class _TreeMesh:
     cdef object _average_cell_to_face, _average_cell_vector_to_face, _average_cell_to_face_x, _average_cell_to_face_y, _average_cell_to_face_z
     cdef object _face_divergence
     cdef object _edge_curl, _nodal_gradient
+    cdef object _cell_face_table, _cell_edge_table, _face_deflation, _edge_deflation
 
     cdef object __ubc_order, __ubc_indArr
 
@@ -442,6 +449,11 @@ cdef class _TreeMesh:
         self._nodal_gradient = None
         self._edge_curl = None
 
+        self._cell_face_table = None
+        self._cell_edge_table = None
+        self._face_deflation = None
+        self._edge_deflation = None
+
         self.__ubc_order = None
         self.__ubc_indArr = None
 
@@ -1642,6 +1654,7 @@ cdef class _TreeMesh:
                 ind = cell.index
                 for ii in range(dim):
                     gridCC[ind, ii] = cell.location[ii]
+            self._cell_centers = self._to_dtype(self._cell_centers)
         return self._cell_centers
 
     @property
@@ -1670,6 +1683,7 @@ cdef class _TreeMesh:
                     ind = node.index
                     for ii in range(dim):
                         gridN[ind, ii] = node.location[ii]
+            self._nodes = self._to_dtype(self._nodes)
         return self._nodes
 
     @property
@@ -1755,6 +1769,7 @@ cdef class _TreeMesh:
             ind = cell.index
             for ii in range(dim):
                 gridCH[ind, ii] = cell.edges[ii*epc].length
+        self._h_gridded = self._to_dtype(self._h_gridded)
 
         return self._h_gridded
 
@@ -1783,6 +1798,7 @@ cdef class _TreeMesh:
                     ind = edge.index
                     for ii in range(dim):
                         gridEx[ind, ii] = edge.location[ii]
+            self._edges_x = self._to_dtype(self._edges_x)
         return self._edges_x
 
     @property
@@ -1835,6 +1851,7 @@ cdef class _TreeMesh:
                     ind = edge.index
                     for ii in range(dim):
                         gridEy[ind, ii] = edge.location[ii]
+            self._edges_y = self._to_dtype(self._edges_y)
         return self._edges_y
 
     @property
@@ -1887,6 +1904,7 @@ cdef class _TreeMesh:
                     ind = edge.index
                     for ii in range(dim):
                         gridEz[ind, ii] = edge.location[ii]
+            self._edges_z = self._to_dtype(self._edges_z)
         return self._edges_z
 
     @property
@@ -1982,6 +2000,7 @@ cdef class _TreeMesh:
                     ind = face.index
                     for ii in range(dim):
                         gridFx[ind, ii] = face.location[ii]
+            self._faces_x = self._to_dtype(self._faces_x)
         return self._faces_x
 
     @property
@@ -2010,6 +2029,7 @@ cdef class _TreeMesh:
                     ind = face.index
                     for ii in range(dim):
                         gridFy[ind, ii] = face.location[ii]
+            self._faces_y = self._to_dtype(self._faces_y)
         return self._faces_y
 
     @property
@@ -2039,6 +2059,7 @@ cdef class _TreeMesh:
                     ind = face.index
                     for ii in range(dim):
                         gridFz[ind, ii] = face.location[ii]
+            self._faces_z = self._to_dtype(self._faces_z)
         return self._faces_z
 
     @property
@@ -2213,6 +2234,7 @@ cdef class _TreeMesh:
             vol = self._cell_volumes
             for cell in self.tree.cells:
                 vol[cell.index] = cell.volume
+            self._cell_volumes = self._to_dtype(self._cell_volumes)
         return self._cell_volumes
 
     @property
@@ -2256,6 +2278,7 @@ cdef class _TreeMesh:
                 face = it.second
                 if face.hanging: continue
                 area[face.index + offset] = face.area
+            self._face_areas = self._to_dtype(self._face_areas)
         return self._face_areas
 
     @property
@@ -2297,6 +2320,7 @@ cdef class _TreeMesh:
                     edge = it.second
                     if edge.hanging: continue
                     edge_l[edge.index + offset] = edge.length
+            self._edge_lengths = self._to_dtype(self._edge_lengths)
         return self._edge_lengths
 
     @property
@@ -2733,7 +2757,7 @@ cdef class _TreeMesh:
         else:
             D = self._face_divergence_3D()
         R = self._deflate_faces()
-        self._face_divergence = D*R
+        self._face_divergence = self._to_dtype(D*R)
         return self._face_divergence
 
     @cython.cdivision(True)
@@ -2923,7 +2947,7 @@ cdef class _TreeMesh:
 
         C = sp.csr_matrix((V, (I, J)),shape=(n_faces, self.n_total_edges))
         R = self._deflate_edges()
-        self._edge_curl = C*R
+        self._edge_curl = self._to_dtype(C*R)
         return self._edge_curl
 
     @property
@@ -3028,7 +3052,7 @@ cdef class _TreeMesh:
 
         Rn = self._deflate_nodes()
         G = sp.csr_matrix((V, (I, J)), shape=(self.n_edges, self.n_total_nodes))
-        self._nodal_gradient = G*Rn
+        self._nodal_gradient = self._to_dtype(G*Rn)
         return self._nodal_gradient
 
     @property
@@ -3097,7 +3121,7 @@ cdef class _TreeMesh:
                         V[2*ind    ] = 0.5
                         V[2*ind + 1] = 0.5
 
-        return sp.csr_matrix((V, (I,J)), shape=(self.n_total_faces_x, self.n_cells))
+        return self._to_dtype(sp.csr_matrix((V, (I,J)), shape=(self.n_total_faces_x, self.n_cells)))
 
     @cython.boundscheck(False)
     def average_cell_to_total_face_y(self):
@@ -3159,7 +3183,7 @@ cdef class _TreeMesh:
                         J[2*ind + 1] = next_cell.children[(i>>1)*4 + i%2].index
                         V[2*ind    ] = 0.5
                         V[2*ind + 1] = 0.5
-        return sp.csr_matrix((V, (I,J)), shape=(self.n_total_faces_y, self.n_cells))
+        return self._to_dtype(sp.csr_matrix((V, (I,J)), shape=(self.n_total_faces_y, self.n_cells)))
 
     @cython.boundscheck(False)
     def average_cell_to_total_face_z(self):
@@ -3202,7 +3226,7 @@ cdef class _TreeMesh:
                     V[2*ind    ] = 0.5
                     V[2*ind + 1] = 0.5
 
-        return sp.csr_matrix((V, (I,J)), shape=(self.n_total_faces_z, self.n_cells))
+        return self._to_dtype(sp.csr_matrix((V, (I,J)), shape=(self.n_total_faces_z, self.n_cells)))
 
     @property
     @cython.boundscheck(False)
@@ -3276,7 +3300,7 @@ cdef class _TreeMesh:
                         V[2*ind    ] = -1.0
                         V[2*ind + 1] =  1.0
 
-        self._stencil_cell_gradient_x = (
+        self._stencil_cell_gradient_x = self._to_dtype(
             sp.csr_matrix((V, (I,J)), shape=(self.n_total_faces_x, self.n_cells))
         )
         return self._stencil_cell_gradient_x
@@ -3354,7 +3378,7 @@ cdef class _TreeMesh:
                         V[2*ind    ] = -1.0
                         V[2*ind + 1] = 1.0
 
-        self._stencil_cell_gradient_y = (
+        self._stencil_cell_gradient_y = self._to_dtype(
             sp.csr_matrix((V, (I,J)), shape=(self.n_total_faces_y, self.n_cells))
         )
         return self._stencil_cell_gradient_y
@@ -3412,7 +3436,7 @@ cdef class _TreeMesh:
                     V[2*ind    ] = -1.0
                     V[2*ind + 1] =  1.0
 
-        self._stencil_cell_gradient_z = (
+        self._stencil_cell_gradient_z = self._to_dtype(
             sp.csr_matrix((V, (I,J)), shape=(self.n_total_faces_z, self.n_cells))
         )
         return self._stencil_cell_gradient_z
@@ -3522,15 +3546,18 @@ cdef class _TreeMesh:
         If a hanging edge has a single parent, it's value is the same as the parent
         If a hanging edge has 2 parents, it's an average of the two parents
         """
-        if self._dim == 2:
-            Rx = self._deflate_edges_x()
-            Ry = self._deflate_edges_y()
-            return sp.block_diag((Rx, Ry))
-        else:
-            Rx = self._deflate_edges_x()
-            Ry = self._deflate_edges_y()
-            Rz = self._deflate_edges_z()
-            return sp.block_diag((Rx, Ry, Rz))
+        if self._edge_deflation is None:
+            if self._dim == 2:
+                Rx = self._deflate_edges_x()
+                Ry = self._deflate_edges_y()
+                R = sp.block_diag((Rx, Ry))
+            else:
+                Rx = self._deflate_edges_x()
+                Ry = self._deflate_edges_y()
+                Rz = self._deflate_edges_z()
+                R = sp.block_diag((Rx, Ry, Rz))
+            self._edge_deflation = R.tocsr()
+        return self._edge_deflation
 
     def _deflate_faces(self):
         """Return a matrix that removes hanging faces.
@@ -3538,15 +3565,18 @@ cdef class _TreeMesh:
         The operation assigns the hanging face the value of its parent.
         A hanging face will only ever have 1 parent.
         """
-        if(self._dim == 2):
-            Rx = self._deflate_edges_x()
-            Ry = self._deflate_edges_y()
-            return sp.block_diag((Ry, Rx))
-        else:
-            Rx = self._deflate_faces_x()
-            Ry = self._deflate_faces_y()
-            Rz = self._deflate_faces_z()
-            return sp.block_diag((Rx, Ry, Rz))
+        if self._face_deflation is None:
+            if(self._dim == 2):
+                Rx = self._deflate_edges_x()
+                Ry = self._deflate_edges_y()
+                R = sp.block_diag((Ry, Rx))
+            else:
+                Rx = self._deflate_faces_x()
+                Ry = self._deflate_faces_y()
+                Rz = self._deflate_faces_z()
+                R = sp.block_diag((Rx, Ry, Rz))
+            self._face_deflation = R.tocsr()
+        return self._face_deflation
 
     @cython.boundscheck(False)
     def _deflate_faces_x(self):
@@ -3704,7 +3734,7 @@ cdef class _TreeMesh:
                 V[ind*n_epc + ii] = scale
 
         Rex = self._deflate_edges_x()
-        self._average_edge_x_to_cell = sp.csr_matrix((V, (I, J)))*Rex
+        self._average_edge_x_to_cell = self._to_dtype(sp.csr_matrix((V, (I, J)))*Rex)
         return self._average_edge_x_to_cell
 
     @property
@@ -3760,7 +3790,7 @@ cdef class _TreeMesh:
                 V[ind*n_epc + ii] = scale
 
         Rey = self._deflate_edges_y()
-        self._average_edge_y_to_cell = sp.csr_matrix((V, (I, J)))*Rey
+        self._average_edge_y_to_cell = self._to_dtype(sp.csr_matrix((V, (I, J)))*Rey)
         return self._average_edge_y_to_cell
 
     @property
@@ -3818,7 +3848,7 @@ cdef class _TreeMesh:
                 V[ind*n_epc + ii] = scale
 
         Rez = self._deflate_edges_z()
-        self._average_edge_z_to_cell = sp.csr_matrix((V, (I, J)))*Rez
+        self._average_edge_z_to_cell = self._to_dtype(sp.csr_matrix((V, (I, J)))*Rez)
         return self._average_edge_z_to_cell
 
     @property
@@ -3857,7 +3887,7 @@ cdef class _TreeMesh:
             stacks = [self.average_edge_x_to_cell, self.average_edge_y_to_cell]
             if self._dim == 3:
                 stacks += [self.average_edge_z_to_cell]
-            self._average_edge_to_cell = 1.0/self._dim * sp.hstack(stacks).tocsr()
+            self._average_edge_to_cell = self._to_dtype(1.0/self._dim * sp.hstack(stacks).tocsr())
         return self._average_edge_to_cell
 
     @property
@@ -3908,7 +3938,7 @@ cdef class _TreeMesh:
             stacks = [self.average_edge_x_to_cell, self.average_edge_y_to_cell]
             if self._dim == 3:
                 stacks += [self.average_edge_z_to_cell]
-            self._average_edge_to_cell_vector = sp.block_diag(stacks).tocsr()
+            self._average_edge_to_cell_vector = self._to_dtype(sp.block_diag(stacks).tocsr())
         return self._average_edge_to_cell_vector
 
     @property
@@ -4004,7 +4034,7 @@ cdef class _TreeMesh:
         Av = sp.csr_matrix((V, (I, J)),shape=(self.n_faces, self.n_total_edges))
         R = self._deflate_edges()
 
-        self._average_edge_to_face_vector = Av @ R
+        self._average_edge_to_face_vector = self._to_dtype(Av @ R)
         return self._average_edge_to_face_vector
 
     @property
@@ -4064,7 +4094,7 @@ cdef class _TreeMesh:
             V[ii*2 : ii*2 + 2] = 0.5
 
         Rfx = self._deflate_faces_x()
-        self._average_face_x_to_cell = sp.csr_matrix((V, (I, J)))*Rfx
+        self._average_face_x_to_cell = self._to_dtype(sp.csr_matrix((V, (I, J)))*Rfx)
         return self._average_face_x_to_cell
 
     @property
@@ -4124,7 +4154,7 @@ cdef class _TreeMesh:
             V[ii*2 : ii*2 + 2] = 0.5
 
         Rfy = self._deflate_faces_y()
-        self._average_face_y_to_cell = sp.csr_matrix((V, (I, J)))*Rfy
+        self._average_face_y_to_cell = self._to_dtype(sp.csr_matrix((V, (I, J)))*Rfy)
         return self._average_face_y_to_cell
 
     @property
@@ -4183,7 +4213,7 @@ cdef class _TreeMesh:
             V[ii*2 : ii*2 + 2] = 0.5
 
         Rfy = self._deflate_faces_z()
-        self._average_face_z_to_cell = sp.csr_matrix((V, (I, J)))*Rfy
+        self._average_face_z_to_cell = self._to_dtype(sp.csr_matrix((V, (I, J)))*Rfy)
         return self._average_face_z_to_cell
 
     @property
@@ -4222,7 +4252,7 @@ cdef class _TreeMesh:
             stacks = [self.average_face_x_to_cell, self.aveFy2CC]
             if self._dim == 3:
                 stacks += [self.average_face_z_to_cell]
-            self._average_face_to_cell = 1./self._dim*sp.hstack(stacks).tocsr()
+            self._average_face_to_cell = self._to_dtype(1./self._dim*sp.hstack(stacks).tocsr())
         return self._average_face_to_cell
 
     @property
@@ -4273,7 +4303,7 @@ cdef class _TreeMesh:
             stacks = [self.average_face_x_to_cell, self.aveFy2CC]
             if self._dim == 3:
                 stacks += [self.average_face_z_to_cell]
-            self._average_face_to_cell_vector = sp.block_diag(stacks).tocsr()
+            self._average_face_to_cell_vector = self._to_dtype(sp.block_diag(stacks).tocsr())
         return self._average_face_to_cell_vector
 
     @property
@@ -4328,7 +4358,7 @@ cdef class _TreeMesh:
                     V[ii*n_ppc + id] = scale
 
             Rn = self._deflate_nodes()
-            self._average_node_to_cell = sp.csr_matrix((V, (I, J)), shape=(self.n_cells, self.n_total_nodes))*Rn
+            self._average_node_to_cell = self._to_dtype(sp.csr_matrix((V, (I, J)), shape=(self.n_cells, self.n_total_nodes))*Rn)
         return self._average_node_to_cell
 
     @property
@@ -4365,7 +4395,7 @@ cdef class _TreeMesh:
                 V[ii*2 + id] = 0.5
 
         Rn = self._deflate_nodes()
-        self._average_node_to_edge_x = sp.csr_matrix((V, (I, J)), shape=(self.n_edges_x, self.n_total_nodes))*Rn
+        self._average_node_to_edge_x = self._to_dtype(sp.csr_matrix((V, (I, J)), shape=(self.n_edges_x, self.n_total_nodes))*Rn)
         return self._average_node_to_edge_x
 
     @property
@@ -4402,7 +4432,7 @@ cdef class _TreeMesh:
                 V[ii*2 + id] = 0.5
 
         Rn = self._deflate_nodes()
-        self._average_node_to_edge_y = sp.csr_matrix((V, (I, J)), shape=(self.n_edges_y, self.n_total_nodes))*Rn
+        self._average_node_to_edge_y = self._to_dtype(sp.csr_matrix((V, (I, J)), shape=(self.n_edges_y, self.n_total_nodes))*Rn)
         return self._average_node_to_edge_y
 
     @property
@@ -4441,7 +4471,7 @@ cdef class _TreeMesh:
                 V[ii*2 + id] = 0.5
 
         Rn = self._deflate_nodes()
-        self._average_node_to_edge_z = sp.csr_matrix((V, (I, J)), shape=(self.n_edges_z, self.n_total_nodes))*Rn
+        self._average_node_to_edge_z = self._to_dtype(sp.csr_matrix((V, (I, J)), shape=(self.n_edges_z, self.n_total_nodes))*Rn)
         return self._average_node_to_edge_z
 
     @property
@@ -4483,7 +4513,7 @@ cdef class _TreeMesh:
         stacks = [self.average_node_to_edge_x, self.average_node_to_edge_y]
         if self._dim == 3:
             stacks += [self.average_node_to_edge_z]
-        self._average_node_to_edge = sp.vstack(stacks).tocsr()
+        self._average_node_to_edge = self._to_dtype(sp.vstack(stacks).tocsr())
         return self._average_node_to_edge
 
     @property
@@ -4522,7 +4552,7 @@ cdef class _TreeMesh:
                 V[ii*4 + id] = 0.25
 
         Rn = self._deflate_nodes()
-        self._average_node_to_face_x = sp.csr_matrix((V, (I, J)), shape=(self.n_faces_x, self.n_total_nodes))*Rn
+        self._average_node_to_face_x = self._to_dtype(sp.csr_matrix((V, (I, J)), shape=(self.n_faces_x, self.n_total_nodes))*Rn)
         return self._average_node_to_face_x
 
     @property
@@ -4562,7 +4592,7 @@ cdef class _TreeMesh:
                 V[ii*4 + id] = 0.25
 
         Rn = self._deflate_nodes()
-        self._average_node_to_face_y = sp.csr_matrix((V, (I, J)), shape=(self.n_faces_y, self.n_total_nodes))*Rn
+        self._average_node_to_face_y = self._to_dtype(sp.csr_matrix((V, (I, J)), shape=(self.n_faces_y, self.n_total_nodes))*Rn)
         return self._average_node_to_face_y
 
     @property
@@ -4602,7 +4632,7 @@ cdef class _TreeMesh:
                 V[ii*4 + id] = 0.25
 
         Rn = self._deflate_nodes()
-        self._average_node_to_face_z = sp.csr_matrix((V, (I, J)), shape=(self.n_faces_z, self.n_total_nodes))*Rn
+        self._average_node_to_face_z = self._to_dtype(sp.csr_matrix((V, (I, J)), shape=(self.n_faces_z, self.n_total_nodes))*Rn)
         return self._average_node_to_face_z
 
     @property
@@ -4644,7 +4674,7 @@ cdef class _TreeMesh:
         stacks = [self.average_node_to_face_x, self.average_node_to_face_y]
         if self._dim == 3:
             stacks += [self.average_node_to_face_z]
-        self._average_node_to_face = sp.vstack(stacks).tocsr()
+        self._average_node_to_face = self._to_dtype(sp.vstack(stacks).tocsr())
         return self._average_node_to_face
 
     @property
@@ -4693,7 +4723,7 @@ cdef class _TreeMesh:
         if self._dim == 3:
             stacks.append(self.average_cell_to_face_z)
 
-        self._average_cell_to_face = sp.vstack(stacks).tocsr()
+        self._average_cell_to_face = self._to_dtype(sp.vstack(stacks).tocsr())
         return self._average_cell_to_face
 
     @property
@@ -4753,7 +4783,7 @@ cdef class _TreeMesh:
         if self._dim == 3:
             stacks.append(self.average_cell_to_face_z)
 
-        self._average_cell_vector_to_face = sp.block_diag(stacks).tocsr()
+        self._average_cell_vector_to_face = self._to_dtype(sp.block_diag(stacks).tocsr())
         return self._average_cell_vector_to_face
 
     @property
@@ -4869,7 +4899,7 @@ cdef class _TreeMesh:
                         V[2*ind    ] = w/children_per_parent
                         V[2*ind + 1] = (1.0-w)/children_per_parent
 
-        self._average_cell_to_face_x = sp.csr_matrix((V, (I, J)), shape=(self.n_faces_x, self.n_cells))
+        self._average_cell_to_face_x = self._to_dtype(sp.csr_matrix((V, (I, J)), shape=(self.n_faces_x, self.n_cells)))
         return self._average_cell_to_face_x
 
     @property
@@ -4985,7 +5015,7 @@ cdef class _TreeMesh:
                         V[2*ind    ] = w/children_per_parent
                         V[2*ind + 1] = (1.0-w)/children_per_parent
 
-        self._average_cell_to_face_y = sp.csr_matrix((V, (I,J)), shape=(self.n_faces_y, self.n_cells))
+        self._average_cell_to_face_y = self._to_dtype(sp.csr_matrix((V, (I,J)), shape=(self.n_faces_y, self.n_cells)))
         return self._average_cell_to_face_y
 
     @property
@@ -5072,7 +5102,7 @@ cdef class _TreeMesh:
                     V[2*ind    ] = w/children_per_parent
                     V[2*ind + 1] = (1.0-w)/children_per_parent
 
-        self._average_cell_to_face_z = sp.csr_matrix((V, (I,J)), shape=(self.n_faces_z, self.n_cells))
+        self._average_cell_to_face_z = self._to_dtype(sp.csr_matrix((V, (I,J)), shape=(self.n_faces_z, self.n_cells)))
         return self._average_cell_to_face_z
 
     @property
@@ -5108,7 +5138,7 @@ cdef class _TreeMesh:
                 is_b,
                 (faces_z[:, 2] == z0) | (faces_z[:, 2] == zF)
             ]
-        return sp.eye(self.n_faces, format='csr')[is_b]
+        return sp.eye(self.n_faces, format='csr', dtype=self._dtype)[is_b]
 
     @property
     def project_edge_to_boundary_edge(self):
@@ -5150,7 +5180,7 @@ cdef class _TreeMesh:
             is_b = np.r_[is_bx, is_by, is_bz]
         else:
             is_b = np.r_[is_bx, is_by]
-        return sp.eye(self.n_edges, format='csr')[is_b]
+        return sp.eye(self.n_edges, format='csr', dtype=self._dtype)[is_b]
 
     @property
     def project_node_to_boundary_node(self):
@@ -5181,7 +5211,7 @@ cdef class _TreeMesh:
         if self.dim > 2:
             z0, zF = self._zs[0], self._zs[-1]
             is_b |= (nodes[:, 2] == z0) | (nodes[:, 2] == zF)
-        return sp.eye(self.n_nodes, format='csr')[is_b]
+        return sp.eye(self.n_nodes, format='csr', dtype=self._dtype)[is_b]
 
     def _get_containing_cell_index(self, loc):
         cdef double x, y, z
@@ -5231,51 +5261,13 @@ cdef class _TreeMesh:
 
     def _getFaceP(self, xFace, yFace, zFace):
         cdef int dim = self._dim
-        cdef int_t ind, id
-
-        cdef np.int64_t[:] I, J, J1, J2, J3
-        cdef np.float64_t[:] V
+        inds = self._cell_total_face_indices()
 
-        J1 = np.empty(self.n_cells, dtype=np.int64)
-        J2 = np.empty(self.n_cells, dtype=np.int64)
-        if dim==3:
-            J3 = np.empty(self.n_cells, dtype=np.int64)
-
-        cdef int[3] faces
-        cdef np.int64_t[:] offsets = np.empty(self._dim, dtype=np.int64)
-        faces[0] = (xFace == 'fXp')
-        faces[1] = (yFace == 'fYp')
+        J = [inds[:, int(xFace == 'fXp')], inds[:, 2 + int(yFace == 'fYp')]]
         if dim == 3:
-            faces[2] = (zFace == 'fZp')
-
-        if dim == 2:
-            offsets[0] = 0
-            offsets[1] = self.n_total_faces_x
-        else:
-            offsets[0] = 0
-            offsets[1] = self.n_total_faces_x
-            offsets[2] = self.n_total_faces_x + self.n_total_faces_y
-
-        for cell in self.tree.cells:
-            ind = cell.index
-            if dim==2:
-                J1[ind] = cell.edges[2 + faces[0]].index
-                J2[ind] = cell.edges[    faces[1]].index + offsets[1]
-            else:
-                J1[ind] = cell.faces[    faces[0]].index
-                J2[ind] = cell.faces[2 + faces[1]].index + offsets[1]
-                J3[ind] = cell.faces[4 + faces[2]].index + offsets[2]
-
-        I = np.arange(dim*self.n_cells, dtype=np.int64)
-        if dim==2:
-            J = np.r_[J1, J2]
-        else:
-            J = np.r_[J1, J2, J3]
-        V = np.ones(self.n_cells*dim, dtype=np.float64)
-
-        P = sp.csr_matrix((V, (I, J)), shape=(self._dim*self.n_cells, self.n_total_faces))
-        Rf = self._deflate_faces()
-        return P*Rf
+            J.append(inds[:, 4 + int(zFace == 'fZp')])
+        # P_total has a single unit entry per row, so P_total @ Rf selects rows of Rf
+        return self._deflate_faces()[np.concatenate(J)]
 
     def _getFacePxx(self):
         def Pxx(xFace, yFace):
@@ -5289,49 +5281,18 @@ cdef class _TreeMesh:
 
     def _getEdgeP(self, xEdge, yEdge, zEdge):
         cdef int dim = self._dim
-        cdef int_t ind, id
         cdef int epc = 1<<(dim-1) #edges per cell 2/4
+        inds = self._cell_total_edge_indices()
 
-        cdef np.int64_t[:] I, J, J1, J2, J3
-        cdef np.float64_t[:] V
-
-        J1 = np.empty(self.n_cells, dtype=np.int64)
-        J2 = np.empty(self.n_cells, dtype=np.int64)
-        if dim == 3:
-            J3 = np.empty(self.n_cells, dtype=np.int64)
-
-        cdef int[3] edges
-        cdef np.int64_t[:] offsets = np.empty(self._dim, dtype=np.int64)
+        edges = [xEdge, yEdge, zEdge][:dim]
         try:
-            edges[0] = int(xEdge[-1]) #0, 1, 2, 3
-            edges[1] = int(yEdge[-1]) #0, 1, 2, 3
-            if dim == 3:
-                edges[2] = int(zEdge[-1]) #0, 1, 2, 3
+            edges = [int(edge[-1]) for edge in edges] #0, 1, 2, 3
         except ValueError:
             raise Exception('Last character of edge string must be 0, 1, 2, or 3')
 
-        offsets[0] = 0
-        offsets[1] = self.n_total_edges_x
-        if dim==3:
-            offsets[2] = self.n_total_edges_x + self.n_total_edges_y
-
-        for cell in self.tree.cells:
-            ind = cell.index
-            J1[ind] = cell.edges[0*epc + edges[0]].index + offsets[0]
-            J2[ind] = cell.edges[1*epc + edges[1]].index + offsets[1]
-            if dim==3:
-                J3[ind] = cell.edges[2*epc + edges[2]].index + offsets[2]
-
-        I = np.arange(dim*self.n_cells, dtype=np.int64)
-        if dim==2:
-            J = np.r_[J1, J2]
-        else:
-            J = np.r_[J1, J2, J3]
-        V = np.ones(self.n_cells*dim, dtype=np.float64)
-
-        P = sp.csr_matrix((V, (I, J)), shape=(self._dim*self.n_cells, self.n_total_edges))
-        Rf = self._deflate_edges()
-        return P*Rf
+        J = [inds[:, i*epc + edge] for i, edge in enumerate(edges)]
+        # P_total has a single unit entry per row, so P_total @ Re selects rows of Re
+        return self._deflate_edges()[np.concatenate(J)]
 
     def _getEdgePxx(self):
         def Pxx(xEdge, yEdge):
@@ -5343,6 +5304,87 @@ cdef class _TreeMesh:
             return self._getEdgeP(xEdge, yEdge, zEdge)
         return Pxxx
 
+    def _cell_total_face_indices(self):
+        """Indices of the faces of every cell, including hanging faces.
+
+        Returns an (n_cells, 2 * dim) array, ordered as the x-, x+, y-, y+, z-
+        and z+ faces of each cell, indexing into all the faces of the mesh. The
+        table is cached on the mesh.
+        """
+        if self._cell_face_table is not None:
+            return self._cell_face_table
+        cdef int dim = self._dim
+        cdef int_t ind
+        cdef np.int64_t off_y = self.n_total_faces_x
+        cdef np.int64_t off_z = self.n_total_faces_x + self.n_total_faces_y
+        cdef np.int64_t[:, :] inds = np.empty((self.n_cells, 2 * dim), dtype=np.int64)
+
+        for cell in self.tree.cells:
+            ind = cell.index
+            if dim == 2:
+                inds[ind, 0] = cell.edges[2].index
+                inds[ind, 1] = cell.edges[3].index
+                inds[ind, 2] = cell.edges[0].index + off_y
+                inds[ind, 3] = cell.edges[1].index + off_y
+            else:
+                inds[ind, 0] = cell.faces[0].index
+                inds[ind, 1] = cell.faces[1].index
+                inds[ind, 2] = cell.faces[2].index + off_y
+                inds[ind, 3] = cell.faces[3].index + off_y
+                inds[ind, 4] = cell.faces[4].index + off_z
+                inds[ind, 5] = cell.faces[5].index + off_z
+        self._cell_face_table = _compact_indices(np.asarray(inds), self.n_total_faces)
+        return self._cell_face_table
+
+    def _cell_total_edge_indices(self):
+        """Indices of the edges of every cell, including hanging edges.
+
+        Returns an (n_cells, dim * 2**(dim - 1)) array, ordered as the x, y and
+        z edges of each cell, indexing into all the edges of the mesh. The
+        table is cached on the mesh.
+        """
+        if self._cell_edge_table is not None:
+            return self._cell_edge_table
+        cdef int dim = self._dim
+        cdef int epc = 1<<(dim-1) #edges per cell 2/4
+        cdef int_t ind, i
+        cdef np.int64_t[3] offsets
+        cdef np.int64_t[:, :] inds = np.empty((self.n_cells, dim * epc), dtype=np.int64)
+
+        offsets[0] = 0
+        offsets[1] = self.n_total_edges_x
+        if dim == 3:
+            offsets[2] = self.n_total_edges_x + self.n_total_edges_y
+
+        for cell in self.tree.cells:
+            ind = cell.index
+            for i in range(dim * epc):
+                inds[ind, i] = cell.edges[i].index + offsets[i // epc]
+        self._cell_edge_table = _compact_indices(np.asarray(inds), self.n_total_edges)
+        return self._cell_edge_table
+
+    @property
+    def projection_cache_nbytes(self):
+        """Memory used by the cached inner product projection data, in bytes.
+
+        The per-cell face and edge index tables and the matrices removing the
+        hanging faces and edges are computed on the first request of an inner
+        product (or its derivative) that needs them, and are kept on the mesh
+        to be reused for every following model.
+
+        Returns
+        -------
+        int
+        """
+        nbytes = 0
+        for table in [self._cell_face_table, self._cell_edge_table]:
+            if table is not None:
+                nbytes += table.nbytes
+        for R in [self._face_deflation, self._edge_deflation]:
+            if R is not None:
+                nbytes += R.data.nbytes + R.indices.nbytes + R.indptr.nbytes
+        return nbytes
+
     def _getEdgeIntMat(self, locs, zerosOutside, direction):
         cdef:
             double[:, :] locations = locs
@@ -3,12 +3,48 @@ import numpy as np
 import warnings
 import os
 import json
+import functools
+from concurrent.futures import ThreadPoolExecutor
+import scipy.sparse as sp
 from scipy.spatial import KDTree
 from discretize.utils.code_utils import (
     deprecate_property,
     deprecate_method,
     as_array_n_by_dim,
 )
+from discretize.utils.matrix_utils import _downcast_indices
+
+_FLOAT64 = np.dtype(np.float64)
+
+
+def _cast_to_dtype(value, dtype):
+    """Cast floating point arrays and sparse matrices in `value` to `dtype`.
+
+    Sparse matrices additionally have their index arrays stored as int32 when
+    possible. Anything that is not floating point is returned unchanged.
+    """
+    if isinstance(value, np.ndarray) or sp.issparse(value):
+        if np.issubdtype(value.dtype, np.complexfloating):
+            target = np.result_type(dtype, np.complex64)
+        elif np.issubdtype(value.dtype, np.floating):
+            target = dtype
+        else:
+            return value
+        if value.dtype != target:
+            value = value.astype(target)
+        if sp.issparse(value):
+            value = _downcast_indices(value)
+        return value
+    if isinstance(value, tuple):
+        return tuple(_cast_to_dtype(v, dtype) for v in value)
+    if callable(value) and not isinstance(value, type):
+        # e.g. the functions returned by the inner product derivatives
+        @functools.wraps(value)
+        def cast_func(*args, **kwargs):
+            return _cast_to_dtype(value(*args, **kwargs), dtype)
+
+        return cast_func
+    return value
 
 
 class BaseMesh:
@@ -38,6 +74,28 @@ class BaseMesh:
         "aveN2F": "average_node_to_face",
     }
 
+    _dtype = _FLOAT64
+
+    def _to_dtype(self, value):
+        """Return `value` in the precision of the mesh.
+
+        The geometry and operators of the mesh pass their results through this
+        before caching or returning them, it is a no-op for double precision
+        meshes.
+        """
+        if self._dtype is _FLOAT64:
+            return value
+        return _cast_to_dtype(value, self._dtype)
+
+    @staticmethod
+    def _validate_dtype(dtype):
+        """Validate the floating point precision of a mesh."""
+        dtype = np.dtype(np.float64 if dtype is None else dtype)
+        if dtype not in [np.float32, np.float64]:
+            raise ValueError(f"dtype must be either float32 or float64, not {dtype}")
+        # return the canonical instance
+        return np.dtype(dtype.type)
+
     def __getattr__(self, name):
         """Reimplement get attribute to allow for aliases."""
         if name == "_aliases":
@@ -70,6 +128,8 @@ class BaseMesh:
             if attr is not None:
                 if isinstance(attr, np.ndarray):
                     attr = attr.tolist()
+                elif isinstance(attr, np.dtype):
+                    attr = attr.name
                 elif isinstance(attr, tuple):
                     # change to a list and make sure inner items are not numpy arrays
                     attr = list(attr)
@@ -222,6 +282,24 @@ class BaseMesh:
         """
         raise NotImplementedError(f"dim not implemented for {type(self)}")
 
+    @property
+    def dtype(self):
+        """The floating point precision of the mesh's geometry and operators.
+
+        Meshes created with ``dtype=np.float32`` return their gridded
+        locations, cell volumes, face areas, edge lengths, differential and
+        averaging operators, inner product matrices, and interpolation matrices
+        in single precision, with 32-bit sparse indices whenever their sizes
+        allow. The values defining the mesh (e.g. the cell widths or the nodes
+        of a :class:`~discretize.SimplexMesh`) are kept in double precision.
+
+        Returns
+        -------
+        numpy.dtype
+            Either float32 or float64.
+        """
+        return self._dtype
+
     @property
     def n_cells(self):
         """Total number of cells in the mesh.
@@ -3588,6 +3666,178 @@ class BaseMesh:
             f"get_interpolation_matrix not implemented for {type(self)}"
         )
 
+    def iter_interpolation_matrix(
+        self,
+        loc,
+        location_type="cell_centers",
+        zeros_outside=False,
+        chunk_size=65536,
+        **kwargs,
+    ):
+        """Generate the interpolation matrix in blocks of rows.
+
+        This is a memory bounded alternative to :meth:`get_interpolation_matrix`
+        for very large sets of locations. The locations are processed in
+        consecutive chunks of at most `chunk_size` points, and the rows of the
+        interpolation matrix associated with each chunk are yielded as they are
+        built, so only a single block needs to be held in memory at any time.
+
+        Parameters
+        ----------
+        loc : (n_pts, dim) numpy.ndarray
+            Location of points being to interpolate to. Must have same dimensions as the mesh.
+        location_type : str, optional
+            Tensor locations on the mesh being interpolated from. See
+            :meth:`get_interpolation_matrix` for the available options.
+        zeros_outside : bool, optional
+            If *False*, nearest neighbour is used to compute the interpolate value
+            at locations outside the mesh. If *True* , values at locations outside
+            the mesh will be zero.
+        chunk_size : int, optional
+            Maximum number of locations processed in each block.
+        **kwargs
+            Passed along to :meth:`get_interpolation_matrix`.
+
+        Yields
+        ------
+        rows : slice
+            The rows of the full interpolation matrix covered by this block.
+        Q : (n_rows, n_loc_type) scipy.sparse.csr_matrix
+            The interpolation matrix for the locations ``loc[rows]``.
+
+        See Also
+        --------
+        get_interpolation_matrix
+        interpolate
+
+        Examples
+        --------
+        Stacking the blocks reproduces the full interpolation matrix.
+
+        >>> from discretize import TensorMesh
+        >>> import numpy as np
+        >>> import scipy.sparse as sp
+        >>> mesh = TensorMesh([8, 8])
+        >>> locs = np.random.rand(100, 2)
+        >>> blocks = [Q for _, Q in mesh.iter_interpolation_matrix(locs, 'nodes', chunk_size=30)]
+        >>> len(blocks)
+        4
+        >>> Q = mesh.get_interpolation_matrix(locs, 'nodes')
+        >>> np.allclose(sp.vstack(blocks).toarray(), Q.toarray())
+        True
+        """
+        chunk_size = int(chunk_size)
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be a positive integer, not {chunk_size}")
+        loc = as_array_n_by_dim(np.asarray(loc), self.dim)
+        n_loc = loc.shape[0]
+        for start in range(0, n_loc, chunk_size):
+            rows = slice(start, min(start + chunk_size, n_loc))
+            Q = self.get_interpolation_matrix(
+                loc[rows], location_type, zeros_outside, **kwargs
+            )
+            yield rows, Q.tocsr()
+
+    def interpolate(
+        self,
+        values,
+        loc,
+        location_type="cell_centers",
+        zeros_outside=False,
+        chunk_size=65536,
+        n_workers=None,
+        output=None,
+        **kwargs,
+    ):
+        """Interpolate discrete values on the mesh to a set of locations.
+
+        This applies the interpolation matrix of :meth:`get_interpolation_matrix`
+        to `values` without ever forming the full matrix. The locations are
+        processed in chunks of at most `chunk_size` points (see
+        :meth:`iter_interpolation_matrix`), keeping the memory usage bounded
+        regardless of the number of locations. The chunks can optionally be
+        processed concurrently by a pool of threads.
+
+        Parameters
+        ----------
+        values : (n_loc_type) or (n_loc_type, n_fields) numpy.ndarray
+            Discrete quantity defined on the `location_type` of the mesh. Multiple
+            fields can be interpolated at once by passing them as columns.
+        loc : (n_pts, dim) numpy.ndarray
+            Location of points being to interpolate to. Must have same dimensions as the mesh.
+        location_type : str, optional
+            Tensor locations on the mesh being interpolated from. See
+            :meth:`get_interpolation_matrix` for the available options.
+        zeros_outside : bool, optional
+            If *False*, nearest neighbour is used to compute the interpolate value
+            at locations outside the mesh. If *True* , values at locations outside
+            the mesh will be zero.
+        chunk_size : int, optional
+            Maximum number of locations processed in each block.
+        n_workers : int, optional
+            Number of threads in the pool processing the chunks. By default, the
+            chunks are processed serially.
+        output : (n_pts) or (n_pts, n_fields) numpy.ndarray, optional
+            Array to be filled with the interpolated values and returned.
+        **kwargs
+            Passed along to :meth:`get_interpolation_matrix`, e.g. the
+            `n_threads` of the meshes that accept it, which is used within each
+            chunk.
+
+        Returns
+        -------
+        (n_pts) or (n_pts, n_fields) numpy.ndarray
+            The interpolated values.
+
+        See Also
+        --------
+        get_interpolation_matrix
+        iter_interpolation_matrix
+
+        Examples
+        --------
+        >>> from discretize import TensorMesh
+        >>> import numpy as np
+        >>> mesh = TensorMesh([8, 8, 8])
+        >>> locs = np.random.rand(1000, 3)
+        >>> values = np.random.rand(mesh.n_cells)
+        >>> v1 = mesh.interpolate(values, locs, chunk_size=128, n_workers=2)
+        >>> v2 = mesh.get_interpolation_matrix(locs) @ values
+        >>> np.allclose(v1, v2)
+        True
+        """
+        values = np.asarray(values)
+        loc = as_array_n_by_dim(np.asarray(loc), self.dim)
+        out_shape = (loc.shape[0],) + values.shape[1:]
+        if output is None:
+            output = np.empty(out_shape, dtype=np.result_type(values, np.float64))
+        elif output.shape != out_shape:
+            raise ValueError(f"output must have shape {out_shape}, not {output.shape}")
+
+        chunk_size = int(chunk_size)
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be a positive integer, not {chunk_size}")
+        n_loc = loc.shape[0]
+
+        def apply(start):
+            rows = slice(start, min(start + chunk_size, n_loc))
+            Q = self.get_interpolation_matrix(
+                loc[rows], location_type, zeros_outside, **kwargs
+            )
+            output[rows] = Q @ values
+
+        starts = range(0, n_loc, chunk_size)
+        if n_workers is None or n_workers <= 1:
+            for start in starts:
+                apply(start)
+        else:
+            # each worker builds and applies its own block, so at most
+            # n_workers blocks are alive at any given time.
+            with ThreadPoolExecutor(max_workers=n_workers) as pool:
+                # consume the results to re-raise any exceptions
+                list(pool.map(apply, starts))
+        return output
+
     def _parse_location_type(self, location_type):
         if len(location_type) == 0:
             return location_type
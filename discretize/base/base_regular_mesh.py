@@ -441,7 +441,7 @@ class BaseRegularMesh(BaseMesh):
         if self.dim == 2:
             nX = np.c_[np.ones(self.n_faces_x), np.zeros(self.n_faces_x)]
             nY = np.c_[np.zeros(self.n_faces_y), np.ones(self.n_faces_y)]
-            return np.r_[nX, nY]
+            return self._to_dtype(np.r_[nX, nY])
         elif self.dim == 3:
             nX = np.c_[
                 np.ones(self.n_faces_x),
@@ -458,7 +458,7 @@ class BaseRegularMesh(BaseMesh):
                 np.zeros(self.n_faces_z),
                 np.ones(self.n_faces_z),
             ]
-            return np.r_[nX, nY, nZ]
+            return self._to_dtype(np.r_[nX, nY, nZ])
 
     @property
     def edge_tangents(self):  # NOQA D102
@@ -466,7 +466,7 @@ class BaseRegularMesh(BaseMesh):
         if self.dim == 2:
             tX = np.c_[np.ones(self.n_edges_x), np.zeros(self.n_edges_x)]
             tY = np.c_[np.zeros(self.n_edges_y), np.ones(self.n_edges_y)]
-            return np.r_[tX, tY]
+            return self._to_dtype(np.r_[tX, tY])
         elif self.dim == 3:
             tX = np.c_[
                 np.ones(self.n_edges_x),
@@ -483,7 +483,7 @@ class BaseRegularMesh(BaseMesh):
                 np.zeros(self.n_edges_z),
                 np.ones(self.n_edges_z),
             ]
-            return np.r_[tX, tY, tZ]
+            return self._to_dtype(np.r_[tX, tY, tZ])
 
     @property
     def reference_is_rotated(self):
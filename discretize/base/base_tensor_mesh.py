@@ -16,8 +16,10 @@ from discretize.utils import (
     TensorType,
     interpolation_matrix,
     make_boundary_bool,
+    inverse_property_tensor,
 )
 from discretize.utils.code_utils import deprecate_method, deprecate_property
+from discretize.utils.matrix_utils import _sparse_matmul
 import warnings
 
 
@@ -61,6 +63,10 @@ class BaseTensorMesh(BaseRegularMesh):
           each axis is the first node location ('0'), in the center ('C') or the last
           node location ('N').
 
+    dtype : {numpy.float64, numpy.float32}, optional
+        The floating point precision of the mesh's geometry and operators, see
+        :py:attr:`~discretize.base.BaseMesh.dtype`.
+
     See Also
     --------
     utils.unpack_widths :
@@ -81,9 +87,10 @@ class BaseTensorMesh(BaseRegularMesh):
     }
 
     _unitDimensions = [1, 1, 1]
-    _items = {"h"} | BaseRegularMesh._items
+    _items = {"h", "dtype"} | BaseRegularMesh._items
 
-    def __init__(self, h, origin=None, **kwargs):
+    def __init__(self, h, origin=None, dtype=None, **kwargs):
+        self._dtype = self._validate_dtype(dtype)
         if "x0" in kwargs:
             origin = kwargs.pop("x0")
 
@@ -304,8 +311,8 @@ class BaseTensorMesh(BaseRegularMesh):
         # Documentation inherited from discretize.base.BaseMesh
         dim = self.dim
         if dim == 1:
-            return self.nodes_x[[0, -1]]
-        return self.nodes[make_boundary_bool(self.shape_nodes)]
+            return self._to_dtype(self.nodes_x[[0, -1]])
+        return self._to_dtype(self.nodes[make_boundary_bool(self.shape_nodes)])
 
     @property
     def h_gridded(self):
@@ -351,8 +358,8 @@ class BaseTensorMesh(BaseRegularMesh):
 
         """
         if self.dim == 1:
-            return self.h[0][:, None]
-        return ndgrid(*self.h)
+            return self._to_dtype(self.h[0][:, None])
+        return self._to_dtype(ndgrid(*self.h))
 
     @property
     def faces_x(self):
@@ -419,34 +426,34 @@ class BaseTensorMesh(BaseRegularMesh):
             faces = np.r_[faces, self.faces_y]
         if self.dim > 2 and self.faces_z is not None:
             faces = np.r_[faces, self.faces_z]
-        return faces
+        return self._to_dtype(faces)
 
     @property
     def boundary_faces(self):  # NOQA D102
         # Documentation inherited from discretize.base.BaseMesh
         dim = self.dim
         if dim == 1:
-            return self.nodes_x[[0, -1]]
+            return self._to_dtype(self.nodes_x[[0, -1]])
         if dim == 2:
             fx = ndgrid(self.nodes_x[[0, -1]], self.cell_centers_y)
             fy = ndgrid(self.cell_centers_x, self.nodes_y[[0, -1]])
-            return np.r_[fx, fy]
+            return self._to_dtype(np.r_[fx, fy])
         if dim == 3:
             fx = ndgrid(self.nodes_x[[0, -1]], self.cell_centers_y, self.cell_centers_z)
             fy = ndgrid(self.cell_centers_x, self.nodes_y[[0, -1]], self.cell_centers_z)
             fz = ndgrid(self.cell_centers_x, self.cell_centers_y, self.nodes_z[[0, -1]])
-            return np.r_[fx, fy, fz]
+            return self._to_dtype(np.r_[fx, fy, fz])
 
     @property
     def boundary_face_outward_normals(self):  # NOQA D102
         # Documentation inherited from discretize.base.BaseMesh
         dim = self.dim
         if dim == 1:
-            return np.array([-1, 1])
+            return self._to_dtype(np.array([-1, 1]))
         if dim == 2:
             nx = ndgrid(np.r_[-1, 1], np.zeros(self.shape_cells[1]))
             ny = ndgrid(np.zeros(self.shape_cells[0]), np.r_[-1, 1])
-            return np.r_[nx, ny]
+            return self._to_dtype(np.r_[nx, ny])
         if dim == 3:
             nx = ndgrid(
                 np.r_[-1, 1],
@@ -463,7 +470,7 @@ class BaseTensorMesh(BaseRegularMesh):
                 np.zeros(self.shape_cells[1]),
                 np.r_[-1, 1],
             )
-            return np.r_[nx, ny, nz]
+            return self._to_dtype(np.r_[nx, ny, nz])
 
     @property
     def edges_x(self):
@@ -530,7 +537,7 @@ class BaseTensorMesh(BaseRegularMesh):
             edges = np.r_[edges, self.edges_y]
         if self.dim > 2 and self.edges_z is not None:
             edges = np.r_[edges, self.edges_z]
-        return edges
+        return self._to_dtype(edges)
 
     @property
     def boundary_edges(self):
@@ -552,16 +559,16 @@ class BaseTensorMesh(BaseRegularMesh):
         if dim == 2:
             ex = ndgrid(self.cell_centers_x, self.nodes_y[[0, -1]])
             ey = ndgrid(self.nodes_x[[0, -1]], self.cell_centers_y)
-            return np.r_[ex, ey]
+            return self._to_dtype(np.r_[ex, ey])
         if dim == 3:
             ex = self.edges_x[make_boundary_bool(self.shape_edges_x, dir="yz")]
             ey = self.edges_y[make_boundary_bool(self.shape_edges_y, dir="xz")]
             ez = self.edges_z[make_boundary_bool(self.shape_edges_z, dir="xy")]
-            return np.r_[ex, ey, ez]
+            return self._to_dtype(np.r_[ex, ey, ez])
 
     def _getTensorGrid(self, key):
         if getattr(self, "_" + key, None) is None:
-            setattr(self, "_" + key, ndgrid(self.get_tensor(key)))
+            setattr(self, "_" + key, self._to_dtype(ndgrid(self.get_tensor(key))))
         return getattr(self, "_" + key)
 
     def get_tensor(self, key):
@@ -723,6 +730,7 @@ class BaseTensorMesh(BaseRegularMesh):
                 raise ValueError("Points outside of mesh")
         else:
             indZeros = np.logical_not(self.is_inside(loc))
+            loc = loc.copy()
             loc[indZeros, :] = np.array([v.mean() for v in self.get_tensor("CC")])
 
         location_type = self._parse_location_type(location_type)
@@ -792,14 +800,18 @@ class BaseTensorMesh(BaseRegularMesh):
                 FutureWarning,
             )
             zeros_outside = kwargs["zerosOutside"]
-        return self._getInterpolationMat(loc, location_type, zeros_outside)
+        return self._to_dtype(
+            self._getInterpolationMat(loc, location_type, zeros_outside)
+        )
 
     def _fastInnerProduct(
         self, projection_type, model=None, invert_model=False, invert_matrix=False
     ):
         """Fast version of getFaceInnerProduct.
 
-        This does not handle the case of a full tensor property.
+        Full tensor properties are handled by
+        :meth:`_fast_full_tensor_inner_product`, which is exact, while the
+        isotropic and diagonal anisotropic cases use averaging.
 
         Parameters
         ----------
@@ -831,12 +843,28 @@ class BaseTensorMesh(BaseRegularMesh):
         if model is None:
             model = np.ones(self.nC)
 
+        n_full = 3 if self.dim == 2 else 6
+        is_full = (
+            self.dim > 1
+            and self._meshType != "CYL"
+            and not is_scalar(model)
+            and np.size(model) == self.nC * n_full
+        )
+
         if invert_model:
-            model = 1.0 / model
+            if is_full:
+                model = inverse_property_tensor(self, model)
+            else:
+                model = 1.0 / model
 
         if is_scalar(model):
             model = model * np.ones(self.nC)
 
+        if is_full:
+            if invert_matrix:
+                raise NotImplementedError("Solver needed to invert A.")
+            return self._fast_full_tensor_inner_product(projection_type, model)
+
         # number of elements we are averaging (equals dim for regular
         # meshes, but for cyl, where we use symmetry, it is 1 for edge
         # variables and 2 for face variables)
@@ -850,21 +878,21 @@ class BaseTensorMesh(BaseRegularMesh):
         if model.size == self.nC:
             Av = getattr(self, "ave" + projection_type + "2CC")
             Vprop = self.cell_volumes * mkvc(model)
-            M = n_elements * sdiag(Av.T * Vprop)
+            M = n_elements * sdiag(_sparse_matmul(Av.T, Vprop))
 
         elif model.size == self.nC * self.dim:
             Av = getattr(self, "ave" + projection_type + "2CCV")
 
             # if cyl, then only certain components are relevant due to symmetry
             # for faces, x, z matters, for edges, y (which is theta) matters
-            if self._meshType == "CYL":
+            if self._meshType == "CYL" and self.is_symmetric:
                 if projection_type == "E":
                     model = model[:, 1]  # this is the action of a projection mat
                 elif projection_type == "F":
                     model = model[:, [0, 2]]
 
-            V = sp.kron(sp.identity(n_elements), sdiag(self.cell_volumes))
-            M = sdiag(Av.T * V * mkvc(model))
+            Vprop = np.tile(self.cell_volumes, n_elements) * mkvc(model)
+            M = sdiag(_sparse_matmul(Av.T, Vprop))
         else:
             return None
 
@@ -873,6 +901,147 @@ class BaseTensorMesh(BaseRegularMesh):
         else:
             return M
 
+    def _cell_local_indices(self, projection_type):
+        """Get the indices of the faces or edges of every cell.
+
+        Parameters
+        ----------
+        projection_type : {'F', 'E'}
+            'F' for faces or 'E' for edges
+
+        Returns
+        -------
+        numpy.ndarray of int
+            For faces, an (n_cells, 2 * dim) array ordered as the x-, x+, y-,
+            y+, z- and z+ faces of each cell. For edges, an
+            (n_cells, dim * 2**(dim - 1)) array with the x, y and z edges of each
+            cell, ordered by their position along the remaining axes.
+        scipy.sparse.csr_matrix or None
+            A matrix mapping the values on the mesh's faces or edges to the ones
+            indexed above, or ``None`` if they are the same.
+        """
+        dim = self.dim
+        subs = np.unravel_index(np.arange(self.nC), self.shape_cells, order="F")
+        inds = []
+        offset = 0
+        for a in range(dim):
+            if projection_type == "F":
+                shifted = [a]
+            else:
+                shifted = [k for k in range(dim) if k != a]
+            shape = [
+                n + 1 if k in shifted else n for k, n in enumerate(self.shape_cells)
+            ]
+            for local in range(2 ** len(shifted)):
+                sub = list(subs)
+                for bit, k in enumerate(shifted):
+                    sub[k] = sub[k] + ((local >> bit) & 1)
+                inds.append(np.ravel_multi_index(sub, shape, order="F") + offset)
+            offset += np.prod(shape)
+        return np.stack(inds, axis=1), None
+
+    def _fast_full_tensor_inner_product(self, projection_type, model):
+        """Assemble the inner product matrix of a full tensor property.
+
+        The non-zero values are computed directly from the 2x2 or 3x3 property
+        tensor of each cell at each of its corners, without forming the
+        projection matrices.
+
+        Parameters
+        ----------
+        projection_type : {'F', 'E'}
+            'F' for faces or 'E' for edges
+        model : numpy.ndarray
+            The full tensor property, (n_cells, 3) in 2D or (n_cells, 6) in 3D.
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+        """
+        blocks = self._property_tensor_blocks(model)
+        blocks *= (self.cell_volumes / 2**self.dim)[:, None, None]
+        return self._corner_inner_product(projection_type, blocks)
+
+    def _property_tensor_blocks(self, model):
+        """Expand a property to the (n_cells, dim, dim) tensor of every cell.
+
+        Parameters
+        ----------
+        model : numpy.ndarray
+            An isotropic, diagonal anisotropic or full tensor property.
+
+        Returns
+        -------
+        (n_cells, dim, dim) numpy.ndarray
+        """
+        dim = self.dim
+        n_cells = self.nC
+        model = np.asarray(model).reshape((n_cells, -1), order="F")
+        if model.shape[1] == 1:
+            pairs = [(a, a) for a in range(dim)]
+            model = np.repeat(model, dim, axis=1)
+        elif model.shape[1] == dim:
+            pairs = [(a, a) for a in range(dim)]
+        elif dim == 2:
+            pairs = [(0, 0), (1, 1), (0, 1)]
+        else:
+            pairs = [(0, 0), (1, 1), (2, 2), (0, 1), (0, 2), (1, 2)]
+        blocks = np.zeros((n_cells, dim, dim), dtype=model.dtype)
+        for k, (a, b) in enumerate(pairs):
+            blocks[:, a, b] = blocks[:, b, a] = model[:, k]
+        return blocks
+
+    def _corner_inner_product(self, projection_type, blocks):
+        r"""Sum a block of every cell over the faces or edges at its corners.
+
+        Computes :math:`\sum_i \mathbf{S}_i^T \mathbf{B} \mathbf{S}_i`, where
+        :math:`\mathbf{S}_i` selects the faces (or edges) meeting at the i-th
+        corner of every cell and :math:`\mathbf{B}` is block diagonal, holding
+        one (dim, dim) block per cell. With the cell volumes divided by the
+        number of corners times the property tensor as the blocks, this is
+        the inner product matrix.
+
+        Parameters
+        ----------
+        projection_type : {'F', 'E'}
+            'F' for faces or 'E' for edges
+        blocks : (n_cells, dim, dim) numpy.ndarray
+            The block of each cell.
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+        """
+        dim = self.dim
+        n_cells = self.nC
+        local, R = self._cell_local_indices(projection_type)
+        corners = np.arange(2**dim)[:, None] >> np.arange(dim) & 1
+        if projection_type == "F":
+            # the face normal to each axis on the side of the corner
+            cols = 2 * np.arange(dim) + corners
+        else:
+            # the edge along each axis, located by the corner's other bits
+            cols = np.empty_like(corners)
+            for a in range(dim):
+                others = np.delete(corners, a, axis=1)
+                cols[:, a] = a * 2 ** (dim - 1) + others @ (2 ** np.arange(dim - 1))
+        # (n_cells, n_corners, dim), keeping the entries of each cell together
+        # makes the conversion to CSR considerably faster
+        ind = local[:, cols]
+
+        shape = (n_cells, 2**dim, dim, dim)
+        rows = np.broadcast_to(ind[:, :, :, None], shape).ravel()
+        cols = np.broadcast_to(ind[:, :, None, :], shape).ravel()
+        vals = np.broadcast_to(blocks[:, None, :, :], shape).ravel()
+        if R is not None:
+            n = R.shape[0]
+        else:
+            n = self.n_faces if projection_type == "F" else self.n_edges
+        M = sp.csr_matrix((vals, (rows, cols)), shape=(n, n))
+        if R is not None:
+            M = (R.T @ M @ R).tocsr()
+        return M
+
     def _fastInnerProductDeriv(
         self, projection_type, model, invert_model=False, invert_matrix=False
     ):
@@ -985,6 +1154,8 @@ class BaseTensorMesh(BaseRegularMesh):
                 dMdprop = sdiag(-MI.diagonal() ** 2) * Av.T * P * V
 
         if dMdprop is not None:
+            dMdprop = dMdprop.tocsr()
+            rows = np.repeat(np.arange(dMdprop.shape[0]), np.diff(dMdprop.indptr))
 
             def innerProductDeriv(v=None):
                 if v is None:
@@ -995,7 +1166,12 @@ class BaseTensorMesh(BaseRegularMesh):
                         FutureWarning,
                     )
                     return dMdprop
-                return sdiag(v) * dMdprop
+                # sdiag(v) * dMdprop, scaling the values of dMdprop in a single
+                # pass (which stay real for a real model, even if v is complex)
+                return sp.csr_matrix(
+                    (mkvc(v)[rows] * dMdprop.data, dMdprop.indices, dMdprop.indptr),
+                    shape=dMdprop.shape,
+                )
 
             return innerProductDeriv
         else:
@@ -1,33 +1,27 @@
 """Module containing the curvilinear mesh implementation."""
 import numpy as np
+import scipy.sparse as sp
+from scipy.spatial import KDTree
 
-from discretize.utils import (
-    mkvc,
-    index_cube,
-    face_info,
-    volume_tetrahedron,
-    make_boundary_bool,
-)
+from discretize.utils import mkvc, make_boundary_bool, as_array_n_by_dim
+from discretize.utils.code_utils import _n_threads
 from discretize.base import BaseRectangularMesh
 from discretize.operators import DiffOperators, InnerProducts
 from discretize.mixins import InterfaceMixins
+from discretize._extensions.curvilinear_ext import (
+    _cell_volumes,
+    _face_areas_normals,
+    _edge_lengths_tangents,
+    _locate_points,
+)
 
 
-# Some helper functions.
-def _length2D(x):
-    return (x[:, 0] ** 2 + x[:, 1] ** 2) ** 0.5
-
-
-def _length3D(x):
-    return (x[:, 0] ** 2 + x[:, 1] ** 2 + x[:, 2] ** 2) ** 0.5
-
-
-def _normalize2D(x):
-    return x / np.kron(np.ones((1, 2)), mkvc(_length2D(x), 2))
-
-
-def _normalize3D(x):
-    return x / np.kron(np.ones((1, 3)), mkvc(_length3D(x), 2))
+def _shape_function(refs, bits):
+    """Trilinear shape function of the corner with the given bits at refs."""
+    out = np.ones(refs.shape[0])
+    for r, b in zip(refs.T, bits):
+        out *= r if b else 1 - r
+    return out
 
 
 class CurvilinearMesh(
@@ -50,7 +44,11 @@ class CurvilinearMesh(
           (``n_nodes_x``, ``n_nodes_y``)
         - For a 3D curvilinear mesh, *node_list* = [X, Y, Z] where X, Y and Z have shape
           (``n_nodes_x``, ``n_nodes_y``, ``n_nodes_z``)
-
+    n_threads : int, optional
+        Number of threads used to compute the cell volumes, face areas and
+        normals, and edge lengths and tangents of the mesh. By default, they
+        are computed serially. Several threads require discretize to be built
+        with OpenMP, otherwise a warning is issued.
 
     Examples
     --------
@@ -93,7 +91,7 @@ class CurvilinearMesh(
     }
     _items = {"node_list"}
 
-    def __init__(self, node_list, **kwargs):
+    def __init__(self, node_list, n_threads=None, **kwargs):
         if "nodes" in kwargs:
             node_list = kwargs.pop("nodes")
 
@@ -124,6 +122,7 @@ class CurvilinearMesh(
 
         # absorb the rest of kwargs, and do not pass to super
         super().__init__(shape_cells, origin=self.nodes[0])
+        self._n_threads = n_threads
 
     @property
     def node_list(self):
@@ -588,80 +587,51 @@ class CurvilinearMesh(
     def cell_volumes(self):  # NOQA D102
         # Documentation inherited from discretize.base.BaseMesh
         if getattr(self, "_cell_volumes", None) is None:
-            if self.dim == 2:
-                A, B, C, D = index_cube("ABCD", self.vnN)
-                normal, area = face_info(
-                    np.c_[self.gridN, np.zeros((self.nN, 1))], A, B, C, D
-                )
-                self._cell_volumes = area
-            elif self.dim == 3:
-                # Each polyhedron can be decomposed into 5 tetrahedrons
-                # However, this presents a choice so we may as well divide in
-                # two ways and average.
-                A, B, C, D, E, F, G, H = index_cube("ABCDEFGH", self.vnN)
-
-                vol1 = (
-                    volume_tetrahedron(self.gridN, A, B, D, E)
-                    + volume_tetrahedron(self.gridN, B, E, F, G)  # cutted edge top
-                    + volume_tetrahedron(self.gridN, B, D, E, G)  # cutted edge top
-                    + volume_tetrahedron(self.gridN, B, C, D, G)  # middle
-                    + volume_tetrahedron(self.gridN, D, E, G, H)  # cutted edge bottom
-                )  # cutted edge bottom
-
-                vol2 = (
-                    volume_tetrahedron(self.gridN, A, F, B, C)
-                    + volume_tetrahedron(self.gridN, A, E, F, H)  # cutted edge top
-                    + volume_tetrahedron(self.gridN, A, H, F, C)  # cutted edge top
-                    + volume_tetrahedron(self.gridN, C, H, D, A)  # middle
-                    + volume_tetrahedron(self.gridN, C, G, H, F)  # cutted edge bottom
-                )  # cutted edge bottom
-
-                self._cell_volumes = (vol1 + vol2) / 2
+            # In 3D, each polyhedron can be decomposed into 5 tetrahedrons.
+            # However, this presents a choice so we may as well divide in
+            # two ways and average.
+            nx, ny, nz = (*self.shape_nodes, 1)[:3]
+            self._cell_volumes = np.empty(self.n_cells)
+            _cell_volumes(
+                self.nodes, nx, ny, nz, self._cell_volumes, _n_threads(self._n_threads)
+            )
         return self._cell_volumes
 
     @property
     def face_areas(self):  # NOQA D102
         # Documentation inherited from discretize.base.BaseMesh
-        if (
-            getattr(self, "_face_areas", None) is None
-            or getattr(self, "_normals", None) is None
-        ):
-            # Compute areas of cell faces
+        if getattr(self, "_face_areas", None) is None:
             if self.dim == 2:
-                xy = self.gridN
-                A, B = index_cube("AB", self.vnN, self.vnFx)
-                edge1 = xy[B, :] - xy[A, :]
-                normal1 = np.c_[edge1[:, 1], -edge1[:, 0]]
-                area1 = _length2D(edge1)
-                A, D = index_cube("AD", self.vnN, self.vnFy)
-                # Note that we are doing A-D to make sure the normal points the
-                # right way.
-                # Think about it. Look at the picture. Normal points towards C
-                # iff you do this.
-                edge2 = xy[A, :] - xy[D, :]
-                normal2 = np.c_[edge2[:, 1], -edge2[:, 0]]
-                area2 = _length2D(edge2)
-                self._face_areas = np.r_[mkvc(area1), mkvc(area2)]
-                self._normals = [_normalize2D(normal1), _normalize2D(normal2)]
-
+                # faces are the edges of the other orientation
+                lengths, tangents = self._edge_info((1, 0))
+                self._face_areas = lengths
+                # rotate the tangents clockwise, and flip the y-faces so the
+                # normal of each face points towards C (see the picture)
+                self._face_normals = np.c_[tangents[:, 1], -tangents[:, 0]]
+                self._face_normals[self.n_faces_x :] *= -1
             elif self.dim == 3:
-                A, E, F, B = index_cube("AEFB", self.vnN, self.vnFx)
-                normal1, area1 = face_info(
-                    self.gridN, A, E, F, B, average=False, normalizeNormals=False
-                )
-
-                A, D, H, E = index_cube("ADHE", self.vnN, self.vnFy)
-                normal2, area2 = face_info(
-                    self.gridN, A, D, H, E, average=False, normalizeNormals=False
-                )
-
-                A, B, C, D = index_cube("ABCD", self.vnN, self.vnFz)
-                normal3, area3 = face_info(
-                    self.gridN, A, B, C, D, average=False, normalizeNormals=False
-                )
-
-                self._face_areas = np.r_[mkvc(area1), mkvc(area2), mkvc(area3)]
-                self._normals = [normal1, normal2, normal3]
+                nx, ny = self.shape_nodes[:2]
+                # the second and last corners of the faces, from A:
+                # x-faces are AEFB, y-faces are ADHE and z-faces are ABCD
+                corners = [(nx * ny, nx), (1, nx * ny), (nx, 1)]
+                self._face_areas = np.empty(self.n_faces)
+                self._face_normals = np.empty((self.n_faces, 3))
+                start = 0
+                shapes = [self.shape_faces_x, self.shape_faces_y, self.shape_faces_z]
+                for shape, (s1, s2) in zip(shapes, corners):
+                    end = start + np.prod(shape)
+                    _face_areas_normals(
+                        self.nodes,
+                        nx,
+                        ny,
+                        *shape,
+                        s1,
+                        s2,
+                        self._face_areas[start:end],
+                        self._face_normals[start:end],
+                        _n_threads(self._n_threads),
+                    )
+                    start = end
         return self._face_areas
 
     @property
@@ -671,64 +641,42 @@ class CurvilinearMesh(
         # cross-products can be used to compute the normal vector.
         # In this case, the average normal vector is returned so there
         # is only 1 vector per face.
-        if getattr(self, "_normals", None) is None:
+        if getattr(self, "_face_normals", None) is None:
             self.face_areas  # calling .face_areas will create the face normals
-        if self.dim == 2:
-            return _normalize2D(np.r_[self._normals[0], self._normals[1]])
-        elif self.dim == 3:
-            normal1 = (
-                self._normals[0][0]
-                + self._normals[0][1]
-                + self._normals[0][2]
-                + self._normals[0][3]
-            ) / 4
-            normal2 = (
-                self._normals[1][0]
-                + self._normals[1][1]
-                + self._normals[1][2]
-                + self._normals[1][3]
-            ) / 4
-            normal3 = (
-                self._normals[2][0]
-                + self._normals[2][1]
-                + self._normals[2][2]
-                + self._normals[2][3]
-            ) / 4
-            return _normalize3D(np.r_[normal1, normal2, normal3])
+        return self._face_normals
+
+    def _edge_info(self, order=None):
+        """Lengths and unit tangents of the edges, in the given order of orientations."""
+        nx, ny = self.shape_nodes[:2]
+        shapes = [self.shape_edges_x, self.shape_edges_y, self.shape_edges_z]
+        strides = [1, nx, nx * ny]
+        if order is None:
+            order = range(self.dim)
+        n_edges = sum(np.prod(shapes[i][: self.dim]) for i in order)
+        lengths = np.empty(n_edges)
+        tangents = np.empty((n_edges, self.dim))
+        start = 0
+        for i in order:
+            shape = (*shapes[i][: self.dim], 1)[:3]
+            end = start + np.prod(shape)
+            _edge_lengths_tangents(
+                self.nodes,
+                nx,
+                ny,
+                *shape,
+                strides[i],
+                lengths[start:end],
+                tangents[start:end],
+                _n_threads(self._n_threads),
+            )
+            start = end
+        return lengths, tangents
 
     @property
     def edge_lengths(self):  # NOQA D102
         # Documentation inherited from discretize.base.BaseMesh
         if getattr(self, "_edge_lengths", None) is None:
-            if self.dim == 2:
-                xy = self.gridN
-                A, D = index_cube("AD", self.vnN, self.vnEx)
-                edge1 = xy[D, :] - xy[A, :]
-                A, B = index_cube("AB", self.vnN, self.vnEy)
-                edge2 = xy[B, :] - xy[A, :]
-                self._edge_lengths = np.r_[
-                    mkvc(_length2D(edge1)), mkvc(_length2D(edge2))
-                ]
-                self._edge_tangents = (
-                    np.r_[edge1, edge2] / np.c_[self._edge_lengths, self._edge_lengths]
-                )
-            elif self.dim == 3:
-                xyz = self.gridN
-                A, D = index_cube("AD", self.vnN, self.vnEx)
-                edge1 = xyz[D, :] - xyz[A, :]
-                A, B = index_cube("AB", self.vnN, self.vnEy)
-                edge2 = xyz[B, :] - xyz[A, :]
-                A, E = index_cube("AE", self.vnN, self.vnEz)
-                edge3 = xyz[E, :] - xyz[A, :]
-                self._edge_lengths = np.r_[
-                    mkvc(_length3D(edge1)),
-                    mkvc(_length3D(edge2)),
-                    mkvc(_length3D(edge3)),
-                ]
-                self._edge_tangents = (
-                    np.r_[edge1, edge2, edge3]
-                    / np.c_[self._edge_lengths, self._edge_lengths, self._edge_lengths]
-                )
+            self._edge_lengths, self._edge_tangents = self._edge_info()
         return self._edge_lengths
 
     @property
@@ -737,3 +685,276 @@ class CurvilinearMesh(
         if getattr(self, "_edge_tangents", None) is None:
             self.edge_lengths  # calling .edge_lengths will create the tangents
         return self._edge_tangents
+
+    # --------------- Interpolation ---------------------
+    #
+    # Points are located by walking from the cell with the nearest cell center
+    # towards the cell that contains them, inverting the trilinear map from
+    # the reference cell [0, 1]^dim of each cell visited. Within that cell,
+    # nodal values are interpolated trilinearly, face fluxes and edge
+    # circulations with the lowest order Raviart-Thomas and Nedelec bases
+    # (mapped by the Piola transforms), and cell center values trilinearly on
+    # the grid of cell centers padded with the boundary of the mesh.
+
+    @property
+    def cell_centers_tree(self):
+        """A KDTree object built from the cell centers.
+
+        Returns
+        -------
+        scipy.spatial.KDTree
+        """
+        if getattr(self, "_cc_tree", None) is None:
+            self._cc_tree = KDTree(self.cell_centers)
+        return self._cc_tree
+
+    @property
+    def _padded_cell_centers(self):
+        """Grid of cell centers, padded with the boundary faces, edges and nodes.
+
+        Along each dimension, the padded grid has the first node, the
+        midpoints between nodes and the last node.
+        """
+        if getattr(self, "_padded_cc", None) is None:
+            padded = []
+            for X in self.node_list:
+                for axis in range(self.dim):
+                    X = np.moveaxis(X, axis, 0)
+                    X = np.concatenate([X[:1], (X[1:] + X[:-1]) / 2, X[-1:]])
+                    X = np.moveaxis(X, 0, axis)
+                padded.append(mkvc(X))
+            self._padded_cc = np.stack(padded, axis=-1)
+        return self._padded_cc
+
+    def _locate(self, loc, seeds, nodes=None, shape_nodes=None, n_threads=1):
+        """Locate points in the cells of the mesh (or another grid of nodes).
+
+        Returns the cell, reference coordinates and jacobian of the trilinear
+        map for each point, and whether it is inside the grid.
+        """
+        if nodes is None:
+            nodes, shape_nodes = self.nodes, self.shape_nodes
+        n_loc = loc.shape[0]
+        cells = np.empty(n_loc, dtype=np.intp)
+        refs = np.empty((n_loc, self.dim))
+        jacs = np.empty((n_loc, self.dim, self.dim))
+        inside = np.empty(n_loc, dtype=np.uint8)
+        _locate_points(
+            loc,
+            np.require(seeds, dtype=np.intp),
+            nodes,
+            *(*shape_nodes, 1)[:3],
+            cells,
+            refs,
+            jacs,
+            inside,
+            n_threads,
+        )
+        return cells, refs, jacs, inside.view(bool)
+
+    def point2index(self, locs, n_threads=None):
+        """Find cells that contain the given points.
+
+        Returns an array of index values of the cells that contain the given
+        points. Points outside of the mesh are assigned to the nearest cell
+        on its boundary.
+
+        Parameters
+        ----------
+        locs: (N, dim) array_like
+            points to search for the location of
+        n_threads : int, optional
+            Number of threads used by the search. By default, the points are
+            searched serially. Several threads require discretize to be built
+            with OpenMP, otherwise a warning is issued.
+
+        Returns
+        -------
+        (N) array_like of int
+            Cell indices that contain the points
+        """
+        n_threads = _n_threads(n_threads)
+        locs = np.require(as_array_n_by_dim(locs, self.dim), np.float64, "C")
+        _, seeds = self.cell_centers_tree.query(locs, workers=n_threads)
+        return self._locate(locs, seeds, n_threads=n_threads)[0]
+
+    def get_interpolation_matrix(
+        self,
+        loc,
+        location_type="cell_centers",
+        zeros_outside=False,
+        n_threads=None,
+        **kwargs,
+    ):
+        """Construct a linear interpolation matrix from mesh.
+
+        This method constructs a linear interpolation matrix from tensor locations
+        (nodes, cell-centers, faces, etc...) on the mesh to a set of arbitrary locations.
+
+        Parameters
+        ----------
+        loc : (n_pts, dim) numpy.ndarray
+            Location of points being to interpolate to. Must have same dimensions as the mesh.
+        location_type : str, optional
+            Tensor locations on the mesh being interpolated from. *location_type* must be one of:
+
+            - 'Ex', 'edges_x'           -> x-component of field defined on edges
+            - 'Ey', 'edges_y'           -> y-component of field defined on edges
+            - 'Ez', 'edges_z'           -> z-component of field defined on edges
+            - 'E', 'edges'              -> all the components of a field defined on edges
+            - 'Fx', 'faces_x'           -> x-component of field defined on faces
+            - 'Fy', 'faces_y'           -> y-component of field defined on faces
+            - 'Fz', 'faces_z'           -> z-component of field defined on faces
+            - 'F', 'faces'              -> all the components of a field defined on faces
+            - 'N', 'nodes'              -> scalar field defined on nodes
+            - 'CC', 'cell_centers'      -> scalar field defined on cell centers
+            - 'CCVx', 'cell_centers_x'  -> x-component of vector field defined on cell centers
+            - 'CCVy', 'cell_centers_y'  -> y-component of vector field defined on cell centers
+            - 'CCVz', 'cell_centers_z'  -> z-component of vector field defined on cell centers
+
+            For the faces and edges, the rows of the x, y and z components are
+            stacked, in this order.
+        zeros_outside : bool, optional
+            If *False*, nearest neighbour is used to compute the interpolate value
+            at locations outside the mesh. If *True* , values at locations outside
+            the mesh will be zero.
+        n_threads : int, optional
+            Number of threads used to locate the points. By default, the
+            points are located serially. Several threads require discretize
+            to be built with OpenMP, otherwise a warning is issued.
+
+        Returns
+        -------
+        (n_pts, n_loc_type) or (dim * n_pts, n_loc_type) scipy.sparse.csr_matrix
+            A sparse matrix which interpolates the specified tensor quantity on mesh to
+            the set of specified locations.
+        """
+        n_threads = _n_threads(n_threads)
+        location_type = self._parse_location_type(location_type)
+        loc = np.require(as_array_n_by_dim(loc, self.dim), np.float64, "C")
+        dim = self.dim
+        if location_type[-2:] in ["_x", "_y", "_z"]:
+            component = "xyz".index(location_type[-1])
+            if component >= dim:
+                raise ValueError("mesh is not high enough dimension.")
+            components = [component]
+        else:
+            # the rows of all the components of a vector are stacked
+            components = range(dim)
+
+        _, seeds = self.cell_centers_tree.query(loc, workers=n_threads)
+        cells, refs, jacs, inside = self._locate(loc, seeds, n_threads=n_threads)
+        ijk = np.unravel_index(cells, self.shape_cells, order="F")
+        # corners of the reference cell, with bits (b_0, b_1, b_2)
+        # for the corner at (i + b_0, j + b_1, k + b_2)
+        corners = [[(c >> d) & 1 for d in range(dim)] for c in range(2**dim)]
+
+        if location_type == "nodes":
+            cols, vals = [], []
+            for bits in corners:
+                cols.append(
+                    np.ravel_multi_index(
+                        tuple(i + b for i, b in zip(ijk, bits)),
+                        self.shape_nodes,
+                        order="F",
+                    )
+                )
+                vals.append(_shape_function(refs, bits))
+            vals = [vals]
+            n_items = self.n_nodes
+        elif location_type.startswith("cell_centers"):
+            # locate the points in the padded grid of cell centers, starting
+            # from the cell between the nearest cell centers
+            shape_pad = tuple(n + 2 for n in self.shape_cells)
+            pad_ijk = tuple(i + (r >= 0.5) for i, r in zip(ijk, refs.T))
+            pad_cells = np.ravel_multi_index(
+                pad_ijk, tuple(n - 1 for n in shape_pad), order="F"
+            )
+            pad_cells, pad_refs, _, _ = self._locate(
+                loc, pad_cells, self._padded_cell_centers, shape_pad, n_threads
+            )
+            pad_ijk = np.unravel_index(
+                pad_cells, tuple(n - 1 for n in shape_pad), order="F"
+            )
+            cols, vals = [], []
+            for bits in corners:
+                # the padded points take the values of their nearest cells
+                cell_ijk = tuple(
+                    np.clip(i + b - 1, 0, n - 1)
+                    for i, b, n in zip(pad_ijk, bits, self.shape_cells)
+                )
+                cols.append(np.ravel_multi_index(cell_ijk, self.shape_cells, order="F"))
+                vals.append(_shape_function(pad_refs, bits))
+            vals = [vals]
+            n_items = self.n_cells
+            if location_type != "cell_centers":
+                cols = [col + component * self.n_cells for col in cols]
+                n_items = dim * self.n_cells
+        elif location_type.startswith("faces"):
+            # contravariant Piola map of the reference fluxes, v = J @ v_hat / det(J)
+            areas = self.face_areas
+            scale = jacs / np.linalg.det(jacs)[:, None, None]
+            shapes = [self.shape_faces_x, self.shape_faces_y, self.shape_faces_z]
+            offset = 0
+            cols, dirs, weights = [], [], []
+            for d in range(dim):
+                for side in [0, 1]:
+                    face_ijk = tuple(i + side * (e == d) for e, i in enumerate(ijk))
+                    col = offset + np.ravel_multi_index(face_ijk, shapes[d], order="F")
+                    weight = refs[:, d] if side else 1 - refs[:, d]
+                    cols.append(col)
+                    dirs.append(d)
+                    weights.append(weight * areas[col])
+                offset += np.prod(shapes[d])
+            vals = [
+                [scale[:, c, d] * w for d, w in zip(dirs, weights)] for c in components
+            ]
+            n_items = self.n_faces
+        elif location_type.startswith("edges"):
+            # covariant Piola map of the reference circulations,
+            # v = inv(J).T @ v_hat
+            lengths = self.edge_lengths
+            scale = np.linalg.inv(jacs)
+            shapes = [self.shape_edges_x, self.shape_edges_y, self.shape_edges_z]
+            offset = 0
+            cols, dirs, weights = [], [], []
+            for d in range(dim):
+                # the edges parallel to the d-th reference direction
+                for bits in corners:
+                    if bits[d]:
+                        continue
+                    edge_ijk = tuple(i + b for i, b in zip(ijk, bits))
+                    col = offset + np.ravel_multi_index(edge_ijk, shapes[d], order="F")
+                    weight = _shape_function(
+                        np.delete(refs, d, axis=1), bits[:d] + bits[d + 1 :]
+                    )
+                    cols.append(col)
+                    dirs.append(d)
+                    weights.append(weight * lengths[col])
+                offset += np.prod(shapes[d])
+            vals = [
+                [scale[:, d, c] * w for d, w in zip(dirs, weights)] for c in components
+            ]
+            n_items = self.n_edges
+        else:
+            raise ValueError(f"Unrecognized location type {location_type}")
+
+        n_loc = loc.shape[0]
+        cols = np.stack(cols, axis=-1).reshape(-1)
+        indptr = np.arange(0, cols.size + 1, len(vals[0]))
+        blocks = []
+        for block_vals in vals:
+            block_vals = np.stack(block_vals, axis=-1)
+            if zeros_outside:
+                block_vals[~inside] = 0
+            # the indices are sorted in place, so each block gets its own copy
+            Q = sp.csr_matrix(
+                (block_vals.reshape(-1), cols.copy(), indptr.copy()),
+                shape=(n_loc, n_items),
+            )
+            Q.sum_duplicates()
+            Q.eliminate_zeros()
+            blocks.append(Q)
+        if len(blocks) == 1:
+            return blocks[0]
+        return sp.vstack(blocks, format="csr")
@@ -23,8 +23,192 @@ from discretize.utils.code_utils import (
     deprecate_class,
     deprecate_property,
     deprecate_method,
+    _n_threads,
 )
 import warnings
+import weakref
+
+
+def _hanging_map(is_hanging, targets=None):
+    """Map each hanging item onto the item it is merged with.
+
+    Returns an integer array holding, for each of the hanging items flagged by
+    `is_hanging` (in order), the corresponding index in `targets`, or -1 for
+    items that are eliminated.
+    """
+    n_hanging = np.count_nonzero(is_hanging)
+    hanging_map = np.full(n_hanging, -1, dtype=np.int64)
+    if targets is not None:
+        targets = np.ravel(targets)[:n_hanging]
+        hanging_map[: len(targets)] = targets
+    return hanging_map
+
+
+def _hanging_nodes_layer(nx, ny, nz):
+    """Return the targets of the hanging nodes in nz layers of (nx, ny) nodes.
+
+    In each layer, the nodes on the axis merge with the first of them, and the
+    nodes at the maximum azimuth merge with the nodes at the minimum azimuth.
+    """
+    layer = np.r_[np.zeros(ny - 1, dtype=np.int64), np.arange(1, nx)]
+    return layer + (nx * ny) * np.arange(nz)[:, None]
+
+
+def _interval_overlaps(lower, upper, nodes):
+    """Overlap lengths of the intervals [lower, upper] with the 1D cells on `nodes`.
+
+    Returns an (n_intervals, n_cells) sparse matrix.
+    """
+    n_cells = len(nodes) - 1
+    first = np.clip(np.searchsorted(nodes, lower, side="right") - 1, 0, n_cells)
+    last = np.clip(np.searchsorted(nodes, upper, side="left") - 1, -1, n_cells - 1)
+    count = np.maximum(last - first + 1, 0)
+    rows = np.repeat(np.arange(len(lower)), count)
+    cols = np.repeat(first, count) + (
+        np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+    )
+    length = np.minimum(upper[rows], nodes[cols + 1]) - np.maximum(
+        lower[rows], nodes[cols]
+    )
+    keep = length > 0
+    return sp.csr_matrix(
+        (length[keep], (rows[keep], cols[keep])), shape=(len(lower), n_cells)
+    )
+
+
+def _clip_polygons(polygons, normals):
+    """Clip polygons to the half planes ``normals @ p >= 0``.
+
+    The (n, m, 2) polygons are padded by repeating their first vertex (or are
+    all zeros when empty), and the clipped polygons are returned in the same
+    layout with 2m vertices.
+    """
+    n, m, _ = polygons.shape
+    following = np.roll(polygons, -1, axis=1)
+    d0 = np.einsum("ijk,ik->ij", polygons, normals)
+    d1 = np.roll(d0, -1, axis=1)
+    inside0, inside1 = d0 >= 0, d1 >= 0
+    crosses = inside0 != inside1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(crosses, d0 / (d0 - d1), 0.0)
+    crossing = polygons + t[..., None] * (following - polygons)
+    vertices = np.stack([crossing, following], axis=2).reshape(n, 2 * m, 2)
+    valid = np.stack([crosses, inside1], axis=2).reshape(n, 2 * m)
+    order = np.argsort(~valid, axis=1, kind="stable")
+    vertices = np.take_along_axis(vertices, order[..., None], axis=1)
+    count = valid.sum(axis=1)
+    pad = np.arange(2 * m) >= count[:, None]
+    vertices = np.where(pad[..., None], vertices[:, :1], vertices)
+    vertices[count == 0] = 0.0
+    return vertices
+
+
+def _disk_polygon_areas(polygons, radius):
+    """Areas of the intersections of polygons with disks centered on the origin."""
+    a_pts = polygons
+    b_pts = np.roll(polygons, -1, axis=1)
+    radius = radius[:, None]
+    d = b_pts - a_pts
+    a = (d * d).sum(axis=-1)
+    b = (a_pts * d).sum(axis=-1)
+    c = (a_pts * a_pts).sum(axis=-1) - radius**2
+    disc = b * b - a * c
+    # the part of each edge inside of the disk is [t1, t2]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sq = np.sqrt(np.maximum(disc, 0))
+        t1 = np.clip((-b - sq) / a, 0, 1)
+        t2 = np.clip((-b + sq) / a, 0, 1)
+    outside = (disc <= 0) | (a == 0)
+    t1[outside] = 0.0
+    t2[outside] = 0.0
+    p1 = a_pts + t1[..., None] * d
+    p2 = a_pts + t2[..., None] * d
+
+    def cross(u, v):
+        return u[..., 0] * v[..., 1] - u[..., 1] * v[..., 0]
+
+    def angle(u, v):
+        return np.arctan2(cross(u, v), (u * v).sum(axis=-1))
+
+    # the parts of the edges outside of the disk contribute circular sectors
+    outer = np.where(t1 > 0, angle(a_pts, p1), 0.0)
+    outer += np.where(t2 < 1, angle(p2, b_pts), 0.0)
+    area = 0.5 * radius**2 * outer + 0.5 * cross(p1, p2)
+    return area.sum(axis=1)
+
+
+def _annular_sector_overlaps(x_lo, x_hi, y_lo, y_hi, r_nodes, t_nodes, chunk=2**15):
+    """Overlap areas of rectangles with the annular sectors of a polar grid.
+
+    The rectangles are in coordinates relative to the center of the polar grid,
+    and the returned (n_rectangles, n_r * n_t) sparse matrix orders the
+    sectors with the radial index changing fastest.
+    """
+    n_r, n_t = len(r_nodes) - 1, len(t_nodes) - 1
+    # split the azimuthal cells into wedges spanning at most 90 degrees
+    n_split = np.ceil(np.diff(t_nodes) / (np.pi / 2)).astype(np.int64)
+    wedge_cell = np.repeat(np.arange(n_t), n_split)
+    wedge_width = np.repeat(np.diff(t_nodes) / n_split, n_split)
+    offset = np.arange(n_split.sum()) - np.repeat(np.cumsum(n_split) - n_split, n_split)
+    wedge_lo = t_nodes[wedge_cell] + offset * wedge_width
+    wedge_hi = wedge_lo + wedge_width
+    n_w = len(wedge_cell)
+
+    # radial range of each rectangle
+    d_min = np.hypot(
+        np.maximum(np.maximum(x_lo, -x_hi), 0), np.maximum(np.maximum(y_lo, -y_hi), 0)
+    )
+    d_max = np.hypot(
+        np.maximum(np.abs(x_lo), np.abs(x_hi)), np.maximum(np.abs(y_lo), np.abs(y_hi))
+    )
+    r_first = np.searchsorted(r_nodes, d_min, side="right") - 1
+    r_last = np.minimum(np.searchsorted(r_nodes, d_max, side="left") - 1, n_r - 1)
+    r_count = np.maximum(r_last - r_first + 1, 0)
+
+    # azimuthal range of each rectangle (all of them if it touches the axis)
+    corners_x = np.c_[x_lo, x_hi, x_hi, x_lo]
+    corners_y = np.c_[y_lo, y_lo, y_hi, y_hi]
+    center = np.arctan2((y_lo + y_hi) / 2, (x_lo + x_hi) / 2)
+    relative = np.arctan2(corners_y, corners_x) - center[:, None]
+    relative = (relative + np.pi) % (2 * np.pi) - np.pi
+    span_lo = (center + relative.min(axis=1) - t_nodes[0]) % (2 * np.pi)
+    span_hi = span_lo + relative.max(axis=1) - relative.min(axis=1)
+    starts = np.r_[wedge_lo, wedge_lo + 2 * np.pi] - t_nodes[0]
+    w_first = np.searchsorted(starts, span_lo, side="right") - 1
+    w_count = np.searchsorted(starts, span_hi, side="left") - w_first
+    on_axis = d_min == 0
+    w_first[on_axis] = 0
+    w_count = np.where(on_axis, n_w, np.minimum(w_count, n_w))
+
+    count = r_count * w_count
+    rect = np.repeat(np.arange(len(x_lo)), count)
+    local = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+    i_r, i_w = np.divmod(local, w_count[rect])
+    i_r += r_first[rect]
+    i_w = (i_w + w_first[rect]) % n_w
+
+    areas = np.empty(len(rect))
+    for start in range(0, len(rect), chunk):
+        sl = slice(start, start + chunk)
+        rc = rect[sl]
+        polygons = np.stack(
+            [
+                np.c_[x_lo[rc], x_hi[rc], x_hi[rc], x_lo[rc]],
+                np.c_[y_lo[rc], y_lo[rc], y_hi[rc], y_hi[rc]],
+            ],
+            axis=-1,
+        )
+        t_a, t_b = wedge_lo[i_w[sl]], wedge_hi[i_w[sl]]
+        polygons = _clip_polygons(polygons, np.c_[-np.sin(t_a), np.cos(t_a)])
+        polygons = _clip_polygons(polygons, np.c_[np.sin(t_b), -np.cos(t_b)])
+        areas[sl] = _disk_polygon_areas(
+            polygons, r_nodes[i_r[sl] + 1]
+        ) - _disk_polygon_areas(polygons, r_nodes[i_r[sl]])
+    keep = areas > 0
+    cols = i_r[keep] + n_r * wedge_cell[i_w[keep]]
+    return sp.csr_matrix(
+        (areas[keep], (rect[keep], cols)), shape=(len(x_lo), n_r * n_t)
+    )
 
 
 class CylindricalMesh(
@@ -497,7 +681,9 @@ class CylindricalMesh(
             A 1D array containing the x-edge lengths for the entire mesh
         """
         if getattr(self, "_edge_lengths_x", None) is None:
-            self._edge_lengths_x = self._edge_x_lengths_full[~self._ishanging_edges_x]
+            self._edge_lengths_x = self._to_dtype(
+                self._edge_x_lengths_full[~self._ishanging_edges_x]
+            )
         return self._edge_lengths_x
 
     @property
@@ -528,11 +714,11 @@ class CylindricalMesh(
         """
         if getattr(self, "_edge_lengths_y", None) is None:
             if self.is_symmetric:
-                self._edge_lengths_y = self._edge_y_lengths_full
+                self._edge_lengths_y = self._to_dtype(self._edge_y_lengths_full)
             else:
-                self._edge_lengths_y = self._edge_y_lengths_full[
-                    ~self._ishanging_edges_y
-                ]
+                self._edge_lengths_y = self._to_dtype(
+                    self._edge_y_lengths_full[~self._ishanging_edges_y]
+                )
         return self._edge_lengths_y
 
     @property
@@ -556,7 +742,9 @@ class CylindricalMesh(
             A 1D array containing the z-edge lengths for the entire mesh
         """
         if getattr(self, "_edge_lengths_z", None) is None:
-            self._edge_lengths_z = self._edge_z_lengths_full[~self._ishanging_edges_z]
+            self._edge_lengths_z = self._to_dtype(
+                self._edge_z_lengths_full[~self._ishanging_edges_z]
+            )
         return self._edge_lengths_z
 
     @property
@@ -620,9 +808,11 @@ class CylindricalMesh(
         """
         if getattr(self, "_face_x_areas", None) is None:
             if self.is_symmetric:
-                self._face_x_areas = self._face_x_areas_full
+                self._face_x_areas = self._to_dtype(self._face_x_areas_full)
             else:
-                self._face_x_areas = self._face_x_areas_full[~self._ishanging_faces_x]
+                self._face_x_areas = self._to_dtype(
+                    self._face_x_areas_full[~self._ishanging_faces_x]
+                )
         return self._face_x_areas
 
     @property
@@ -655,7 +845,9 @@ class CylindricalMesh(
         if getattr(self, "_face_y_areas", None) is None:
             if self.is_symmetric:
                 raise Exception("There are no y-faces on the Cyl Symmetric mesh")
-            self._face_y_areas = self._face_y_areas_full[~self._ishanging_faces_y]
+            self._face_y_areas = self._to_dtype(
+                self._face_y_areas_full[~self._ishanging_faces_y]
+            )
         return self._face_y_areas
 
     @property
@@ -693,9 +885,11 @@ class CylindricalMesh(
         """
         if getattr(self, "_face_z_areas", None) is None:
             if self.is_symmetric:
-                self._face_z_areas = self._face_z_areas_full
+                self._face_z_areas = self._to_dtype(self._face_z_areas_full)
             else:
-                self._face_z_areas = self._face_z_areas_full[~self._ishanging_faces_z]
+                self._face_z_areas = self._to_dtype(
+                    self._face_z_areas_full[~self._ishanging_faces_z]
+                )
         return self._face_z_areas
 
     @property
@@ -752,14 +946,16 @@ class CylindricalMesh(
         if getattr(self, "_cell_volumes", None) is None:
             if self.is_symmetric:
                 az = pi * (self.nodes_x**2 - np.r_[0, self.nodes_x[:-1]] ** 2)
-                self._cell_volumes = np.kron(self.h[2], az)
+                self._cell_volumes = self._to_dtype(np.kron(self.h[2], az))
             else:
-                self._cell_volumes = np.kron(
-                    self.h[2],
+                self._cell_volumes = self._to_dtype(
                     np.kron(
-                        self.h[1],
-                        0.5 * (self.nodes_x[1:] ** 2 - self.nodes_x[:-1] ** 2),
-                    ),
+                        self.h[2],
+                        np.kron(
+                            self.h[1],
+                            0.5 * (self.nodes_x[1:] ** 2 - self.nodes_x[:-1] ** 2),
+                        ),
+                    )
                 )
         return self._cell_volumes
 
@@ -774,19 +970,15 @@ class CylindricalMesh(
 
     @property
     def _hanging_faces_x(self):
-        """Hanging x-faces dictionary mapping.
+        """Hanging x-faces mapping.
 
-        Dictionary of the indices of the hanging x-faces (keys) and a list
-        of indices that the eliminated faces map to (if applicable)
+        Integer array holding, for each hanging x-face (in the order of
+        ``np.nonzero(self._ishanging_faces_x)``), the index of the x-face it
+        maps to, or -1 if it is eliminated.
         """
-        if getattr(self, "_hanging_faces_x_dict", None) is None:
-            self._hanging_faces_x_dict = dict(
-                zip(
-                    np.nonzero(self._ishanging_faces_x)[0].tolist(),
-                    [None] * self._n_hanging_faces_x,
-                )
-            )
-        return self._hanging_faces_x_dict
+        if getattr(self, "_hanging_faces_x_map", None) is None:
+            self._hanging_faces_x_map = _hanging_map(self._ishanging_faces_x)
+        return self._hanging_faces_x_map
 
     @property
     def _ishanging_faces_y(self):
@@ -799,24 +991,18 @@ class CylindricalMesh(
 
     @property
     def _hanging_faces_y(self):
-        """Hanging y-faces dictionary mapping.
+        """Hanging y-faces mapping.
 
-        Dictionary of the indices of the hanging y-faces (keys) and a list
-        of indices that the eliminated faces map to (if applicable).
+        Integer array holding, for each hanging y-face, the index of the y-face
+        it maps to, or -1 if it is eliminated. The y-faces at the maximum
+        azimuth map onto the y-faces at the minimum azimuth.
         """
-        if getattr(self, "_hanging_faces_y_dict", None) is None:
-            deflate_y = np.zeros(self._shape_total_nodes[1], dtype=bool)
-            deflate_y[0] = True
-            deflateFy = np.nonzero(
-                np.kron(
-                    np.ones(self.shape_cells[2], dtype=bool),
-                    np.kron(deflate_y, np.ones(self.shape_cells[0], dtype=bool)),
-                )
-            )[0].tolist()
-            self._hanging_faces_y_dict = dict(
-                zip(np.nonzero(self._ishanging_faces_y)[0].tolist(), deflateFy)
-            )
-        return self._hanging_faces_y_dict
+        if getattr(self, "_hanging_faces_y_map", None) is None:
+            ncx, _, ncz = self.shape_cells
+            ny = self._shape_total_nodes[1]
+            deflateFy = np.arange(ncx) + (ncx * ny) * np.arange(ncz)[:, None]
+            self._hanging_faces_y_map = _hanging_map(self._ishanging_faces_y, deflateFy)
+        return self._hanging_faces_y_map
 
     @property
     def _ishanging_faces_z(self):
@@ -827,12 +1013,12 @@ class CylindricalMesh(
 
     @property
     def _hanging_faces_z(self):
-        """Hanging z-faces dictionary mapping.
+        """Hanging z-faces mapping.
 
-        Dictionary of the indices of the hanging z-faces (keys) and a list
-        of indices that the eliminated faces map to (if applicable).
+        Integer array holding, for each hanging z-face, the index of the z-face
+        it maps to. There are no hanging z-faces.
         """
-        return {}
+        return np.empty(0, dtype=np.int64)
 
     @property
     def _ishanging_edges_x(self):
@@ -845,25 +1031,18 @@ class CylindricalMesh(
 
     @property
     def _hanging_edges_x(self):
-        """Hanging x-edges dictionary mapping.
+        """Hanging x-edges mapping.
 
-        Dictionary of the indices of the hanging x-edges (keys) and a list
-        of indices that the eliminated faces map to (if applicable).
+        Integer array holding, for each hanging x-edge, the index of the x-edge
+        it maps to, or -1 if it is eliminated. The x-edges at the maximum
+        azimuth map onto the x-edges at the minimum azimuth.
         """
-        if getattr(self, "_hanging_edges_x_dict", None) is None:
+        if getattr(self, "_hanging_edges_x_map", None) is None:
             nx, ny, nz = self._shape_total_nodes
-            deflate_y = np.zeros(ny, dtype=bool)
-            deflate_y[0] = True
-            deflateEx = np.nonzero(
-                np.kron(
-                    np.ones(nz, dtype=bool),
-                    np.kron(deflate_y, np.ones(self.shape_cells[0], dtype=bool)),
-                )
-            )[0].tolist()
-            self._hanging_edges_x_dict = dict(
-                zip(np.nonzero(self._ishanging_edges_x)[0].tolist(), deflateEx)
-            )
-        return self._hanging_edges_x_dict
+            ncx = self.shape_cells[0]
+            deflateEx = np.arange(ncx) + (ncx * ny) * np.arange(nz)[:, None]
+            self._hanging_edges_x_map = _hanging_map(self._ishanging_edges_x, deflateEx)
+        return self._hanging_edges_x_map
 
     @property
     def _ishanging_edges_y(self):
@@ -877,19 +1056,15 @@ class CylindricalMesh(
 
     @property
     def _hanging_edges_y(self):
-        """Hanging y-edges dictionary mapping.
+        """Hanging y-edges mapping.
 
-        Dictionary of the indices of the hanging y-edges (keys) and a list
-        of indices that the eliminated faces map to (if applicable).
+        Integer array holding, for each hanging y-edge, the index of the y-edge
+        it maps to, or -1 if it is eliminated. The y-edges on the axis of
+        symmetry are all eliminated.
         """
-        if getattr(self, "_hanging_edges_y_dict", None) is None:
-            self._hanging_edges_y_dict = dict(
-                zip(
-                    np.nonzero(self._ishanging_edges_y)[0].tolist(),
-                    [None] * len(self._ishanging_edges_y_bool),
-                )
-            )
-        return self._hanging_edges_y_dict
+        if getattr(self, "_hanging_edges_y_map", None) is None:
+            self._hanging_edges_y_map = _hanging_map(self._ishanging_edges_y)
+        return self._hanging_edges_y_map
 
     @property
     def _ishanging_edges(self):
@@ -921,27 +1096,24 @@ class CylindricalMesh(
 
     @property
     def _hanging_edges_z(self):
-        """Hanging z-edges dictionary mapping.
+        """Hanging z-edges mapping.
 
-        Dictionary of the indices of the hanging z-edges (keys) and a list
-        of indices that the eliminated faces map to (if applicable).
+        Integer array holding, for each hanging z-edge, the index of the z-edge
+        it maps to, or -1 if it is eliminated. The z-edges on the axis of symmetry
+        map onto the first of them in each layer, and the z-edges at the maximum
+        azimuth map onto the z-edges at the minimum azimuth.
         """
-        if getattr(self, "_hanging_edges_z_dict", None) is None:
-            nx, ny, nz = self._shape_total_nodes
-            # deflate
-            deflateEz = np.hstack(
-                [
-                    np.hstack(
-                        [np.zeros(ny - 1, dtype=int), np.arange(1, nx, dtype=int)]
-                    )
-                    + i * int(nx * ny)
-                    for i in range(self.shape_cells[2])
-                ]
-            )
-            deflate = zip(np.nonzero(self._ishanging_edges_z)[0].tolist(), deflateEz)
-
-            self._hanging_edges_z_dict = dict(deflate)
-        return self._hanging_edges_z_dict
+        if getattr(self, "_hanging_edges_z_map", None) is None:
+            if self.is_symmetric:
+                # there are no z-edges on a symmetric mesh
+                self._hanging_edges_z_map = _hanging_map(self._ishanging_edges_z)
+            else:
+                nx, ny, nz = self._shape_total_nodes
+                deflateEz = _hanging_nodes_layer(nx, ny, self.shape_cells[2])
+                self._hanging_edges_z_map = _hanging_map(
+                    self._ishanging_edges_z, deflateEz
+                )
+        return self._hanging_edges_z_map
 
     @property
     def _ishanging_nodes(self):
@@ -960,27 +1132,23 @@ class CylindricalMesh(
 
     @property
     def _hanging_nodes(self):
-        """Hanging nodes dictionary mapping.
+        """Hanging nodes mapping.
 
-        Dictionary of the indices of the hanging nodes (keys) and a list
-        of indices that the eliminated nodes map to (if applicable).
+        Integer array holding, for each hanging node, the index of the node it
+        maps to. The nodes on the axis of symmetry map onto the first of them in
+        each layer, and the nodes at the maximum azimuth map onto the nodes at
+        the minimum azimuth.
         """
-        if getattr(self, "_hanging_nodes_dict", None) is None:
-            nx, ny, nz = self._shape_total_nodes
-            # go by layer
-            deflateN = np.hstack(
-                [
-                    np.hstack(
-                        [np.zeros(ny - 1, dtype=int), np.arange(1, nx, dtype=int)]
-                    )
-                    + i * int(nx * ny)
-                    for i in range(nz)
-                ]
-            ).tolist()
-            self._hanging_nodes_dict = dict(
-                zip(np.nonzero(self._ishanging_nodes)[0].tolist(), deflateN)
-            )
-        return self._hanging_nodes_dict
+        if getattr(self, "_hanging_nodes_map", None) is None:
+            if self.is_symmetric:
+                # no nodes are hanging on a symmetric mesh
+                self._hanging_nodes_map = _hanging_map(self._ishanging_nodes)
+            else:
+                nx, ny, nz = self._shape_total_nodes
+                self._hanging_nodes_map = _hanging_map(
+                    self._ishanging_nodes, _hanging_nodes_layer(nx, ny, nz)
+                )
+        return self._hanging_nodes_map
 
     ####################################################
     # Grids
@@ -1006,9 +1174,9 @@ class CylindricalMesh(
             gridded node locations
         """
         if self.is_symmetric:
-            self._nodes = self._nodes_full
+            self._nodes = self._to_dtype(self._nodes_full)
         if getattr(self, "_nodes", None) is None:
-            self._nodes = self._nodes_full[~self._ishanging_nodes, :]
+            self._nodes = self._to_dtype(self._nodes_full[~self._ishanging_nodes, :])
         return self._nodes
 
     @property
@@ -1035,7 +1203,9 @@ class CylindricalMesh(
             if self.is_symmetric:
                 return super().faces_x
             else:
-                self._faces_x = self._faces_x_full[~self._ishanging_faces_x, :]
+                self._faces_x = self._to_dtype(
+                    self._faces_x_full[~self._ishanging_faces_x, :]
+                )
         return self._faces_x
 
     @property
@@ -1062,7 +1232,9 @@ class CylindricalMesh(
             if self.is_symmetric:
                 return self._edges_y_full
             else:
-                self._edges_y = self._edges_y_full[~self._ishanging_edges_y, :]
+                self._edges_y = self._to_dtype(
+                    self._edges_y_full[~self._ishanging_edges_y, :]
+                )
         return self._edges_y
 
     @property
@@ -1089,7 +1261,9 @@ class CylindricalMesh(
             if self.is_symmetric:
                 self._edges_z = None
             else:
-                self._edges_z = self._edges_z_full[~self._ishanging_edges_z, :]
+                self._edges_z = self._to_dtype(
+                    self._edges_z_full[~self._ishanging_edges_z, :]
+                )
         return self._edges_z
 
     @property
@@ -1113,7 +1287,7 @@ class CylindricalMesh(
     @property
     def boundary_faces(self):  # NOQA D102
         # Documentation inherited from discretize.base.BaseMesh
-        return self.faces[self._is_boundary_face]
+        return self._to_dtype(self.faces[self._is_boundary_face])
 
     @property
     def boundary_face_outward_normals(self):  # NOQA D102
@@ -1125,7 +1299,7 @@ class CylindricalMesh(
         n1 = self.shape_cells[1] * self.shape_cells[2]
         n2 = self.shape_cells[0] * self.shape_cells[1]
         normals[n1 : n1 + n2] *= -1
-        return normals
+        return self._to_dtype(normals)
 
     @property
     def _is_boundary_node(self):
@@ -1141,7 +1315,7 @@ class CylindricalMesh(
     @property
     def boundary_nodes(self):  # NOQA D102
         # Documentation inherited from discretize.base.BaseMesh
-        return self.nodes[self._is_boundary_node]
+        return self._to_dtype(self.nodes[self._is_boundary_node])
 
     @property
     def _is_boundary_edge(self):
@@ -1170,7 +1344,7 @@ class CylindricalMesh(
     @property
     def boundary_edges(self):  # NOQA D102
         # Documentation inherited from discretize.base.BaseMesh
-        return self.edges[self._is_boundary_edge]
+        return self._to_dtype(self.edges[self._is_boundary_edge])
 
     ####################################################
     # Operators
@@ -1188,7 +1362,7 @@ class CylindricalMesh(
             elif self.shape_cells[1] > 1:
                 D2 = self.face_y_divergence
                 D = sp.hstack((D1, D2, D3), format="csr")
-            self._face_divergence = D
+            self._face_divergence = self._to_dtype(D)
         return self._face_divergence
 
     @property
@@ -1203,12 +1377,11 @@ class CylindricalMesh(
 
             S = self._face_x_areas_full
             V = self.cell_volumes
-            self._face_x_divergence = sdiag(1 / V) * D1 * sdiag(S)
+            self._face_x_divergence = self._to_dtype(sdiag(1 / V) * D1 * sdiag(S))
 
             if not self.is_symmetric:
-                self._face_x_divergence = (
-                    self._face_x_divergence
-                    * self._deflation_matrix("Fx", as_ones=True).T
+                self._face_x_divergence = self._to_dtype(
+                    self._face_x_divergence * self._expansion_matrix("Fx")
                 )
 
         return self._face_x_divergence
@@ -1220,11 +1393,8 @@ class CylindricalMesh(
             D2 = super()._face_y_divergence_stencil
             S = self._face_y_areas_full  # self.reshape(self.face_areas, 'F', 'Fy', 'V')
             V = self.cell_volumes
-            self._face_y_divergence = (
-                sdiag(1 / V)
-                * D2
-                * sdiag(S)
-                * self._deflation_matrix("Fy", as_ones=True).T
+            self._face_y_divergence = self._to_dtype(
+                sdiag(1 / V) * D2 * sdiag(S) * self._expansion_matrix("Fy")
             )
         return self._face_y_divergence
 
@@ -1235,7 +1405,7 @@ class CylindricalMesh(
             D3 = super()._face_z_divergence_stencil
             S = self._face_z_areas_full
             V = self.cell_volumes
-            self._face_z_divergence = sdiag(1 / V) * D3 * sdiag(S)
+            self._face_z_divergence = self._to_dtype(sdiag(1 / V) * D3 * sdiag(S))
         return self._face_z_divergence
 
     @property
@@ -1306,12 +1476,8 @@ class CylindricalMesh(
             G = sp.vstack([Gr, Gphi, Gz])[~self._ishanging_edges]
 
             # apply inflation to map true nodes to hanging nodes with the same values
-            G = (
-                sdiag(1 / self.edge_lengths)
-                @ G
-                @ self._deflation_matrix("nodes", as_ones=True).T
-            )
-            self._nodal_gradient = G
+            G = sdiag(1 / self.edge_lengths) @ G @ self._expansion_matrix("nodes")
+            self._nodal_gradient = self._to_dtype(G)
         return self._nodal_gradient
 
     @property
@@ -1336,14 +1502,13 @@ class CylindricalMesh(
         else:
             stencil = super()._edge_curl_stencil
             P_f = self._deflation_matrix("faces")
-            P_e = self._deflation_matrix("edges", as_ones=True)
-            return P_f @ stencil @ P_e.T
+            return P_f @ stencil @ self._expansion_matrix("edges")
 
     @property
     def edge_curl(self):  # NOQA D102
         # Documentation inherited from discretize.base.BaseMesh
         if getattr(self, "_edge_curl", None) is None:
-            self._edge_curl = (
+            self._edge_curl = self._to_dtype(
                 sdiag(1 / self.face_areas)
                 * self._edge_curl_stencil
                 * sdiag(self.edge_lengths)
@@ -1355,13 +1520,13 @@ class CylindricalMesh(
         # Documentation inherited from discretize.operators.DiffOperators
         if self.is_symmetric:
             raise Exception("There are no x-edges on a cyl symmetric mesh")
-        return (
+        return self._to_dtype(
             kron3(
                 av(self.shape_cells[2]),
                 av(self.shape_cells[1]),
                 speye(self.shape_cells[0]),
             )
-            * self._deflation_matrix("Ex", as_ones=True).T
+            * self._expansion_matrix("Ex")
         )
 
     @property
@@ -1369,15 +1534,15 @@ class CylindricalMesh(
         # Documentation inherited from discretize.operators.DiffOperators
         if self.is_symmetric:
             avR = av(self.shape_cells[0])[:, 1:]
-            return sp.kron(av(self.shape_cells[2]), avR, format="csr")
+            return self._to_dtype(sp.kron(av(self.shape_cells[2]), avR, format="csr"))
         else:
-            return (
+            return self._to_dtype(
                 kron3(
                     av(self.shape_cells[2]),
                     speye(self.shape_cells[1]),
                     av(self.shape_cells[0]),
                 )
-                * self._deflation_matrix("Ey", as_ones=True).T
+                * self._expansion_matrix("Ey")
             )
 
     @property
@@ -1385,13 +1550,13 @@ class CylindricalMesh(
         # Documentation inherited from discretize.operators.DiffOperators
         if self.is_symmetric:
             raise Exception("There are no z-edges on a cyl symmetric mesh")
-        return (
+        return self._to_dtype(
             kron3(
                 speye(self.shape_cells[2]),
                 av(self.shape_cells[1]),
                 av(self.shape_cells[0]),
             )
-            * self._deflation_matrix("Ez", as_ones=True).T
+            * self._expansion_matrix("Ez")
         )
 
     @property
@@ -1403,7 +1568,7 @@ class CylindricalMesh(
             if self.is_symmetric:
                 self._average_edge_to_cell = self.aveEy2CC
             else:
-                self._average_edge_to_cell = (
+                self._average_edge_to_cell = self._to_dtype(
                     1.0
                     / self.dim
                     * sp.hstack(
@@ -1419,8 +1584,10 @@ class CylindricalMesh(
             return self.average_edge_to_cell
         else:
             if getattr(self, "_average_edge_to_cell_vector", None) is None:
-                self._average_edge_to_cell_vector = sp.block_diag(
-                    (self.aveEx2CC, self.aveEy2CC, self.aveEz2CC), format="csr"
+                self._average_edge_to_cell_vector = self._to_dtype(
+                    sp.block_diag(
+                        (self.aveEx2CC, self.aveEy2CC, self.aveEz2CC), format="csr"
+                    )
                 )
         return self._average_edge_to_cell_vector
 
@@ -1430,31 +1597,33 @@ class CylindricalMesh(
         avR = av(self.vnC[0])[
             :, 1:
         ]  # TODO: this should be handled by a deflation matrix
-        return kron3(speye(self.vnC[2]), speye(self.vnC[1]), avR)
+        return self._to_dtype(kron3(speye(self.vnC[2]), speye(self.vnC[1]), avR))
 
     @property
     def average_face_y_to_cell(self):  # NOQA D102
         # Documentation inherited from discretize.operators.DiffOperators
-        return (
+        return self._to_dtype(
             kron3(speye(self.vnC[2]), av(self.vnC[1]), speye(self.vnC[0]))
-            * self._deflation_matrix("Fy", as_ones=True).T
+            * self._expansion_matrix("Fy")
         )
 
     @property
     def average_face_z_to_cell(self):  # NOQA D102
         # Documentation inherited from discretize.operators.DiffOperators
-        return kron3(av(self.vnC[2]), speye(self.vnC[1]), speye(self.vnC[0]))
+        return self._to_dtype(
+            kron3(av(self.vnC[2]), speye(self.vnC[1]), speye(self.vnC[0]))
+        )
 
     @property
     def average_face_to_cell(self):  # NOQA D102
         # Documentation inherited from discretize.base.BaseMesh
         if getattr(self, "_average_face_to_cell", None) is None:
             if self.is_symmetric:
-                self._average_face_to_cell = 0.5 * (
-                    sp.hstack((self.aveFx2CC, self.aveFz2CC), format="csr")
+                self._average_face_to_cell = self._to_dtype(
+                    0.5 * (sp.hstack((self.aveFx2CC, self.aveFz2CC), format="csr"))
                 )
             else:
-                self._average_face_to_cell = (
+                self._average_face_to_cell = self._to_dtype(
                     1.0
                     / self.dim
                     * (
@@ -1471,12 +1640,14 @@ class CylindricalMesh(
         if getattr(self, "_average_face_to_cell_vector", None) is None:
             # n = self.vnC
             if self.is_symmetric:
-                self._average_face_to_cell_vector = sp.block_diag(
-                    (self.aveFx2CC, self.aveFz2CC), format="csr"
+                self._average_face_to_cell_vector = self._to_dtype(
+                    sp.block_diag((self.aveFx2CC, self.aveFz2CC), format="csr")
                 )
             else:
-                self._average_face_to_cell_vector = sp.block_diag(
-                    (self.aveFx2CC, self.aveFy2CC, self.aveFz2CC), format="csr"
+                self._average_face_to_cell_vector = self._to_dtype(
+                    sp.block_diag(
+                        (self.aveFx2CC, self.aveFy2CC, self.aveFz2CC), format="csr"
+                    )
                 )
         return self._average_face_to_cell_vector
 
@@ -1503,8 +1674,8 @@ class CylindricalMesh(
         # Documentation inherited from discretize.base.BaseMesh
         if getattr(self, "_average_node_to_face", None) is None:
             ave = super().average_node_to_face
-            ave = ave @ self._deflation_matrix("nodes", as_ones=True).T
-            self._average_node_to_face = ave
+            ave = ave @ self._expansion_matrix("nodes")
+            self._average_node_to_face = self._to_dtype(ave)
         return self._average_node_to_face
 
     @property
@@ -1531,9 +1702,11 @@ class CylindricalMesh(
                     speye(self.shape_cells[0]),
                 )
 
-                self._average_cell_to_face = sp.vstack(
-                    (av_c2f_r, av_c2f_t, av_c2f_z),
-                    format="csr",
+                self._average_cell_to_face = self._to_dtype(
+                    sp.vstack(
+                        (av_c2f_r, av_c2f_t, av_c2f_z),
+                        format="csr",
+                    )
                 )
         return self._average_cell_to_face
 
@@ -1541,19 +1714,19 @@ class CylindricalMesh(
     def project_face_to_boundary_face(self):  # NOQA D102
         # Documentation inherited from discretize.base.BaseMesh
         P = speye(self.n_faces)
-        return P[self._is_boundary_face]
+        return self._to_dtype(P[self._is_boundary_face])
 
     @property
     def project_node_to_boundary_node(self):  # NOQA D102
         # Documentation inherited from discretize.base.BaseMesh
         P = speye(self.n_nodes)
-        return P[self._is_boundary_node]
+        return self._to_dtype(P[self._is_boundary_node])
 
     @property
     def project_edge_to_boundary_edge(self):  # NOQA D102
         # Documentation inherited from discretize.base.BaseMesh
         P = speye(self.n_edges)
-        return P[self._is_boundary_edge]
+        return self._to_dtype(P[self._is_boundary_edge])
 
     ####################################################
     # Deflation Matrices
@@ -1563,9 +1736,33 @@ class CylindricalMesh(
         """Construct the deflation matrix.
 
         Construct the deflation matrix to remove hanging edges / faces / nodes
-        from the operators.
+        from the operators. The matrices are cached for each location type.
         """
         location = self._parse_location_type(location)
+        if getattr(self, "_deflation_matrices", None) is None:
+            self._deflation_matrices = {}
+        key = (location, bool(as_ones))
+        if key not in self._deflation_matrices:
+            self._deflation_matrices[key] = self.__deflation_matrix(*key)
+        return self._deflation_matrices[key]
+
+    def _expansion_matrix(self, location):
+        """Construct the expansion matrix.
+
+        The expansion matrix copies the values on the edges / faces / nodes of
+        the mesh to all of the hanging ones they are merged with; it is the
+        transpose of the deflation matrix built with ``as_ones=True``. The
+        matrices are cached, in CSR format, for each location type.
+        """
+        location = self._parse_location_type(location)
+        if getattr(self, "_expansion_matrices", None) is None:
+            self._expansion_matrices = {}
+        if location not in self._expansion_matrices:
+            P = self._deflation_matrix(location, as_ones=True)
+            self._expansion_matrices[location] = P.T.tocsr()
+        return self._expansion_matrices[location]
+
+    def __deflation_matrix(self, location, as_ones):
         if location not in [
             "nodes",
             "faces",
@@ -1595,60 +1792,76 @@ class CylindricalMesh(
                         [
                             self._deflation_matrix(location + coord, as_ones=as_ones)
                             for coord in ["_x", "_z"]
-                        ]
+                        ],
+                        format="csr",
                     )
             return sp.block_diag(
                 [
                     self._deflation_matrix(location + coord, as_ones=as_ones)
                     for coord in ["_x", "_y", "_z"]
-                ]
+                ],
+                format="csr",
             )
 
-        R = speye(getattr(self, "_n_total_{}".format(location)))
-        hanging_dict = getattr(self, "_hanging_{}".format(location))
-        nothanging = ~getattr(self, "_ishanging_{}".format(location))
-
-        # remove eliminated edges / faces (eg. Fx just doesn't exist)
-        hang = {k: v for k, v in hanging_dict.items() if v is not None}
-
-        values = list(hang.values())
-        entries = np.ones(len(values))
-
-        Hang = sp.csr_matrix(
-            (entries, (values, list(hang.keys()))),
-            shape=(
-                getattr(self, "_n_total_{}".format(location)),
-                getattr(self, "_n_total_{}".format(location)),
-            ),
-        )
-        R = R + Hang
-
-        R = R[nothanging, :]
-
-        if not as_ones:
-            R = sdiag(1.0 / R.sum(1)) * R
-
-        return R
+        is_hanging = getattr(self, "_ishanging_{}".format(location))
+        targets = getattr(self, "_hanging_{}".format(location))
+        n_total = len(is_hanging)
+        n_kept = n_total - np.count_nonzero(is_hanging)
+
+        # each remaining entity collects itself and the hanging entities that
+        # map onto it, eliminated entities (eg. Fx just doesn't exist) are dropped.
+        # Every column holds at most one entry, so build it column by column.
+        row = np.cumsum(~is_hanging) - 1
+        col_row = np.where(is_hanging, -1, row)
+        hanging = np.flatnonzero(is_hanging)
+        mapped = targets >= 0
+        hanging, targets = hanging[mapped], targets[mapped]
+        mapped = ~is_hanging[targets]
+        col_row[hanging[mapped]] = row[targets[mapped]]
+
+        has_entry = col_row >= 0
+        indices = col_row[has_entry]
+        indptr = np.r_[0, np.cumsum(has_entry)]
+        if as_ones:
+            values = np.ones(len(indices))
+        else:
+            values = 1.0 / np.bincount(indices, minlength=n_kept)[indices]
+        R = sp.csc_matrix((values, indices, indptr), shape=(n_kept, n_total))
+        return R.tocsr()
 
     ####################################################
     # Interpolation
     ####################################################
 
     def get_interpolation_matrix(
-        self, loc, location_type="cell_centers", zeros_outside=False, **kwargs
+        self,
+        loc,
+        location_type="cell_centers",
+        zeros_outside=False,
+        reference_system="cylindrical",
+        n_threads=None,
+        **kwargs,
     ):
         r"""Construct interpolation matrix from mesh.
 
         This method allows the user to construct a sparse linear-interpolation
         matrix which interpolates discrete quantities from mesh centers, nodes,
         edges or faces to an arbitrary set of locations in 3D space.
-        Locations are defined in cylindrical coordinates; i.e. :math:`(r, \phi, z)`.
+        Locations are defined in cylindrical coordinates; i.e. :math:`(r, \phi, z)`,
+        or in cartesian coordinates.
+
+        For a 3D mesh that is not symmetric, the interpolation is periodic in
+        :math:`\phi`, and locations closer to the axis than the first radial
+        positions of a discrete quantity are interpolated along the diameter
+        through the axis. The matrix is assembled by a compiled loop over the
+        locations.
 
         Parameters
         ----------
         loc : (n_pts, dim) numpy.ndarray
             Location of points to interpolate to in cylindrical coordinates ; i.e.
-            :math:`(r, \phi, z)`
+            :math:`(r, \phi, z)`, or in cartesian coordinates :math:`(x, y, z)`
+            if `reference_system` is *'cartesian'*.
         location_type : str
             What discrete quantity on the mesh you are interpolating from. Options are:
 
@@ -1668,12 +1881,26 @@ class CylindricalMesh(
             If *False* , nearest neighbour is used to compute the value for
             locations outside the mesh. If *True* , values outside the mesh
             will be equal to zero.
+        reference_system : {'cylindrical', 'cartesian'}
+            The coordinate system of `loc`. Cartesian locations are relative
+            to the :py:attr:`~.CylindricalMesh.cartesian_origin` in the
+            horizontal plane.
+        n_threads : int, optional
+            Number of threads used to assemble the matrix of a 3D mesh that
+            is not symmetric. By default, it is assembled serially. Several
+            threads require discretize to be built with OpenMP, otherwise a
+            warning is issued.
 
         Returns
         -------
         (n_pts, n_loc_type) scipy.sparse.csr_matrix
             The interpolation matrix
 
+        Notes
+        -----
+        The vector components of the discrete quantities are always the
+        cylindrical :math:`(r, \phi, z)` components, including for cartesian
+        locations.
         """
         if "locType" in kwargs:
             warnings.warn(
@@ -1697,8 +1924,39 @@ class CylindricalMesh(
                 "as this variable does not exist.".format(location_type)
             )
 
-        loc = as_array_n_by_dim(loc, self.dim).copy()
-        loc[:, 1] = loc[:, 1] % (2 * np.pi)
+        reference_system = reference_system.lower()
+        reference_system = {
+            "car": "cartesian",
+            "cart": "cartesian",
+            "cy": "cylindrical",
+            "cyl": "cylindrical",
+        }.get(reference_system, reference_system)
+        if reference_system not in ["cartesian", "cylindrical"]:
+            raise ValueError(
+                "reference_system must be 'cylindrical' or 'cartesian', not "
+                f"{reference_system!r}."
+            )
+        cartesian = reference_system == "cartesian"
+
+        loc = as_array_n_by_dim(loc, self.dim)
+        if self.dim == 3 and not self.is_symmetric:
+            Q = self._periodic_interpolation(
+                loc, location_type, cartesian, _n_threads(n_threads)
+            )
+            if zeros_outside:
+                if cartesian:
+                    loc = self._cartesian_locations_to_cylindrical(loc)
+                outside = ~self.is_inside(loc)
+                Q.data[np.repeat(outside, np.diff(Q.indptr))] = 0
+                Q.eliminate_zeros()
+            return self._to_dtype(Q)
+
+        if cartesian:
+            loc = self._cartesian_locations_to_cylindrical(loc)
+        else:
+            loc = loc.copy()
+        # wrap the angles into the azimuthal range of the mesh
+        loc[:, 1] = (loc[:, 1] - self.origin[1]) % (2 * np.pi) + self.origin[1]
 
         if location_type in ["cell_centers_x", "cell_centers_y", "cell_centers_z"]:
             Q = interpolation_matrix(loc, *self.get_tensor("cell_centers"))
@@ -1715,7 +1973,7 @@ class CylindricalMesh(
             if self.dim == 3:
                 rtz.append(self.nodes_z)
             Q = interpolation_matrix(loc, *rtz)
-            Q = Q @ self._deflation_matrix("nodes", as_ones=True).T
+            Q = Q @ self._expansion_matrix("nodes")
         elif location_type == "cell_centers":
             # theta wrap around interpolation
             rtz = [
@@ -1782,7 +2040,7 @@ class CylindricalMesh(
                 if self.dim == 3:
                     rtz.append(self.cell_centers_z)
                 Q = interpolation_matrix(loc, *rtz)
-                Q = Q @ self._deflation_matrix("faces_y", as_ones=True).T
+                Q = Q @ self._expansion_matrix("faces_y")
                 components[1] = Q
             elif location_type == "faces_z":
                 # theta wrap around interpolation
@@ -1816,7 +2074,7 @@ class CylindricalMesh(
                 if self.dim == 3:
                     rtz.append(self.nodes_z)
                 Q = interpolation_matrix(loc, *rtz)
-                Q = Q @ self._deflation_matrix("edges_x", as_ones=True).T
+                Q = Q @ self._expansion_matrix("edges_x")
                 components[0] = Q
             elif location_type == "edges_y":
                 # theta wrap around
@@ -1846,7 +2104,7 @@ class CylindricalMesh(
             elif location_type == "edges_z":
                 rtz = [self.nodes_x, self._nodes_y_full, self.cell_centers_z]
                 Q = interpolation_matrix(loc, *rtz)
-                Q = Q @ self._deflation_matrix("edges_z", as_ones=True).T
+                Q = Q @ self._expansion_matrix("edges_z")
                 components[2] = Q
             else:
                 raise ValueError("Unrecognized location type")
@@ -1854,6 +2112,81 @@ class CylindricalMesh(
             Q = sp.hstack([comp for comp in components if comp.shape[1] > 0])
         if zeros_outside:
             Q[~self.is_inside(loc), :] = 0
+        return self._to_dtype(Q)
+
+    def _cartesian_locations_to_cylindrical(self, loc):
+        """Convert cartesian locations to cylindrical coordinates of this mesh."""
+        x = loc[:, 0] - self.cartesian_origin[0]
+        y = loc[:, 1] - self.cartesian_origin[1]
+        out = np.empty_like(loc, dtype=np.float64)
+        out[:, 0] = np.hypot(x, y)
+        out[:, 1] = np.arctan2(y, x)
+        out[:, 2:] = loc[:, 2:]
+        return out
+
+    def _periodic_interpolation(self, loc, location_type, cartesian, n_threads=1):
+        """Interpolation matrix of a non-symmetric 3D mesh."""
+        from discretize._extensions.interputils_cython import _interp_cyl_3D
+
+        r_n, r_c = self.nodes_x, self.cell_centers_x
+        t_n, t_c = self.nodes_y, self.cell_centers_y
+        z_n, z_c = self.nodes_z, self.cell_centers_z
+        # grids, and whether the nodes on the axis are a single item per z
+        grids = {
+            "cell_centers": (r_c, t_c, z_c, False),
+            "nodes": (r_n, t_n, z_n, True),
+            "faces_x": (r_n[1:], t_c, z_c, False),
+            "faces_y": (r_c, t_n, z_c, False),
+            "faces_z": (r_c, t_c, z_n, False),
+            "edges_x": (r_c, t_n, z_n, False),
+            "edges_y": (r_n[1:], t_c, z_n, False),
+            "edges_z": (r_n, t_n, z_c, True),
+        }
+        n_cells = self.n_cells
+        # location of the component, and the offset and total number of items
+        components = {
+            "cell_centers": ("cell_centers", 0, n_cells),
+            "nodes": ("nodes", 0, self.n_nodes),
+            "cell_centers_x": ("cell_centers", 0, 2 * n_cells),
+            "cell_centers_y": ("cell_centers", 0, n_cells),
+            "cell_centers_z": ("cell_centers", n_cells, 2 * n_cells),
+            "faces_x": ("faces_x", 0, self.n_faces),
+            "faces_y": ("faces_y", self.n_faces_x, self.n_faces),
+            "faces_z": ("faces_z", self.n_faces_x + self.n_faces_y, self.n_faces),
+            "edges_x": ("edges_x", 0, self.n_edges),
+            "edges_y": ("edges_y", self.n_edges_x, self.n_edges),
+            "edges_z": ("edges_z", self.n_edges_x + self.n_edges_y, self.n_edges),
+        }
+        if location_type not in components:
+            raise ValueError("Unrecognized location type")
+        grid, offset, n_items = components[location_type]
+        r, t, z, axis_node = grids[grid]
+        # radial and azimuthal components change sign across the axis
+        axis_sign = -1.0 if location_type[-1] in "xy" else 1.0
+
+        n_loc = loc.shape[0]
+        indices = np.empty(8 * n_loc, dtype=np.int64)
+        data = np.empty(8 * n_loc, dtype=np.float64)
+        x0, y0 = self.cartesian_origin[:2]
+        _interp_cyl_3D(
+            np.require(loc, dtype=np.float64, requirements="C"),
+            *(np.asarray(v, dtype=np.float64) for v in (r, t, z)),
+            offset,
+            axis_node,
+            axis_sign,
+            cartesian,
+            x0,
+            y0,
+            indices,
+            data,
+            n_threads,
+        )
+        Q = sp.csr_matrix(
+            (data, indices, np.arange(0, 8 * n_loc + 1, 8)), shape=(n_loc, n_items)
+        )
+        # the items on the axis, or a single azimuthal position, repeat
+        Q.sum_duplicates()
+        Q.eliminate_zeros()
         return Q
 
     def cartesian_grid(self, location_type="cell_centers", theta_shift=None, **kwargs):
@@ -1890,7 +2223,12 @@ class CylindricalMesh(
         return cyl2cart(grid)  # TODO: account for cartesian origin
 
     def get_interpolation_matrix_cartesian_mesh(
-        self, Mrect, location_type="cell_centers", location_type_to=None, **kwargs
+        self,
+        Mrect,
+        location_type="cell_centers",
+        location_type_to=None,
+        volume_average=False,
+        **kwargs,
     ):
         """Construct projection matrix from ``CylindricalMesh`` to other mesh.
 
@@ -1902,15 +2240,39 @@ class CylindricalMesh(
         defined in Cartesian coordinates; e.g. :class:`~discretize.TensorMesh`,
         :class:`~discretize.TreeMesh` or :class:`~discretize.CurvilinearMesh`.
 
+        For vector quantities on the faces or edges, each Cartesian component
+        is the sum of the radial, azimuthal and vertical components of the
+        cylindrical mesh projected onto the faces' normals (or the edges'
+        tangents) of the other mesh.
+
+        The matrices are cached for each mesh they map to, so repeated calls
+        (e.g. when exporting each time step of a transient simulation) do not
+        rebuild them. Each call returns a copy of the cached matrix, which can
+        be modified freely. Several time steps can be mapped at once with
+        ``P @ fields`` for an (n_loc_type, n_times) array of fields.
+
         Parameters
         ----------
         Mrect : discretize.base.BaseMesh
             the mesh we are interpolating onto
-        location_type : {'CC', 'N', 'Ex', 'Ey', 'Ez', 'Fx', 'Fy', 'Fz'}
+        location_type : {'CC', 'N', 'F', 'E', 'Ex', 'Ey', 'Ez', 'Fx', 'Fy', 'Fz'}
             gridded locations of the cylindrical mesh.
-        location_type_to : {None, 'CC', 'N', 'Ex', 'Ey', 'Ez', 'Fx', 'Fy', 'Fz'}
+        location_type_to : {None, 'CC', 'N', 'F', 'E', 'Ex', 'Ey', 'Ez', 'Fx', 'Fy', 'Fz'}
             gridded locations being interpolated to on the other mesh.
             If *None*, this method will use the same type as *location_type*.
+        volume_average : bool, optional
+            For cell centered quantities on a :class:`~discretize.TensorMesh`
+            or a :class:`~discretize.TreeMesh`, average the cylindrical model
+            over the volume of each of the Cartesian cells instead of
+            interpolating it at their centers. The volume shared by each
+            Cartesian cell and each cylindrical cell is computed exactly, as
+            the area of the intersection of the cell's horizontal rectangle
+            with the annular sector of the cylindrical cell, times the length
+            of the overlap of their vertical extents. Each value is then
+            weighted by that volume over the volume of the Cartesian cell, so
+            that ``np.sum(Mrect.cell_volumes * (P @ values))`` equals the
+            integral of the cylindrical model over the part of the
+            cylindrical mesh inside `Mrect`.
 
         Returns
         -------
@@ -1934,83 +2296,175 @@ class CylindricalMesh(
             location_type_to = kwargs["locTypeTo"]
 
         location_type = self._parse_location_type(location_type)
-
-        if not self.is_symmetric:
-            raise AssertionError(
-                "Currently we have not taken into account other projections "
-                "for more complicated CylindricalMeshes"
-            )
-
         if location_type_to is None:
             location_type_to = location_type
         location_type_to = self._parse_location_type(location_type_to)
+        volume_average = bool(volume_average)
+        if volume_average:
+            if location_type != "cell_centers" or location_type_to != "cell_centers":
+                raise ValueError(
+                    "volume_average is only supported from and to cell centers"
+                )
+            if getattr(Mrect, "_meshType", None) not in ["TENSOR", "TREE"]:
+                raise TypeError(
+                    "volume_average is only supported to a TensorMesh or a TreeMesh"
+                )
+            if self.dim != 3 or Mrect.dim != 3:
+                raise ValueError("volume_average is only supported for 3D meshes")
+
+        # Cache on the other mesh (weakly), along with the parameters that
+        # could have changed since the matrix was built.
+        if getattr(self, "_cartesian_maps", None) is None:
+            self._cartesian_maps = weakref.WeakKeyDictionary()
+        key = (
+            location_type,
+            location_type_to,
+            volume_average,
+            tuple(self.cartesian_origin),
+            tuple(getattr(Mrect, "origin", ())),
+            Mrect.n_cells,
+        )
+        maps = self._cartesian_maps.setdefault(Mrect, {})
+        if key not in maps:
+            if volume_average:
+                P = self._cartesian_volume_average(Mrect)
+            else:
+                P = self._cartesian_interpolation(
+                    Mrect, location_type, location_type_to
+                )
+            maps[key] = P
+        return maps[key].copy()
+
+    def _cartesian_interpolation(self, Mrect, location_type, location_type_to):
+        if location_type in ["faces", "edges"]:
+            if location_type_to not in ["faces", "edges"]:
+                raise ValueError(
+                    f"Cannot interpolate {location_type} to {location_type_to}"
+                )
+            # each cartesian component sums the projections of the existing
+            # cylindrical components.
+            components = [
+                f"{location_type}_{c}"
+                for c in "xyz"
+                if getattr(self, f"n_{location_type}_{c}") > 0
+            ]
+            blocks = []
+            for c in "xyz":
+                to = f"{location_type_to}_{c}"
+                r, theta, z = self._cartesian_to_cylindrical(Mrect, to)
+                block = spzeros(len(r), getattr(self, f"n_{location_type}"))
+                for component in components:
+                    Q = self._cartesian_component(Mrect, component, to, r, theta, z)
+                    if Q is not None:
+                        block = block + Q
+                blocks.append(block)
+            return sp.vstack(blocks, format="csr")
+        r, theta, z = self._cartesian_to_cylindrical(Mrect, location_type_to)
+        Q = self._cartesian_component(
+            Mrect, location_type, location_type_to, r, theta, z
+        )
+        if Q is None:
+            Q = spzeros(len(r), getattr(self, f"n_{location_type[:-2]}"))
+        return Q.tocsr()
 
-        if location_type == "faces":
-            # do this three times for each component
-            X = self.get_interpolation_matrix_cartesian_mesh(
-                Mrect, location_type="faces_x", location_type_to=location_type_to + "_x"
-            )
-            Y = self.get_interpolation_matrix_cartesian_mesh(
-                Mrect, location_type="faces_y", location_type_to=location_type_to + "_y"
-            )
-            Z = self.get_interpolation_matrix_cartesian_mesh(
-                Mrect, location_type="faces_z", location_type_to=location_type_to + "_z"
-            )
-            return sp.vstack((X, Y, Z))
-        if location_type == "edges":
-            X = self.get_interpolation_matrix_cartesian_mesh(
-                Mrect, location_type="edges_x", location_type_to=location_type_to + "_x"
-            )
-            Y = self.get_interpolation_matrix_cartesian_mesh(
-                Mrect, location_type="edges_y", location_type_to=location_type_to + "_y"
-            )
-            Z = spzeros(getattr(Mrect, "n_" + location_type_to + "_z"), self.n_edges)
-            return sp.vstack((X, Y, Z))
-
+    def _cartesian_to_cylindrical(self, Mrect, location_type_to):
         grid = getattr(Mrect, location_type_to)
         # This is unit circle stuff, 0 to 2*pi, starting at x-axis, rotating
         # counter clockwise in an x-y slice
-        theta = (
-            -np.arctan2(
-                grid[:, 0] - self.cartesian_origin[0],
-                grid[:, 1] - self.cartesian_origin[1],
-            )
-            + np.pi / 2
-        )
+        x = grid[:, 0] - self.cartesian_origin[0]
+        y = grid[:, 1] - self.cartesian_origin[1]
+        theta = -np.arctan2(x, y) + np.pi / 2
         theta[theta < 0] += np.pi * 2.0
-        r = (
-            (grid[:, 0] - self.cartesian_origin[0]) ** 2
-            + (grid[:, 1] - self.cartesian_origin[1]) ** 2
-        ) ** 0.5
+        r = (x**2 + y**2) ** 0.5
+        return r, theta, grid[:, 2]
 
-        if location_type in ["cell_centers", "nodes", "faces_z", "edges_z"]:
-            G, proj = np.c_[r, theta, grid[:, 2]], np.ones(r.size)
-        else:
-            dotMe = {
-                "faces_x": Mrect.face_normals[: Mrect.nFx, :],
-                "faces_y": Mrect.face_normals[Mrect.nFx : (Mrect.nFx + Mrect.nFy), :],
-                "faces_z": Mrect.face_normals[-Mrect.nFz :, :],
-                "edges_x": Mrect.edge_tangents[: Mrect.nEx, :],
-                "edges_y": Mrect.edge_tangents[Mrect.nEx : (Mrect.nEx + Mrect.nEy), :],
-                "edges_z": Mrect.edge_tangents[-Mrect.nEz :, :],
-            }[location_type_to]
-            if "faces" in location_type:
-                normals = np.c_[np.cos(theta), np.sin(theta), np.zeros(theta.size)]
-                proj = (normals * dotMe).sum(axis=1)
-            elif "edges" in location_type:
-                tangents = np.c_[-np.sin(theta), np.cos(theta), np.zeros(theta.size)]
-                proj = (tangents * dotMe).sum(axis=1)
-            G = np.c_[r, theta, grid[:, 2]]
+    def _cartesian_component(self, Mrect, location_type, location_type_to, r, theta, z):
+        """Interpolate one cylindrical quantity projected onto `location_type_to`.
+
+        Returns None when the projection vanishes everywhere.
+        """
+        G = np.c_[r, theta, z]
+        if location_type in ["cell_centers", "nodes"]:
+            return self.get_interpolation_matrix(G, location_type)
 
         interp_type = location_type
-        if interp_type == "faces_y":
-            interp_type = "faces_x"
-        elif interp_type == "edges_x":
-            interp_type = "edges_y"
-
-        Pc2r = self.get_interpolation_matrix(G, interp_type)
-        Proj = sdiag(proj)
-        return Proj * Pc2r
+        if self.is_symmetric:
+            # only the radial faces and the azimuthal edges exist
+            if interp_type == "faces_y":
+                interp_type = "faces_x"
+            elif interp_type == "edges_x":
+                interp_type = "edges_y"
+        if location_type_to[:-2] == "faces":
+            n_x, n_y = Mrect.n_faces_x, Mrect.n_faces_y
+            directions = Mrect.face_normals
+        elif location_type_to[:-2] == "edges":
+            n_x, n_y = Mrect.n_edges_x, Mrect.n_edges_y
+            directions = Mrect.edge_tangents
+        else:
+            raise ValueError(
+                f"Cannot interpolate {location_type} to {location_type_to}"
+            )
+        directions = {
+            "x": directions[:n_x],
+            "y": directions[n_x : n_x + n_y],
+            "z": directions[n_x + n_y :],
+        }[location_type_to[-1]]
+        if interp_type[-1] == "x":
+            unit = np.c_[np.cos(theta), np.sin(theta), np.zeros(theta.size)]
+        elif interp_type[-1] == "y":
+            unit = np.c_[-np.sin(theta), np.cos(theta), np.zeros(theta.size)]
+        else:
+            unit = np.c_[np.zeros((theta.size, 2)), np.ones(theta.size)]
+        proj = (unit * directions).sum(axis=1)
+        if not np.any(proj):
+            return None
+        return sdiag(proj) @ self.get_interpolation_matrix(G, interp_type)
+
+    def _cartesian_volume_average(self, Mrect):
+        """Build the conservative volume averaging to a tensor or tree mesh."""
+        x0, y0 = self.cartesian_origin[:2]
+        r_nodes, t_nodes, z_nodes = (
+            o + np.r_[0, np.cumsum(h)] for o, h in zip(self.origin, self.h)
+        )
+        if Mrect._meshType == "TENSOR":
+            # the overlaps are separable into the horizontal and vertical parts
+            x_nodes, y_nodes, z_to = Mrect.nodes_x, Mrect.nodes_y, Mrect.nodes_z
+            x_lo, y_lo = np.meshgrid(
+                x_nodes[:-1] - x0, y_nodes[:-1] - y0, indexing="ij"
+            )
+            x_hi, y_hi = np.meshgrid(x_nodes[1:] - x0, y_nodes[1:] - y0, indexing="ij")
+            W_xy = _annular_sector_overlaps(
+                x_lo.reshape(-1, order="F"),
+                x_hi.reshape(-1, order="F"),
+                y_lo.reshape(-1, order="F"),
+                y_hi.reshape(-1, order="F"),
+                r_nodes,
+                t_nodes,
+            )
+            W_z = _interval_overlaps(z_to[:-1], z_to[1:], z_nodes)
+            W = sp.kron(W_z, W_xy, format="csr")
+        else:
+            h = Mrect.h_gridded / 2
+            lower = Mrect.cell_centers - h
+            upper = Mrect.cell_centers + h
+            W_xy = _annular_sector_overlaps(
+                lower[:, 0] - x0,
+                upper[:, 0] - x0,
+                lower[:, 1] - y0,
+                upper[:, 1] - y0,
+                r_nodes,
+                t_nodes,
+            ).tocoo()
+            W_z = _interval_overlaps(lower[:, 2], upper[:, 2], z_nodes)
+            # combine every horizontal overlap of a cell with its vertical ones
+            n_z = np.diff(W_z.indptr)[W_xy.row]
+            rows = np.repeat(W_xy.row, n_z)
+            local = np.arange(n_z.sum()) - np.repeat(np.cumsum(n_z) - n_z, n_z)
+            z_index = W_z.indptr[rows] + local
+            cols = np.repeat(W_xy.col, n_z) + W_xy.shape[1] * W_z.indices[z_index]
+            data = np.repeat(W_xy.data, n_z) * W_z.data[z_index]
+            W = sp.csr_matrix((data, (rows, cols)), shape=(Mrect.n_cells, self.n_cells))
+        return sdiag(1.0 / Mrect.cell_volumes) @ W
 
     # DEPRECATIONS
     areaFx = deprecate_property(
@@ -407,7 +407,7 @@ class InterfaceVTK(object):
         Wedges happen on the very internal layer about r=0, and hexes occur elsewhere.
         """
         # # Points
-        P = mesh._deflation_matrix("nodes", as_ones=True).T.tocsr()
+        P = mesh._expansion_matrix("nodes")
 
         if np.any(mesh.h[1] >= np.pi):
             raise NotImplementedError(
@@ -14,6 +14,29 @@ Operator Classes
 
   DiffOperators
   InnerProducts
+  inner_product_assembler.InnerProductAssembler
+  inner_product_assembler.InnerProductDeriv
+
+Matrix-free Operator Classes
+----------------------------
+.. autosummary::
+  :toctree: generated/
+
+  kron_operators.BaseKronOperator
+  kron_operators.TensorProductOperator
+  kron_operators.DiagonalOperator
+  kron_operators.ScaledOperator
+  kron_operators.ProductOperator
+  kron_operators.BlockOperator
+
+Fast Solvers
+------------
+.. autosummary::
+  :toctree: generated/
+
+  fast_poisson.FastPoissonSolver
+  cylindrical_modes.CylindricalModeDecomposition
+  cylindrical_modes.CylindricalModeSolver
 """
 
 from discretize.operators.differential_operators import DiffOperators
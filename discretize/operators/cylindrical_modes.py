@@ -0,0 +1,449 @@
+"""Azimuthal Fourier mode decomposition on three dimensional cylindrical meshes."""
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import scipy.fft as fft
+import scipy.sparse as sp
+from scipy.sparse.linalg import splu
+
+from discretize.operators.kron_operators import BaseKronOperator
+
+_COMPOSITE_LOCATIONS = {
+    "faces": ["faces_x", "faces_y", "faces_z"],
+    "edges": ["edges_x", "edges_y", "edges_z"],
+}
+
+
+def _map_threaded(func, items, n_threads):
+    if n_threads is None or n_threads <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=n_threads) as pool:
+        return list(pool.map(func, items))
+
+
+class CylindricalModeDecomposition:
+    r"""Azimuthal Fourier mode decomposition of a 3D cylindrical mesh.
+
+    On a :class:`~discretize.CylindricalMesh` with uniform azimuthal cell
+    widths, the discrete operators (and the inner products of axisymmetric
+    models) are invariant to a rotation by one cell. Every such operator is
+    block circulant along :math:`\theta`, and is block diagonalized by a
+    discrete Fourier transform along :math:`\theta`, decoupling the 3D problem
+    into one 2D (:math:`r`, :math:`z`) problem per azimuthal mode.
+
+    The values of a field at a given radius and height, at each of the
+    :math:`n_\theta` azimuthal positions, are transformed with a unitary FFT.
+    Entities on the axis of the mesh (the nodes and the z-edges at
+    :math:`r=0`) do not depend on :math:`\theta`, and are only part of mode
+    0, where they are placed before the transformed values.
+
+    Parameters
+    ----------
+    mesh : discretize.CylindricalMesh
+        A three dimensional cylindrical mesh with uniform ``h[1]``.
+
+    Examples
+    --------
+    Build the per-mode blocks of the curl and check them against the 3D
+    operator.
+
+    >>> from discretize import CylindricalMesh
+    >>> from discretize.operators.cylindrical_modes import CylindricalModeDecomposition
+    >>> import numpy as np
+    >>> mesh = CylindricalMesh([4, 8, 4])
+    >>> modes = CylindricalModeDecomposition(mesh)
+    >>> C_k = modes.mode_operators(mesh.edge_curl, "faces", "edges")
+    >>> len(C_k)
+    8
+    >>> e = np.random.rand(mesh.n_edges)
+    >>> e_k = modes.to_modes(e, "edges")
+    >>> f_k = [C @ v for C, v in zip(C_k, e_k)]
+    >>> np.allclose(modes.from_modes(f_k, "faces"), mesh.edge_curl @ e)
+    True
+    """
+
+    def __init__(self, mesh):
+        if getattr(mesh, "_meshType", None) != "CYL" or mesh.dim != 3:
+            raise TypeError(
+                "The mode decomposition is only implemented for 3D CylindricalMesh"
+            )
+        if mesh.is_symmetric:
+            raise ValueError("The mesh must have more than one azimuthal cell")
+        h_theta = mesh.h[1]
+        if not np.allclose(h_theta, h_theta[0], rtol=1e-12, atol=0):
+            raise ValueError("The azimuthal cell widths, h[1], must be uniform")
+        self._mesh = mesh
+        self._layouts = {}
+
+    @property
+    def mesh(self):
+        """The cylindrical mesh being decomposed.
+
+        Returns
+        -------
+        discretize.CylindricalMesh
+        """
+        return self._mesh
+
+    @property
+    def n_modes(self):
+        """Number of azimuthal modes.
+
+        Returns
+        -------
+        int
+        """
+        return self._mesh.shape_cells[1]
+
+    def _layout(self, location_type):
+        """Return the indices of the circulant and the axis entities.
+
+        The circulant entities are returned as an (n_rz, n_modes) array, such
+        that ``circ[i, t]`` is the entity at the i-th radius and height, rotated
+        by `t` cells from the first one.
+        """
+        location_type = self._mesh._parse_location_type(location_type)
+        if location_type in self._layouts:
+            return self._layouts[location_type]
+        mesh = self._mesh
+        if location_type in _COMPOSITE_LOCATIONS:
+            circ, axis, offset = [], [], 0
+            for component in _COMPOSITE_LOCATIONS[location_type]:
+                c, a = self._layout(component)
+                circ.append(c + offset)
+                axis.append(a + offset)
+                offset += getattr(mesh, f"n_{component}")
+            layout = (np.concatenate(circ), np.concatenate(axis))
+        else:
+            try:
+                grid = getattr(mesh, location_type)
+            except AttributeError:
+                raise ValueError(f"Unrecognized location_type: {location_type}")
+            on_axis = grid[:, 0] == 0.0
+            circ = np.flatnonzero(~on_axis)
+            theta = grid[circ, 1]
+            i_t = np.rint((theta - theta.min()) / mesh.h[1][0]).astype(np.int64)
+            # within each azimuthal position the entities are in the same
+            # (r, z) order, so a stable sort groups them by rotation.
+            circ = circ[np.argsort(i_t % self.n_modes, kind="stable")]
+            circ = circ.reshape(self.n_modes, -1).T
+            layout = (circ, np.flatnonzero(on_axis))
+        self._layouts[location_type] = layout
+        return layout
+
+    def mode_size(self, mode, location_type):
+        """Return the number of unknowns of a location type in a given mode.
+
+        Parameters
+        ----------
+        mode : int
+            The azimuthal mode number.
+        location_type : str
+            The location type of the field, e.g. ``'edges'`` or ``'cell_centers'``.
+
+        Returns
+        -------
+        int
+        """
+        circ, axis = self._layout(location_type)
+        return circ.shape[0] + (len(axis) if mode % self.n_modes == 0 else 0)
+
+    def _forward(self, v, location_type, real=False):
+        circ, axis = self._layout(location_type)
+        v = np.asarray(v)
+        if real:
+            coefficients = fft.rfft(v[circ], axis=1, norm="ortho")
+        else:
+            coefficients = fft.fft(v[circ], axis=1, norm="ortho")
+        return v[axis], coefficients
+
+    def _backward(self, axis_values, coefficients, location_type, real=False):
+        circ, axis = self._layout(location_type)
+        if real:
+            values = fft.irfft(coefficients, n=self.n_modes, axis=1, norm="ortho")
+        else:
+            values = fft.ifft(coefficients, axis=1, norm="ortho")
+        n = circ.size + axis.size
+        out = np.empty((n,) + values.shape[2:], dtype=values.dtype)
+        out[circ] = values
+        out[axis] = axis_values
+        return out
+
+    def to_modes(self, v, location_type):
+        """Transform a field into its azimuthal Fourier modes.
+
+        Parameters
+        ----------
+        v : (n,) or (n, n_vec) array_like
+            The field defined on `location_type`.
+        location_type : str
+            The location type of the field, e.g. ``'edges'`` or ``'cell_centers'``.
+
+        Returns
+        -------
+        list of numpy.ndarray
+            The complex coefficients of each mode, the `k`-th entry has
+            ``mode_size(k, location_type)`` rows.
+        """
+        axis_values, coefficients = self._forward(v, location_type)
+        modes = [coefficients[:, k] for k in range(self.n_modes)]
+        modes[0] = np.concatenate([axis_values, modes[0]])
+        return modes
+
+    def from_modes(self, modes, location_type):
+        """Assemble a field from its azimuthal Fourier modes.
+
+        Parameters
+        ----------
+        modes : list of numpy.ndarray
+            The coefficients of every mode, as returned by :meth:`to_modes`.
+        location_type : str
+            The location type of the field, e.g. ``'edges'`` or ``'cell_centers'``.
+
+        Returns
+        -------
+        (n,) or (n, n_vec) numpy.ndarray
+            The (complex) field.
+        """
+        if len(modes) != self.n_modes:
+            raise ValueError(f"Expected {self.n_modes} modes, got {len(modes)}")
+        n_axis = len(self._layout(location_type)[1])
+        modes = [np.asarray(mode) for mode in modes]
+        axis_values = modes[0][:n_axis]
+        coefficients = np.stack([modes[0][n_axis:]] + modes[1:], axis=1)
+        return self._backward(axis_values, coefficients, location_type)
+
+    def _check_invariant(self, A, circ_out, axis_out, circ_in):
+        """Check that `A` is invariant to a rotation by one azimuthal cell.
+
+        The rows at the second azimuthal position (and the rows of the axis
+        entities) must equal the rows at the first position with their
+        columns rotated by one cell.
+        """
+        rotate = np.arange(A.shape[1])
+        rotate[circ_in] = np.roll(circ_in, -1, axis=1)
+        rows = sp.vstack([A[circ_out[:, 0]], A[axis_out]]).tocoo()
+        rotated = sp.csr_matrix((rows.data, (rows.row, rotate[rows.col])), rows.shape)
+        diff = sp.vstack([A[circ_out[:, 1]], A[axis_out]]) - rotated
+        if diff.nnz and abs(diff).max() > 1e-10 * abs(rows.data).max():
+            raise ValueError(
+                "A is not invariant to a rotation by one azimuthal cell, and "
+                "can not be decomposed into azimuthal modes"
+            )
+
+    def mode_operators(self, A, location_type_out, location_type_in=None, modes=None):
+        r"""Block diagonalize an azimuthally invariant operator.
+
+        For an operator :math:`\mathbf{A}` mapping fields on
+        `location_type_in` to fields on `location_type_out`, return the
+        blocks :math:`\mathbf{A}_k` such that the `k`-th mode of
+        :math:`\mathbf{A}\mathbf{v}` is :math:`\mathbf{A}_k \mathbf{v}_k`.
+        The blocks are read off of the rows of :math:`\mathbf{A}` at the first
+        azimuthal position, so `A` must be invariant to a rotation by one
+        cell, as are the differential operators of the mesh and the inner
+        products of axisymmetric models.
+
+        Parameters
+        ----------
+        A : (n_out, n_in) scipy.sparse.spmatrix
+            The 3D operator, e.g. ``mesh.edge_curl`` or
+            ``mesh.get_edge_inner_product(sigma)``.
+        location_type_out : str
+            The location type of the range of `A`.
+        location_type_in : str, optional
+            The location type of the domain of `A`. Defaults to
+            `location_type_out`.
+        modes : iterable of int, optional
+            The modes to build, defaults to all of them.
+
+        Returns
+        -------
+        list of scipy.sparse.csr_matrix
+            The block of each requested mode. The blocks of modes 0 and
+            :math:`n_\theta/2` of real operators are real, all the others
+            are complex.
+
+        Raises
+        ------
+        ValueError
+            If `A` is not invariant to a rotation by one azimuthal cell.
+        """
+        if location_type_in is None:
+            location_type_in = location_type_out
+        n_t = self.n_modes
+        circ_out, axis_out = self._layout(location_type_out)
+        circ_in, axis_in = self._layout(location_type_in)
+        A = sp.csr_matrix(A)
+        n_in = circ_in.size + axis_in.size
+        if A.shape != (circ_out.size + axis_out.size, n_in):
+            raise ValueError(
+                f"A has shape {A.shape}, which does not match the locations "
+                f"{location_type_out} and {location_type_in}"
+            )
+        n_ai, n_ao = len(axis_in), len(axis_out)
+        m_in, m_out = circ_in.shape[0], circ_out.shape[0]
+        self._check_invariant(A, circ_out, axis_out, circ_in)
+
+        # (mode position, rotation) of every column, axis columns have j = -1
+        col_j = np.full(n_in, -1, dtype=np.int64)
+        col_t = np.zeros(n_in, dtype=np.int64)
+        col_j[circ_in] = np.arange(m_in)[:, None]
+        col_t[circ_in] = np.arange(n_t)
+        col_a = np.full(n_in, -1, dtype=np.int64)
+        col_a[axis_in] = np.arange(n_ai)
+
+        rows = A[circ_out[:, 0]].tocoo()
+        is_circ = col_j[rows.col] >= 0
+        i, j = rows.row[is_circ], col_j[rows.col[is_circ]]
+        t, values = col_t[rows.col[is_circ]], rows.data[is_circ]
+
+        # the pattern is shared by all the modes, sum the rotations of each
+        # (i, j) pair with a bincount.
+        key, inverse = np.unique(i * m_in + j, return_inverse=True)
+        indptr = np.zeros(m_out + 1, dtype=np.int64)
+        np.cumsum(np.bincount(key // m_in, minlength=m_out), out=indptr[1:])
+        indices = key % m_in
+
+        def block(k):
+            phase = np.exp(2j * np.pi * ((k * t) % n_t) / n_t)
+            if (2 * k) % n_t == 0:
+                phase = phase.real
+            data = values * phase
+            if np.iscomplexobj(data):
+                data = np.bincount(inverse, data.real, len(key)) + 1j * np.bincount(
+                    inverse, data.imag, len(key)
+                )
+            else:
+                data = np.bincount(inverse, data, len(key))
+            return sp.csr_matrix((data, indices, indptr), shape=(m_out, m_in))
+
+        if modes is None:
+            modes = range(n_t)
+        blocks = [block(k % n_t) for k in modes]
+        if n_ai == 0 and n_ao == 0:
+            return blocks
+
+        # the axis entities only couple to the mean (mode 0) of the others
+        scale = np.sqrt(n_t)
+        circ_axis = rows.tocsc()[:, axis_in] * scale
+        axis_rows = A[axis_out]
+        coo = axis_rows.tocoo()
+        j = col_j[coo.col]
+        is_circ = j >= 0
+        axis_circ = sp.csr_matrix(
+            (coo.data[is_circ] / scale, (coo.row[is_circ], j[is_circ])),
+            shape=(n_ao, m_in),
+        )
+        axis_axis = axis_rows[:, axis_in]
+        for index, k in enumerate(modes):
+            if k % n_t == 0:
+                blocks[index] = sp.bmat(
+                    [[axis_axis, axis_circ], [circ_axis, blocks[index]]], format="csr"
+                )
+        return blocks
+
+
+class CylindricalModeSolver(BaseKronOperator):
+    r"""Solve azimuthally invariant systems on a 3D cylindrical mesh by modes.
+
+    A system matrix on a 3D :class:`~discretize.CylindricalMesh` that is
+    invariant to a rotation by one azimuthal cell, such as one built from the
+    differential operators of the mesh and the inner products of an
+    axisymmetric model, decouples into independent 2D systems for each
+    azimuthal Fourier mode (see :class:`CylindricalModeDecomposition`).
+    Instead of factoring the 3D matrix, each of the (much smaller) mode
+    blocks is factored separately, and a solve transforms the right hand side
+    to the modes, solves each mode and transforms the solution back.
+
+    When `A` is real only the modes :math:`0, \ldots, n_\theta/2` are
+    factored, as the others are their complex conjugates.
+
+    Parameters
+    ----------
+    mesh : discretize.CylindricalMesh
+        A three dimensional cylindrical mesh with uniform ``h[1]``.
+    A : (n, n) scipy.sparse.spmatrix
+        The system matrix.
+    location_type : str, optional
+        The location type of the unknowns, e.g. ``'edges'``, ``'faces'``,
+        ``'nodes'`` or ``'cell_centers'``.
+    solver : callable, optional
+        Called with the sparse matrix of each mode, returning an object with
+        a ``solve(b)`` method (that also accepts ``trans='H'`` when solving
+        with the adjoint). Defaults to :func:`scipy.sparse.linalg.splu`.
+    n_threads : int, optional
+        Number of threads used to factor and to solve the modes. By default,
+        the modes are processed serially.
+
+    Raises
+    ------
+    ValueError
+        If `A` is not invariant to a rotation by one azimuthal cell.
+
+    Examples
+    --------
+    >>> from discretize import CylindricalMesh
+    >>> from discretize.operators.cylindrical_modes import CylindricalModeSolver
+    >>> import numpy as np
+    >>> mesh = CylindricalMesh([8, 16, 8])
+    >>> sigma = 1 + mesh.cell_centers[:, 0]
+    >>> C = mesh.edge_curl
+    >>> A = C.T @ mesh.get_face_inner_product() @ C + 1j * mesh.get_edge_inner_product(sigma)
+    >>> Ainv = CylindricalModeSolver(mesh, A, "edges", n_threads=2)
+    >>> b = np.random.rand(mesh.n_edges)
+    >>> np.allclose(A @ (Ainv @ b), b)
+    True
+    """
+
+    def __init__(self, mesh, A, location_type="edges", solver=None, n_threads=None):
+        self._modes = CylindricalModeDecomposition(mesh)
+        self._location_type = mesh._parse_location_type(location_type)
+        A = sp.csr_matrix(A)
+        n_t = self._modes.n_modes
+        self._real = not np.iscomplexobj(A)
+        modes = range(n_t // 2 + 1) if self._real else range(n_t)
+        blocks = self._modes.mode_operators(A, self._location_type, modes=modes)
+        if solver is None:
+
+            def solver(block):
+                return splu(block.tocsc())
+
+        self._solvers = _map_threaded(solver, blocks, n_threads)
+        self._n_threads = n_threads
+        self._trans = "N"
+        super().__init__(A.dtype, A.shape)
+
+    def _solve_modes(self, axis_values, coefficients):
+        n_axis = len(axis_values)
+        trans = self._trans
+
+        def solve(k):
+            rhs = coefficients[:, k]
+            if k == 0:
+                rhs = np.concatenate([axis_values, rhs])
+            if self._real and (2 * k) % self._modes.n_modes == 0:
+                rhs = rhs.real
+            if trans == "N":
+                return self._solvers[k].solve(rhs)
+            return self._solvers[k].solve(rhs, trans=trans)
+
+        solutions = _map_threaded(solve, range(coefficients.shape[1]), self._n_threads)
+        axis_values = solutions[0][:n_axis]
+        solutions[0] = solutions[0][n_axis:]
+        return axis_values, np.stack(solutions, axis=1)
+
+    def _matmat(self, x):
+        if self._real and np.iscomplexobj(x):
+            return self._matmat(x.real) + 1j * self._matmat(x.imag)
+        modes = self._modes
+        axis_values, coefficients = modes._forward(x, self._location_type, self._real)
+        axis_values, coefficients = self._solve_modes(axis_values, coefficients)
+        return modes._backward(
+            axis_values, coefficients, self._location_type, self._real
+        )
+
+    def _adjoint(self):
+        out = object.__new__(CylindricalModeSolver)
+        out.__dict__.update(self.__dict__)
+        out._trans = "H" if self._trans == "N" else "N"
+        return out
@@ -229,7 +229,7 @@ class DiffOperators(BaseMesh):
             # Compute areas of cell faces & volumes
             S = self.face_areas
             V = self.cell_volumes
-            self._face_divergence = sdiag(1 / V) * D * sdiag(S)
+            self._face_divergence = self._to_dtype(sdiag(1 / V) * D * sdiag(S))
         return self._face_divergence
 
     @property
@@ -347,7 +347,7 @@ class DiffOperators(BaseMesh):
         # Compute areas of cell faces & volumes
         S = self.reshape(self.face_areas, "F", "Fx", "V")
         V = self.cell_volumes
-        return sdiag(1 / V) * self._face_x_divergence_stencil * sdiag(S)
+        return self._to_dtype(sdiag(1 / V) * self._face_x_divergence_stencil * sdiag(S))
 
     @property
     def face_y_divergence(self):
@@ -466,7 +466,7 @@ class DiffOperators(BaseMesh):
         # Compute areas of cell faces & volumes
         S = self.reshape(self.face_areas, "F", "Fy", "V")
         V = self.cell_volumes
-        return sdiag(1 / V) * self._face_y_divergence_stencil * sdiag(S)
+        return self._to_dtype(sdiag(1 / V) * self._face_y_divergence_stencil * sdiag(S))
 
     @property
     def face_z_divergence(self):
@@ -595,7 +595,7 @@ class DiffOperators(BaseMesh):
         # Compute areas of cell faces & volumes
         S = self.reshape(self.face_areas, "F", "Fz", "V")
         V = self.cell_volumes
-        return sdiag(1 / V) * self._face_z_divergence_stencil * sdiag(S)
+        return self._to_dtype(sdiag(1 / V) * self._face_z_divergence_stencil * sdiag(S))
 
     ###########################################################################
     #                                                                         #
@@ -673,7 +673,7 @@ class DiffOperators(BaseMesh):
         if getattr(self, "_nodal_gradient", None) is None:
             G = self._nodal_gradient_stencil
             L = self.edge_lengths
-            self._nodal_gradient = sdiag(1 / L) * G
+            self._nodal_gradient = self._to_dtype(sdiag(1 / L) * G)
         return self._nodal_gradient
 
     @property
@@ -757,13 +757,13 @@ class DiffOperators(BaseMesh):
             warnings.warn("Laplacian has not been tested rigorously.")
             # Compute divergence operator on faces
             if self.dim == 1:
-                self._nodal_laplacian = self._nodal_laplacian_x
+                self._nodal_laplacian = self._to_dtype(self._nodal_laplacian_x)
             elif self.dim == 2:
-                self._nodal_laplacian = (
+                self._nodal_laplacian = self._to_dtype(
                     self._nodal_laplacian_x + self._nodal_laplacian_y
                 )
             elif self.dim == 3:
-                self._nodal_laplacian = (
+                self._nodal_laplacian = self._to_dtype(
                     self._nodal_laplacian_x
                     + self._nodal_laplacian_y
                     + self._nodal_laplacian_z
@@ -963,7 +963,7 @@ class DiffOperators(BaseMesh):
             else:
                 b = Pbn.T @ (gamma / beta * (AveBN2Bf.T @ boundary_areas))
             B = sp.diags(Pbn.T @ (-alpha / beta * (AveBN2Bf.T @ boundary_areas)))
-        return B, b
+        return self._to_dtype((B, b))
 
     ###########################################################################
     #                                                                         #
@@ -1184,7 +1184,7 @@ class DiffOperators(BaseMesh):
                 speye(self.shape_cells[1]),
                 _ddxCellGrad(self.shape_cells[0], BC),
             )
-        return G1
+        return self._to_dtype(G1)
 
     @property
     def stencil_cell_gradient_y(self):
@@ -1319,7 +1319,7 @@ class DiffOperators(BaseMesh):
             G2 = sp.kron(_ddxCellGrad(n[1], BC), speye(n[0]))
         elif self.dim == 3:
             G2 = kron3(speye(n[2]), _ddxCellGrad(n[1], BC), speye(n[0]))
-        return G2
+        return self._to_dtype(G2)
 
     @property
     def stencil_cell_gradient_z(self):
@@ -1425,7 +1425,7 @@ class DiffOperators(BaseMesh):
         BC = ["neumann", "neumann"]  # TODO: remove this hard-coding
         n = self.vnC
         G3 = kron3(_ddxCellGrad(n[2], BC), speye(n[1]), speye(n[0]))
-        return G3
+        return self._to_dtype(G3)
 
     @property
     def stencil_cell_gradient(self):  # NOQA D102
@@ -1458,7 +1458,7 @@ class DiffOperators(BaseMesh):
                 speye(self.shape_cells[0]),
             )
             G = sp.vstack((G1, G2, G3), format="csr")
-        return G
+        return self._to_dtype(G)
 
     @property
     def cell_gradient(self):
@@ -1617,7 +1617,7 @@ class DiffOperators(BaseMesh):
             V = (
                 self.aveCC2F * self.cell_volumes
             )  # Average volume between adjacent cells
-            self._cell_gradient = sdiag(S / V) * G
+            self._cell_gradient = self._to_dtype(sdiag(S / V) * G)
         return self._cell_gradient
 
     def cell_gradient_weak_form_robin(self, alpha=0.0, beta=1.0, gamma=0.0):
@@ -1754,7 +1754,7 @@ class DiffOperators(BaseMesh):
         A = M @ A
         b = M @ b
 
-        return A, b
+        return self._to_dtype((A, b))
 
     @property
     def cell_gradient_BC(self):
@@ -1781,7 +1781,7 @@ class DiffOperators(BaseMesh):
             V = (
                 self.aveCC2F * self.cell_volumes
             )  # Average volume between adjacent cells
-            self._cell_gradient_BC = sdiag(S / V) * G
+            self._cell_gradient_BC = self._to_dtype(sdiag(S / V) * G)
         return self._cell_gradient_BC
 
     @property
@@ -1905,7 +1905,7 @@ class DiffOperators(BaseMesh):
             # Compute areas of cell faces & volumes
             V = self.aveCC2F * self.cell_volumes
             L = self.reshape(self.face_areas / V, "F", "Fx", "V")
-            self._cell_gradient_x = sdiag(L) * G1
+            self._cell_gradient_x = self._to_dtype(sdiag(L) * G1)
         return self._cell_gradient_x
 
     @property
@@ -2030,7 +2030,7 @@ class DiffOperators(BaseMesh):
             # Compute areas of cell faces & volumes
             V = self.aveCC2F * self.cell_volumes
             L = self.reshape(self.face_areas / V, "F", "Fy", "V")
-            self._cell_gradient_y = sdiag(L) * G2
+            self._cell_gradient_y = self._to_dtype(sdiag(L) * G2)
         return self._cell_gradient_y
 
     @property
@@ -2125,7 +2125,7 @@ class DiffOperators(BaseMesh):
             # Compute areas of cell faces & volumes
             V = self.aveCC2F * self.cell_volumes
             L = self.reshape(self.face_areas / V, "F", "Fz", "V")
-            self._cell_gradient_z = sdiag(L) * G3
+            self._cell_gradient_z = self._to_dtype(sdiag(L) * G3)
         return self._cell_gradient_z
 
     ###########################################################################
@@ -2223,15 +2223,20 @@ class DiffOperators(BaseMesh):
                 S = self.cell_volumes
             elif self.dim == 3:
                 S = self.face_areas
-            self._edge_curl = sdiag(1 / S) @ self._edge_curl_stencil @ sdiag(L)
+            self._edge_curl = self._to_dtype(
+                sdiag(1 / S) @ self._edge_curl_stencil @ sdiag(L)
+            )
         return self._edge_curl
 
     @property
     def boundary_face_scalar_integral(self):  # NOQA D102
         # Documentation inherited from discretize.base.BaseMesh
         if self.dim == 1:
-            return sp.csr_matrix(
-                ([-1, 1], ([0, self.n_faces_x - 1], [0, 1])), shape=(self.n_faces_x, 2)
+            return self._to_dtype(
+                sp.csr_matrix(
+                    ([-1, 1], ([0, self.n_faces_x - 1], [0, 1])),
+                    shape=(self.n_faces_x, 2),
+                )
             )
         P = self.project_face_to_boundary_face
 
@@ -2239,7 +2244,7 @@ class DiffOperators(BaseMesh):
             (P @ self.face_normals) * self.boundary_face_outward_normals, axis=-1
         )
         A = sp.diags(self.face_areas) @ P.T @ sp.diags(w_h_dot_normal)
-        return A
+        return self._to_dtype(A)
 
     @property
     def boundary_edge_vector_integral(self):
@@ -2285,11 +2290,14 @@ class DiffOperators(BaseMesh):
         w_cross_n = np.cross(-w, Av.T @ dA)
 
         if self.dim == 2:
-            return Pe.T @ sp.diags(w_cross_n, format="csr")
-        return Pe.T @ sp.diags(
-            w_cross_n.T,
-            n_boundary_edges * np.arange(3),
-            shape=(n_boundary_edges, 3 * n_boundary_edges),
+            return self._to_dtype(Pe.T @ sp.diags(w_cross_n, format="csr"))
+        return self._to_dtype(
+            Pe.T
+            @ sp.diags(
+                w_cross_n.T,
+                n_boundary_edges * np.arange(3),
+                shape=(n_boundary_edges, 3 * n_boundary_edges),
+            )
         )
 
     @property
@@ -2319,9 +2327,11 @@ class DiffOperators(BaseMesh):
         boundary nodes.
         """
         if self.dim == 1:
-            return sp.csr_matrix(
-                ([-1, 1], ([0, self.shape_nodes[0] - 1], [0, 1])),
-                shape=(self.shape_nodes[0], 2),
+            return self._to_dtype(
+                sp.csr_matrix(
+                    ([-1, 1], ([0, self.shape_nodes[0] - 1], [0, 1])),
+                    shape=(self.shape_nodes[0], 2),
+                )
             )
         Pn = self.project_node_to_boundary_node
         Pf = self.project_face_to_boundary_face
@@ -2335,8 +2345,11 @@ class DiffOperators(BaseMesh):
         diags = u_dot_ds.T
         offsets = n_boundary_nodes * np.arange(self.dim)
 
-        return Pn.T @ sp.diags(
-            diags, offsets, shape=(n_boundary_nodes, self.dim * n_boundary_nodes)
+        return self._to_dtype(
+            Pn.T
+            @ sp.diags(
+                diags, offsets, shape=(n_boundary_nodes, self.dim * n_boundary_nodes)
+            )
         )
 
     def get_BC_projections(self, BC, discretization="CC"):
@@ -2521,12 +2534,15 @@ class DiffOperators(BaseMesh):
             if self.dim == 1:
                 self._average_face_to_cell = self.aveFx2CC
             elif self.dim == 2:
-                self._average_face_to_cell = (0.5) * sp.hstack(
-                    (self.aveFx2CC, self.aveFy2CC), format="csr"
+                self._average_face_to_cell = self._to_dtype(
+                    (0.5) * sp.hstack((self.aveFx2CC, self.aveFy2CC), format="csr")
                 )
             elif self.dim == 3:
-                self._average_face_to_cell = (1.0 / 3.0) * sp.hstack(
-                    (self.aveFx2CC, self.aveFy2CC, self.aveFz2CC), format="csr"
+                self._average_face_to_cell = self._to_dtype(
+                    (1.0 / 3.0)
+                    * sp.hstack(
+                        (self.aveFx2CC, self.aveFy2CC, self.aveFz2CC), format="csr"
+                    )
                 )
         return self._average_face_to_cell
 
@@ -2537,12 +2553,14 @@ class DiffOperators(BaseMesh):
             if self.dim == 1:
                 self._average_face_to_cell_vector = self.aveFx2CC
             elif self.dim == 2:
-                self._average_face_to_cell_vector = sp.block_diag(
-                    (self.aveFx2CC, self.aveFy2CC), format="csr"
+                self._average_face_to_cell_vector = self._to_dtype(
+                    sp.block_diag((self.aveFx2CC, self.aveFy2CC), format="csr")
                 )
             elif self.dim == 3:
-                self._average_face_to_cell_vector = sp.block_diag(
-                    (self.aveFx2CC, self.aveFy2CC, self.aveFz2CC), format="csr"
+                self._average_face_to_cell_vector = self._to_dtype(
+                    sp.block_diag(
+                        (self.aveFx2CC, self.aveFy2CC, self.aveFz2CC), format="csr"
+                    )
                 )
         return self._average_face_to_cell_vector
 
@@ -2636,11 +2654,15 @@ class DiffOperators(BaseMesh):
         if getattr(self, "_average_face_x_to_cell", None) is None:
             n = self.vnC
             if self.dim == 1:
-                self._average_face_x_to_cell = av(n[0])
+                self._average_face_x_to_cell = self._to_dtype(av(n[0]))
             elif self.dim == 2:
-                self._average_face_x_to_cell = sp.kron(speye(n[1]), av(n[0]))
+                self._average_face_x_to_cell = self._to_dtype(
+                    sp.kron(speye(n[1]), av(n[0]))
+                )
             elif self.dim == 3:
-                self._average_face_x_to_cell = kron3(speye(n[2]), speye(n[1]), av(n[0]))
+                self._average_face_x_to_cell = self._to_dtype(
+                    kron3(speye(n[2]), speye(n[1]), av(n[0]))
+                )
         return self._average_face_x_to_cell
 
     @property
@@ -2735,9 +2757,13 @@ class DiffOperators(BaseMesh):
         if getattr(self, "_average_face_y_to_cell", None) is None:
             n = self.vnC
             if self.dim == 2:
-                self._average_face_y_to_cell = sp.kron(av(n[1]), speye(n[0]))
+                self._average_face_y_to_cell = self._to_dtype(
+                    sp.kron(av(n[1]), speye(n[0]))
+                )
             elif self.dim == 3:
-                self._average_face_y_to_cell = kron3(speye(n[2]), av(n[1]), speye(n[0]))
+                self._average_face_y_to_cell = self._to_dtype(
+                    kron3(speye(n[2]), av(n[1]), speye(n[0]))
+                )
         return self._average_face_y_to_cell
 
     @property
@@ -2834,7 +2860,9 @@ class DiffOperators(BaseMesh):
         if getattr(self, "_average_face_z_to_cell", None) is None:
             n = self.vnC
             if self.dim == 3:
-                self._average_face_z_to_cell = kron3(av(n[2]), speye(n[1]), speye(n[0]))
+                self._average_face_z_to_cell = self._to_dtype(
+                    kron3(av(n[2]), speye(n[1]), speye(n[0]))
+                )
         return self._average_face_z_to_cell
 
     @property
@@ -2842,39 +2870,47 @@ class DiffOperators(BaseMesh):
         # Documentation inherited from discretize.base.BaseMesh
         if getattr(self, "_average_cell_to_face", None) is None:
             if self.dim == 1:
-                self._average_cell_to_face = av_extrap(self.shape_cells[0])
+                self._average_cell_to_face = self._to_dtype(
+                    av_extrap(self.shape_cells[0])
+                )
             elif self.dim == 2:
-                self._average_cell_to_face = sp.vstack(
-                    (
-                        sp.kron(
-                            speye(self.shape_cells[1]), av_extrap(self.shape_cells[0])
-                        ),
-                        sp.kron(
-                            av_extrap(self.shape_cells[1]), speye(self.shape_cells[0])
+                self._average_cell_to_face = self._to_dtype(
+                    sp.vstack(
+                        (
+                            sp.kron(
+                                speye(self.shape_cells[1]),
+                                av_extrap(self.shape_cells[0]),
+                            ),
+                            sp.kron(
+                                av_extrap(self.shape_cells[1]),
+                                speye(self.shape_cells[0]),
+                            ),
                         ),
-                    ),
-                    format="csr",
+                        format="csr",
+                    )
                 )
             elif self.dim == 3:
-                self._average_cell_to_face = sp.vstack(
-                    (
-                        kron3(
-                            speye(self.shape_cells[2]),
-                            speye(self.shape_cells[1]),
-                            av_extrap(self.shape_cells[0]),
-                        ),
-                        kron3(
-                            speye(self.shape_cells[2]),
-                            av_extrap(self.shape_cells[1]),
-                            speye(self.shape_cells[0]),
-                        ),
-                        kron3(
-                            av_extrap(self.shape_cells[2]),
-                            speye(self.shape_cells[1]),
-                            speye(self.shape_cells[0]),
+                self._average_cell_to_face = self._to_dtype(
+                    sp.vstack(
+                        (
+                            kron3(
+                                speye(self.shape_cells[2]),
+                                speye(self.shape_cells[1]),
+                                av_extrap(self.shape_cells[0]),
+                            ),
+                            kron3(
+                                speye(self.shape_cells[2]),
+                                av_extrap(self.shape_cells[1]),
+                                speye(self.shape_cells[0]),
+                            ),
+                            kron3(
+                                av_extrap(self.shape_cells[2]),
+                                speye(self.shape_cells[1]),
+                                speye(self.shape_cells[0]),
+                            ),
                         ),
-                    ),
-                    format="csr",
+                        format="csr",
+                    )
                 )
         return self._average_cell_to_face
 
@@ -2891,8 +2927,8 @@ class DiffOperators(BaseMesh):
                 aveCC2VFy = sp.kron(
                     av_extrap(self.shape_cells[1]), speye(self.shape_cells[0])
                 )
-                self._average_cell_vector_to_face = sp.block_diag(
-                    (aveCCV2Fx, aveCC2VFy), format="csr"
+                self._average_cell_vector_to_face = self._to_dtype(
+                    sp.block_diag((aveCCV2Fx, aveCC2VFy), format="csr")
                 )
             elif self.dim == 3:
                 aveCCV2Fx = kron3(
@@ -2910,8 +2946,8 @@ class DiffOperators(BaseMesh):
                     speye(self.shape_cells[1]),
                     speye(self.shape_cells[0]),
                 )
-                self._average_cell_vector_to_face = sp.block_diag(
-                    (aveCCV2Fx, aveCC2VFy, aveCC2BFz), format="csr"
+                self._average_cell_vector_to_face = self._to_dtype(
+                    sp.block_diag((aveCCV2Fx, aveCC2VFy, aveCC2BFz), format="csr")
                 )
         return self._average_cell_vector_to_face
 
@@ -2939,7 +2975,7 @@ class DiffOperators(BaseMesh):
                     ),
                     format="csr",
                 )
-            self._average_cell_to_edge = avg
+            self._average_cell_to_edge = self._to_dtype(avg)
         return self._average_cell_to_edge
 
     @property
@@ -2949,12 +2985,15 @@ class DiffOperators(BaseMesh):
             if self.dim == 1:
                 self._avE2CC = self.aveEx2CC
             elif self.dim == 2:
-                self._avE2CC = 0.5 * sp.hstack(
-                    (self.aveEx2CC, self.aveEy2CC), format="csr"
+                self._avE2CC = self._to_dtype(
+                    0.5 * sp.hstack((self.aveEx2CC, self.aveEy2CC), format="csr")
                 )
             elif self.dim == 3:
-                self._avE2CC = (1.0 / 3) * sp.hstack(
-                    (self.aveEx2CC, self.aveEy2CC, self.aveEz2CC), format="csr"
+                self._avE2CC = self._to_dtype(
+                    (1.0 / 3)
+                    * sp.hstack(
+                        (self.aveEx2CC, self.aveEy2CC, self.aveEz2CC), format="csr"
+                    )
                 )
         return self._avE2CC
 
@@ -2965,12 +3004,14 @@ class DiffOperators(BaseMesh):
             if self.dim == 1:
                 self._average_edge_to_cell_vector = self.aveEx2CC
             elif self.dim == 2:
-                self._average_edge_to_cell_vector = sp.block_diag(
-                    (self.aveEx2CC, self.aveEy2CC), format="csr"
+                self._average_edge_to_cell_vector = self._to_dtype(
+                    sp.block_diag((self.aveEx2CC, self.aveEy2CC), format="csr")
                 )
             elif self.dim == 3:
-                self._average_edge_to_cell_vector = sp.block_diag(
-                    (self.aveEx2CC, self.aveEy2CC, self.aveEz2CC), format="csr"
+                self._average_edge_to_cell_vector = self._to_dtype(
+                    sp.block_diag(
+                        (self.aveEx2CC, self.aveEy2CC, self.aveEz2CC), format="csr"
+                    )
                 )
         return self._average_edge_to_cell_vector
 
@@ -3064,11 +3105,15 @@ class DiffOperators(BaseMesh):
             # The number of cell centers in each direction
             n = self.vnC
             if self.dim == 1:
-                self._average_edge_x_to_cell = speye(n[0])
+                self._average_edge_x_to_cell = self._to_dtype(speye(n[0]))
             elif self.dim == 2:
-                self._average_edge_x_to_cell = sp.kron(av(n[1]), speye(n[0]))
+                self._average_edge_x_to_cell = self._to_dtype(
+                    sp.kron(av(n[1]), speye(n[0]))
+                )
             elif self.dim == 3:
-                self._average_edge_x_to_cell = kron3(av(n[2]), av(n[1]), speye(n[0]))
+                self._average_edge_x_to_cell = self._to_dtype(
+                    kron3(av(n[2]), av(n[1]), speye(n[0]))
+                )
         return self._average_edge_x_to_cell
 
     @property
@@ -3163,9 +3208,13 @@ class DiffOperators(BaseMesh):
             # The number of cell centers in each direction
             n = self.vnC
             if self.dim == 2:
-                self._average_edge_y_to_cell = sp.kron(speye(n[1]), av(n[0]))
+                self._average_edge_y_to_cell = self._to_dtype(
+                    sp.kron(speye(n[1]), av(n[0]))
+                )
             elif self.dim == 3:
-                self._average_edge_y_to_cell = kron3(av(n[2]), speye(n[1]), av(n[0]))
+                self._average_edge_y_to_cell = self._to_dtype(
+                    kron3(av(n[2]), speye(n[1]), av(n[0]))
+                )
         return self._average_edge_y_to_cell
 
     @property
@@ -3262,7 +3311,9 @@ class DiffOperators(BaseMesh):
             # The number of cell centers in each direction
             n = self.vnC
             if self.dim == 3:
-                self._average_edge_z_to_cell = kron3(speye(n[2]), av(n[1]), av(n[0]))
+                self._average_edge_z_to_cell = self._to_dtype(
+                    kron3(speye(n[2]), av(n[1]), av(n[0]))
+                )
         return self._average_edge_z_to_cell
 
     @property
@@ -3271,10 +3322,12 @@ class DiffOperators(BaseMesh):
         if self.dim == 1:
             return self.average_cell_to_face
         elif self.dim == 2:
-            return sp.diags(
-                [1, 1],
-                [-self.n_faces_x, self.n_faces_y],
-                shape=(self.n_faces, self.n_edges),
+            return self._to_dtype(
+                sp.diags(
+                    [1, 1],
+                    [-self.n_faces_x, self.n_faces_y],
+                    shape=(self.n_faces, self.n_edges),
+                )
             )
         n1, n2, n3 = self.shape_cells
         ex_to_fy = kron3(av(n3), speye(n2 + 1), speye(n1))
@@ -3294,7 +3347,7 @@ class DiffOperators(BaseMesh):
             ],
             format="csr",
         )
-        return e_to_f
+        return self._to_dtype(e_to_f)
 
     @property
     def average_node_to_cell(self):  # NOQA D102
@@ -3302,17 +3355,19 @@ class DiffOperators(BaseMesh):
         if getattr(self, "_average_node_to_cell", None) is None:
             # The number of cell centers in each direction
             if self.dim == 1:
-                self._average_node_to_cell = av(self.shape_cells[0])
+                self._average_node_to_cell = self._to_dtype(av(self.shape_cells[0]))
             elif self.dim == 2:
-                self._average_node_to_cell = sp.kron(
-                    av(self.shape_cells[1]), av(self.shape_cells[0])
-                ).tocsr()
+                self._average_node_to_cell = self._to_dtype(
+                    sp.kron(av(self.shape_cells[1]), av(self.shape_cells[0])).tocsr()
+                )
             elif self.dim == 3:
-                self._average_node_to_cell = kron3(
-                    av(self.shape_cells[2]),
-                    av(self.shape_cells[1]),
-                    av(self.shape_cells[0]),
-                ).tocsr()
+                self._average_node_to_cell = self._to_dtype(
+                    kron3(
+                        av(self.shape_cells[2]),
+                        av(self.shape_cells[1]),
+                        av(self.shape_cells[0]),
+                    ).tocsr()
+                )
         return self._average_node_to_cell
 
     @property
@@ -3364,20 +3419,26 @@ class DiffOperators(BaseMesh):
         if getattr(self, "_average_node_to_edge", None) is None:
             # The number of cell centers in each direction
             if self.dim == 1:
-                self._average_node_to_edge = self._average_node_to_edge_x
+                self._average_node_to_edge = self._to_dtype(
+                    self._average_node_to_edge_x
+                )
             elif self.dim == 2:
-                self._average_node_to_edge = sp.vstack(
-                    (self._average_node_to_edge_x, self._average_node_to_edge_y),
-                    format="csr",
+                self._average_node_to_edge = self._to_dtype(
+                    sp.vstack(
+                        (self._average_node_to_edge_x, self._average_node_to_edge_y),
+                        format="csr",
+                    )
                 )
             elif self.dim == 3:
-                self._average_node_to_edge = sp.vstack(
-                    (
-                        self._average_node_to_edge_x,
-                        self._average_node_to_edge_y,
-                        self._average_node_to_edge_z,
-                    ),
-                    format="csr",
+                self._average_node_to_edge = self._to_dtype(
+                    sp.vstack(
+                        (
+                            self._average_node_to_edge_x,
+                            self._average_node_to_edge_y,
+                            self._average_node_to_edge_z,
+                        ),
+                        format="csr",
+                    )
                 )
         return self._average_node_to_edge
 
@@ -3427,20 +3488,26 @@ class DiffOperators(BaseMesh):
         if getattr(self, "_average_node_to_face", None) is None:
             # The number of cell centers in each direction
             if self.dim == 1:
-                self._average_node_to_face = self._average_node_to_face_x
+                self._average_node_to_face = self._to_dtype(
+                    self._average_node_to_face_x
+                )
             elif self.dim == 2:
-                self._average_node_to_face = sp.vstack(
-                    (self._average_node_to_face_x, self._average_node_to_face_y),
-                    format="csr",
+                self._average_node_to_face = self._to_dtype(
+                    sp.vstack(
+                        (self._average_node_to_face_x, self._average_node_to_face_y),
+                        format="csr",
+                    )
                 )
             elif self.dim == 3:
-                self._average_node_to_face = sp.vstack(
-                    (
-                        self._average_node_to_face_x,
-                        self._average_node_to_face_y,
-                        self._average_node_to_face_z,
-                    ),
-                    format="csr",
+                self._average_node_to_face = self._to_dtype(
+                    sp.vstack(
+                        (
+                            self._average_node_to_face_x,
+                            self._average_node_to_face_y,
+                            self._average_node_to_face_z,
+                        ),
+                        format="csr",
+                    )
                 )
         return self._average_node_to_face
 
@@ -3457,7 +3524,7 @@ class DiffOperators(BaseMesh):
             is_b = np.r_[is_b, make_boundary_bool(self.shape_faces_y, dir="y")]
         if self.dim == 3:
             is_b = np.r_[is_b, make_boundary_bool(self.shape_faces_z, dir="z")]
-        return sp.eye(self.n_faces, format="csr")[is_b]
+        return sp.eye(self.n_faces, format="csr", dtype=self._dtype)[is_b]
 
     @property
     def project_edge_to_boundary_edge(self):  # NOQA D102
@@ -3476,7 +3543,7 @@ class DiffOperators(BaseMesh):
         ]
         if self.dim == 3:
             is_b = np.r_[is_b, make_boundary_bool(self.shape_edges_z, dir="xy")]
-        return sp.eye(self.n_edges, format="csr")[is_b]
+        return sp.eye(self.n_edges, format="csr", dtype=self._dtype)[is_b]
 
     @property
     def project_node_to_boundary_node(self):  # NOQA D102
@@ -3488,7 +3555,7 @@ class DiffOperators(BaseMesh):
         # The below should work for a regular structured mesh
 
         is_b = make_boundary_bool(self.shape_nodes)
-        return sp.eye(self.n_nodes, format="csr")[is_b]
+        return sp.eye(self.n_nodes, format="csr", dtype=self._dtype)[is_b]
 
     # DEPRECATED
     cellGrad = deprecate_property(
@@ -0,0 +1,243 @@
+"""Fast direct solvers for the Poisson equation on tensor meshes."""
+import numpy as np
+import scipy.fft as fft
+from scipy.linalg import eigh
+from discretize.utils import ddx, av_extrap
+from discretize.operators.differential_operators import _ddxCellGrad, _validate_BC
+from discretize.operators.kron_operators import BaseKronOperator
+
+# fast transforms diagonalizing the uniform one dimensional operators, keyed by
+# (location, lower boundary, upper boundary), along with a function of
+# (k, n) returning the corresponding eigenvalues for unit cell widths.
+_UNIFORM_TRANSFORMS = {
+    ("cell_centers", "neumann", "neumann"): (
+        fft.dct,
+        fft.idct,
+        2,
+        lambda k, n: -4 * np.sin(np.pi * k / (2 * n)) ** 2,
+    ),
+    ("cell_centers", "dirichlet", "dirichlet"): (
+        fft.dst,
+        fft.idst,
+        2,
+        lambda k, n: -4 * np.sin(np.pi * (k + 1) / (2 * n)) ** 2,
+    ),
+    ("cell_centers", "neumann", "dirichlet"): (
+        fft.dct,
+        fft.idct,
+        4,
+        lambda k, n: -4 * np.sin(np.pi * (2 * k + 1) / (4 * n)) ** 2,
+    ),
+    ("cell_centers", "dirichlet", "neumann"): (
+        fft.dst,
+        fft.idst,
+        4,
+        lambda k, n: -4 * np.sin(np.pi * (2 * k + 1) / (4 * n)) ** 2,
+    ),
+    ("nodes", "neumann", "neumann"): (
+        fft.dct,
+        fft.idct,
+        1,
+        lambda k, n: 4 * np.sin(np.pi * k / (2 * n)) ** 2,
+    ),
+    ("nodes", "dirichlet", "dirichlet"): (
+        fft.dst,
+        fft.idst,
+        1,
+        lambda k, n: 4 * np.sin(np.pi * (k + 1) / (2 * n)) ** 2,
+    ),
+}
+
+
+def _expand_along(v, axis, ndim):
+    shape = [1] * ndim
+    shape[axis] = -1
+    return v.reshape(shape)
+
+
+class _AxisTransform:
+    r"""Diagonalization of a one dimensional generalized eigenproblem.
+
+    Represents :math:`\mathbf{K} = \mathbf{M} \mathbf{V} \mathbf{\Lambda}
+    \mathbf{V}^T \mathbf{M}` with :math:`\mathbf{V}^T \mathbf{M} \mathbf{V} = \mathbf{I}`
+    for a symmetric stiffness matrix `K` and a diagonal mass matrix `M`, by
+    factoring :math:`\mathbf{V} = \mathbf{M}^{-1/2}\mathbf{Q}`.
+    """
+
+    def __init__(self, K, m, uniform=None):
+        self.m_isqrt = 1.0 / np.sqrt(m)
+        if uniform is None:
+            S = K.toarray() * self.m_isqrt[:, None] * self.m_isqrt[None, :]
+            self.eigenvalues, self.Q = eigh(S)
+        else:
+            # the eigenvectors are given by a discrete sine or cosine transform
+            self._forward, self._backward, self._kind, self.eigenvalues = uniform
+            self.Q = None
+
+    def forward(self, X, axis):
+        """Apply V^T along `axis`."""
+        X = X * _expand_along(self.m_isqrt, axis, X.ndim)
+        if self.Q is None:
+            return self._forward(X, type=self._kind, norm="ortho", axis=axis)
+        return np.moveaxis(np.tensordot(self.Q.T, X, axes=(1, axis)), 0, axis)
+
+    def backward(self, X, axis):
+        """Apply V along `axis`."""
+        if self.Q is None:
+            X = self._backward(X, type=self._kind, norm="ortho", axis=axis)
+        else:
+            X = np.moveaxis(np.tensordot(self.Q, X, axes=(1, axis)), 0, axis)
+        return X * _expand_along(self.m_isqrt, axis, X.ndim)
+
+
+class FastPoissonSolver(BaseKronOperator):
+    r"""Fast direct solver for the Poisson equation on a tensor mesh.
+
+    On a :class:`~discretize.TensorMesh` the discrete Laplacians are sums of
+    Kronecker products of one dimensional operators, which can be inverted by
+    diagonalizing each of the one dimensional operators separately (fast
+    diagonalization). Along axes with uniform cell widths, the one dimensional
+    eigenvectors are discrete sine or cosine transforms and are applied with
+    an FFT; along non-uniform axes they are obtained from a dense
+    eigendecomposition of the (small) one dimensional operator. For uniform
+    meshes the cost of a solve is :math:`\mathcal{O}(N \log N)`.
+
+    Two discretizations are supported:
+
+    - ``'cell_centers'`` solves
+      :math:`\mathbf{D} \mathbf{G}_c \mathbf{u} = \mathbf{q}` with
+      ``mesh.face_divergence @ mesh.cell_gradient``, where the zero Dirichlet
+      and zero Neumann boundary conditions are those defined by
+      :py:meth:`~discretize.operators.DiffOperators.set_cell_gradient_BC`.
+    - ``'nodes'`` solves the weak form
+      :math:`\mathbf{G}_n^T \mathbf{M}_e \mathbf{G}_n \mathbf{u} = \mathbf{q}`,
+      with ``mesh.nodal_gradient`` and ``mesh.get_edge_inner_product()``.
+      Neumann boundaries are natural, while on zero Dirichlet boundaries the
+      nodes are fixed to zero (their entries in `q` are ignored).
+
+    When every boundary is Neumann the operator is singular, and the solver
+    returns the solution without the constant component.
+
+    Parameters
+    ----------
+    mesh : discretize.TensorMesh
+        The mesh to solve on.
+    location_type : {'cell_centers', 'nodes'}
+        Which discretization of the Laplacian to invert.
+    bc : str or list, optional
+        The boundary conditions, in the same format as accepted by
+        :py:meth:`~discretize.operators.DiffOperators.set_cell_gradient_BC`.
+        Defaults to the current boundary conditions of the mesh for
+        ``'cell_centers'`` and ``'neumann'`` for ``'nodes'``.
+
+    Examples
+    --------
+    >>> from discretize import TensorMesh
+    >>> from discretize.operators.fast_poisson import FastPoissonSolver
+    >>> import numpy as np
+    >>> mesh = TensorMesh([32, 32, 32])
+    >>> bc = mesh.set_cell_gradient_BC('dirichlet')
+    >>> Ainv = FastPoissonSolver(mesh)
+    >>> q = np.random.rand(mesh.n_cells)
+    >>> u = Ainv @ q
+    >>> A = mesh.face_divergence @ mesh.cell_gradient
+    >>> np.allclose(A @ u, q)
+    True
+    """
+
+    def __init__(self, mesh, location_type="cell_centers", bc=None):
+        if getattr(mesh, "_meshType", None) != "TENSOR":
+            raise TypeError("FastPoissonSolver is only implemented for a TensorMesh")
+        location_type = mesh._parse_location_type(location_type)
+        if location_type not in ["cell_centers", "nodes"]:
+            raise ValueError(
+                "location_type must be either 'cell_centers' or 'nodes', "
+                f"not {location_type}"
+            )
+        if bc is None:
+            if location_type == "cell_centers":
+                bc = mesh._cell_gradient_BC_list
+            else:
+                bc = "neumann"
+        if isinstance(bc, str):
+            bc = [bc] * mesh.dim
+        if not isinstance(bc, list) or len(bc) != mesh.dim:
+            raise ValueError("bc list must be the size of your mesh")
+        bc = [_validate_BC(bc_i) for bc_i in bc]
+
+        self._location_type = location_type
+        self._transposed = False
+        self._shape_full = (
+            mesh.shape_cells if location_type == "cell_centers" else mesh.shape_nodes
+        )
+        self._cell_volumes = mesh.cell_volumes
+        self._slices = []
+        self._axes = []
+        for h, bc_i in zip(mesh.h, bc):
+            n = len(h)
+            key = (location_type, *bc_i)
+            if location_type == "cell_centers":
+                # h * L, with L = (1/h) ddx (1/h_f) g
+                K = ddx(n).multiply(1.0 / (av_extrap(n) @ h)) @ _ddxCellGrad(n, bc_i)
+                m = h
+                sl = slice(None)
+            else:
+                K = ddx(n).T.multiply(1.0 / h) @ ddx(n)
+                m = np.r_[h, 0] / 2 + np.r_[0, h] / 2
+                # remove the nodes on dirichlet boundaries
+                sl = slice(
+                    1 if bc_i[0] == "dirichlet" else None,
+                    -1 if bc_i[1] == "dirichlet" else None,
+                )
+                K = K.tocsr()[sl][:, sl]
+                m = m[sl]
+            self._slices.append(sl)
+            if key in _UNIFORM_TRANSFORMS and np.allclose(h, h[0], rtol=1e-12, atol=0):
+                forward, backward, kind, eig = _UNIFORM_TRANSFORMS[key]
+                lam = eig(np.arange(K.shape[0]), n) / h[0] ** 2
+                transform = _AxisTransform(K, m, uniform=(forward, backward, kind, lam))
+            else:
+                transform = _AxisTransform(K, m)
+            self._axes.append(transform)
+
+        lam = 0.0
+        for i, transform in enumerate(self._axes):
+            lam = lam + _expand_along(transform.eigenvalues, i, mesh.dim)
+        lam = np.broadcast_to(lam, tuple(len(t.eigenvalues) for t in self._axes))
+        with np.errstate(divide="ignore"):
+            lam_inv = 1.0 / lam
+        if not any("dirichlet" in bc_i for bc_i in bc):
+            # Pure Neumann: drop the null space (constant) component
+            lam_inv[np.unravel_index(np.argmin(np.abs(lam)), lam.shape)] = 0.0
+        self._lam_inv = lam_inv
+        n = int(np.prod(self._shape_full))
+        super().__init__(np.float64, (n, n))
+
+    def _matmat(self, x):
+        n_vec = x.shape[1]
+        X = x.reshape(self._shape_full + (n_vec,), order="F")
+        is_cc = self._location_type == "cell_centers"
+        if is_cc and not self._transposed:
+            X = X * self._cell_volumes.reshape(self._shape_full + (1,), order="F")
+        X = X[tuple(self._slices)]
+        for axis, transform in enumerate(self._axes):
+            X = transform.forward(X, axis)
+        X = X * self._lam_inv[..., None]
+        for axis, transform in enumerate(self._axes):
+            X = transform.backward(X, axis)
+        out = np.zeros(self._shape_full + (n_vec,), dtype=X.dtype)
+        out[tuple(self._slices)] = X
+        if is_cc and self._transposed:
+            out *= self._cell_volumes.reshape(self._shape_full + (1,), order="F")
+        return out.reshape(-1, n_vec, order="F")
+
+    def _transpose(self):
+        if self._location_type == "nodes":
+            return self
+        out = object.__new__(FastPoissonSolver)
+        out.__dict__.update(self.__dict__)
+        out._transposed = not self._transposed
+        return out
+
+    def _adjoint(self):
+        return self._transpose()
@@ -0,0 +1,790 @@
+"""Reusable assembly of inner product matrices."""
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import LinearOperator
+from discretize.utils import (
+    TensorType,
+    inverse_property_tensor,
+    is_scalar,
+    mkvc,
+    sdiag,
+)
+from discretize.utils.matrix_utils import _downcast_indices, _sparse_matmul
+
+
+def _parse_tensor_type(mesh, tensor_type):
+    """Return the tensor type (1, 2 or 3) from an integer or an example model."""
+    if isinstance(tensor_type, (int, np.integer)):
+        tensor_type = int(tensor_type)
+    else:
+        tensor_type = TensorType(mesh, tensor_type)._tt
+    if tensor_type < 1:
+        # scalar (or default) models are isotropic models with a constant value
+        tensor_type = 1
+    if tensor_type not in [1, 2, 3]:
+        raise ValueError(f"tensor_type must be 1, 2, or 3, not {tensor_type}")
+    return tensor_type
+
+
+def _property_tensor_components(dim, tensor_type):
+    """List the non-zero entries of a single cell's property tensor.
+
+    Returns ``(a, b, k)`` triplets, meaning that entry ``(a, b)`` of the tensor
+    is the ``k``-th parameter of the cell, in the order used by
+    :func:`discretize.utils.make_property_tensor`.
+    """
+    if tensor_type == 1:
+        return [(a, a, 0) for a in range(dim)]
+    if tensor_type == 2:
+        return [(a, a, a) for a in range(dim)]
+    # the order of the off diagonal parameters follows make_property_tensor
+    if dim == 2:
+        return [(0, 0, 0), (1, 1, 1), (0, 1, 2), (1, 0, 2)]
+    components = [(0, 0, 0), (1, 1, 1), (2, 2, 2)]
+    for k, (a, b) in enumerate([(0, 1), (0, 2), (1, 2)]):
+        components += [(a, b, 3 + k), (b, a, 3 + k)]
+    return components
+
+
+def _property_tensor_entries(n_cells, dim, tensor_type):
+    """Describe the property tensor as a linear function of its parameters.
+
+    Returns the rows, columns, and parameter indices of every non-zero entry of
+    the property tensor built by :func:`discretize.utils.make_property_tensor`,
+    ordered as ``np.r_[m_x, m_y, m_z]`` for the vector components.
+    """
+    cells = np.arange(n_cells)
+    components = _property_tensor_components(dim, tensor_type)
+    rows = np.concatenate([a * n_cells + cells for a, _, _ in components])
+    cols = np.concatenate([b * n_cells + cells for _, b, _ in components])
+    params = np.concatenate([k * n_cells + cells for _, _, k in components])
+    return rows, cols, params
+
+
+def _local_parameter_blocks(projections, tensor_type):
+    """Compute the local mass block of every cell for each of its parameters.
+
+    Parameters
+    ----------
+    projections : (n_cells, n_corners, dim, n_local) numpy.ndarray
+        The projection of each cell's local faces (or edges) onto a vector at
+        each of its corners.
+    tensor_type : {1, 2, 3}
+        The type of the physical property.
+
+    Returns
+    -------
+    dict of int to (n_cells, n_local, n_local) numpy.ndarray
+        The block multiplying each of a cell's parameters.
+    """
+    dim = projections.shape[2]
+    blocks = {}
+    for a, b, k in _property_tensor_components(dim, tensor_type):
+        block = projections[:, :, a].transpose((0, 2, 1)) @ projections[:, :, b]
+        blocks[k] = blocks[k] + block if k in blocks else block
+    return blocks
+
+
+def _sort_local_entries(items, n):
+    """Sort the entries of every cell's local block by their global position.
+
+    Parameters
+    ----------
+    items : (n_cells, n_local) numpy.ndarray of int
+        The faces (or edges) of each cell.
+    n : int
+        The number of faces (or edges) of the mesh.
+
+    Returns
+    -------
+    keys : (nnz) numpy.ndarray of int
+        The sorted ``i * n + j`` positions of the non-zero entries.
+    order : (n_cells * n_local**2) numpy.ndarray of int
+        The flattened local block entries, sorted by their position.
+    starts : (nnz) numpy.ndarray of int
+        The index into `order` of the first entry of each position.
+    """
+    items = items.astype(np.int64)
+    keys = (items[:, :, None] * n + items[:, None, :]).reshape(-1)
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    if len(order) <= np.iinfo(np.int32).max:
+        order = order.astype(np.int32)
+    return keys[starts], order, starts
+
+
+def _local_data_map(blocks, order, starts, n_params):
+    """Build the data map of the inner product from the local blocks.
+
+    Parameters
+    ----------
+    blocks : dict of int to (n_cells, n_local, n_local) numpy.ndarray
+        The block multiplying each of a cell's parameters.
+    order, starts : numpy.ndarray of int
+        The sorted local block entries, as returned by :func:`_sort_local_entries`.
+    n_params : int
+        The number of model parameters.
+
+    Returns
+    -------
+    (nnz, n_params) scipy.sparse.csr_matrix
+    """
+    n_cells, n_local, _ = next(iter(blocks.values())).shape
+    # each entry contributes one term per parameter of its cell
+    cells = order // n_local**2
+    indices = np.stack([k * n_cells + cells for k in blocks], axis=1)
+    data = np.stack([b.reshape(-1)[order] for b in blocks.values()], axis=1)
+    indptr = len(blocks) * np.r_[starts, len(order)]
+    return _downcast_indices(
+        sp.csr_matrix(
+            (data.reshape(-1), indices.reshape(-1), indptr),
+            shape=(len(starts), n_params),
+        )
+    )
+
+
+def _pair_products(P, rows, cols):
+    """Expand ``P[rows].T @ P[cols]`` into one term per pair of non-zeros.
+
+    Returns the index of the (row, col) pair each term came from, along with
+    the term's row, column and value in the product.
+    """
+    P = P.tocsr()
+    indptr, indices, data = P.indptr, P.indices, P.data
+    row_nnz = np.diff(indptr)
+    n_r = row_nnz[rows]
+    n_c = row_nnz[cols]
+    n_pairs = n_r * n_c
+    pair = np.repeat(np.arange(len(rows)), n_pairs)
+    local = np.arange(n_pairs.sum()) - np.repeat(np.cumsum(n_pairs) - n_pairs, n_pairs)
+    nz_r = indptr[rows][pair] + local // n_c[pair]
+    nz_c = indptr[cols][pair] + local % n_c[pair]
+    return pair, indices[nz_r], indices[nz_c], data[nz_r] * data[nz_c]
+
+
+class InnerProductAssembler:
+    r"""Reusable assembler for the face or edge inner product matrices.
+
+    The inner product matrices of a mesh,
+
+    .. math::
+        \mathbf{M}(\mathbf{m}) = \sum_i \mathbf{P}_i^T
+        \mathbf{\Sigma}(\mathbf{m}) \mathbf{P}_i,
+
+    are linear in the model :math:`\mathbf{m}`, and their sparsity pattern
+    does not depend on it. This class analyzes the pattern and the map from the
+    model to the non-zero values of the matrix once, after which assembling
+    the inner product matrix for a new model reduces to a single sparse
+    matrix-vector product that fills the matrix's ``data`` array.
+
+    This is useful when the inner product matrix is needed for many different
+    models on the same mesh, e.g. within an inversion.
+
+    Parameters
+    ----------
+    mesh : discretize.base.BaseMesh
+        A mesh that uses :class:`~discretize.operators.InnerProducts` to
+        construct its inner product matrices, or a
+        :class:`~discretize.SimplexMesh`.
+    projection_type : {'F', 'E'}
+        Whether to assemble the face ('F') or the edge ('E') inner product.
+    tensor_type : int or numpy.ndarray, optional
+        The type of the physical property: 1 for isotropic, 2 for diagonal
+        anisotropic, and 3 for full tensor properties. Alternatively, an example
+        model from which the type is inferred.
+
+    See Also
+    --------
+    discretize.operators.InnerProducts.get_face_inner_product_assembler
+    discretize.operators.InnerProducts.get_edge_inner_product_assembler
+
+    Examples
+    --------
+    >>> from discretize import TensorMesh
+    >>> from discretize.operators.inner_product_assembler import InnerProductAssembler
+    >>> import numpy as np
+    >>> mesh = TensorMesh([8, 9, 10])
+    >>> assembler = InnerProductAssembler(mesh, "E")
+    >>> sigma = np.random.rand(mesh.n_cells)
+    >>> Me = assembler(sigma)
+    >>> np.allclose(Me.toarray(), mesh.get_edge_inner_product(sigma).toarray())
+    True
+
+    The matrix from a previous call can be filled in place with a new model.
+
+    >>> Me2 = assembler(2 * sigma, out=Me)
+    >>> Me2 is Me
+    True
+    """
+
+    def __init__(self, mesh, projection_type="F", tensor_type=1):
+        if projection_type not in ["F", "E"]:
+            raise TypeError("projection_type must be 'F' for faces or 'E' for edges")
+        if mesh._meshType == "CYL":
+            raise NotImplementedError(
+                "InnerProductAssembler is not implemented for a CylindricalMesh"
+            )
+        tensor_type = _parse_tensor_type(mesh, tensor_type)
+        n_cells, dim = mesh.n_cells, mesh.dim
+        n_params = {1: 1, 2: dim, 3: 3 if dim == 2 else 6}[tensor_type] * n_cells
+        if dim == 1 and tensor_type == 3:
+            raise ValueError("Full tensor properties are not defined for a 1D mesh")
+
+        n = mesh.n_faces if projection_type == "F" else mesh.n_edges
+        self._local = None
+        if mesh._meshType == "simplex":
+            items, projections = mesh._inner_product_local_projections(projection_type)
+            keys, order, starts = _sort_local_entries(items, n)
+            if tensor_type == 1:
+                # with a single block per cell, the data map is as compact as
+                # the blocks themselves
+                blocks = _local_parameter_blocks(projections, 1)
+                data_map = _local_data_map(blocks, order, starts, n_params)
+            else:
+                # keep the projections of every simplex along with the map
+                # scattering their blocks into the matrix, rather than a data
+                # map with an entry for each parameter of every block entry
+                self._local = (items, projections, order, starts)
+                data_map = None
+        else:
+            Ps = mesh._getInnerProductProjectionMatrices(
+                projection_type, TensorType(mesh, np.ones(n_params))
+            )
+            rows, cols, params = _property_tensor_entries(n_cells, dim, tensor_type)
+            terms = [_pair_products(P, rows, cols) for P in Ps]
+            param = np.concatenate([params[t[0]] for t in terms])
+            i = np.concatenate([t[1] for t in terms]).astype(np.int64)
+            j = np.concatenate([t[2] for t in terms])
+            values = np.concatenate([t[3] for t in terms])
+
+            # the sorted unique (i, j) pairs are the CSR ordering of the matrix
+            keys, position = np.unique(i * n + j, return_inverse=True)
+            data_map = _downcast_indices(
+                sp.csr_matrix((values, (position, param)), shape=(len(keys), n_params))
+            )
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(keys // n, minlength=n), out=indptr[1:])
+        self._pattern = _downcast_indices(
+            sp.csr_matrix(
+                (np.zeros(len(keys)), keys % n, indptr), shape=(n, n), copy=False
+            )
+        )
+        self._pattern.has_sorted_indices = True
+        # the pattern is shared by the derivatives, guard it against edits
+        self._pattern.indices.flags.writeable = False
+        self._pattern.indptr.flags.writeable = False
+        self._data_map = data_map
+        self._n_parameters = n_params
+        self._mesh = mesh
+        self._tensor_type = tensor_type
+        self._rows = None
+        self._diagonal = None
+        self._diagonal_map = None
+        self._jacobian_pattern = None
+        self._scatter = None
+
+    @property
+    def tensor_type(self):
+        """The type of the physical property (1, 2 or 3).
+
+        Returns
+        -------
+        int
+        """
+        return self._tensor_type
+
+    @property
+    def shape(self):
+        """The shape of the assembled inner product matrices.
+
+        Returns
+        -------
+        tuple of int
+        """
+        return self._pattern.shape
+
+    @property
+    def n_parameters(self):
+        """The number of model parameters.
+
+        Returns
+        -------
+        int
+        """
+        return self._n_parameters
+
+    @property
+    def indices(self):
+        """The CSR column indices of every assembled matrix.
+
+        Returns
+        -------
+        numpy.ndarray of int
+            A read-only view of the assembler's pattern.
+        """
+        return self._pattern.indices
+
+    @property
+    def indptr(self):
+        """The CSR index pointers of every assembled matrix.
+
+        Returns
+        -------
+        numpy.ndarray of int
+            A read-only view of the assembler's pattern.
+        """
+        return self._pattern.indptr
+
+    @property
+    def data_map(self):
+        """The sparse map from the model parameters to the matrix's ``data``.
+
+        For a :class:`~discretize.SimplexMesh`, the assembler scatters the local
+        blocks of each simplex directly, and this map is only built when first
+        accessed.
+
+        Returns
+        -------
+        (nnz, n_parameters) scipy.sparse.csr_matrix
+        """
+        if self._data_map is None:
+            _, projections, order, starts = self._local
+            blocks = _local_parameter_blocks(projections, self._tensor_type)
+            self._data_map = _local_data_map(blocks, order, starts, self.n_parameters)
+        return self._data_map
+
+    def _map_parameters(self, params):
+        """Compute the non-zero values of the matrix from (n_parameters, ...) values."""
+        if self._local is None:
+            return _sparse_matmul(self._data_map, params)
+        items, projections, order, starts = self._local
+        n_cells = items.shape[0]
+        dim, n_local = projections.shape[2:]
+        if params.ndim == 2:
+            # the block of each parameter is shared by all the models, so the
+            # blocks are combined with the parameters of every model at once
+            blocks = _local_parameter_blocks(projections, self._tensor_type)
+            n_blocks, n_models = len(blocks), params.shape[1]
+            blocks = np.stack([blocks[k] for k in range(n_blocks)], axis=-1)
+            params = params.reshape((n_blocks, n_cells, n_models)).transpose((1, 0, 2))
+            local = blocks.reshape((n_cells, -1, n_blocks)) @ params
+            local = local.reshape((-1, n_models))
+        else:
+            params = params.reshape((-1, n_cells))
+            tensors = np.zeros((n_cells, 1, dim, dim), dtype=params.dtype)
+            for a, b, k in _property_tensor_components(dim, self._tensor_type):
+                tensors[:, 0, a, b] = params[k]
+            # the property tensor at every corner, projected on both sides
+            local = (tensors @ projections).reshape((n_cells, -1, n_local))
+            projections = projections.reshape((n_cells, -1, n_local))
+            local = (projections.transpose((0, 2, 1)) @ local).reshape(-1)
+        if self._scatter is None:
+            # sums the entries of the local blocks into the matrix's values
+            self._scatter = _downcast_indices(
+                sp.csr_matrix(
+                    (
+                        np.ones(order.size, dtype=self._mesh.dtype),
+                        order,
+                        np.r_[starts, order.size],
+                    ),
+                    shape=(len(starts), order.size),
+                )
+            )
+        return _sparse_matmul(self._scatter, local)
+
+    def _local_jacobian(self, v):
+        """Compute the (n, n_parameters) derivative of ``M(m) @ v`` from the local blocks."""
+        items, projections, _, _ = self._local
+        n_cells, n_local = items.shape
+        v = mkvc(np.asarray(v))
+        dim = projections.shape[2]
+        # the vector at each corner of each cell, projected back on the items
+        vecs = projections @ v[items][:, None, :, None]
+        vecs = projections.transpose((0, 2, 3, 1)) @ vecs[..., 0][:, None]
+        terms = {}
+        for a, b, k in _property_tensor_components(dim, self._tensor_type):
+            term = vecs[:, a, :, b]
+            terms[k] = terms[k] + term if k in terms else term
+        # every column, i.e. each parameter of a cell, holds the cell's items
+        values = np.stack([terms[k] for k in range(len(terms))]).reshape(-1)
+        if self._jacobian_pattern is None:
+            rows = np.tile(items.reshape(-1), len(terms))
+            indptr = np.arange(0, values.size + 1, n_local)
+            pattern = _downcast_indices(
+                sp.csc_matrix(
+                    (np.zeros(values.size), rows, indptr),
+                    shape=(self.shape[0], self.n_parameters),
+                )
+            )
+            pattern.indices.flags.writeable = False
+            pattern.indptr.flags.writeable = False
+            self._jacobian_pattern = pattern
+        pattern = self._jacobian_pattern
+        return sp.csc_matrix(
+            (values, pattern.indices, pattern.indptr), shape=pattern.shape, copy=False
+        )
+
+    def _parameters(self, model, invert_model=False):
+        """Expand a model to the vector of parameters."""
+        if model is None:
+            model = 1.0
+        if is_scalar(model):
+            if self._tensor_type != 1:
+                raise ValueError(
+                    "Scalar models are only valid for isotropic properties"
+                )
+            model = np.full(self.n_parameters, model)
+        if invert_model:
+            model = inverse_property_tensor(self._mesh, model)
+        model = mkvc(np.asarray(model))
+        if model.size != self.n_parameters:
+            raise ValueError(
+                f"Expected a model with {self.n_parameters} parameters, "
+                f"got {model.size}"
+            )
+        dtype = self._mesh.dtype
+        if np.iscomplexobj(model):
+            dtype = np.result_type(dtype, np.complex64)
+        return model.astype(dtype, copy=False)
+
+    def data(self, model, invert_model=False):
+        """Compute the non-zero values of the inner product matrix.
+
+        Parameters
+        ----------
+        model : numpy.ndarray or float
+            The physical property, in any of the formats accepted by
+            :func:`~discretize.utils.make_property_tensor` for this tensor type.
+        invert_model : bool, optional
+            Whether to use the inverse of the physical property.
+
+        Returns
+        -------
+        (nnz) numpy.ndarray
+            The ``data`` array of the inner product matrix, in the order given by
+            :py:attr:`indices` and :py:attr:`indptr`.
+        """
+        model = self._parameters(model, invert_model)
+        return self._map_parameters(model).astype(model.dtype, copy=False)
+
+    def __call__(self, model=None, invert_model=False, invert_matrix=False, out=None):
+        """Assemble the inner product matrix for a model.
+
+        Parameters
+        ----------
+        model : numpy.ndarray or float, optional
+            The physical property, in any of the formats accepted by
+            :func:`~discretize.utils.make_property_tensor` for this tensor type.
+            Defaults to ones.
+        invert_model : bool, optional
+            Whether to use the inverse of the physical property.
+        invert_matrix : bool, optional
+            Whether to return the inverse of the inner product matrix. This is
+            only supported for diagonal inner product matrices.
+        out : scipy.sparse.csr_matrix, optional
+            A matrix previously returned by this assembler, whose ``data`` is
+            overwritten in place.
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+        """
+        data = self.data(model, invert_model)
+        if invert_matrix:
+            return self._inverse(data)
+        if out is not None:
+            if (
+                out.format != "csr"
+                or out.shape != self.shape
+                or out.nnz != self._pattern.nnz
+            ):
+                raise ValueError("out must be a matrix returned by this assembler")
+            if out.data.dtype != data.dtype:
+                out.data = data
+            else:
+                out.data[:] = data
+            return out
+        return self._matrix(data)
+
+    def batch_data(self, models, invert_model=False):
+        """Compute the non-zero values of the inner product matrices of many models.
+
+        The parameters of every model are gathered into a single block, so
+        that the values of all the matrices are computed with one sparse
+        matrix product.
+
+        Parameters
+        ----------
+        models : sequence of numpy.ndarray or float
+            The physical properties, iterated over along the first axis. Each
+            one can be in any of the formats accepted by :py:meth:`data`.
+        invert_model : bool, optional
+            Whether to use the inverses of the physical properties.
+
+        Returns
+        -------
+        (n_models, nnz) numpy.ndarray
+            The ``data`` arrays of the inner product matrices, with one model
+            per row, in the order given by :py:attr:`indices` and
+            :py:attr:`indptr`.
+        """
+        params = np.stack([self._parameters(m, invert_model) for m in models], axis=1)
+        data = self._map_parameters(params).astype(params.dtype, copy=False)
+        return np.ascontiguousarray(data.T)
+
+    def batch(self, models, invert_model=False, invert_matrix=False):
+        """Assemble the inner product matrices of many models.
+
+        Parameters
+        ----------
+        models : sequence of numpy.ndarray or float
+            The physical properties, iterated over along the first axis. Each
+            one can be in any of the formats accepted by :py:meth:`__call__`.
+        invert_model : bool, optional
+            Whether to use the inverses of the physical properties.
+        invert_matrix : bool, optional
+            Whether to return the inverses of the inner product matrices. This
+            is only supported for diagonal inner product matrices.
+
+        Returns
+        -------
+        list of scipy.sparse.csr_matrix
+            The inner product matrix of each model.
+
+        Examples
+        --------
+        Assemble the edge inner products of a complex conductivity at many
+        frequencies.
+
+        >>> from discretize import TensorMesh
+        >>> import numpy as np
+        >>> mesh = TensorMesh([8, 9, 10])
+        >>> assembler = mesh.get_edge_inner_product_assembler()
+        >>> sigma = np.random.rand(mesh.n_cells)
+        >>> freqs = np.logspace(0, 4, 30)
+        >>> models = sigma + 2j * np.pi * freqs[:, None] * 8.85e-12
+        >>> Mes = assembler.batch(models)
+        >>> len(Mes)
+        30
+        >>> np.allclose(Mes[3].toarray(), mesh.get_edge_inner_product(models[3]).toarray())
+        True
+        """
+        data = self.batch_data(models, invert_model)
+        if invert_matrix:
+            return [self._inverse(d) for d in data]
+        return [self._matrix(d) for d in data]
+
+    def _matrix(self, data):
+        """Wrap an array of non-zero values in a matrix with the pattern.
+
+        The matrix gets its own copies of the index arrays, so that it can be
+        modified in place without affecting the assembler.
+        """
+        A = sp.csr_matrix(
+            (data, self._pattern.indices.copy(), self._pattern.indptr.copy()),
+            shape=self.shape,
+            copy=False,
+        )
+        A.has_sorted_indices = True
+        return A
+
+    def _inverse(self, data):
+        """Invert a diagonal inner product matrix from its non-zero values."""
+        if self._tensor_type == 3:
+            raise NotImplementedError("Solver needed to invert A.")
+        return sdiag(1.0 / data[self._diagonal_positions()])
+
+    def _row_indices(self):
+        """Row of every non-zero entry of the pattern."""
+        if self._rows is None:
+            A = self._pattern
+            self._rows = np.repeat(
+                np.arange(A.shape[0], dtype=A.indices.dtype), np.diff(A.indptr)
+            )
+        return self._rows
+
+    def _diagonal_positions(self):
+        """Position of the diagonal entry of each row in the data array."""
+        if self._diagonal is None:
+            self._diagonal = np.flatnonzero(
+                self._pattern.indices == self._row_indices()
+            )
+        return self._diagonal
+
+    def deriv(self, v, model=None, invert_model=False, invert_matrix=False):
+        """Get the derivative of the inner product matrix times a vector.
+
+        Parameters
+        ----------
+        v : (n) numpy.ndarray
+            The vector the inner product matrix multiplies.
+        model : numpy.ndarray or float, optional
+            The physical property, only needed if `invert_model` or
+            `invert_matrix` are used.
+        invert_model : bool, optional
+            Whether the inner product uses the inverse of the physical property.
+        invert_matrix : bool, optional
+            Whether to differentiate the inverse of the inner product matrix.
+            This is only supported for diagonal inner product matrices.
+
+        Returns
+        -------
+        discretize.operators.inner_product_assembler.InnerProductDeriv
+            The matrix-free (n, n_parameters) derivative of ``M(m) @ v`` with
+            respect to the model parameters.
+
+        Examples
+        --------
+        >>> from discretize import TensorMesh
+        >>> import numpy as np
+        >>> mesh = TensorMesh([8, 9, 10])
+        >>> assembler = mesh.get_edge_inner_product_assembler()
+        >>> v = np.random.rand(mesh.n_edges)
+        >>> dMdm = assembler.deriv(v)
+        >>> w = np.random.rand(mesh.n_cells)
+        >>> dMdm_true = mesh.get_edge_inner_product_deriv(np.ones(mesh.n_cells))(v)
+        >>> np.allclose(dMdm @ w, dMdm_true @ w)
+        True
+        >>> u = np.random.rand(mesh.n_edges)
+        >>> np.allclose(dMdm.T @ u, dMdm_true.T @ u)
+        True
+        """
+        return InnerProductDeriv(self, v, model, invert_model, invert_matrix)
+
+
+class InnerProductDeriv(LinearOperator):
+    r"""Matrix-free derivative of an inner product matrix times a vector.
+
+    Represents the (n, n_parameters) matrix
+    :math:`\partial (\mathbf{M}(\mathbf{m}) \mathbf{v}) / \partial \mathbf{m}` as a
+    :class:`scipy.sparse.linalg.LinearOperator`. Its products with vectors, and
+    those of its transpose, are applied directly from the precomputed pattern
+    and data map of an :class:`InnerProductAssembler`, without assembling a
+    sparse matrix.
+
+    Parameters
+    ----------
+    assembler : discretize.operators.inner_product_assembler.InnerProductAssembler
+        The assembler of the inner product matrix.
+    v : (n) numpy.ndarray
+        The vector the inner product matrix multiplies.
+    model : numpy.ndarray or float, optional
+        The physical property, only needed if `invert_model` or `invert_matrix`
+        are used.
+    invert_model : bool, optional
+        Whether the inner product uses the inverse of the physical property.
+    invert_matrix : bool, optional
+        Whether to differentiate the inverse of the inner product matrix. This
+        is only supported for diagonal inner product matrices.
+
+    See Also
+    --------
+    InnerProductAssembler.deriv
+    """
+
+    def __init__(
+        self, assembler, v, model=None, invert_model=False, invert_matrix=False
+    ):
+        n = assembler.shape[0]
+        v = mkvc(np.asarray(v))
+        if v.size != n:
+            raise ValueError(f"Expected a vector of length {n}, got {v.size}")
+        if (invert_model or invert_matrix) and assembler.tensor_type == 3:
+            raise NotImplementedError(
+                "Derivatives of inverted full tensor inner products are not implemented"
+            )
+        dtype = np.result_type(v, assembler._mesh.dtype)
+
+        # chain rule factor for the inverted model, d(1/m)/dm
+        self._model_scale = None
+        if invert_model or invert_matrix:
+            params = assembler._parameters(model)
+            dtype = np.result_type(dtype, params)
+        if invert_model:
+            params = 1.0 / params
+            self._model_scale = -(params**2)
+
+        self._assembler = assembler
+        if invert_matrix:
+            # d(diag(1/d) v)/dm = -diag(v/d**2) dd/dm, with d the diagonal of M
+            if assembler._diagonal_map is None:
+                assembler._diagonal_map = assembler.data_map[
+                    assembler._diagonal_positions()
+                ]
+            self._data_map = assembler._diagonal_map
+            self._row_scale = -v / _sparse_matmul(self._data_map, params) ** 2
+        elif assembler._local is not None:
+            # the explicit derivative is only as large as the local blocks
+            self._data_map = assembler._local_jacobian(v)
+            self._row_scale = None
+            self._v = None
+        else:
+            self._data_map = assembler._data_map
+            self._row_scale = None
+            self._v = v[assembler.indices]
+
+        super().__init__(dtype, (n, assembler.n_parameters))
+
+    def _data_to_rows(self, data):
+        """Multiply the (nnz, k) values of the inner product matrices by v."""
+        if self._row_scale is not None:
+            return self._row_scale[:, None] * data
+        if self._v is None:
+            return data
+        indptr = self._assembler.indptr
+        out = np.add.reduceat(self._v[:, None] * data, indptr[:-1], axis=0)
+        out[indptr[1:] == indptr[:-1]] = 0
+        return out
+
+    def _rows_to_data(self, x):
+        """Apply the transpose of :meth:`_data_to_rows`."""
+        if self._row_scale is not None:
+            return self._row_scale[:, None] * x
+        if self._v is None:
+            return x
+        return self._v[:, None] * x[self._assembler._row_indices()]
+
+    def _matmat(self, x):
+        if self._model_scale is not None:
+            x = self._model_scale[:, None] * x
+        return self._data_to_rows(_sparse_matmul(self._data_map, x))
+
+    def _transpose_matmat(self, x):
+        out = _sparse_matmul(self._data_map.T, self._rows_to_data(x))
+        if self._model_scale is not None:
+            out = self._model_scale[:, None] * out
+        return out
+
+    def _matvec(self, x):
+        return self._matmat(x.reshape(-1, 1))[:, 0]
+
+    def _rmatvec(self, x):
+        return self._rmatmat(x.reshape(-1, 1))[:, 0]
+
+    def _rmatmat(self, x):
+        return np.conj(self._transpose_matmat(np.conj(x)))
+
+    def tocsr(self):
+        """Expand the derivative to an explicit sparse matrix.
+
+        Returns
+        -------
+        (n, n_parameters) scipy.sparse.csr_matrix
+        """
+        if self._row_scale is not None:
+            dMdm = sdiag(self._row_scale) @ self._data_map
+        elif self._v is None:
+            dMdm = self._data_map
+        else:
+            nnz = len(self._v)
+            S = sp.csr_matrix(
+                (self._v, self._assembler.indices, self._assembler.indptr),
+                shape=(self.shape[0], nnz),
+            )
+            # S has the pattern's rows, with one column per non-zero entry
+            S.indices = np.arange(nnz, dtype=S.indices.dtype)
+            dMdm = S @ self._data_map
+        if self._model_scale is not None:
+            dMdm = dMdm @ sdiag(self._model_scale)
+        return dMdm.tocsr()
@@ -13,6 +13,11 @@ from discretize.utils import (
     inverse_3x3_block_diagonal,
     spzeros,
     sdinv,
+    is_scalar,
+)
+from discretize.operators.inner_product_assembler import (
+    InnerProductAssembler,
+    _parse_tensor_type,
 )
 import numpy as np
 import warnings
@@ -36,7 +41,7 @@ class InnerProducts(BaseMesh):
         invert_model=False,
         invert_matrix=False,
         do_fast=True,
-        **kwargs
+        **kwargs,
     ):
         # Inherited documentation from discretize.base.BaseMesh
         if "invProp" in kwargs:
@@ -61,12 +66,14 @@ class InnerProducts(BaseMesh):
             )
             do_fast = kwargs["doFast"]
 
-        return self._getInnerProduct(
-            "F",
-            model=model,
-            invert_model=invert_model,
-            invert_matrix=invert_matrix,
-            do_fast=do_fast,
+        return self._to_dtype(
+            self._getInnerProduct(
+                "F",
+                model=model,
+                invert_model=invert_model,
+                invert_matrix=invert_matrix,
+                do_fast=do_fast,
+            )
         )
 
     def get_edge_inner_product(  # NOQA D102
@@ -75,7 +82,7 @@ class InnerProducts(BaseMesh):
         invert_model=False,
         invert_matrix=False,
         do_fast=True,
-        **kwargs
+        **kwargs,
     ):
         # Inherited documentation from discretize.base.BaseMesh
         if "invProp" in kwargs:
@@ -99,14 +106,235 @@ class InnerProducts(BaseMesh):
                 FutureWarning,
             )
             do_fast = kwargs["doFast"]
-        return self._getInnerProduct(
-            "E",
-            model=model,
-            invert_model=invert_model,
-            invert_matrix=invert_matrix,
-            do_fast=do_fast,
+        return self._to_dtype(
+            self._getInnerProduct(
+                "E",
+                model=model,
+                invert_model=invert_model,
+                invert_matrix=invert_matrix,
+                do_fast=do_fast,
+            )
         )
 
+    def get_face_inner_product_approx_inverse(
+        self, model=None, invert_model=False, method="lumped"
+    ):
+        r"""Get an approximate inverse of the face inner product matrix.
+
+        The inner product matrix of a full tensor property is not diagonal, and
+        its exact inverse is dense. This method returns a sparse approximation of
+        the inverse that is cheap to build and apply, e.g. for explicit time
+        stepping.
+
+        Parameters
+        ----------
+        model : None or numpy.ndarray, optional
+            The physical property, in any of the formats accepted by
+            :meth:`get_face_inner_product`, including full tensors.
+        invert_model : bool, optional
+            Whether to use the inverse of the physical property.
+        method : {'lumped', 'block_diagonal'}
+            The approximation to use, see the notes. Only ``'lumped'`` is
+            available on a :class:`~discretize.CylindricalMesh` or a
+            :class:`~discretize.CurvilinearMesh`.
+
+        Returns
+        -------
+        (n_faces, n_faces) scipy.sparse.csr_matrix
+            The approximate inverse of the face inner product matrix.
+
+        Raises
+        ------
+        NotImplementedError
+            If `method` is ``'block_diagonal'`` and the mesh is not a
+            :class:`~discretize.TensorMesh` or a :class:`~discretize.TreeMesh`.
+
+        Notes
+        -----
+        The ``'lumped'`` approximation ignores the off-diagonal terms of the
+        property tensor and returns the inverse of the diagonal matrix the mesh
+        uses for isotropic and diagonal anisotropic properties.
+
+        The inner product matrix is assembled from the faces meeting at the
+        corners of every cell, :math:`\mathbf{M} = \mathbf{P}^T \mathbf{W}
+        \mathbf{\Sigma} \mathbf{P}`, where :math:`\mathbf{P}` selects those
+        faces, :math:`\mathbf{W}` holds the volume of each cell divided by its
+        number of corners, and :math:`\mathbf{\Sigma}` is block diagonal, holding
+        the property tensor of each cell. The ``'block_diagonal'`` approximation
+        inverts those blocks,
+
+        .. math::
+            \mathbf{M}^{-1} \approx \mathbf{D}^{-1} \mathbf{P}^T \mathbf{W}
+            \mathbf{\Sigma}^{-1} \mathbf{P} \mathbf{D}^{-1},
+
+        with :math:`\mathbf{D}` the lumped (row summed)
+        :math:`\mathbf{P}^T \mathbf{W} \mathbf{P}`. It is exact for a
+        homogeneous isotropic property on a tensor mesh, keeps the coupling
+        between the components of a full tensor, is symmetric positive definite,
+        and has the sparsity of the inner product matrix. It is only available for
+        :class:`~discretize.TensorMesh` and :class:`~discretize.TreeMesh`, use
+        ``'lumped'`` on cylindrical meshes.
+
+        Examples
+        --------
+        >>> from discretize import TensorMesh
+        >>> import numpy as np
+        >>> mesh = TensorMesh([8, 9, 10])
+        >>> sigma = np.c_[
+        ...     np.full((mesh.n_cells, 3), 2.0), np.full((mesh.n_cells, 3), 0.5)
+        ... ]
+        >>> Mf_inv = mesh.get_face_inner_product_approx_inverse(
+        ...     sigma, method="block_diagonal"
+        ... )
+        >>> Mf_inv.shape == (mesh.n_faces, mesh.n_faces)
+        True
+        """
+        return self._get_inner_product_approx_inverse("F", model, invert_model, method)
+
+    def get_edge_inner_product_approx_inverse(
+        self, model=None, invert_model=False, method="lumped"
+    ):
+        r"""Get an approximate inverse of the edge inner product matrix.
+
+        The inner product matrix of a full tensor property is not diagonal, and
+        its exact inverse is dense. This method returns a sparse approximation of
+        the inverse that is cheap to build and apply, e.g. for explicit time
+        stepping.
+
+        Parameters
+        ----------
+        model : None or numpy.ndarray, optional
+            The physical property, in any of the formats accepted by
+            :meth:`get_edge_inner_product`, including full tensors.
+        invert_model : bool, optional
+            Whether to use the inverse of the physical property.
+        method : {'lumped', 'block_diagonal'}
+            The approximation to use, see the notes. Only ``'lumped'`` is
+            available on a :class:`~discretize.CylindricalMesh` or a
+            :class:`~discretize.CurvilinearMesh`.
+
+        Returns
+        -------
+        (n_edges, n_edges) scipy.sparse.csr_matrix
+            The approximate inverse of the edge inner product matrix.
+
+        Raises
+        ------
+        NotImplementedError
+            If `method` is ``'block_diagonal'`` and the mesh is not a
+            :class:`~discretize.TensorMesh` or a :class:`~discretize.TreeMesh`.
+
+        Notes
+        -----
+        See :meth:`get_face_inner_product_approx_inverse` for the details of the
+        approximations, with edges instead of faces.
+        """
+        return self._get_inner_product_approx_inverse("E", model, invert_model, method)
+
+    def _get_inner_product_approx_inverse(
+        self, projection_type, model, invert_model, method
+    ):
+        if method not in ["lumped", "block_diagonal"]:
+            raise ValueError(
+                f"method must be 'lumped' or 'block_diagonal', not {method!r}"
+            )
+        if model is None:
+            model = 1.0
+        if is_scalar(model):
+            model = model * np.ones(self.nC)
+        if invert_model:
+            model = inverse_property_tensor(self, model)
+        tensor_type = TensorType(self, model)
+
+        if method == "lumped":
+            if tensor_type > 1:
+                model = model.reshape((self.nC, -1), order="F")
+            if tensor_type == 3:
+                # lump the off-diagonal terms of the tensor
+                model = model[:, : self.dim]
+            if hasattr(self, "_fastInnerProduct"):
+                return self._fastInnerProduct(
+                    projection_type, model=model, invert_matrix=True
+                )
+            return sdinv(self._getInnerProduct(projection_type, model, do_fast=False))
+
+        if self._meshType == "CYL" or not hasattr(self, "_corner_inner_product"):
+            raise NotImplementedError(
+                f"The block diagonal approximation is not implemented for a {type(self).__name__}"
+            )
+        # the volume of each cell associated with each of its corners
+        w = (self.cell_volumes / 2**self.dim)[:, None, None]
+        blocks = self._property_tensor_blocks(inverse_property_tensor(self, model))
+        K = self._corner_inner_product(projection_type, w * blocks)
+        W = self._corner_inner_product(projection_type, w * np.eye(self.dim))
+        D_inv = sdiag(1.0 / (W @ np.ones(W.shape[0])))
+        return (D_inv @ K @ D_inv).tocsr()
+
+    def get_face_inner_product_assembler(self, tensor_type=1):
+        """Get a reusable assembler for the face inner product matrix.
+
+        The assembler precomputes the sparsity pattern of the face inner
+        product matrix and the map from the model to its non-zero values, so
+        that assembling the matrix for a new model only requires filling its
+        ``data`` array. The assembler is cached on the mesh for each tensor type.
+
+        Parameters
+        ----------
+        tensor_type : int or numpy.ndarray, optional
+            The type of the physical property: 1 for isotropic, 2 for diagonal
+            anisotropic, and 3 for full tensor properties. Alternatively, an
+            example model from which the type is inferred.
+
+        Returns
+        -------
+        discretize.operators.inner_product_assembler.InnerProductAssembler
+
+        Examples
+        --------
+        >>> from discretize import TreeMesh
+        >>> import numpy as np
+        >>> mesh = TreeMesh([16, 16])
+        >>> mesh.refine_ball([0.5, 0.5], 0.2, -1)
+        >>> assemble_Mf = mesh.get_face_inner_product_assembler()
+        >>> sigma = np.random.rand(mesh.n_cells)
+        >>> Mf = assemble_Mf(sigma)
+        >>> np.allclose(Mf.toarray(), mesh.get_face_inner_product(sigma).toarray())
+        True
+        """
+        return self._get_inner_product_assembler("F", tensor_type)
+
+    def get_edge_inner_product_assembler(self, tensor_type=1):
+        """Get a reusable assembler for the edge inner product matrix.
+
+        The assembler precomputes the sparsity pattern of the edge inner
+        product matrix and the map from the model to its non-zero values, so
+        that assembling the matrix for a new model only requires filling its
+        ``data`` array. The assembler is cached on the mesh for each tensor type.
+
+        Parameters
+        ----------
+        tensor_type : int or numpy.ndarray, optional
+            The type of the physical property: 1 for isotropic, 2 for diagonal
+            anisotropic, and 3 for full tensor properties. Alternatively, an
+            example model from which the type is inferred.
+
+        Returns
+        -------
+        discretize.operators.inner_product_assembler.InnerProductAssembler
+        """
+        return self._get_inner_product_assembler("E", tensor_type)
+
+    def _get_inner_product_assembler(self, projection_type, tensor_type):
+        tensor_type = _parse_tensor_type(self, tensor_type)
+        if getattr(self, "_inner_product_assemblers", None) is None:
+            self._inner_product_assemblers = {}
+        key = (projection_type, tensor_type)
+        if key not in self._inner_product_assemblers:
+            self._inner_product_assemblers[key] = InnerProductAssembler(
+                self, projection_type, tensor_type
+            )
+        return self._inner_product_assemblers[key]
+
     def _getInnerProduct(
         self,
         projection_type,
@@ -114,7 +342,7 @@ class InnerProducts(BaseMesh):
         invert_model=False,
         invert_matrix=False,
         do_fast=True,
-        **kwargs
+        **kwargs,
     ):
         """Get the inner product matrix.
 
@@ -265,12 +493,14 @@ class InnerProducts(BaseMesh):
                 FutureWarning,
             )
             do_fast = kwargs["doFast"]
-        return self._getInnerProductDeriv(
-            model,
-            "F",
-            do_fast=do_fast,
-            invert_model=invert_model,
-            invert_matrix=invert_matrix,
+        return self._to_dtype(
+            self._getInnerProductDeriv(
+                model,
+                "F",
+                do_fast=do_fast,
+                invert_model=invert_model,
+                invert_matrix=invert_matrix,
+            )
         )
 
     def get_edge_inner_product_deriv(  # NOQA D102
@@ -298,12 +528,14 @@ class InnerProducts(BaseMesh):
                 FutureWarning,
             )
             do_fast = kwargs["doFast"]
-        return self._getInnerProductDeriv(
-            model,
-            "E",
-            do_fast=do_fast,
-            invert_model=invert_model,
-            invert_matrix=invert_matrix,
+        return self._to_dtype(
+            self._getInnerProductDeriv(
+                model,
+                "E",
+                do_fast=do_fast,
+                invert_model=invert_model,
+                invert_matrix=invert_matrix,
+            )
         )
 
     def _getInnerProductDeriv(
@@ -0,0 +1,379 @@
+"""Matrix-free operators with Kronecker product structure."""
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import LinearOperator
+from discretize.utils import is_scalar, sdiag, speye
+
+
+class BaseKronOperator(LinearOperator):
+    """Base class for the structured, matrix-free operators.
+
+    These operators are :class:`scipy.sparse.linalg.LinearOperator` objects
+    that keep track of how they were built, allowing them to be transposed,
+    composed, and scaled while still retaining the ability to be expanded to
+    an explicit sparse matrix with :meth:`tocsr`.
+    """
+
+    def tocsr(self):
+        """Expand the operator to an explicit sparse matrix.
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+        """
+        raise NotImplementedError(f"tocsr is not implemented for {type(self)}")
+
+    def toarray(self):
+        """Expand the operator to a dense array.
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+        return self.tocsr().toarray()
+
+    def _matvec(self, x):
+        return self._matmat(x.reshape(-1, 1))
+
+    def _rmatvec(self, x):
+        return self._adjoint()._matmat(x.reshape(-1, 1))
+
+    def _rmatmat(self, x):
+        return self._adjoint()._matmat(x)
+
+    def dot(self, x):
+        """Apply the operator to `x`.
+
+        Composing with another structured operator (or a scalar) returns a new
+        structured operator, everything else is passed on to
+        :meth:`scipy.sparse.linalg.LinearOperator.dot`.
+
+        Parameters
+        ----------
+        x : discretize.operators.kron_operators.BaseKronOperator, scalar or array_like
+
+        Returns
+        -------
+        discretize.operators.kron_operators.BaseKronOperator or numpy.ndarray
+        """
+        if isinstance(x, BaseKronOperator):
+            return ProductOperator(self, x)
+        if is_scalar(x):
+            return ScaledOperator(self, x)
+        return super().dot(x)
+
+    def __mul__(self, x):
+        """Apply or compose the operator."""
+        return self.dot(x)
+
+    def __matmul__(self, x):
+        """Apply or compose the operator."""
+        if is_scalar(x):
+            raise ValueError("Scalar operands are not allowed, use '*' instead")
+        return self.dot(x)
+
+    def __rmul__(self, x):
+        """Scale the operator."""
+        if is_scalar(x):
+            return ScaledOperator(self, x)
+        return super().__rmul__(x)
+
+    def __neg__(self):
+        """Negate the operator."""
+        return ScaledOperator(self, -1)
+
+
+class TensorProductOperator(BaseKronOperator):
+    r"""Kronecker product of one dimensional operators.
+
+    Represents the operator
+
+    .. math::
+        \mathbf{A} = \mathbf{A}_z \otimes \mathbf{A}_y \otimes \mathbf{A}_x
+
+    without forming it, by applying each factor along its own axis of the
+    Fortran ordered (x changing fastest) input array.
+
+    Parameters
+    ----------
+    factors : list of scipy.sparse.spmatrix or int
+        The one dimensional operators ordered by axis, (`A_x`, `A_y`, `A_z`).
+        An integer `n` stands for an `n` by `n` identity, which is skipped
+        when applying the operator.
+
+    Examples
+    --------
+    >>> from discretize.operators.kron_operators import TensorProductOperator
+    >>> from discretize.utils import ddx, kron3, speye
+    >>> import numpy as np
+    >>> D = TensorProductOperator([ddx(4), 5, 6])
+    >>> D.shape
+    (120, 150)
+    >>> x = np.random.rand(150)
+    >>> np.allclose(D @ x, kron3(speye(6), speye(5), ddx(4)) @ x)
+    True
+    """
+
+    def __init__(self, factors):
+        factors = list(factors)
+        if len(factors) == 0:
+            raise ValueError("At least one factor must be given")
+        for i, A in enumerate(factors):
+            if not isinstance(A, (int, np.integer)):
+                factors[i] = sp.csr_matrix(A)
+        self._factors = factors
+        self._shape_out = tuple(
+            A if isinstance(A, (int, np.integer)) else A.shape[0] for A in factors
+        )
+        self._shape_in = tuple(
+            A if isinstance(A, (int, np.integer)) else A.shape[1] for A in factors
+        )
+        dtypes = [A.dtype for A in factors if not isinstance(A, (int, np.integer))]
+        dtype = np.result_type(*dtypes) if dtypes else np.float64
+        shape = (int(np.prod(self._shape_out)), int(np.prod(self._shape_in)))
+        super().__init__(dtype, shape)
+
+    @property
+    def factors(self):
+        """The one dimensional factors ordered by axis.
+
+        Returns
+        -------
+        list of scipy.sparse.csr_matrix or int
+        """
+        return self._factors
+
+    def _matmat(self, x):
+        n_vec = x.shape[1]
+        X = x.reshape(self._shape_in + (n_vec,), order="F")
+        for axis, A in enumerate(self._factors):
+            if isinstance(A, (int, np.integer)):
+                continue
+            X = np.moveaxis(X, axis, 0)
+            shape = X.shape
+            X = A @ X.reshape(shape[0], -1)
+            X = np.moveaxis(X.reshape((A.shape[0],) + shape[1:]), 0, axis)
+        return X.reshape(-1, n_vec, order="F")
+
+    def _transpose(self):
+        return TensorProductOperator(
+            [A if isinstance(A, (int, np.integer)) else A.T for A in self._factors]
+        )
+
+    def _adjoint(self):
+        return TensorProductOperator(
+            [
+                A if isinstance(A, (int, np.integer)) else A.T.conjugate()
+                for A in self._factors
+            ]
+        )
+
+    def tocsr(self):  # NOQA D102
+        out = None
+        for A in self._factors:
+            if isinstance(A, (int, np.integer)):
+                A = speye(A)
+            out = A if out is None else sp.kron(A, out)
+        return out.tocsr()
+
+
+class DiagonalOperator(BaseKronOperator):
+    """Diagonal operator.
+
+    Parameters
+    ----------
+    diagonal : (n) numpy.ndarray
+        The entries on the diagonal.
+    """
+
+    def __init__(self, diagonal):
+        self._diagonal = np.asarray(diagonal).reshape(-1)
+        n = len(self._diagonal)
+        super().__init__(self._diagonal.dtype, (n, n))
+
+    @property
+    def diagonal(self):
+        """The entries on the diagonal.
+
+        Returns
+        -------
+        (n) numpy.ndarray
+        """
+        return self._diagonal
+
+    def _matmat(self, x):
+        return self._diagonal[:, None] * x
+
+    def _transpose(self):
+        return self
+
+    def _adjoint(self):
+        return DiagonalOperator(self._diagonal.conjugate())
+
+    def tocsr(self):  # NOQA D102
+        return sdiag(self._diagonal).tocsr()
+
+
+class ScaledOperator(BaseKronOperator):
+    """An operator multiplied by a scalar.
+
+    Parameters
+    ----------
+    operator : discretize.operators.kron_operators.BaseKronOperator
+    scale : scalar
+    """
+
+    def __init__(self, operator, scale):
+        self._operator = operator
+        self._scale = scale
+        dtype = np.result_type(operator.dtype, np.min_scalar_type(scale))
+        super().__init__(dtype, operator.shape)
+
+    def _matmat(self, x):
+        return self._scale * self._operator._matmat(x)
+
+    def _transpose(self):
+        return ScaledOperator(self._operator._transpose(), self._scale)
+
+    def _adjoint(self):
+        return ScaledOperator(self._operator._adjoint(), np.conjugate(self._scale))
+
+    def tocsr(self):  # NOQA D102
+        return (self._scale * self._operator.tocsr()).tocsr()
+
+
+class ProductOperator(BaseKronOperator):
+    """Composition of several operators.
+
+    Parameters
+    ----------
+    *operators : discretize.operators.kron_operators.BaseKronOperator
+        The operators to compose, the last one is applied first.
+    """
+
+    def __init__(self, *operators):
+        ops = []
+        for op in operators:
+            # flatten nested products
+            if isinstance(op, ProductOperator):
+                ops.extend(op._operators)
+            else:
+                ops.append(op)
+        for left, right in zip(ops[:-1], ops[1:]):
+            if left.shape[1] != right.shape[0]:
+                raise ValueError(
+                    f"Incompatible operator shapes {left.shape} and {right.shape}"
+                )
+        self._operators = ops
+        dtype = np.result_type(*[op.dtype for op in ops])
+        super().__init__(dtype, (ops[0].shape[0], ops[-1].shape[1]))
+
+    def _matmat(self, x):
+        for op in self._operators[::-1]:
+            x = op._matmat(x)
+        return x
+
+    def _transpose(self):
+        return ProductOperator(*[op._transpose() for op in self._operators[::-1]])
+
+    def _adjoint(self):
+        return ProductOperator(*[op._adjoint() for op in self._operators[::-1]])
+
+    def tocsr(self):  # NOQA D102
+        ops = self._operators
+        out = ops[-1].tocsr()
+        for op in ops[-2::-1]:
+            out = op.tocsr() @ out
+        return out.tocsr()
+
+
+class BlockOperator(BaseKronOperator):
+    """Operator assembled from blocks of operators.
+
+    This is the matrix-free analog of :func:`scipy.sparse.bmat`.
+
+    Parameters
+    ----------
+    blocks : list of list of discretize.operators.kron_operators.BaseKronOperator or None
+        The grid of sub-operators, with ``None`` representing a block of zeros.
+        Every block row and block column must contain at least one operator.
+    """
+
+    def __init__(self, blocks):
+        blocks = [list(row) for row in blocks]
+        n_cols = len(blocks[0])
+        if any(len(row) != n_cols for row in blocks):
+            raise ValueError("Every block row must have the same number of blocks")
+        row_sizes = [None] * len(blocks)
+        col_sizes = [None] * n_cols
+        for i, row in enumerate(blocks):
+            for j, op in enumerate(row):
+                if op is None:
+                    continue
+                for sizes, k, n in [
+                    (row_sizes, i, op.shape[0]),
+                    (col_sizes, j, op.shape[1]),
+                ]:
+                    if sizes[k] is None:
+                        sizes[k] = n
+                    elif sizes[k] != n:
+                        raise ValueError(
+                            f"Incompatible block size for block ({i}, {j})"
+                        )
+        if None in row_sizes or None in col_sizes:
+            raise ValueError(
+                "Every block row and block column must contain an operator"
+            )
+        self._blocks = blocks
+        self._row_offsets = np.r_[0, np.cumsum(row_sizes)]
+        self._col_offsets = np.r_[0, np.cumsum(col_sizes)]
+        dtype = np.result_type(
+            *[op.dtype for row in blocks for op in row if op is not None]
+        )
+        super().__init__(dtype, (self._row_offsets[-1], self._col_offsets[-1]))
+
+    @property
+    def blocks(self):
+        """The grid of sub-operators.
+
+        Returns
+        -------
+        list of list of discretize.operators.kron_operators.BaseKronOperator or None
+        """
+        return self._blocks
+
+    def _matmat(self, x):
+        out = np.zeros(
+            (self.shape[0], x.shape[1]), dtype=np.result_type(self.dtype, x.dtype)
+        )
+        rows, cols = self._row_offsets, self._col_offsets
+        for i, row in enumerate(self._blocks):
+            for j, op in enumerate(row):
+                if op is not None:
+                    out[rows[i] : rows[i + 1]] += op._matmat(x[cols[j] : cols[j + 1]])
+        return out
+
+    def _transpose(self):
+        return BlockOperator(
+            [
+                [None if op is None else op._transpose() for op in col]
+                for col in zip(*self._blocks)
+            ]
+        )
+
+    def _adjoint(self):
+        return BlockOperator(
+            [
+                [None if op is None else op._adjoint() for op in col]
+                for col in zip(*self._blocks)
+            ]
+        )
+
+    def tocsr(self):  # NOQA D102
+        return sp.bmat(
+            [
+                [None if op is None else op.tocsr() for op in row]
+                for row in self._blocks
+            ],
+            format="csr",
+        )
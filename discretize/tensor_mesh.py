@@ -3,8 +3,14 @@ import numpy as np
 
 from discretize.base import BaseRectangularMesh, BaseTensorMesh
 from discretize.operators import DiffOperators, InnerProducts
+from discretize.operators.differential_operators import _ddxCellGrad
+from discretize.operators.kron_operators import (
+    TensorProductOperator,
+    DiagonalOperator,
+    BlockOperator,
+)
 from discretize.mixins import InterfaceMixins, TensorMeshIO
-from discretize.utils import mkvc
+from discretize.utils import mkvc, ddx, av, av_extrap
 from discretize.utils.code_utils import deprecate_property
 
 
@@ -51,6 +57,10 @@ class TensorMesh(
           each axis is the first node location ('0'), in the center ('C') or the last
           node location ('N') (see Examples).
 
+    dtype : {numpy.float64, numpy.float32}, optional
+        The floating point precision of the mesh's geometry and operators, see
+        :py:attr:`~discretize.base.BaseMesh.dtype`.
+
     See Also
     --------
     utils.unpack_widths :
@@ -167,13 +177,15 @@ class TensorMesh(
             vh = self.h
             # Compute cell volumes
             if self.dim == 1:
-                self._cell_volumes = mkvc(vh[0])
+                self._cell_volumes = self._to_dtype(mkvc(vh[0]))
             elif self.dim == 2:
                 # Cell sizes in each direction
-                self._cell_volumes = mkvc(np.outer(vh[0], vh[1]))
+                self._cell_volumes = self._to_dtype(mkvc(np.outer(vh[0], vh[1])))
             elif self.dim == 3:
                 # Cell sizes in each direction
-                self._cell_volumes = mkvc(np.outer(mkvc(np.outer(vh[0], vh[1])), vh[2]))
+                self._cell_volumes = self._to_dtype(
+                    mkvc(np.outer(mkvc(np.outer(vh[0], vh[1])), vh[2]))
+                )
         return self._cell_volumes
 
     @property
@@ -204,7 +216,7 @@ class TensorMesh(
                 areaFx = np.outer(np.ones(n[0] + 1), vh[1])
             elif self.dim == 3:
                 areaFx = np.outer(np.ones(n[0] + 1), mkvc(np.outer(vh[1], vh[2])))
-            self._face_x_areas = mkvc(areaFx)
+            self._face_x_areas = self._to_dtype(mkvc(areaFx))
         return self._face_x_areas
 
     @property
@@ -236,7 +248,7 @@ class TensorMesh(
                 areaFy = np.outer(vh[0], np.ones(n[1] + 1))
             elif self.dim == 3:
                 areaFy = np.outer(vh[0], mkvc(np.outer(np.ones(n[1] + 1), vh[2])))
-            self._face_y_areas = mkvc(areaFy)
+            self._face_y_areas = self._to_dtype(mkvc(areaFy))
         return self._face_y_areas
 
     @property
@@ -266,7 +278,7 @@ class TensorMesh(
                 raise Exception("{}D meshes do not have z-Faces".format(self.dim))
             elif self.dim == 3:
                 areaFz = np.outer(vh[0], mkvc(np.outer(vh[1], np.ones(n[2] + 1))))
-            self._face_z_areas = mkvc(areaFz)
+            self._face_z_areas = self._to_dtype(mkvc(areaFz))
         return self._face_z_areas
 
     @property
@@ -305,7 +317,7 @@ class TensorMesh(
                 edgeEx = np.outer(
                     vh[0], mkvc(np.outer(np.ones(n[1] + 1), np.ones(n[2] + 1)))
                 )
-            self._edge_x_lengths = mkvc(edgeEx)
+            self._edge_x_lengths = self._to_dtype(mkvc(edgeEx))
         return self._edge_x_lengths
 
     @property
@@ -338,7 +350,7 @@ class TensorMesh(
                 edgeEy = np.outer(
                     np.ones(n[0] + 1), mkvc(np.outer(vh[1], np.ones(n[2] + 1)))
                 )
-            self._edge_y_lengths = mkvc(edgeEy)
+            self._edge_y_lengths = self._to_dtype(mkvc(edgeEy))
         return self._edge_y_lengths
 
     @property
@@ -369,7 +381,7 @@ class TensorMesh(
                 edgeEz = np.outer(
                     np.ones(n[0] + 1), mkvc(np.outer(np.ones(n[1] + 1), vh[2]))
                 )
-            self._edge_z_lengths = mkvc(edgeEz)
+            self._edge_z_lengths = self._to_dtype(mkvc(edgeEz))
         return self._edge_z_lengths
 
     @property
@@ -381,7 +393,7 @@ class TensorMesh(
             return np.r_[self.edge_x_lengths, self.edge_y_lengths]
         elif self.dim == 3:
             return np.r_[self.edge_x_lengths, self.edge_y_lengths, self.edge_z_lengths]
-        return self._edge
+        return self._to_dtype(self._edge)
 
     @property
     def face_boundary_indices(self):
@@ -536,6 +548,203 @@ class TensorMesh(
             indzu = self.gridCC[:, 2] == max(self.gridCC[:, 2])
             return indxd, indxu, indyd, indyu, indzd, indzu
 
+    def get_kron_operator(self, key):
+        """Return a matrix-free, Kronecker structured version of an operator.
+
+        The differential and averaging operators of a tensor mesh are Kronecker
+        products of one dimensional operators, scaled by geometric quantities.
+        Instead of assembling the full sparse matrix, the returned operator
+        only stores the one dimensional factors (and any diagonal scalings)
+        and applies them axis by axis to a reshaped input. It supports
+        matrix-vector products with ``@``, transposes with ``.T``, composition
+        with other structured operators, and can be expanded to the equivalent
+        :class:`scipy.sparse.csr_matrix` on demand with ``tocsr()``.
+
+        Parameters
+        ----------
+        key : str
+            The name of the operator, one of:
+
+            - 'face_divergence'
+            - 'nodal_gradient'
+            - 'edge_curl'
+            - 'cell_gradient'
+            - 'average_face_to_cell'
+            - 'average_face_to_cell_vector'
+            - 'average_cell_to_face'
+            - 'average_cell_vector_to_face'
+            - 'average_cell_to_edge'
+            - 'average_edge_to_cell'
+            - 'average_edge_to_cell_vector'
+            - 'average_node_to_cell'
+            - 'average_node_to_edge'
+            - 'average_node_to_face'
+
+        Returns
+        -------
+        discretize.operators.kron_operators.BaseKronOperator
+
+        Examples
+        --------
+        >>> from discretize import TensorMesh
+        >>> import numpy as np
+        >>> mesh = TensorMesh([10, 12, 14])
+        >>> D = mesh.get_kron_operator('face_divergence')
+        >>> C = mesh.get_kron_operator('edge_curl')
+        >>> DC = D @ C
+        >>> e = np.random.rand(mesh.n_edges)
+        >>> np.allclose(DC @ e, 0.0)
+        True
+        >>> np.allclose(D.tocsr().toarray(), mesh.face_divergence.toarray())
+        True
+        """
+        dim = self.dim
+        n = self.shape_cells
+        N = self.shape_nodes
+
+        def kron(*factors):
+            return TensorProductOperator(factors[:dim])
+
+        def hstack(*ops):
+            return BlockOperator([ops[:dim]])
+
+        def vstack(*ops):
+            return BlockOperator([[op] for op in ops[:dim]])
+
+        def block_diag(*ops):
+            ops = ops[:dim]
+            return BlockOperator(
+                [
+                    [op if i == j else None for j in range(dim)]
+                    for i, op in enumerate(ops)
+                ]
+            )
+
+        # pad the shapes so the expressions below can always index three axes
+        n = tuple(n) + (1,) * (3 - dim)
+        N = tuple(N) + (1,) * (3 - dim)
+
+        if key == "face_divergence":
+            D = hstack(
+                kron(ddx(n[0]), n[1], n[2]),
+                kron(n[0], ddx(n[1]), n[2]),
+                kron(n[0], n[1], ddx(n[2])),
+            )
+            op = DiagonalOperator(1 / self.cell_volumes) @ D
+            op = op @ DiagonalOperator(self.face_areas)
+        elif key == "nodal_gradient":
+            G = vstack(
+                kron(ddx(n[0]), N[1], N[2]),
+                kron(N[0], ddx(n[1]), N[2]),
+                kron(N[0], N[1], ddx(n[2])),
+            )
+            op = DiagonalOperator(1 / self.edge_lengths) @ G
+        elif key == "edge_curl":
+            if dim == 1:
+                raise NotImplementedError("Edge Curl only programed for 2 or 3D.")
+            if dim == 2:
+                C = hstack(
+                    TensorProductOperator([n[0], -ddx(n[1])]),
+                    TensorProductOperator([ddx(n[0]), n[1]]),
+                )
+                S = self.cell_volumes
+            else:
+                C = BlockOperator(
+                    [
+                        [
+                            None,
+                            kron(N[0], n[1], -ddx(n[2])),
+                            kron(N[0], ddx(n[1]), n[2]),
+                        ],
+                        [
+                            kron(n[0], N[1], ddx(n[2])),
+                            None,
+                            kron(-ddx(n[0]), N[1], n[2]),
+                        ],
+                        [
+                            kron(n[0], -ddx(n[1]), N[2]),
+                            kron(ddx(n[0]), n[1], N[2]),
+                            None,
+                        ],
+                    ]
+                )
+                S = self.face_areas
+            op = DiagonalOperator(1 / S) @ C @ DiagonalOperator(self.edge_lengths)
+        elif key == "cell_gradient":
+            BC = self._cell_gradient_BC_list
+            if isinstance(BC, str):
+                BC = [BC] * dim
+            BC = list(BC) + [None] * (3 - dim)
+            G = vstack(
+                kron(_ddxCellGrad(n[0], BC[0]), n[1], n[2]),
+                kron(n[0], _ddxCellGrad(n[1], BC[1]), n[2]) if dim > 1 else None,
+                kron(n[0], n[1], _ddxCellGrad(n[2], BC[2])) if dim > 2 else None,
+            )
+            V = self.get_kron_operator("average_cell_to_face") @ self.cell_volumes
+            op = DiagonalOperator(self.face_areas / V) @ G
+        elif key in ["average_face_to_cell", "average_face_to_cell_vector"]:
+            comps = (
+                kron(av(n[0]), n[1], n[2]),
+                kron(n[0], av(n[1]), n[2]),
+                kron(n[0], n[1], av(n[2])),
+            )
+            if key == "average_face_to_cell":
+                op = (1.0 / dim) * hstack(*comps)
+            else:
+                op = block_diag(*comps)
+        elif key in ["average_cell_to_face", "average_cell_vector_to_face"]:
+            comps = (
+                kron(av_extrap(n[0]), n[1], n[2]),
+                kron(n[0], av_extrap(n[1]), n[2]),
+                kron(n[0], n[1], av_extrap(n[2])),
+            )
+            if key == "average_cell_to_face":
+                op = vstack(*comps)
+            else:
+                op = block_diag(*comps)
+        elif key == "average_cell_to_edge":
+            if dim == 1:
+                op = kron(n[0])
+            else:
+                op = vstack(
+                    kron(n[0], av_extrap(n[1]), av_extrap(n[2])),
+                    kron(av_extrap(n[0]), n[1], av_extrap(n[2])),
+                    kron(av_extrap(n[0]), av_extrap(n[1]), n[2]),
+                )
+        elif key in ["average_edge_to_cell", "average_edge_to_cell_vector"]:
+            if dim == 1:
+                op = kron(n[0])
+            else:
+                comps = (
+                    kron(n[0], av(n[1]), av(n[2])),
+                    kron(av(n[0]), n[1], av(n[2])),
+                    kron(av(n[0]), av(n[1]), n[2]),
+                )
+                if key == "average_edge_to_cell":
+                    op = (1.0 / dim) * hstack(*comps)
+                else:
+                    op = block_diag(*comps)
+        elif key == "average_node_to_cell":
+            op = kron(av(n[0]), av(n[1]), av(n[2]))
+        elif key == "average_node_to_edge":
+            op = vstack(
+                kron(av(n[0]), N[1], N[2]),
+                kron(N[0], av(n[1]), N[2]),
+                kron(N[0], N[1], av(n[2])),
+            )
+        elif key == "average_node_to_face":
+            if dim == 1:
+                op = kron(N[0])
+            else:
+                op = vstack(
+                    kron(N[0], av(n[1]), av(n[2])),
+                    kron(av(n[0]), N[1], av(n[2])),
+                    kron(av(n[0]), av(n[1]), N[2]),
+                )
+        else:
+            raise KeyError(f"Unrecognized operator key {key}")
+        return op
+
     def _repr_attributes(self):
         """Represent attributes of the mesh."""
         attrs = {}
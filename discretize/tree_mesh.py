@@ -171,6 +171,9 @@ class TreeMesh(
     diagonal_balance : bool, optional
         Whether to balance cells along the diagonal of the tree during construction.
         This will effect all calls to refine the tree.
+    dtype : {numpy.float64, numpy.float32}, optional
+        The floating point precision of the mesh's geometry and operators, see
+        :py:attr:`~discretize.base.BaseMesh.dtype`.
 
     Examples
     --------
@@ -231,13 +234,16 @@ class TreeMesh(
             "gridhEz": "hanging_edges_z",
         },
     }
-    _items = {"h", "origin", "cell_state"}
+    _items = {"h", "origin", "cell_state", "dtype"}
 
     # inheriting stuff from BaseTensorMesh that isn't defined in _QuadTree
-    def __init__(self, h=None, origin=None, diagonal_balance=False, **kwargs):
+    def __init__(
+        self, h=None, origin=None, diagonal_balance=False, dtype=None, **kwargs
+    ):
         if "x0" in kwargs:
             origin = kwargs.pop("x0")
         super().__init__(h=h, origin=origin, diagonal_balance=diagonal_balance)
+        self._dtype = self._validate_dtype(dtype)
 
         cell_state = kwargs.pop("cell_state", None)
         cell_indexes = kwargs.pop("cell_indexes", None)
@@ -775,13 +781,10 @@ class TreeMesh(
     def stencil_cell_gradient(self):  # NOQA D102
         # Documentation inherited from discretize.base.BaseMesh
         if getattr(self, "_stencil_cell_gradient", None) is None:
-            self._stencil_cell_gradient = sp.vstack(
-                [self.stencil_cell_gradient_x, self.stencil_cell_gradient_y]
-            )
+            G = [self.stencil_cell_gradient_x, self.stencil_cell_gradient_y]
             if self.dim == 3:
-                self._stencil_cell_gradient = sp.vstack(
-                    [self._stencil_cell_gradient, self.stencil_cell_gradient_z]
-                )
+                G.append(self.stencil_cell_gradient_z)
+            self._stencil_cell_gradient = self._to_dtype(sp.vstack(G))
 
         return self._stencil_cell_gradient
 
@@ -813,7 +816,7 @@ class TreeMesh(
                 Pafz = sp.diags(iz)
                 Pi = sp.block_diag([Pafx, Pafy, Pafz])
 
-            self._cell_gradient = (
+            self._cell_gradient = self._to_dtype(
                 -Pi * MfI * self.face_divergence.T * sp.diags(self.cell_volumes)
             )
 
@@ -834,7 +837,7 @@ class TreeMesh(
             MfI = self.get_face_inner_product(invMat=True)
             MfIx = sp.diags(MfI.diagonal()[:nFx])
 
-            self._cell_gradient_x = (
+            self._cell_gradient_x = self._to_dtype(
                 -Pafx * MfIx * self.face_x_divergence.T * sp.diags(self.cell_volumes)
             )
 
@@ -856,7 +859,7 @@ class TreeMesh(
             MfI = self.get_face_inner_product(invMat=True)
             MfIy = sp.diags(MfI.diagonal()[nFx : nFx + nFy])
 
-            self._cell_gradient_y = (
+            self._cell_gradient_y = self._to_dtype(
                 -Pafy * MfIy * self.face_y_divergence.T * sp.diags(self.cell_volumes)
             )
 
@@ -880,7 +883,7 @@ class TreeMesh(
             MfI = self.get_face_inner_product(invMat=True)
             MfIz = sp.diags(MfI.diagonal()[nFx + nFy :])
 
-            self._cell_gradient_z = (
+            self._cell_gradient_z = self._to_dtype(
                 -Pafz * MfIz * self.face_z_divergence.T * sp.diags(self.cell_volumes)
             )
 
@@ -890,23 +893,27 @@ class TreeMesh(
     def face_x_divergence(self):  # NOQA D102
         # Documentation inherited from discretize.operators.DifferentialOperators
         if getattr(self, "_face_x_divergence", None) is None:
-            self._face_x_divergence = self.face_divergence[:, : self.nFx]
+            self._face_x_divergence = self._to_dtype(
+                self.face_divergence[:, : self.nFx]
+            )
         return self._face_x_divergence
 
     @property
     def face_y_divergence(self):  # NOQA D102
         # Documentation inherited from discretize.operators.DifferentialOperators
         if getattr(self, "_face_y_divergence", None) is None:
-            self._face_y_divergence = self.face_divergence[
-                :, self.nFx : self.nFx + self.nFy
-            ]
+            self._face_y_divergence = self._to_dtype(
+                self.face_divergence[:, self.nFx : self.nFx + self.nFy]
+            )
         return self._face_y_divergence
 
     @property
     def face_z_divergence(self):  # NOQA D102
         # Documentation inherited from discretize.operators.DifferentialOperators
         if getattr(self, "_face_z_divergence", None) is None:
-            self._face_z_divergence = self.face_divergence[:, self.nFx + self.nFy :]
+            self._face_z_divergence = self._to_dtype(
+                self.face_divergence[:, self.nFx + self.nFy :]
+            )
         return self._face_z_divergence
 
     def point2index(self, locs):  # NOQA D102
@@ -968,7 +975,7 @@ class TreeMesh(
             raise ValueError(
                 "Location must be a grid location, not {}".format(location_type)
             )
-        return Av
+        return self._to_dtype(Av)
 
     @property
     def permute_cells(self):
@@ -1049,6 +1056,12 @@ class TreeMesh(
             pass
         return False
 
+    def _cell_local_indices(self, projection_type):
+        # Documentation inherited from discretize.base.BaseTensorMesh
+        if projection_type == "F":
+            return self._cell_total_face_indices(), self._deflate_faces()
+        return self._cell_total_edge_indices(), self._deflate_edges()
+
     def __reduce__(self):
         """Return the necessary items to reconstruct this object's state."""
         return TreeMesh, (self.h, self.origin), self.__getstate__()
@@ -1,13 +1,19 @@
 """Module containing unstructured meshes for discretize."""
 import numpy as np
 import scipy.sparse as sp
+from scipy.sparse.csgraph import reverse_cuthill_mckee
 from scipy.spatial import KDTree
-from discretize.utils import Identity, invert_blocks, spzeros
+from discretize.utils import invert_blocks
+from discretize.utils.code_utils import _n_threads
 from discretize.base import BaseMesh
+from discretize.operators.inner_product_assembler import (
+    InnerProductAssembler,
+    _parse_tensor_type,
+)
 from discretize._extensions.simplex_helpers import (
-    _build_faces_edges,
-    _build_adjacency,
+    _build_topology,
     _directed_search,
+    _hilbert_keys,
     _interp_cc,
 )
 from discretize.mixins import InterfaceMixins, SimplexMeshIO
@@ -31,12 +37,38 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
         indexes into the `nodes` array. Each row defines which nodes make a given cell.
         This array is sorted along each row and then stored on the mesh.
 
+    dtype : {numpy.float64, numpy.float32}, optional
+        The floating point precision of the mesh's geometry and operators, see
+        :py:attr:`~discretize.base.BaseMesh.dtype`. The `nodes` are always stored
+        in double precision.
+
+    n_threads : int, optional
+        Number of threads used to build the edges, faces and adjacency of the
+        mesh. By default, they are built serially. Several threads require
+        discretize to be built with OpenMP, otherwise a warning is issued.
+
+    reorder : {None, "rcm", "hilbert"}, optional
+        Renumber the nodes and cells of the mesh to improve the locality of its
+        operators. ``"rcm"`` orders the nodes with the reverse Cuthill-McKee
+        algorithm and the cells by their nodes, and ``"hilbert"`` orders the
+        cells along a Hilbert curve through their centers and the nodes by
+        their first appearance in the cells. The faces and edges follow the
+        order of the cells. The permutations are available as
+        :py:attr:`node_permutation`, :py:attr:`cell_permutation`,
+        :py:attr:`face_permutation` and :py:attr:`edge_permutation`.
+
     Notes
     -----
     Only rudimentary checking of the input nodes and simplices is performed, only
     checking for degenerate simplices who have zero volume. There are no checks for
     overlapping cells, or for the quality of the mesh.
 
+    The edges, faces and adjacency of the mesh, and the barycentric transforms of
+    its cells, are only built when they are first used. This keeps meshes that are
+    only used for cell centered quantities light. The memory held by these tables
+    is reported by :py:attr:`table_nbytes`, and they can be released again with
+    :py:meth:`drop_tables`.
+
     Examples
     --------
     Here we generate a basic 2D triangular mesh, by triangulating a rectangular domain.
@@ -67,9 +99,10 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
     """
 
     _meshType = "simplex"
-    _items = {"nodes", "simplices"}
+    _items = {"nodes", "simplices", "dtype"}
 
-    def __init__(self, nodes, simplices):
+    def __init__(self, nodes, simplices, dtype=None, n_threads=None, reorder=None):
+        self._dtype = self._validate_dtype(dtype)
         # grab copies of the nodes and simplices for protection
         nodes = np.asarray(nodes)
         simplices = np.asarray(simplices)
@@ -83,6 +116,16 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
                 "simplices second dimension is not compatible with the mesh dimension. "
                 f"Saw {simplices.shape[1]}, and expected {dim + 1}."
             )
+        if reorder is not None:
+            node_perm, cell_perm = _reorder_simplices(
+                nodes, simplices, reorder, n_threads
+            )
+            node_inv = np.empty_like(node_perm)
+            node_inv[node_perm] = np.arange(len(node_perm))
+            nodes = nodes[node_perm]
+            simplices = node_inv[simplices[cell_perm]]
+            self._node_permutation = node_perm
+            self._cell_permutation = cell_perm
 
         self._nodes = nodes.copy()
         self._nodes.setflags(write="false")
@@ -94,18 +137,266 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
         if self.cell_volumes.min() == 0.0:
             raise ValueError("Triangulation contains degenerate simplices")
 
-        self._number()
+        self._n_threads = n_threads
+
+    _topology_names = (
+        "simplex_faces",
+        "faces",
+        "simplex_edges",
+        "edges",
+        "face_edges",
+        "neighbors",
+    )
 
     def _number(self):
-        items = _build_faces_edges(self.simplices)
-        self._simplex_faces = np.array(items[0])
-        self._faces = np.array(items[1])
-        self._simplex_edges = np.array(items[2])
-        self._edges = np.array(items[3])
-        self._n_faces = self._faces.shape[0]
-        self._n_edges = self._edges.shape[0]
-        if self.dim == 3:
-            self._face_edges = np.array(items[4])
+        # the tables are stored as 32 bit integers whenever they fit
+        items = _build_topology(
+            self.simplices, self.n_nodes, _n_threads(self._n_threads)
+        )
+        self._topology = {
+            name: item
+            for name, item in zip(self._topology_names, items)
+            if item is not None
+        }
+
+    def _get_topology(self, name):
+        # the edges, faces and adjacency are built together on first use
+        if getattr(self, "_topology", None) is None:
+            self._number()
+        return self._topology[name]
+
+    @property
+    def _simplex_faces(self):
+        return self._get_topology("simplex_faces")
+
+    @property
+    def _faces(self):
+        return self._get_topology("faces")
+
+    @property
+    def _simplex_edges(self):
+        return self._get_topology("simplex_edges")
+
+    @property
+    def _edges(self):
+        return self._get_topology("edges")
+
+    @property
+    def _face_edges(self):
+        return self._get_topology("face_edges")
+
+    @property
+    def table_nbytes(self):
+        """The memory used by the tables currently stored on the mesh.
+
+        The topological tables (``"simplex_faces"``, ``"faces"``,
+        ``"simplex_edges"``, ``"edges"``, ``"face_edges"`` and ``"neighbors"``),
+        the barycentric ``"transform"`` and ``"shift"``, the ``"cell_volumes"``,
+        and the ``"face_permutation"`` and ``"edge_permutation"`` of a reordered
+        mesh are only listed once they have been built.
+
+        Returns
+        -------
+        dict of {str: int}
+            The number of bytes of each stored table.
+        """
+        tables = dict(getattr(self, "_topology", None) or {})
+        for name in [
+            "transform",
+            "shift",
+            "cell_volumes",
+            "face_permutation",
+            "edge_permutation",
+        ]:
+            table = getattr(self, "_" + name, None)
+            if table is not None:
+                tables[name] = table
+        return {name: table.nbytes for name, table in tables.items()}
+
+    def drop_tables(self, *groups):
+        """Release tables stored on the mesh.
+
+        The dropped tables are rebuilt on their next use.
+
+        Parameters
+        ----------
+        *groups : {"topology", "transform_and_shift", "cell_volumes", "cell_centers_tree"}
+            The groups of tables to drop, by default all of them. Dropping the
+            ``"topology"`` also drops the tables derived from it, i.e. the
+            boundary faces, the face and edge permutations, and the inner
+            product assemblers.
+        """
+        attributes = {
+            "topology": [
+                "_topology",
+                "_is_boundary_face",
+                "_face_permutation",
+                "_edge_permutation",
+                "_inner_product_assemblers",
+            ],
+            "transform_and_shift": ["_transform", "_shift"],
+            "cell_volumes": ["_cell_volumes"],
+            "cell_centers_tree": ["_cc_tree"],
+        }
+        if not groups:
+            groups = attributes.keys()
+        for group in groups:
+            if group not in attributes:
+                raise ValueError(
+                    f"Unrecognized group of tables {group!r}, expected one of "
+                    f"{list(attributes)}."
+                )
+            for attribute in attributes[group]:
+                setattr(self, attribute, None)
+
+    @property
+    def node_permutation(self):
+        """The original index of each node of the mesh.
+
+        For a mesh constructed with `reorder`, ``mesh.nodes`` equals
+        ``nodes[mesh.node_permutation]`` for the `nodes` it was constructed
+        with. Otherwise this is the identity.
+
+        Returns
+        -------
+        (n_nodes) numpy.ndarray of int
+        """
+        if getattr(self, "_node_permutation", None) is None:
+            return np.arange(self.n_nodes)
+        return self._node_permutation
+
+    @property
+    def cell_permutation(self):
+        """The original index of each cell of the mesh.
+
+        For a mesh constructed with `reorder`, the i'th cell of the mesh is the
+        ``mesh.cell_permutation[i]``'th simplex it was constructed with.
+        Otherwise this is the identity.
+
+        Returns
+        -------
+        (n_cells) numpy.ndarray of int
+        """
+        if getattr(self, "_cell_permutation", None) is None:
+            return np.arange(self.n_cells)
+        return self._cell_permutation
+
+    @property
+    def face_permutation(self):
+        """The original index of each face of the mesh.
+
+        For a mesh constructed with `reorder`, the i'th face of the mesh is the
+        ``mesh.face_permutation[i]``'th face of the mesh constructed from the
+        same nodes and simplices without reordering. Otherwise this is the
+        identity. The normal of a face can be flipped by the reordering, see
+        `face_orientation`.
+
+        Returns
+        -------
+        (n_faces) numpy.ndarray of int
+        """
+        if self.dim == 2:
+            return self.edge_permutation
+        if getattr(self, "_face_permutation", None) is None:
+            if getattr(self, "_cell_permutation", None) is None:
+                return np.arange(self.n_faces)
+            # the i'th face of a simplex is opposite its i'th node
+            self._face_permutation = self._original_numbering(
+                self._simplex_faces, self._original_local_order()
+            )
+        return self._face_permutation
+
+    @property
+    def edge_permutation(self):
+        """The original index of each edge of the mesh.
+
+        For a mesh constructed with `reorder`, the i'th edge of the mesh is the
+        ``mesh.edge_permutation[i]``'th edge of the mesh constructed from the
+        same nodes and simplices without reordering. Otherwise this is the
+        identity. The tangent of an edge can be flipped by the reordering, see
+        `edge_orientation`.
+
+        Returns
+        -------
+        (n_edges) numpy.ndarray of int
+        """
+        if getattr(self, "_edge_permutation", None) is None:
+            if getattr(self, "_cell_permutation", None) is None:
+                return np.arange(self.n_edges)
+            pairs = np.array([[1, 2], [0, 2], [0, 1], [0, 3], [1, 3], [2, 3]])
+            pairs = pairs[: self._simplex_edges.shape[1]]
+            lookup = np.empty((self.dim + 1, self.dim + 1), dtype=int)
+            lookup[pairs[:, 0], pairs[:, 1]] = np.arange(len(pairs))
+            lookup[pairs[:, 1], pairs[:, 0]] = np.arange(len(pairs))
+            order = self._original_local_order()
+            self._edge_permutation = self._original_numbering(
+                self._simplex_edges,
+                lookup[order[:, pairs[:, 0]], order[:, pairs[:, 1]]],
+            )
+        return self._edge_permutation
+
+    @property
+    def face_orientation(self):
+        """The orientation of each face relative to the unreordered mesh.
+
+        For a mesh constructed with `reorder`, the normal of the i'th face is
+        ``mesh.face_orientation[i]`` times the normal of the
+        ``mesh.face_permutation[i]``'th face of the mesh constructed without
+        reordering. Otherwise this is all ones.
+
+        Returns
+        -------
+        (n_faces) numpy.ndarray of int
+            +1 where the normal is preserved and -1 where it is flipped.
+        """
+        if self.dim == 2:
+            return self.edge_orientation
+        if getattr(self, "_node_permutation", None) is None:
+            return np.ones(self.n_faces, dtype=int)
+        # the face normals follow the sorted order of the face's nodes, so
+        # the normal flips with the parity of the original node order.
+        original = self._node_permutation[self._faces]
+        inversions = (
+            (original[:, 0] > original[:, 1]).astype(int)
+            + (original[:, 0] > original[:, 2])
+            + (original[:, 1] > original[:, 2])
+        )
+        return 1 - 2 * (inversions % 2)
+
+    @property
+    def edge_orientation(self):
+        """The orientation of each edge relative to the unreordered mesh.
+
+        For a mesh constructed with `reorder`, the tangent of the i'th edge is
+        ``mesh.edge_orientation[i]`` times the tangent of the
+        ``mesh.edge_permutation[i]``'th edge of the mesh constructed without
+        reordering. Otherwise this is all ones.
+
+        Returns
+        -------
+        (n_edges) numpy.ndarray of int
+            +1 where the tangent is preserved and -1 where it is flipped.
+        """
+        if getattr(self, "_node_permutation", None) is None:
+            return np.ones(self.n_edges, dtype=int)
+        # the edge tangents point from the lower to the higher node index
+        original = self._node_permutation[self._edges]
+        return np.where(original[:, 0] < original[:, 1], 1, -1)
+
+    def _original_local_order(self):
+        # the local position of each originally sorted node in the simplices
+        return np.argsort(self._node_permutation[self.simplices], axis=1)
+
+    def _original_numbering(self, simplex_items, local):
+        # The original items were numbered by their first appearance in the
+        # original simplices, where the j'th item of the i'th simplex is
+        # simplex_items[i, local[i, j]] in the reordered mesh.
+        items = np.empty_like(simplex_items)
+        items[self._cell_permutation] = np.take_along_axis(simplex_items, local, 1)
+        _, first = np.unique(items, return_index=True)
+        numbering = np.empty(len(first), dtype=np.int64)
+        numbering[np.argsort(first)] = np.arange(len(first))
+        return numbering
 
     @property
     def simplices(self):
@@ -134,11 +425,7 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
         -------
         (n_cells, dim + 1) numpy.ndarray of int
         """
-        if getattr(self, "_neighbors", None) is None:
-            self._neighbors = np.array(
-                _build_adjacency(self._simplex_faces, self.n_faces)
-            )
-        return self._neighbors
+        return self._get_topology("neighbors")
 
     @property
     def transform_and_shift(self):
@@ -186,7 +473,7 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
     @property
     def cell_centers(self):  # NOQA D102
         # Documentation inherited from discretize.base.BaseMesh
-        return np.mean(self.nodes[self.simplices], axis=1)
+        return self._to_dtype(np.mean(self.nodes[self.simplices], axis=1))
 
     @property
     def cell_volumes(self):  # NOQA D102
@@ -196,42 +483,42 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
             mats = np.pad(simplex_nodes, ((0, 0), (0, 0), (0, 1)), constant_values=1)
             V1 = np.abs(np.linalg.det(mats))
             V1 /= 6 if self.dim == 3 else 2
-            self._cell_volumes = V1
+            self._cell_volumes = self._to_dtype(V1)
         return self._cell_volumes
 
     @property
     def n_edges(self):  # NOQA D102
         # Documentation inherited from discretize.base.BaseMesh
-        return self._n_edges
+        return self._edges.shape[0]
 
     @property
     def edges(self):  # NOQA D102
         # Documentation inherited from discretize.base.BaseMesh
-        return np.mean(self.nodes[self._edges], axis=1)
+        return self._to_dtype(np.mean(self.nodes[self._edges], axis=1))
 
     @property
     def edge_tangents(self):  # NOQA D102
         # Documentation inherited from discretize.base.BaseMesh
         tangents = np.diff(self.nodes[self._edges], axis=1).squeeze()
         tangents /= np.linalg.norm(tangents, axis=-1)[:, None]
-        return tangents
+        return self._to_dtype(tangents)
 
     @property
     def edge_lengths(self):  # NOQA D102
         # Documentation inherited from discretize.base.BaseMesh
-        return np.linalg.norm(
-            np.diff(self.nodes[self._edges], axis=1).squeeze(), axis=-1
+        return self._to_dtype(
+            np.linalg.norm(np.diff(self.nodes[self._edges], axis=1).squeeze(), axis=-1)
         )
 
     @property
     def n_faces(self):  # NOQA D102
         # Documentation inherited from discretize.base.BaseMesh
-        return self._n_faces
+        return self._faces.shape[0]
 
     @property
     def faces(self):  # NOQA D102
         # Documentation inherited from discretize.base.BaseMesh
-        return np.mean(self.nodes[self._faces], axis=1)
+        return self._to_dtype(np.mean(self.nodes[self._faces], axis=1))
 
     @property
     def face_areas(self):  # NOQA D102
@@ -243,7 +530,7 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
             v01 = face_nodes[:, 1] - face_nodes[:, 0]
             v02 = face_nodes[:, 2] - face_nodes[:, 0]
             areas = np.linalg.norm(np.cross(v01, v02), axis=1) / 2
-            return areas
+            return self._to_dtype(areas)
 
     @property
     def face_normals(self):  # NOQA D102
@@ -252,7 +539,7 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
             # Take the normal as being the cross product of edge_tangents
             # and a unit vector in a "3rd" dimension.
             normals = np.cross(self.edge_tangents, [0, 0, 1])[:, :-1]
-            return normals
+            return self._to_dtype(normals)
         else:
             # define normal as |01 x 02|
             # therefore clockwise path about the normal is 0->1->2->0
@@ -261,7 +548,7 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
             v02 = face_nodes[:, 2] - face_nodes[:, 0]
             normal = np.cross(v01, v02)
             normal /= np.linalg.norm(normal, axis=1)[:, None]
-            return normal
+            return self._to_dtype(normal)
 
     @property
     def face_divergence(self):  # NOQA D102
@@ -280,7 +567,7 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
         ind_ptr = (self.dim + 1) * np.arange(self.n_cells + 1)
         col_inds = self._simplex_faces.reshape(-1)
         D = sp.csr_matrix((Aijs, col_inds, ind_ptr), shape=(self.n_cells, self.n_faces))
-        return D
+        return self._to_dtype(D)
 
     @property
     def nodal_gradient(self):  # NOQA D102
@@ -289,8 +576,8 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
         col_inds = self._edges.reshape(-1)
         Aijs = ((1.0 / self.edge_lengths[:, None]) * [-1, 1]).reshape(-1)
 
-        return sp.csr_matrix(
-            (Aijs, col_inds, ind_ptr), shape=(self.n_edges, self.n_nodes)
+        return self._to_dtype(
+            sp.csr_matrix((Aijs, col_inds, ind_ptr), shape=(self.n_edges, self.n_nodes))
         )
 
     @property
@@ -343,43 +630,19 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
 
         C = sp.csr_matrix((Aijs, col_inds, ind_ptr), shape=(n_faces, n_edges))
 
-        return C
+        return self._to_dtype(C)
 
-    def __validate_model(self, model, invert_model=False):
+    def __model_tensor_type(self, model):
+        # determines the tensor type of the model from its size
         n_cells = self.n_cells
         dim = self.dim
-        # determines the tensor type of the model and reshapes it properly
-        model = np.atleast_1d(model)
-        n_aniso = ((dim + 1) * dim) // 2
-        if model.size == n_aniso * n_cells:
-            # model is fully anisotropic
-            # reshape it into a stack of dim x dim matrices
-            if model.ndim == 1:
-                model = model.reshape((-1, n_aniso), order="F")
-            vals = model
-            if self.dim == 2:
-                model = np.stack(
-                    [[vals[:, 0], vals[:, 2]], [vals[:, 2], vals[:, 1]]]
-                ).transpose((2, 0, 1))
-            else:
-                model = np.stack(
-                    [
-                        [vals[:, 0], vals[:, 3], vals[:, 4]],
-                        [vals[:, 3], vals[:, 1], vals[:, 5]],
-                        [vals[:, 4], vals[:, 5], vals[:, 2]],
-                    ]
-                ).transpose((2, 0, 1))
-        elif model.size == dim * n_cells:
-            if model.ndim == 1:
-                model = model.reshape((n_cells, dim), order="F")
-            model = model.reshape(-1)
-
-        if invert_model:
-            if model.ndim == 1:
-                model = 1.0 / model
-            else:
-                model = invert_blocks(model)
-        return model
+        size = np.size(model)
+        if size == 1:
+            return 0
+        sizes = {n_cells: 1, dim * n_cells: 2, (((dim + 1) * dim) // 2) * n_cells: 3}
+        if size not in sizes:
+            raise ValueError("Unrecognized size of model vector")
+        return sizes[size]
 
     def __get_inner_product_projection_matrices(
         self, i_type, with_volume=True, return_pointers=True
@@ -438,33 +701,124 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
         else:
             return Ps
 
-    def __get_inner_product(self, i_type, model, invert_model):
-        Ps, (T_col_inds, T_ind_ptr) = self.__get_inner_product_projection_matrices(
-            i_type
-        )
-        n_cells = self.n_cells
+    def _inner_product_local_projections(self, i_type):
+        """Project each simplex's faces or edges onto vectors at its nodes.
+
+        Parameters
+        ----------
+        i_type : {'F', 'E'}
+            Whether to project the faces or the edges.
+
+        Returns
+        -------
+        items : (n_cells, n_local) numpy.ndarray of int
+            The faces (or edges) of each simplex.
+        projections : (n_cells, dim + 1, dim, n_local) numpy.ndarray
+            For each node of each simplex, the volume weighted matrix taking
+            the values on the simplex's faces (or edges) to the vector at the
+            node.
+        """
         dim = self.dim
-        if model is None:
-            Mu = Identity()
-        else:
-            model = self.__validate_model(model, invert_model)
-            if model.size == 1:
-                Mu = sp.diags((model,), (0,), shape=(dim * n_cells, dim * n_cells))
-            elif model.size == n_cells:
-                Mu = sp.diags(np.repeat(model, dim))
-            elif model.size == dim * n_cells:
-                # diagonally anisotropic model
-                Mu = sp.diags(model)
-            elif model.size == (dim * dim) * n_cells:
-                Mu = sp.csr_matrix(
-                    (model.reshape(-1), T_col_inds, T_ind_ptr),
-                    shape=(dim * n_cells, dim * n_cells),
-                )
+        n_cells = self.n_cells
+        if i_type == "F":
+            vecs = self.face_normals
+            items = self._simplex_faces
+            if dim == 2:
+                node_items = np.array([[1, 2], [0, 2], [0, 1]])
             else:
-                raise ValueError("Unrecognized size of model vector")
+                node_items = np.array([[1, 2, 3], [0, 2, 3], [0, 1, 3], [0, 1, 2]])
+        elif i_type == "E":
+            vecs = self.edge_tangents
+            items = self._simplex_edges
+            if dim == 2:
+                node_items = np.array([[1, 2], [0, 2], [0, 1]])
+            elif dim == 3:
+                node_items = np.array([[1, 2, 3], [0, 2, 4], [0, 1, 5], [3, 4, 5]])
+
+        # (n_cells, dim + 1, dim, dim) inverses of the item vectors at each node
+        trans_inv = invert_blocks(vecs[items[:, node_items]])
+        trans_inv *= np.sqrt(self.cell_volumes / (dim + 1))[:, None, None, None]
+
+        projections = np.zeros((n_cells, dim + 1, dim, items.shape[1]))
+        nodes = np.arange(dim + 1)[:, None]
+        projections[:, nodes, :, node_items] = trans_inv.transpose((1, 3, 0, 2))
+        return items, projections
+
+    def __get_inner_product_assembler(self, i_type, tensor_type):
+        tensor_type = _parse_tensor_type(self, tensor_type)
+        if getattr(self, "_inner_product_assemblers", None) is None:
+            self._inner_product_assemblers = {}
+        key = (i_type, tensor_type)
+        if key not in self._inner_product_assemblers:
+            self._inner_product_assemblers[key] = InnerProductAssembler(
+                self, i_type, tensor_type
+            )
+        return self._inner_product_assemblers[key]
+
+    def get_face_inner_product_assembler(self, tensor_type=1):
+        """Get a reusable assembler for the face inner product matrix.
+
+        The assembler precomputes the local mass blocks of every simplex and
+        their scatter map into the face inner product matrix once, so that
+        assembling the matrix, or its derivative, for a new model is a
+        single sparse matrix-vector product. The assembler is cached on the
+        mesh for each tensor type.
+
+        Parameters
+        ----------
+        tensor_type : int or numpy.ndarray, optional
+            The type of the physical property: 1 for isotropic, 2 for diagonal
+            anisotropic, and 3 for full tensor properties. Alternatively, an
+            example model from which the type is inferred.
+
+        Returns
+        -------
+        discretize.operators.inner_product_assembler.InnerProductAssembler
+
+        Examples
+        --------
+        >>> from discretize import SimplexMesh
+        >>> from discretize.utils import example_simplex_mesh
+        >>> import numpy as np
+        >>> mesh = SimplexMesh(*example_simplex_mesh((5, 6, 7)))
+        >>> assemble_Mf = mesh.get_face_inner_product_assembler()
+        >>> sigma = np.random.rand(mesh.n_cells)
+        >>> Mf = assemble_Mf(sigma)
+        >>> v = np.random.rand(mesh.n_faces)
+        >>> dMf_dsigma = assemble_Mf.deriv(v)
+        >>> dMf_dsigma.shape == (mesh.n_faces, mesh.n_cells)
+        True
+        """
+        return self.__get_inner_product_assembler("F", tensor_type)
+
+    def get_edge_inner_product_assembler(self, tensor_type=1):
+        """Get a reusable assembler for the edge inner product matrix.
 
-        A = np.sum([P.T @ Mu @ P for P in Ps])
-        return A
+        The assembler precomputes the local mass blocks of every simplex and
+        their scatter map into the edge inner product matrix once, so that
+        assembling the matrix, or its derivative, for a new model is a
+        single sparse matrix-vector product. The assembler is cached on the
+        mesh for each tensor type.
+
+        Parameters
+        ----------
+        tensor_type : int or numpy.ndarray, optional
+            The type of the physical property: 1 for isotropic, 2 for diagonal
+            anisotropic, and 3 for full tensor properties. Alternatively, an
+            example model from which the type is inferred.
+
+        Returns
+        -------
+        discretize.operators.inner_product_assembler.InnerProductAssembler
+        """
+        return self.__get_inner_product_assembler("E", tensor_type)
+
+    def __get_inner_product(self, i_type, model, invert_model):
+        if model is None:
+            model = 1.0
+        tensor_type = self.__model_tensor_type(model)
+        assembler = self.__get_inner_product_assembler(i_type, tensor_type)
+        return assembler(model, invert_model=invert_model)
 
     def get_face_inner_product(  # NOQA D102
         self,
@@ -478,7 +832,7 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
             raise NotImplementedError(
                 "The inverse of the inner product matrix with a tetrahedral mesh is not supported."
             )
-        return self.__get_inner_product("F", model, invert_model)
+        return self._to_dtype(self.__get_inner_product("F", model, invert_model))
 
     def get_edge_inner_product(  # NOQA D102
         self,
@@ -492,72 +846,20 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
             raise NotImplementedError(
                 "The inverse of the inner product matrix with a tetrahedral mesh is not supported."
             )
-        return self.__get_inner_product("E", model, invert_model)
+        return self._to_dtype(self.__get_inner_product("E", model, invert_model))
 
     def __get_inner_product_deriv_func(self, i_type, model):
-        Ps, _ = self.__get_inner_product_projection_matrices(i_type)
-        dim = self.dim
-        n_cells = self.n_cells
-        if model.size == 1:
-            tensor_type = 0
-        elif model.size == n_cells:
-            tensor_type = 1
-            col_inds = np.repeat(np.arange(n_cells), dim)
-            ind_ptr = np.arange(n_cells * dim + 1)
-        elif model.size == dim * n_cells:
-            tensor_type = 2
-            col_inds = np.arange(dim * n_cells).reshape((n_cells, dim), order="F")
-            col_inds = col_inds.reshape(-1)
-            ind_ptr = np.arange(n_cells * dim + 1)
-        elif model.size == (((dim + 1) * dim) // 2) * n_cells:
-            tensor_type = 3
-            # create a stencil that goes from the model vector ordering
-            # into the anisotropy tensor
-            if dim == 2:
-                stencil = np.array([[0, 2], [2, 1]])
-            elif dim == 3:
-                stencil = np.array([[0, 3, 4], [3, 1, 5], [4, 5, 2]])
-            col_inds = n_cells * stencil + np.arange(n_cells)[:, None, None]
-            col_inds = col_inds.reshape(-1)
-            ind_ptr = dim * np.arange(n_cells * dim + 1)
-        else:
-            raise ValueError("Unrecognized size of model vector")
-        inv_items = model.size
-
-        if i_type == "F":
-            n_items = self.n_faces
-        elif i_type == "E":
-            n_items = self.n_edges
+        tensor_type = self.__model_tensor_type(model)
+        assembler = self.__get_inner_product_assembler(i_type, tensor_type)
 
         def func(v):
-            dMdm = spzeros(n_items, inv_items)
             if tensor_type == 0:
-                for P in Ps:
-                    dMdm = dMdm + sp.csr_matrix(
-                        (P.T * (P * v), (range(n_items), np.zeros(n_items))),
-                        shape=(n_items, inv_items),
-                    )
-            elif tensor_type == 1:
-                for P in Ps:
-                    ys = P @ v
-                    dMdm = dMdm + P.T @ sp.csr_matrix(
-                        (ys, col_inds, ind_ptr), shape=(n_cells * dim, inv_items)
-                    )
-            elif tensor_type == 2:
-                for P in Ps:
-                    ys = P @ v
-                    dMdm = dMdm + P.T @ sp.csr_matrix(
-                        (ys, col_inds, ind_ptr), shape=(n_cells * dim, inv_items)
-                    )
-            elif tensor_type == 3:
-                for P in Ps:
-                    ys = P @ v
-                    ys = np.repeat(ys, dim).reshape((-1, dim, dim))
-                    ys = ys.transpose((0, 2, 1)).reshape(-1)
-                    dMdm = dMdm + P.T @ sp.csr_matrix(
-                        (ys, col_inds, ind_ptr), shape=(n_cells * dim, inv_items)
-                    )
-            return dMdm
+                # a single parameter scales the whole matrix
+                return sp.csr_matrix((assembler() @ v)[:, None])
+            if tensor_type == 1:
+                return assembler.deriv(v).tocsr()
+            # anisotropic derivatives are built directly from the local blocks
+            return assembler._local_jacobian(v)
 
         return func
 
@@ -571,7 +873,7 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
             )
         if invert_matrix:
             raise NotImplementedError("Inverted matrix derivatives are not supported")
-        return self.__get_inner_product_deriv_func("F", model)
+        return self._to_dtype(self.__get_inner_product_deriv_func("F", model))
 
     def get_edge_inner_product_deriv(  # NOQA D102
         self, model, do_fast=True, invert_model=False, invert_matrix=False
@@ -583,7 +885,7 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
             )
         if invert_matrix:
             raise NotImplementedError("Inverted matrix derivatives are not supported")
-        return self.__get_inner_product_deriv_func("E", model)
+        return self._to_dtype(self.__get_inner_product_deriv_func("E", model))
 
     @property
     def cell_centers_tree(self):
@@ -597,50 +899,135 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
             self._cc_tree = KDTree(self.cell_centers)
         return self._cc_tree
 
-    def point2index(self, locs):  # NOQA D102
-        # Documentation inherited from discretize.base.BaseMesh
-        tree = self.cell_centers_tree
+    def _find_simplices(
+        self,
+        locs,
+        zeros_outside=False,
+        return_bary=True,
+        n_threads=None,
+        coherent=False,
+    ):
+        """Find the simplices containing each location with a directed search.
+
+        Each search starts from the nearest cell center, or with `coherent`
+        from the simplex found for the previous location.
+        """
+        locs = np.require(np.atleast_2d(locs), dtype=np.float64, requirements="C")
+        n_threads = _n_threads(n_threads)
+        chunk_size = 0
+        if coherent:
+            # split the locations into a few chunks per thread, only the first
+            # location of each chunk needs a starting guess.
+            n_chunks = min(len(locs), 4 * n_threads) if n_threads > 1 else 1
+            chunk_size = -(-len(locs) // max(n_chunks, 1))
+            starts = locs[::chunk_size] if chunk_size > 0 else locs
+        else:
+            starts = locs
         # for each location, find the nearest cell center as an initial guess for
         # the nearest simplex, then use a directed search to further refine
-        _, nearest_cc = tree.query(locs)
-        nodes = self.nodes
-        simplex_nodes = self.simplices
+        _, nearest_cc = self.cell_centers_tree.query(starts, workers=n_threads)
         transform, shift = self.transform_and_shift
         return _directed_search(
-            np.atleast_2d(locs),
+            locs,
             np.atleast_1d(nearest_cc),
-            nodes,
-            simplex_nodes,
             self.neighbors,
             transform,
             shift,
-            return_bary=False,
+            zeros_outside=zeros_outside,
+            return_bary=return_bary,
+            n_threads=n_threads,
+            chunk_size=chunk_size,
         )
 
-    def get_interpolation_matrix(  # NOQA D102
-        self, loc, location_type="cell_centers", zeros_outside=False, **kwargs
+    def point2index(self, locs, n_threads=None, coherent=False):
+        """Find cells that contain the given points.
+
+        Returns an array of index values of the cells that contain the given
+        points
+
+        Parameters
+        ----------
+        locs: (N, dim) array_like
+            points to search for the location of
+        n_threads : int, optional
+            Number of threads used by the search. By default, the points are
+            searched serially. Several threads require discretize to be built
+            with OpenMP, otherwise a warning is issued.
+        coherent : bool, optional
+            Whether consecutive points are close to each other (e.g. points
+            sorted along a profile line). If *True*, the search for each point
+            starts from the cell containing the previous point, instead of
+            the cell with the nearest cell center.
+
+        Returns
+        -------
+        (N) array_like of int
+            Cell indices that contain the points
+        """
+        return self._find_simplices(
+            locs, return_bary=False, n_threads=n_threads, coherent=coherent
+        )
+
+    def get_interpolation_matrix(
+        self,
+        loc,
+        location_type="cell_centers",
+        zeros_outside=False,
+        n_threads=None,
+        coherent=False,
+        **kwargs,
     ):
-        # Documentation inherited from discretize.base.BaseMesh
+        """Construct a linear interpolation matrix from mesh.
+
+        This method constructs a linear interpolation matrix from tensor locations
+        (nodes, cell-centers, faces, etc...) on the mesh to a set of arbitrary locations.
+
+        Parameters
+        ----------
+        loc : (n_pts, dim) numpy.ndarray
+            Location of points being to interpolate to. Must have same dimensions as the mesh.
+        location_type : str, optional
+            Tensor locations on the mesh being interpolated from. *location_type* must be one of:
+
+            - 'Ex', 'edges_x'           -> x-component of field defined on x edges
+            - 'Ey', 'edges_y'           -> y-component of field defined on y edges
+            - 'Ez', 'edges_z'           -> z-component of field defined on z edges
+            - 'Fx', 'faces_x'           -> x-component of field defined on x faces
+            - 'Fy', 'faces_y'           -> y-component of field defined on y faces
+            - 'Fz', 'faces_z'           -> z-component of field defined on z faces
+            - 'N', 'nodes'              -> scalar field defined on nodes
+            - 'CC', 'cell_centers'      -> scalar field defined on cell centers
+        zeros_outside : bool, optional
+            If *False*, nearest neighbour is used to compute the interpolate value
+            at locations outside the mesh. If *True* , values at locations outside
+            the mesh will be zero.
+        n_threads : int, optional
+            Number of threads used to locate the points. By default, the
+            points are located serially. Several threads require discretize
+            to be built with OpenMP, otherwise a warning is issued.
+        coherent : bool, optional
+            Whether consecutive points are close to each other (e.g. points
+            sorted along a profile line). If *True*, the search for each point
+            starts from the cell containing the previous point, instead of
+            the cell with the nearest cell center.
+
+        Returns
+        -------
+        (n_pts, n_loc_type) scipy.sparse.csr_matrix
+            A sparse matrix which interpolates the specified tensor quantity on mesh to
+            the set of specified locations.
+        """
         location_type = self._parse_location_type(location_type)
-        tree = self.cell_centers_tree
-        # for each location, find the nearest cell center as an initial guess for
-        # the nearest simplex, then use a directed search to further refine
-        loc = np.atleast_2d(loc)
-        _, nearest_cc = tree.query(loc)
-        nodes = self.nodes
+        loc = np.require(np.atleast_2d(loc), dtype=np.float64, requirements="C")
         simplex_nodes = self.simplices
         transform, shift = self.transform_and_shift
 
-        inds, barys = _directed_search(
+        inds, barys = self._find_simplices(
             loc,
-            nearest_cc,
-            nodes,
-            simplex_nodes,
-            self.neighbors,
-            transform,
-            shift,
             zeros_outside=zeros_outside,
             return_bary=True,
+            n_threads=n_threads,
+            coherent=coherent,
         )
 
         if zeros_outside:
@@ -661,12 +1048,14 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
             # which will also be the cells used to interpolate from.
             mat = self.average_node_to_cell.T[which_node].tocsr()
             # this will overwrite the "mat" matrices data to create the interpolation
-            _interp_cc(loc, self.cell_centers, mat.data, mat.indices, mat.indptr)
+            mat = mat.astype(np.float64, copy=False)
+            cell_centers = np.require(self.cell_centers, dtype=np.float64)
+            _interp_cc(loc, cell_centers, mat.data, mat.indices, mat.indptr)
             if zeros_outside:
                 e = np.ones(n_loc)
                 e[inds == -1] = 0.0
                 mat = sp.diags(e, format="csr") @ mat
-            return mat
+            return self._to_dtype(mat)
         else:
             component = location_type[-1]
             if component == "x":
@@ -788,7 +1177,9 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
                     ind_ptr = 4 * np.arange(n_loc + 1)
                 col_inds = faces.reshape(-1)
                 n_items = self.n_faces
-        return sp.csr_matrix((Aij, col_inds, ind_ptr), shape=(n_loc, n_items))
+        return self._to_dtype(
+            sp.csr_matrix((Aij, col_inds, ind_ptr), shape=(n_loc, n_items))
+        )
 
     @property
     def average_node_to_cell(self):  # NOQA D102
@@ -799,7 +1190,9 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
         ind_ptr = nodes_per_cell * np.arange(n_cells + 1)
         col_inds = self.simplices.reshape(-1)
         Aij = np.full(nodes_per_cell * n_cells, 1 / nodes_per_cell)
-        return sp.csr_matrix((Aij, col_inds, ind_ptr), shape=(n_cells, self.n_nodes))
+        return self._to_dtype(
+            sp.csr_matrix((Aij, col_inds, ind_ptr), shape=(n_cells, self.n_nodes))
+        )
 
     @property
     def average_node_to_face(self):  # NOQA D102
@@ -810,7 +1203,9 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
         ind_ptr = nodes_per_face * np.arange(n_faces + 1)
         col_inds = self._faces.reshape(-1)
         Aij = np.full(nodes_per_face * n_faces, 1 / nodes_per_face)
-        return sp.csr_matrix((Aij, col_inds, ind_ptr), shape=(n_faces, self.n_nodes))
+        return self._to_dtype(
+            sp.csr_matrix((Aij, col_inds, ind_ptr), shape=(n_faces, self.n_nodes))
+        )
 
     @property
     def average_node_to_edge(self):  # NOQA D102
@@ -820,7 +1215,9 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
         ind_ptr = 2 * np.arange(n_edges + 1)
         col_inds = self._edges.reshape(-1)
         Aij = np.full(2 * n_edges, 0.5)
-        return sp.csr_matrix((Aij, col_inds, ind_ptr), shape=(n_edges, self.n_nodes))
+        return self._to_dtype(
+            sp.csr_matrix((Aij, col_inds, ind_ptr), shape=(n_edges, self.n_nodes))
+        )
 
     @property
     def average_cell_to_node(self):
@@ -842,7 +1239,7 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
 
         A = sp.csr_matrix((weights, (simps, cells)), shape=(self.n_nodes, self.n_cells))
         norm = sp.diags(1.0 / np.asarray(A.sum(axis=1))[:, 0])
-        return norm @ A
+        return self._to_dtype(norm @ A)
 
     @property
     def average_cell_to_edge(self):  # NOQA D102
@@ -857,7 +1254,7 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
 
         A = sp.csr_matrix((weights, (simps, cells)), shape=(self.n_edges, self.n_cells))
         norm = sp.diags(1.0 / np.asarray(A.sum(axis=1))[:, 0])
-        return norm @ A
+        return self._to_dtype(norm @ A)
 
     @property
     def average_face_to_cell_vector(self):  # NOQA D102
@@ -878,7 +1275,7 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
         ind = np.arange(Av.shape[0]).reshape(n_cells, -1).flatten(order="F")
         P = sp.eye(Av.shape[0], format="csr")[ind]
         Av = P @ Av
-        return Av
+        return self._to_dtype(Av)
 
     @property
     def average_edge_to_cell_vector(self):  # NOQA D102
@@ -899,7 +1296,7 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
         ind = np.arange(Av.shape[0]).reshape(n_cells, -1).flatten(order="F")
         P = sp.eye(Av.shape[0], format="csr")[ind]
         Av = P @ Av
-        return Av
+        return self._to_dtype(Av)
 
     @property
     def average_face_to_cell(self):  # NOQA D102
@@ -911,8 +1308,11 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
         Aij = np.full((n_cells, n_face_per_cell), 1.0 / n_face_per_cell)
         row_ptr = np.arange(n_cells + 1) * (n_face_per_cell)
 
-        return sp.csr_matrix(
-            (Aij.reshape(-1), col_inds.reshape(-1), row_ptr), shape=(n_cells, n_faces)
+        return self._to_dtype(
+            sp.csr_matrix(
+                (Aij.reshape(-1), col_inds.reshape(-1), row_ptr),
+                shape=(n_cells, n_faces),
+            )
         )
 
     @property
@@ -925,8 +1325,11 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
         Aij = np.full((n_cells, n_edge_per_cell), 1.0 / (n_edge_per_cell))
         row_ptr = np.arange(n_cells + 1) * (n_edge_per_cell)
 
-        return sp.csr_matrix(
-            (Aij.reshape(-1), col_inds.reshape(-1), row_ptr), shape=(n_cells, n_edges)
+        return self._to_dtype(
+            sp.csr_matrix(
+                (Aij.reshape(-1), col_inds.reshape(-1), row_ptr),
+                shape=(n_cells, n_edges),
+            )
         )
 
     @property
@@ -936,7 +1339,7 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
         row_sum = np.asarray(A.sum(axis=-1))[:, 0]
         row_sum[row_sum == 0.0] = 1.0
         A = sp.diags(1.0 / row_sum) @ A
-        return A
+        return self._to_dtype(A)
 
     @property
     def stencil_cell_gradient(self):  # NOQA D102
@@ -963,7 +1366,7 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
         -------
         (n_faces) numpy.ndarray of bool
         """
-        if getattr(self, "_boundary_face_list", None) is None:
+        if getattr(self, "_is_boundary_face", None) is None:
             ind_dir = np.where(self.neighbors == -1)
             self._is_boundary_face = self._simplex_faces[ind_dir]
         return self._is_boundary_face
@@ -971,7 +1374,9 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
     @property
     def project_face_to_boundary_face(self):  # NOQA D102
         # Documentation inherited from discretize.base.BaseMesh
-        return sp.eye(self.n_faces, format="csr")[self.boundary_face_list]
+        return sp.eye(self.n_faces, format="csr", dtype=self._dtype)[
+            self.boundary_face_list
+        ]
 
     @property
     def project_edge_to_boundary_edge(self):  # NOQA D102
@@ -979,19 +1384,19 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
         if self.dim == 2:
             return self.project_face_to_boundary_face
         bound_edges = np.unique(self._face_edges[self.boundary_face_list])
-        return sp.eye(self.n_edges, format="csr")[bound_edges]
+        return sp.eye(self.n_edges, format="csr", dtype=self._dtype)[bound_edges]
 
     @property
     def project_node_to_boundary_node(self):  # NOQA D102
         # Documentation inherited from discretize.base.BaseMesh
         bound_nodes = np.unique(self._faces[self.boundary_face_list])
-        return sp.eye(self.n_nodes, format="csr")[bound_nodes]
+        return sp.eye(self.n_nodes, format="csr", dtype=self._dtype)[bound_nodes]
 
     @property
     def boundary_nodes(self):  # NOQA D102
         # Documentation inherited from discretize.base.BaseMesh
         bound_nodes = np.unique(self._faces[self.boundary_face_list])
-        return self.nodes[bound_nodes]
+        return self._to_dtype(self.nodes[bound_nodes])
 
     @property
     def boundary_edges(self):  # NOQA D102
@@ -999,12 +1404,12 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
         if self.dim == 2:
             return self.boundary_faces
         bound_nodes = np.unique(self._face_edges[self.boundary_face_list])
-        return self.edges[bound_nodes]
+        return self._to_dtype(self.edges[bound_nodes])
 
     @property
     def boundary_faces(self):  # NOQA D102
         # Documentation inherited from discretize.base.BaseMesh
-        return self.faces[self.boundary_face_list]
+        return self._to_dtype(self.faces[self.boundary_face_list])
 
     @property
     def boundary_face_outward_normals(self):  # NOQA D102
@@ -1017,7 +1422,7 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
         direc = np.sign(np.einsum("ij,ij->i", bound_face_normals, out_ish))
         boundary_face_outward_normals = direc[:, None] * bound_face_normals
 
-        return boundary_face_outward_normals
+        return self._to_dtype(boundary_face_outward_normals)
 
     @property
     def boundary_face_scalar_integral(self):  # NOQA D102
@@ -1028,7 +1433,7 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
             (P @ self.face_normals) * self.boundary_face_outward_normals, axis=-1
         )
         A = sp.diags(self.face_areas) @ P.T @ sp.diags(w_h_dot_normal)
-        return A
+        return self._to_dtype(A)
 
     @property
     def boundary_node_vector_integral(self):  # NOQA D102
@@ -1045,8 +1450,11 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
         diags = u_dot_ds.T
         offsets = n_boundary_nodes * np.arange(self.dim)
 
-        return Pn.T @ sp.diags(
-            diags, offsets, shape=(n_boundary_nodes, self.dim * n_boundary_nodes)
+        return self._to_dtype(
+            Pn.T
+            @ sp.diags(
+                diags, offsets, shape=(n_boundary_nodes, self.dim * n_boundary_nodes)
+            )
         )
 
     @property
@@ -1085,7 +1493,7 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
         #         for j in range(3):
         #             Ps[j] = Ps[j] + sp.csr_matrix((w_cross_n[:, j], (index, index)), shape=(n_edges, n_edges)) @ Pe.T
         #     M_be = sp.hstack(Ps)
-        return M_be
+        return self._to_dtype(M_be)
 
     def __reduce__(self):
         """Return the class and attributes necessary to reconstruct the mesh."""
@@ -1093,3 +1501,54 @@ class SimplexMesh(BaseMesh, SimplexMeshIO, InterfaceMixins):
             self.nodes,
             self.simplices,
         )
+
+
+def _reorder_simplices(nodes, simplices, method, n_threads=None):
+    """Compute a bandwidth reducing order of the nodes and cells of a mesh.
+
+    Parameters
+    ----------
+    nodes : (n_nodes, dim) numpy.ndarray of float
+        The nodes of the mesh.
+    simplices : (n_cells, dim + 1) numpy.ndarray of int
+        The node indices of each simplex.
+    method : {"rcm", "hilbert"}
+        Order the nodes with the reverse Cuthill-McKee algorithm and the cells
+        by their sorted nodes, or the cells along a Hilbert curve through their
+        centers and the nodes by their first appearance in the cells.
+    n_threads : int, optional
+        Number of threads used for the Hilbert curve.
+
+    Returns
+    -------
+    node_permutation : (n_nodes) numpy.ndarray of int
+        The original index of each reordered node.
+    cell_permutation : (n_cells) numpy.ndarray of int
+        The original index of each reordered cell.
+    """
+    n_nodes = nodes.shape[0]
+    n_cells, n_vert = simplices.shape
+    if method == "rcm":
+        rows = np.repeat(simplices, n_vert, axis=1).reshape(-1)
+        cols = np.tile(simplices, (1, n_vert)).reshape(-1)
+        graph = sp.csr_matrix(
+            (np.ones(len(rows), dtype=np.int8), (rows, cols)),
+            shape=(n_nodes, n_nodes),
+        )
+        node_perm = reverse_cuthill_mckee(graph, symmetric_mode=True).astype(np.int64)
+        node_inv = np.empty_like(node_perm)
+        node_inv[node_perm] = np.arange(n_nodes)
+        relabeled = np.sort(node_inv[simplices], axis=1)
+        cell_perm = np.lexsort(relabeled.T[::-1])
+    elif method == "hilbert":
+        centers = np.mean(nodes[simplices], axis=1)
+        keys = _hilbert_keys(centers, _n_threads(n_threads))
+        cell_perm = np.argsort(keys, kind="stable")
+        # the nodes follow their first appearance in the ordered cells, and
+        # unused nodes are kept at the end
+        used, first = np.unique(simplices[cell_perm], return_index=True)
+        unused = np.setdiff1d(np.arange(n_nodes), used)
+        node_perm = np.r_[used[np.argsort(first)], unused].astype(np.int64)
+    else:
+        raise ValueError(f"reorder must be either 'rcm' or 'hilbert', got {method!r}.")
+    return node_perm, cell_perm
@@ -75,6 +75,7 @@ Matrix Utilities
   inverse_3x3_block_diagonal
   inverse_2x2_block_diagonal
   invert_blocks
+  solve_blocks
   make_property_tensor
   inverse_property_tensor
 
@@ -121,6 +122,7 @@ from discretize.utils.matrix_utils import (
     inverse_3x3_block_diagonal,
     inverse_2x2_block_diagonal,
     invert_blocks,
+    solve_blocks,
     TensorType,
     make_property_tensor,
     inverse_property_tensor,
@@ -2,6 +2,8 @@
 import numpy as np
 import warnings
 
+from discretize._extensions.matrix_ext import _openmp_enabled
+
 SCALARTYPES = (complex, float, int, np.number)
 
 
@@ -71,6 +73,23 @@ def as_array_n_by_dim(pts, dim):
     return pts
 
 
+def _n_threads(n_threads):
+    """Return the number of threads of a compiled kernel, ``None`` meaning one.
+
+    Warns if several threads are requested from extensions built without
+    OpenMP, which then run serially.
+    """
+    n_threads = 1 if n_threads is None else int(n_threads)
+    if n_threads > 1 and not _openmp_enabled():
+        warnings.warn(
+            "discretize was built without OpenMP, "
+            f"n_threads={n_threads} runs on a single thread.",
+            RuntimeWarning,
+            stacklevel=3,
+        )
+    return n_threads
+
+
 def requires(modules):
     """Decorate a function with soft dependencies.
 
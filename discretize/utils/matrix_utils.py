@@ -1,7 +1,13 @@
 """Useful functions for working with vectors and matrices."""
 import numpy as np
 import scipy.sparse as sp
-from discretize.utils.code_utils import is_scalar, deprecate_function
+from discretize.utils.code_utils import is_scalar, deprecate_function, _n_threads
+from discretize._extensions.matrix_ext import (
+    _inverse_2x2_elements,
+    _inverse_3x3_elements,
+    _invert_blocks,
+    _solve_blocks,
+)
 import warnings
 
 
@@ -111,7 +117,15 @@ def sdiag(v):
     if isinstance(v, Zero):
         return Zero()
 
-    return sp.spdiags(mkvc(v), 0, v.size, v.size, format="csr")
+    # build the CSR arrays directly, keeping the dtype of v (e.g. complex)
+    v = mkvc(v)
+    n = v.size
+    nonzero = v != 0
+    index_dtype = np.int32 if n < np.iinfo(np.int32).max else np.int64
+    indices = np.flatnonzero(nonzero).astype(index_dtype, copy=False)
+    indptr = np.zeros(n + 1, dtype=index_dtype)
+    np.cumsum(nonzero, out=indptr[1:])
+    return sp.csr_matrix((v[indices], indices, indptr), shape=(n, n), copy=False)
 
 
 def sdinv(M):
@@ -157,7 +171,7 @@ def speye(n):
     (n, n) scipy.sparse.csr_matrix
         The sparse identity matrix.
     """
-    return sp.identity(n, format="csr")
+    return _downcast_indices(sp.identity(n, format="csr"))
 
 
 def kron3(A, B, C):
@@ -176,7 +190,7 @@ def kron3(A, B, C):
     scipy.sparse.csr_matrix
         Kroneker between the 3 sparse matrices.
     """
-    return sp.kron(sp.kron(A, B), C, format="csr")
+    return _downcast_indices(sp.kron(sp.kron(A, B), C, format="csr"))
 
 
 def spzeros(n1, n2):
@@ -197,6 +211,56 @@ def spzeros(n1, n2):
     return sp.dia_matrix((n1, n2))
 
 
+def _downcast_indices(A):
+    """Store the index arrays of a sparse matrix as int32 if they fit.
+
+    The index arrays of `A` are replaced (not modified) in place. Keeping the
+    operators' indices 32 bit means their products with each other also stay 32
+    bit, as scipy only promotes the index type of a product if one of its
+    operands uses 64 bit indices or the result is too large.
+    """
+    int32_max = np.iinfo(np.int32).max
+    if max(A.shape) > int32_max or A.nnz > int32_max:
+        return A
+    if A.format in ["csr", "csc", "bsr"]:
+        A.indices = A.indices.astype(np.int32, copy=False)
+        A.indptr = A.indptr.astype(np.int32, copy=False)
+    elif A.format == "coo":
+        A.row = A.row.astype(np.int32, copy=False)
+        A.col = A.col.astype(np.int32, copy=False)
+    return A
+
+
+def _sparse_matmul(A, x):
+    """Multiply a sparse matrix by a dense array, without upcasting a real matrix.
+
+    scipy multiplies a real sparse matrix by a complex array by first copying
+    the matrix's values to a complex array. Here a complex `x` is instead viewed
+    as a real array holding its real and imaginary parts side by side, so that
+    both are multiplied by the real matrix in a single pass, and the result is
+    viewed back as complex.
+
+    Parameters
+    ----------
+    A : (m, n) scipy.sparse.spmatrix
+        The sparse matrix.
+    x : (n) or (n, k) numpy.ndarray
+        The array to multiply.
+
+    Returns
+    -------
+    (m) or (m, k) numpy.ndarray
+    """
+    x = np.asarray(x)
+    if not np.iscomplexobj(x) or np.issubdtype(A.dtype, np.complexfloating):
+        return A @ x
+    x = np.ascontiguousarray(x)
+    out = A @ x.view(x.real.dtype).reshape((x.shape[0], -1))
+    dtype = np.result_type(out.dtype, np.complex64)
+    out = np.ascontiguousarray(out).view(dtype)
+    return out.reshape(-1) if x.ndim == 1 else out
+
+
 def ddx(n):
     r"""Create 1D difference (derivative) operator from nodes to centers.
 
@@ -221,7 +285,8 @@ def ddx(n):
     (n, n + 1) scipy.sparse.csr_matrix
         The 1D difference operator from nodes to centers.
     """
-    return sp.spdiags((np.ones((n + 1, 1)) * [-1, 1]).T, [0, 1], n, n + 1, format="csr")
+    D = sp.spdiags((np.ones((n + 1, 1)) * [-1, 1]).T, [0, 1], n, n + 1, format="csr")
+    return _downcast_indices(D)
 
 
 def av(n):
@@ -248,9 +313,10 @@ def av(n):
     (n, n + 1) scipy.sparse.csr_matrix
         The 1D averaging operator from nodes to centers.
     """
-    return sp.spdiags(
+    A = sp.spdiags(
         (0.5 * np.ones((n + 1, 1)) * [1, 1]).T, [0, 1], n, n + 1, format="csr"
     )
+    return _downcast_indices(A)
 
 
 def av_extrap(n):
@@ -284,7 +350,7 @@ def av_extrap(n):
     Av = sp.spdiags(
         (0.5 * np.ones((n, 1)) * [1, 1]).T, [-1, 0], n + 1, n, format="csr"
     ) + sp.csr_matrix(([0.5, 0.5], ([0, n], [0, n - 1])), shape=(n + 1, n))
-    return Av
+    return _downcast_indices(Av)
 
 
 def ndgrid(*args, vector=True, order="F"):
@@ -602,8 +668,61 @@ def get_subarray(A, ind):
         raise Exception("get_subarray does not support dimension asked.")
 
 
+def _block_kernel_dtype(*arrays):
+    """Return the dtype the compiled block kernels use for `arrays`.
+
+    Single and double precision (real or complex) arrays keep their precision,
+    anything else (e.g. integers) is computed in double precision.
+    """
+    dtype = np.result_type(*arrays)
+    if dtype in [np.float32, np.float64, np.complex64, np.complex128]:
+        return dtype
+    if np.issubdtype(dtype, np.complexfloating):
+        return np.dtype(np.complex128)
+    return np.dtype(np.float64)
+
+
+def _diagonal_blocks_matrix(data, sparse_format="csr"):
+    """Build a sparse matrix made of a grid of diagonal blocks.
+
+    `data` is a (dim, n, m) array whose entry ``data[a, i]`` fills row
+    ``a * n + i`` of the (dim * n, dim * n) matrix. If ``m == dim`` the row holds
+    the entries of block ``(a, b)`` in columns ``b * n + i``, and if ``m == 1``
+    the matrix is diagonal. The CSR arrays are filled directly, with sorted
+    and (if they fit) 32 bit indices.
+    """
+    dim, n, m = data.shape
+    n_rows = dim * n
+    index_dtype = np.int32 if n_rows * m < np.iinfo(np.int32).max else np.int64
+    indptr = np.arange(0, n_rows * m + 1, m, dtype=index_dtype)
+    if m == 1:
+        indices = np.arange(n_rows, dtype=index_dtype)
+    else:
+        indices = np.arange(0, n_rows, n, dtype=index_dtype)[None, None, :]
+        indices = indices + np.arange(n, dtype=index_dtype)[:, None]
+        indices = np.broadcast_to(indices, (dim, n, dim)).reshape(-1)
+    M = sp.csr_matrix(
+        (data.reshape(-1), indices, indptr), shape=(n_rows, n_rows), copy=False
+    )
+    if sparse_format != "csr":
+        M = M.asformat(sparse_format)
+    return M
+
+
 def inverse_3x3_block_diagonal(
-    a11, a12, a13, a21, a22, a23, a31, a32, a33, return_matrix=True, **kwargs
+    a11,
+    a12,
+    a13,
+    a21,
+    a22,
+    a23,
+    a31,
+    a32,
+    a33,
+    return_matrix=True,
+    out=None,
+    n_threads=None,
+    **kwargs,
 ):
     r"""Invert a set of 3x3 matricies from vectors containing their elements.
 
@@ -615,10 +734,17 @@ def inverse_3x3_block_diagonal(
     return_matrix : bool, optional
         - **True**: Returns the sparse block 3x3 matrix *M* (default).
         - **False:** Returns the vectors containing the elements of each matrix' inverse.
+    out : sequence of 9 (n_blocks) numpy.ndarray, optional
+        Arrays to store *b11, b12, ..., b33* in. These may be the input arrays,
+        to invert the matrices in place.
+    n_threads : int, optional
+        Number of threads used to invert the matrices. By default, they are
+        inverted serially. Several threads require discretize to be built
+        with OpenMP, otherwise a warning is issued.
 
     Returns
     -------
-    (3 * n_blocks, 3 * n_blocks) scipy.sparse.coo_matrix or list of (n_blocks)
+    (3 * n_blocks, 3 * n_blocks) scipy.sparse.csr_matrix or tuple of (n_blocks)
         numpy.ndarray. If *return_matrix = False*, the function will return vectors
         *b11, b12, b13, b21, b22, b23, b31, b32, b33*. If *return_matrix = True*, the
         function will return the block matrix *M*.
@@ -718,50 +844,25 @@ def inverse_3x3_block_diagonal(
         )
         return_matrix = kwargs["returnMatrix"]
 
-    a11 = mkvc(a11)
-    a12 = mkvc(a12)
-    a13 = mkvc(a13)
-    a21 = mkvc(a21)
-    a22 = mkvc(a22)
-    a23 = mkvc(a23)
-    a31 = mkvc(a31)
-    a32 = mkvc(a32)
-    a33 = mkvc(a33)
-
-    detA = (
-        a31 * a12 * a23
-        - a31 * a13 * a22
-        - a21 * a12 * a33
-        + a21 * a13 * a32
-        + a11 * a22 * a33
-        - a11 * a23 * a32
+    a = np.broadcast_arrays(
+        *(mkvc(x) for x in [a11, a12, a13, a21, a22, a23, a31, a32, a33])
+    )
+    if out is None:
+        out = np.empty((9, a[0].size), dtype=_block_kernel_dtype(*a))
+    dtype = out[0].dtype
+    _inverse_3x3_elements(
+        *(x.astype(dtype, copy=False) for x in a), *out, _n_threads(n_threads)
     )
-
-    b11 = +(a22 * a33 - a23 * a32) / detA
-    b12 = -(a12 * a33 - a13 * a32) / detA
-    b13 = +(a12 * a23 - a13 * a22) / detA
-
-    b21 = +(a31 * a23 - a21 * a33) / detA
-    b22 = -(a31 * a13 - a11 * a33) / detA
-    b23 = +(a21 * a13 - a11 * a23) / detA
-
-    b31 = -(a31 * a22 - a21 * a32) / detA
-    b32 = +(a31 * a12 - a11 * a32) / detA
-    b33 = -(a21 * a12 - a11 * a22) / detA
 
     if not return_matrix:
-        return b11, b12, b13, b21, b22, b23, b31, b32, b33
+        return tuple(out)
 
-    return sp.vstack(
-        (
-            sp.hstack((sdiag(b11), sdiag(b12), sdiag(b13))),
-            sp.hstack((sdiag(b21), sdiag(b22), sdiag(b23))),
-            sp.hstack((sdiag(b31), sdiag(b32), sdiag(b33))),
-        )
-    )
+    return _diagonal_blocks_matrix(np.reshape(out, (3, 3, -1)).transpose((0, 2, 1)))
 
 
-def inverse_2x2_block_diagonal(a11, a12, a21, a22, return_matrix=True, **kwargs):
+def inverse_2x2_block_diagonal(
+    a11, a12, a21, a22, return_matrix=True, out=None, n_threads=None, **kwargs
+):
     r"""
     Invert a set of 2x2 matricies from vectors containing their elements.
 
@@ -773,10 +874,17 @@ def inverse_2x2_block_diagonal(a11, a12, a21, a22, return_matrix=True, **kwargs)
     return_matrix : bool, optional
         - **True:** Returns the sparse block 2x2 matrix *M*.
         - **False:** Returns the vectors containing the elements of each matrix' inverse.
+    out : sequence of 4 (n_blocks) numpy.ndarray, optional
+        Arrays to store *b11, b12, b21, b22* in. These may be the input arrays,
+        to invert the matrices in place.
+    n_threads : int, optional
+        Number of threads used to invert the matrices. By default, they are
+        inverted serially. Several threads require discretize to be built
+        with OpenMP, otherwise a warning is issued.
 
     Returns
     -------
-    (2 * n_blocks, 2 * n_blocks) scipy.sparse.coo_matrix or list of (n_blocks) numpy.ndarray
+    (2 * n_blocks, 2 * n_blocks) scipy.sparse.csr_matrix or tuple of (n_blocks) numpy.ndarray
         If *return_matrix = False*, the function will return vectors
         *b11, b12, b21, b22*.
         If *return_matrix = True*, the function will return the
@@ -870,28 +978,21 @@ def inverse_2x2_block_diagonal(a11, a12, a21, a22, return_matrix=True, **kwargs)
         )
         return_matrix = kwargs["returnMatrix"]
 
-    a11 = mkvc(a11)
-    a12 = mkvc(a12)
-    a21 = mkvc(a21)
-    a22 = mkvc(a22)
-
-    # compute inverse of the determinant.
-    detAinv = 1.0 / (a11 * a22 - a21 * a12)
-
-    b11 = +detAinv * a22
-    b12 = -detAinv * a12
-    b21 = -detAinv * a21
-    b22 = +detAinv * a11
+    a = np.broadcast_arrays(*(mkvc(x) for x in [a11, a12, a21, a22]))
+    if out is None:
+        out = np.empty((4, a[0].size), dtype=_block_kernel_dtype(*a))
+    dtype = out[0].dtype
+    _inverse_2x2_elements(
+        *(x.astype(dtype, copy=False) for x in a), *out, _n_threads(n_threads)
+    )
 
     if not return_matrix:
-        return b11, b12, b21, b22
+        return tuple(out)
 
-    return sp.vstack(
-        (sp.hstack((sdiag(b11), sdiag(b12))), sp.hstack((sdiag(b21), sdiag(b22))))
-    )
+    return _diagonal_blocks_matrix(np.reshape(out, (2, 2, -1)).transpose((0, 2, 1)))
 
 
-def invert_blocks(A):
+def invert_blocks(A, out=None, return_matrix=False, n_threads=None):
     """Invert a set of 2x2 or 3x3 matricies.
 
     This is a shortcut function that will only invert 2x2 and 3x3 matrices.
@@ -901,10 +1002,20 @@ def invert_blocks(A):
     ----------
     A : (..., N, N) numpy.ndarray
         the block of matrices to invert, N must be either 2 or 3.
+    out : (..., N, N) numpy.ndarray, optional
+        A C-contiguous array to store the inverted matrices in. Passing `A` inverts
+        the matrices in place.
+    return_matrix : bool, optional
+        If ``True``, return the inverted (n_blocks, N, N) blocks as a block
+        diagonal :class:`scipy.sparse.bsr_matrix` that uses them as its data.
+    n_threads : int, optional
+        Number of threads used to invert the matrices. By default, they are
+        inverted serially. Several threads require discretize to be built
+        with OpenMP, otherwise a warning is issued.
 
     Returns
     -------
-    (..., N, N) numpy.ndarray
+    (..., N, N) numpy.ndarray or (N * n_blocks, N * n_blocks) scipy.sparse.bsr_matrix
         the block of inverted matrices
 
     See Also
@@ -912,6 +1023,7 @@ def invert_blocks(A):
     numpy.linalg.inv : Similar to this function, but is not specialized to 2x2 or 3x3
     inverse_2x2_block_diagonal : use when each element of the blocks is separated
     inverse_3x3_block_diagonal : use when each element of the blocks is separated
+    solve_blocks : apply the inverses to a set of vectors without storing them
 
     Examples
     --------
@@ -928,51 +1040,100 @@ def invert_blocks(A):
            [0., 1., 0.],
            [0., 0., 1.]])
     """
-    if A.shape[-1] != A.shape[-2]:
-        raise ValueError(f"Last two dimensions are not equal, got {A.shape}")
+    A = np.asarray(A)
+    n = _check_blocks(A)
+    if out is None:
+        out = np.empty(A.shape, dtype=_block_kernel_dtype(A))
+    elif out.shape != A.shape or not out.flags.c_contiguous:
+        raise ValueError(
+            f"out must be a C-contiguous array of shape {A.shape}, got {out.shape}"
+        )
+    if return_matrix and A.ndim != 3:
+        raise ValueError(
+            f"A must have shape (n_blocks, {n}, {n}) to return a matrix, got {A.shape}"
+        )
+    _invert_blocks(
+        A.astype(out.dtype, copy=False).reshape((-1, n, n)),
+        out.reshape((-1, n, n)),
+        _n_threads(n_threads),
+    )
 
-    if A.shape[-1] == 2:
-        a11 = A[..., 0, 0]
-        a12 = A[..., 0, 1]
-        a21 = A[..., 1, 0]
-        a22 = A[..., 1, 1]
-
-        detA = a11 * a22 - a21 * a12
-        B = np.empty_like(A)
-        B[..., 0, 0] = a22 / detA
-        B[..., 0, 1] = -a12 / detA
-        B[..., 1, 0] = -a21 / detA
-        B[..., 1, 1] = a11 / detA
-
-    elif A.shape[-1] == 3:
-        a11 = A[..., 0, 0]
-        a12 = A[..., 0, 1]
-        a13 = A[..., 0, 2]
-        a21 = A[..., 1, 0]
-        a22 = A[..., 1, 1]
-        a23 = A[..., 1, 2]
-        a31 = A[..., 2, 0]
-        a32 = A[..., 2, 1]
-        a33 = A[..., 2, 2]
-
-        B = np.empty_like(A)
-        B[..., 0, 0] = a22 * a33 - a23 * a32
-        B[..., 0, 1] = a13 * a32 - a12 * a33
-        B[..., 0, 2] = a12 * a23 - a13 * a22
-
-        B[..., 1, 0] = a31 * a23 - a21 * a33
-        B[..., 1, 1] = a11 * a33 - a31 * a13
-        B[..., 1, 2] = a21 * a13 - a11 * a23
-
-        B[..., 2, 0] = a21 * a32 - a31 * a22
-        B[..., 2, 1] = a31 * a12 - a11 * a32
-        B[..., 2, 2] = a11 * a22 - a21 * a12
-
-        detA = a11 * B[..., 0, 0] + a21 * B[..., 0, 1] + a31 * B[..., 0, 2]
-        B /= detA[..., None, None]
-    else:
+    if not return_matrix:
+        return out
+
+    n_blocks = out.shape[0]
+    index_dtype = np.int32 if n * n_blocks < np.iinfo(np.int32).max else np.int64
+    blocks = np.arange(n_blocks + 1, dtype=index_dtype)
+    return sp.bsr_matrix(
+        (out, blocks[:-1], blocks), shape=(n * n_blocks, n * n_blocks), copy=False
+    )
+
+
+def solve_blocks(A, b, out=None, n_threads=None):
+    """Solve a set of 2x2 or 3x3 linear systems.
+
+    Computes ``x[..., :] = inv(A[..., :, :]) @ b[..., :]`` for every block in a
+    single pass, without storing the inverses of the blocks.
+
+    Parameters
+    ----------
+    A : (..., N, N) numpy.ndarray
+        the block of matrices, N must be either 2 or 3.
+    b : (..., N) numpy.ndarray
+        the right hand side for each matrix.
+    out : (..., N) numpy.ndarray, optional
+        A C-contiguous array to store the solutions in. This may be `b`.
+    n_threads : int, optional
+        Number of threads used to solve the systems. By default, they are
+        solved serially. Several threads require discretize to be built with
+        OpenMP, otherwise a warning is issued.
+
+    Returns
+    -------
+    (..., N) numpy.ndarray
+        the solution for each matrix.
+
+    See Also
+    --------
+    invert_blocks : returns the inverses of the blocks
+
+    Examples
+    --------
+    >>> from discretize.utils import solve_blocks
+    >>> import numpy as np
+    >>> As = np.random.rand(1000, 3, 3) + 3 * np.eye(3)
+    >>> b = np.random.rand(1000, 3)
+    >>> x = solve_blocks(As, b)
+    >>> np.allclose(As[0] @ x[0], b[0])
+    True
+    """
+    A = np.asarray(A)
+    b = np.asarray(b)
+    n = _check_blocks(A)
+    if b.shape != A.shape[:-1]:
+        raise ValueError(f"b must have shape {A.shape[:-1]}, got {b.shape}")
+    if out is None:
+        out = np.empty(b.shape, dtype=_block_kernel_dtype(A, b))
+    elif out.shape != b.shape or not out.flags.c_contiguous:
+        raise ValueError(
+            f"out must be a C-contiguous array of shape {b.shape}, got {out.shape}"
+        )
+    _solve_blocks(
+        A.astype(out.dtype, copy=False).reshape((-1, n, n)),
+        b.astype(out.dtype, copy=False).reshape((-1, n)),
+        out.reshape((-1, n)),
+        _n_threads(n_threads),
+    )
+    return out
+
+
+def _check_blocks(A):
+    """Validate a set of 2x2 or 3x3 matrices, returning their size."""
+    if A.ndim < 2 or A.shape[-1] != A.shape[-2]:
+        raise ValueError(f"Last two dimensions are not equal, got {A.shape}")
+    if A.shape[-1] not in [2, 3]:
         raise NotImplementedError("Only supports 2x2 and 3x3 blocks")
-    return B
+    return A.shape[-1]
 
 
 class TensorType(object):
@@ -1088,7 +1249,7 @@ class TensorType(object):
         return self._tt > v
 
 
-def make_property_tensor(mesh, tensor):
+def make_property_tensor(mesh, tensor, sparse_format="csr"):
     r"""Construct the physical property tensor.
 
     For a given *mesh*, the input parameter *tensor* is a :class:`numpy.ndarray`
@@ -1119,11 +1280,15 @@ def make_property_tensor(mesh, tensor):
         - *Tensor:* A (*nCell*, *nParam*) numpy.ndarray where each row defines
           the full anisotropic property parameters for each cell. *nParam* = 3 for 2D
           meshes and *nParam* = 6 for 3D meshes.
+    sparse_format : str, optional
+        The sparse format of the returned matrix (e.g. ``"csr"``, ``"csc"``,
+        ``"coo"`` or ``"bsr"``). The matrix is built directly in CSR format and
+        converted to any other requested format.
 
     Returns
     -------
-    (dim * n_cells, dim * n_cells) scipy.sparse.coo_matrix
-        The property tensor.
+    (dim * n_cells, dim * n_cells) scipy.sparse.spmatrix
+        The property tensor, as a CSR matrix by default.
 
     Notes
     -----
@@ -1212,35 +1377,29 @@ def make_property_tensor(mesh, tensor):
     if is_scalar(tensor):
         tensor = tensor * np.ones(mesh.nC)
 
+    n_cells, dim = mesh.nC, mesh.dim
     propType = TensorType(mesh, tensor)
     if propType == 1:  # Isotropic!
-        Sigma = sp.kron(sp.identity(mesh.dim), sdiag(mkvc(tensor)))
+        data = np.tile(mkvc(tensor), dim).reshape((dim, n_cells, 1))
     elif propType == 2:  # Diagonal tensor
-        Sigma = sdiag(mkvc(tensor))
-    elif mesh.dim == 2 and tensor.size == mesh.nC * 3:  # Fully anisotropic, 2D
-        tensor = tensor.reshape((mesh.nC, 3), order="F")
-        row1 = sp.hstack((sdiag(tensor[:, 0]), sdiag(tensor[:, 2])))
-        row2 = sp.hstack((sdiag(tensor[:, 2]), sdiag(tensor[:, 1])))
-        Sigma = sp.vstack((row1, row2))
-    elif mesh.dim == 3 and tensor.size == mesh.nC * 6:  # Fully anisotropic, 3D
-        tensor = tensor.reshape((mesh.nC, 6), order="F")
-        row1 = sp.hstack(
-            (sdiag(tensor[:, 0]), sdiag(tensor[:, 3]), sdiag(tensor[:, 4]))
-        )
-        row2 = sp.hstack(
-            (sdiag(tensor[:, 3]), sdiag(tensor[:, 1]), sdiag(tensor[:, 5]))
-        )
-        row3 = sp.hstack(
-            (sdiag(tensor[:, 4]), sdiag(tensor[:, 5]), sdiag(tensor[:, 2]))
-        )
-        Sigma = sp.vstack((row1, row2, row3))
+        data = mkvc(tensor).reshape((dim, n_cells, 1))
+    elif propType == 3:  # Fully anisotropic
+        # index of the parameter for each component of the symmetric tensor
+        if dim == 2:
+            components = [[0, 2], [2, 1]]
+        else:
+            components = [[0, 3, 4], [3, 1, 5], [4, 5, 2]]
+        tensor = tensor.reshape((n_cells, -1), order="F")
+        data = tensor[:, components].transpose((1, 0, 2))
     else:
         raise Exception("Unexpected shape of tensor")
 
-    return Sigma
+    return _diagonal_blocks_matrix(data, sparse_format=sparse_format)
 
 
-def inverse_property_tensor(mesh, tensor, return_matrix=False, **kwargs):
+def inverse_property_tensor(
+    mesh, tensor, return_matrix=False, sparse_format="csr", **kwargs
+):
     r"""Construct the inverse of the physical property tensor.
 
     For a given *mesh*, the input parameter *tensor* is a :class:`numpy.ndarray`
@@ -1278,15 +1437,18 @@ def inverse_property_tensor(mesh, tensor, return_matrix=False, **kwargs):
         - *False:* the function returns the non-zero elements of the inverse of the
           property tensor in a numpy.ndarray in the same order as the input argument
           *tensor*.
+    sparse_format : str, optional
+        The sparse format of the returned matrix if *return_matrix* = *True*. See
+        :func:`make_property_tensor`.
 
     Returns
     -------
-    numpy.ndarray or scipy.sparse.coo_matrix
+    numpy.ndarray or scipy.sparse.spmatrix
         - If *return_matrix* = *False*, the function outputs the parameters defining the
           inverse of the property tensor in a numpy.ndarray with the same dimensions as
           the input argument *tensor*
         - If *return_natrix* = *True*, the function outputs the inverse of the property
-          tensor as a *scipy.sparse.coo_matrix*.
+          tensor as a sparse matrix of the requested *sparse_format*.
 
     Notes
     -----
@@ -1402,33 +1564,28 @@ def inverse_property_tensor(mesh, tensor, return_matrix=False, **kwargs):
     elif propType < 3:  # Isotropic or Diagonal
         T = 1.0 / mkvc(tensor)  # ensure it is a vector.
     elif mesh.dim == 2 and tensor.size == mesh.nC * 3:  # Fully anisotropic, 2D
-        tensor = tensor.reshape((mesh.nC, 3), order="F")
-        B = inverse_2x2_block_diagonal(
-            tensor[:, 0], tensor[:, 2], tensor[:, 2], tensor[:, 1], return_matrix=False
-        )
-        b11, b12, b21, b22 = B
-        T = np.r_[b11, b22, b12]
+        # invert the symmetric blocks directly from their 3 unique entries
+        s11, s22, s12 = tensor.reshape((mesh.nC, 3), order="F").T
+        T = np.stack([s22, s11, -s12]) / (s11 * s22 - s12 * s12)
+        T = T.reshape(-1)
     elif mesh.dim == 3 and tensor.size == mesh.nC * 6:  # Fully anisotropic, 3D
-        tensor = tensor.reshape((mesh.nC, 6), order="F")
-        B = inverse_3x3_block_diagonal(
-            tensor[:, 0],
-            tensor[:, 3],
-            tensor[:, 4],
-            tensor[:, 3],
-            tensor[:, 1],
-            tensor[:, 5],
-            tensor[:, 4],
-            tensor[:, 5],
-            tensor[:, 2],
-            return_matrix=False,
+        s11, s22, s33, s12, s13, s23 = tensor.reshape((mesh.nC, 6), order="F").T
+        T = np.stack(
+            [
+                s22 * s33 - s23 * s23,
+                s11 * s33 - s13 * s13,
+                s11 * s22 - s12 * s12,
+                s13 * s23 - s12 * s33,
+                s12 * s23 - s13 * s22,
+                s12 * s13 - s11 * s23,
+            ]
         )
-        b11, b12, b13, b21, b22, b23, b31, b32, b33 = B
-        T = np.r_[b11, b22, b33, b12, b13, b23]
+        T = (T / (s11 * T[0] + s12 * T[3] + s13 * T[4])).reshape(-1)
     else:
         raise Exception("Unexpected shape of tensor")
 
     if return_matrix:
-        return make_property_tensor(mesh, T)
+        return make_property_tensor(mesh, T, sparse_format=sparse_format)
 
     return T
 
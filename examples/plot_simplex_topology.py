@@ -0,0 +1,70 @@
+"""
+Simplex: building the mesh topology
+===================================
+
+When a :class:`~discretize.SimplexMesh` is constructed, the unique edges and
+faces of its simplices, the edges of each face, and the adjacency of the
+cells are derived from the connectivity array. The slots of every simplex
+are bucketed by their lowest node (or edge) with a counting sort, and the
+items of each bucket are deduplicated with a direct addressed table on
+separate threads. The resulting tables are stored as 32 bit integers
+whenever they fit.
+
+This example compares the time of this build against the serial reference
+implementation based on a hash map of node tuples, for growing random
+tetrahedral meshes.
+"""
+import timeit
+import matplotlib.pyplot as plt
+import numpy as np
+from scipy.spatial import Delaunay
+from discretize._extensions.simplex_helpers import (
+    _build_faces_edges,
+    _build_adjacency,
+    _build_topology,
+)
+
+
+def reference(simplices):
+    items = _build_faces_edges(simplices)
+    return items, _build_adjacency(items[0], len(items[1]))
+
+
+def build_time(func, *args):
+    # best time of a build in seconds
+    return min(timeit.repeat(lambda: func(*args), number=1, repeat=3))
+
+
+def run(plotIt=True, sizes=(1000, 4000, 16000, 64000), n_threads=4):
+    rng = np.random.default_rng(523)
+    n_cells = []
+    times = {"reference": [], "serial": [], f"{n_threads} threads": []}
+    for n in sizes:
+        nodes = rng.random((n, 3))
+        simplices = np.sort(Delaunay(nodes).simplices, axis=1)
+        n_cells.append(len(simplices))
+        times["reference"].append(build_time(reference, simplices))
+        times["serial"].append(build_time(_build_topology, simplices, n))
+        times[f"{n_threads} threads"].append(
+            build_time(_build_topology, simplices, n, n_threads)
+        )
+        print(
+            f"{n_cells[-1]:9d} cells: "
+            + " | ".join(f"{k} {v[-1]:7.3f} s" for k, v in times.items())
+        )
+
+    if plotIt:
+        fig, ax = plt.subplots(figsize=(6, 5))
+        for label, values in times.items():
+            ax.loglog(n_cells, values, "o-", label=label)
+        ax.set_xlabel("Number of tetrahedra")
+        ax.set_ylabel("Build time (s)")
+        ax.legend()
+        fig.tight_layout()
+
+    return n_cells, times
+
+
+if __name__ == "__main__":
+    run()
+    plt.show()
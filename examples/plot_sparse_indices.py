@@ -0,0 +1,83 @@
+"""
+Operators: 32 bit sparse indices
+================================
+
+The sparse operators assembled by ``discretize`` store their index arrays as
+32 bit integers whenever the number of rows, columns and non-zeros allow it,
+and scipy preserves this through products of the operators. Compared to 64
+bit indices, this reduces the memory of a typical 3D operator by about a
+quarter, and generally speeds up sparse matrix-vector products, which are
+limited by memory bandwidth.
+
+This example compares the memory use and matrix-vector product times of a few
+3D operators against copies of them that use 64 bit indices.
+"""
+import timeit
+import discretize
+import matplotlib.pyplot as plt
+import numpy as np
+
+
+def nbytes(A):
+    return A.data.nbytes + A.indices.nbytes + A.indptr.nbytes
+
+
+def with_int64_indices(A):
+    A = A.copy()
+    A.indices = A.indices.astype(np.int64)
+    A.indptr = A.indptr.astype(np.int64)
+    return A
+
+
+def matvec_time(A, x):
+    # best time of a matrix-vector product in milliseconds
+    return min(timeit.repeat(lambda: A @ x, number=10, repeat=5)) / 10 * 1e3
+
+
+def run(plotIt=True, n=64):
+    mesh = discretize.TensorMesh([n, n, n])
+    sigma = np.random.rand(mesh.n_cells)
+    C = mesh.edge_curl
+    Mf = mesh.get_face_inner_product()
+    operators = {
+        "face_divergence": mesh.face_divergence,
+        "edge_curl": C,
+        "average_edge_to_cell_vector": mesh.average_edge_to_cell_vector,
+        "curl-curl": C.T @ Mf @ C + mesh.get_edge_inner_product(sigma),
+    }
+
+    memory = {}
+    times = {}
+    for name, A in operators.items():
+        A64 = with_int64_indices(A)
+        x = np.random.rand(A.shape[1])
+        memory[name] = (nbytes(A) / 1e6, nbytes(A64) / 1e6)
+        times[name] = (matvec_time(A, x), matvec_time(A64, x))
+        print(
+            f"{name:28s} {A.indices.dtype}: {memory[name][0]:7.2f} MB "
+            f"{times[name][0]:6.2f} ms | int64: {memory[name][1]:7.2f} MB "
+            f"{times[name][1]:6.2f} ms"
+        )
+
+    if plotIt:
+        fig, axes = plt.subplots(1, 2, figsize=(12, 5))
+        names = list(operators.keys())
+        x = np.arange(len(names))
+        for ax, values, label in [
+            (axes[0], memory, "Memory (MB)"),
+            (axes[1], times, "Matrix-vector product (ms)"),
+        ]:
+            ax.bar(x - 0.2, [values[k][0] for k in names], 0.4, label="int32")
+            ax.bar(x + 0.2, [values[k][1] for k in names], 0.4, label="int64")
+            ax.set_xticks(x)
+            ax.set_xticklabels(names, rotation=20)
+            ax.set_ylabel(label)
+            ax.legend()
+        fig.tight_layout()
+
+    return memory, times
+
+
+if __name__ == "__main__":
+    run()
+    plt.show()
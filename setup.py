@@ -74,10 +74,77 @@ if len(sys.argv) >= 2 and (
     install_requires = build_requires + install_requires[1:]
     metadata["install_requires"] = install_requires
 else:
+    import tempfile
+    from distutils.errors import CompileError, LinkError
+    from setuptools.command.build_ext import build_ext
     from setuptools.extension import Extension
     from Cython.Build import cythonize
     import numpy as np
 
+    OPENMP_TEST = r"""
+    #ifndef _OPENMP
+    #error OpenMP is not enabled
+    #endif
+    #include <omp.h>
+    int main(void) { return omp_get_max_threads() > 0 ? 0 : 1; }
+    """
+
+    def openmp_flags(compiler):
+        """Find the compile and link arguments enabling OpenMP.
+
+        Each candidate is tried on a small program, and ``None`` is returned
+        if none of them compiles and links (e.g. Apple clang without libomp).
+        """
+        if compiler.compiler_type == "msvc":
+            candidates = [(["/openmp"], [])]
+        elif sys.platform == "darwin":
+            candidates = [
+                (["-fopenmp"], ["-fopenmp"]),
+                (["-Xpreprocessor", "-fopenmp"], ["-lomp"]),
+            ]
+        else:
+            candidates = [(["-fopenmp"], ["-fopenmp"])]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source = os.path.join(tmp_dir, "test_openmp.c")
+            with open(source, "w") as f:
+                f.write(OPENMP_TEST)
+            for compile_args, link_args in candidates:
+                try:
+                    objects = compiler.compile(
+                        [source], output_dir=tmp_dir, extra_postargs=compile_args
+                    )
+                    compiler.link_executable(
+                        objects,
+                        "test_openmp",
+                        output_dir=tmp_dir,
+                        extra_postargs=link_args,
+                    )
+                except (CompileError, LinkError):
+                    continue
+                return compile_args, link_args
+        return None
+
+    class BuildExtOpenMP(build_ext):
+        """Build the extensions with OpenMP whenever the compiler supports it.
+
+        Set the ``DISC_NO_OPENMP`` environment variable to build without it.
+        """
+
+        def build_extensions(self):
+            flags = None
+            if os.environ.get("DISC_NO_OPENMP", None) is None:
+                flags = openmp_flags(self.compiler)
+            if flags is None:
+                self.warn(
+                    "building the extensions without OpenMP, "
+                    "prange loops and n_threads will run serially"
+                )
+            else:
+                for ext in self.extensions:
+                    ext.extra_compile_args += flags[0]
+                    ext.extra_link_args += flags[1]
+            super().build_extensions()
+
     ext_kwargs = {}
     if os.environ.get("DISC_COV", None) is not None:
         ext_kwargs["define_macros"] = [("CYTHON_TRACE_NOGIL", 1)]
@@ -101,8 +168,21 @@ else:
             include_dirs=[np.get_include()],
             **ext_kwargs
         ),
+        Extension(
+            "discretize._extensions.matrix_ext",
+            ["discretize/_extensions/matrix_ext.pyx"],
+            include_dirs=[np.get_include()],
+            **ext_kwargs
+        ),
+        Extension(
+            "discretize._extensions.curvilinear_ext",
+            ["discretize/_extensions/curvilinear_ext.pyx"],
+            include_dirs=[np.get_include()],
+            **ext_kwargs
+        ),
     ]
 
     metadata["ext_modules"] = cythonize(extensions)
+    metadata["cmdclass"] = {"build_ext": BuildExtOpenMP}
 
 setup(**metadata)
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+import discretize
+from discretize.utils import sdiag, inverse_property_tensor
+from discretize.utils.matrix_utils import _sparse_matmul
+
+
+MESHES = {
+    "tensor2D": ("tensor", 2),
+    "tensor3D": ("tensor", 3),
+    "tree2D": ("tree", 2),
+    "tree3D": ("tree", 3),
+    "curv3D": ("curvilinear", 3),
+    "simplex3D": ("simplex", 3),
+}
+
+
+def complex_model(mesh, tensor_type):
+    n_params = {1: 1, 2: mesh.dim, 3: 3 if mesh.dim == 2 else 6}[tensor_type]
+    real = np.random.rand(mesh.n_cells, n_params)
+    if tensor_type == 3:
+        real[:, : mesh.dim] += 2
+    model = real + 1j * np.random.rand(mesh.n_cells, n_params)
+    return discretize.utils.mkvc(model)
+
+
+@pytest.mark.parametrize("mesh_type", MESHES.keys())
+@pytest.mark.parametrize("projection_type", ["F", "E"])
+@pytest.mark.parametrize("tensor_type", [1, 2, 3])
+@pytest.mark.parametrize("invert_model", [False, True])
+def test_complex_inner_product(
+    make_mesh, mesh_type, projection_type, tensor_type, invert_model
+):
+    mesh = make_mesh(*MESHES[mesh_type])
+    if projection_type == "F":
+        get_inner_product = mesh.get_face_inner_product
+    else:
+        get_inner_product = mesh.get_edge_inner_product
+    model = complex_model(mesh, tensor_type)
+    M = get_inner_product(model, invert_model=invert_model)
+    assert M.dtype == np.complex128
+
+    # compare to assembling the real and imaginary parts separately
+    if invert_model:
+        model = inverse_property_tensor(mesh, model)
+    M_split = get_inner_product(model.real) + 1j * get_inner_product(model.imag)
+    np.testing.assert_allclose(M.toarray(), M_split.toarray(), atol=1e-12)
+
+
+@pytest.mark.parametrize("mesh_type", ["tensor3D", "tree3D"])
+@pytest.mark.parametrize("tensor_type", [1, 2])
+def test_complex_inverse_and_deriv(make_mesh, mesh_type, tensor_type):
+    mesh = make_mesh(*MESHES[mesh_type])
+    model = complex_model(mesh, tensor_type)
+    Minv = mesh.get_edge_inner_product(model, invert_matrix=True)
+    np.testing.assert_allclose(
+        Minv.diagonal(), 1 / mesh.get_edge_inner_product(model).diagonal()
+    )
+
+    # a complex vector times the derivative, for a real and a complex model
+    v = np.random.rand(mesh.n_edges) + 1j * np.random.rand(mesh.n_edges)
+    w = np.random.rand(model.size)
+    for m in [model.real, model]:
+        dMdm = mesh.get_edge_inner_product_deriv(m)(v)
+        dMdm_split = mesh.get_edge_inner_product_deriv(m)(v.real) + 1j * (
+            mesh.get_edge_inner_product_deriv(m)(v.imag)
+        )
+        np.testing.assert_allclose(dMdm @ w, dMdm_split @ w)
+        np.testing.assert_allclose(dMdm @ w, mesh.get_edge_inner_product(w) @ v)
+
+    if mesh._meshType != "TENSOR":
+        # the fast derivatives on other meshes are approximations
+        return
+    assembler = mesh.get_edge_inner_product_assembler(tensor_type)
+    dMdm = assembler.deriv(v, model, invert_model=True)
+    dMdm_split = mesh.get_edge_inner_product_deriv(model, invert_model=True)
+    np.testing.assert_allclose(dMdm @ w, dMdm_split(v) @ w)
+    np.testing.assert_allclose(dMdm.T @ v, dMdm_split(v).T @ v)
+
+
+def test_sparse_matmul():
+    A = sp.random(30, 20, density=0.2, format="csr")
+    x = np.random.rand(20) + 1j * np.random.rand(20)
+    X = np.random.rand(20, 3) + 1j * np.random.rand(20, 3)
+    for a in [A, A.T.T.tocsc(), A.astype(np.float32)]:
+        np.testing.assert_allclose(_sparse_matmul(a, x), a.toarray() @ x, rtol=1e-6)
+        np.testing.assert_allclose(_sparse_matmul(a, X), a.toarray() @ X, rtol=1e-6)
+    assert _sparse_matmul(A, x).dtype == np.complex128
+    assert _sparse_matmul(A, x.astype(np.complex64)).dtype == np.complex128
+    assert _sparse_matmul(A, x.real).dtype == np.float64
+    # a strided view of a complex array
+    np.testing.assert_allclose(_sparse_matmul(A, X[:, 1]), A @ X[:, 1])
+
+
+def test_sdiag_complex():
+    v = np.random.rand(10) + 1j * np.random.rand(10)
+    v[3] = 0
+    D = sdiag(v)
+    assert D.dtype == np.complex128
+    assert D.nnz == 9
+    np.testing.assert_equal(D.diagonal(), v)
@@ -1,4 +1,6 @@
 import numpy as np
+import pytest
+import scipy.sparse as sp
 import unittest
 from discretize import TensorMesh, CurvilinearMesh
 from discretize.utils import ndgrid
@@ -287,5 +289,147 @@ class BasicCurvTests(unittest.TestCase):
         self.assertTrue(np.all(self.Curv3.gridEz == self.TM3.gridEz))
 
 
+@pytest.mark.parametrize("n_threads", [None, 3])
+def test_geometry_against_utils(n_threads):
+    from discretize.utils import (
+        example_curvilinear_grid,
+        index_cube,
+        face_info,
+        volume_tetrahedron,
+    )
+
+    mesh = CurvilinearMesh(
+        example_curvilinear_grid([4, 5, 6], "rotate"), n_threads=n_threads
+    )
+    xyz = mesh.nodes
+    A, B, C, D, E, F, G, H = index_cube("ABCDEFGH", mesh.shape_nodes)
+    vol1 = (
+        volume_tetrahedron(xyz, A, B, D, E)
+        + volume_tetrahedron(xyz, B, E, F, G)
+        + volume_tetrahedron(xyz, B, D, E, G)
+        + volume_tetrahedron(xyz, B, C, D, G)
+        + volume_tetrahedron(xyz, D, E, G, H)
+    )
+    vol2 = (
+        volume_tetrahedron(xyz, A, F, B, C)
+        + volume_tetrahedron(xyz, A, E, F, H)
+        + volume_tetrahedron(xyz, A, H, F, C)
+        + volume_tetrahedron(xyz, C, H, D, A)
+        + volume_tetrahedron(xyz, C, G, H, F)
+    )
+    np.testing.assert_allclose(mesh.cell_volumes, (vol1 + vol2) / 2)
+
+    normals, areas = [], []
+    for nodes, shape in zip(
+        ["AEFB", "ADHE", "ABCD"],
+        [mesh.shape_faces_x, mesh.shape_faces_y, mesh.shape_faces_z],
+    ):
+        normal, area = face_info(xyz, *index_cube(nodes, mesh.shape_nodes, shape))
+        normals.append(normal)
+        areas.append(area)
+    np.testing.assert_allclose(mesh.face_areas, np.concatenate(areas))
+    np.testing.assert_allclose(mesh.face_normals, np.concatenate(normals))
+
+    edges = []
+    for nodes, shape in zip(
+        ["AD", "AB", "AE"],
+        [mesh.shape_edges_x, mesh.shape_edges_y, mesh.shape_edges_z],
+    ):
+        start, end = index_cube(nodes, mesh.shape_nodes, shape)
+        edges.append(xyz[end] - xyz[start])
+    edges = np.concatenate(edges)
+    lengths = np.linalg.norm(edges, axis=1)
+    np.testing.assert_allclose(mesh.edge_lengths, lengths)
+    np.testing.assert_allclose(mesh.edge_tangents, edges / lengths[:, None])
+
+
+@pytest.mark.parametrize(
+    "shape, kind", [([4, 5], "rotate"), ([4, 5, 6], "rotate"), ([5, 4, 3], "sphere")]
+)
+def test_point_location_and_interpolation(shape, kind):
+    from discretize.utils import example_curvilinear_grid
+
+    rng = np.random.default_rng(4)
+    mesh = CurvilinearMesh(example_curvilinear_grid(shape, kind))
+    dim = mesh.dim
+    np.testing.assert_equal(
+        mesh.point2index(mesh.cell_centers), np.arange(mesh.n_cells)
+    )
+
+    # points inside the cells, from random reference coordinates in each
+    cells = rng.integers(mesh.n_cells, size=50)
+    Q_cc = mesh.get_interpolation_matrix(mesh.cell_centers[cells], "CC")
+    np.testing.assert_allclose(Q_cc.toarray(), np.eye(mesh.n_cells)[cells], atol=1e-12)
+    P = mesh.average_node_to_cell[cells]
+    weights = rng.random((50, P.nnz // 50))
+    P.data = (weights / weights.sum(axis=1, keepdims=True)).reshape(-1)
+    locs = P @ mesh.nodes
+    np.testing.assert_equal(mesh.point2index(locs), cells)
+    np.testing.assert_equal(mesh.point2index(locs, n_threads=3), cells)
+
+    # linear functions are reproduced from the nodes
+    a = rng.random(dim)
+    Q = mesh.get_interpolation_matrix(locs, "N")
+    np.testing.assert_allclose(Q @ (mesh.nodes @ a + 1), locs @ a + 1)
+    Q = mesh.get_interpolation_matrix(locs, "CC")
+    np.testing.assert_allclose(Q.sum(axis=1), 1)
+
+    # constant vectors are reproduced from the edges, and from the (planar)
+    # faces in 2D
+    u = rng.random(dim)
+    for i, component in enumerate("xyz"[:dim]):
+        Q = mesh.get_interpolation_matrix(locs, "E" + component)
+        np.testing.assert_allclose(Q @ (mesh.edge_tangents @ u), u[i])
+        if dim == 2:
+            Q = mesh.get_interpolation_matrix(locs, "F" + component)
+            np.testing.assert_allclose(Q @ (mesh.face_normals @ u), u[i])
+        Q = mesh.get_interpolation_matrix(locs, "CCV" + component)
+        assert Q.shape == (50, dim * mesh.n_cells)
+
+    # the faces and edges stack the rows of each component
+    for location_type in ["faces", "edges"]:
+        Q = mesh.get_interpolation_matrix(locs, location_type)
+        Q_parts = [
+            mesh.get_interpolation_matrix(locs, f"{location_type}_{component}")
+            for component in "xyz"[:dim]
+        ]
+        np.testing.assert_allclose(Q.toarray(), sp.vstack(Q_parts).toarray())
+        Q_threads = mesh.get_interpolation_matrix(locs, location_type, n_threads=3)
+        np.testing.assert_equal(Q_threads.toarray(), Q.toarray())
+    Q = mesh.get_interpolation_matrix(locs, "E")
+    np.testing.assert_allclose(Q @ (mesh.edge_tangents @ u), np.repeat(u, 50))
+    Q = mesh.get_interpolation_matrix(np.full((1, dim), 10.0), "F", zeros_outside=True)
+    assert Q.shape == (dim, mesh.n_faces) and Q.nnz == 0
+
+    # nearest values outside of the mesh, unless asked for zeros
+    outside = np.full((1, dim), 10.0)
+    Q = mesh.get_interpolation_matrix(outside, "N")
+    np.testing.assert_allclose(Q.sum(), 1)
+    Q = mesh.get_interpolation_matrix(outside, "N", zeros_outside=True)
+    assert Q.nnz == 0
+
+
+def test_face_interpolation_affine():
+    # the faces of a linearly transformed tensor mesh are planar
+    rng = np.random.default_rng(5)
+    tensor = TensorMesh([4, 5, 3])
+    transform = np.eye(3) + 0.3 * rng.random((3, 3))
+    nodes = tensor.nodes @ transform.T
+    mesh = CurvilinearMesh([n.reshape(tensor.shape_nodes, order="F") for n in nodes.T])
+    locs = rng.random((20, 3)) @ transform.T
+    u = rng.random(3)
+    for i, component in enumerate("xyz"):
+        Q = mesh.get_interpolation_matrix(locs, "F" + component)
+        np.testing.assert_allclose(Q @ (mesh.face_normals @ u), u[i])
+
+    # linear functions are reproduced from the cell centers, away from the
+    # boundary of the mesh
+    interior = np.all(np.abs(locs @ np.linalg.inv(transform).T - 0.5) < 0.3, axis=1)
+    assert np.any(interior)
+    a = rng.random(3)
+    Q = mesh.get_interpolation_matrix(locs[interior], "CC")
+    np.testing.assert_allclose(Q @ (mesh.cell_centers @ a), locs[interior] @ a)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+import discretize
+from discretize.operators.fast_poisson import FastPoissonSolver
+
+BCS = {
+    1: ["neumann", "dirichlet", [["neumann", "dirichlet"]]],
+    2: ["neumann", "dirichlet", [["dirichlet", "neumann"], "dirichlet"]],
+    3: [
+        "neumann",
+        "dirichlet",
+        [["neumann", "dirichlet"], ["dirichlet", "neumann"], "neumann"],
+    ],
+}
+CASES = [(dim, bc) for dim in [1, 2, 3] for bc in BCS[dim]]
+
+
+def get_mesh(dim, uniform):
+    rng = np.random.default_rng(562)
+    if uniform:
+        h = [0.3 * np.ones(n) for n in [6, 7, 8][:dim]]
+    else:
+        h = [rng.random(n) + 0.5 for n in [6, 7, 8][:dim]]
+    return discretize.TensorMesh(h)
+
+
+@pytest.mark.parametrize("uniform", [True, False])
+@pytest.mark.parametrize("dim, bc", CASES)
+def test_cell_centered(dim, bc, uniform):
+    rng = np.random.default_rng(4)
+    mesh = get_mesh(dim, uniform)
+    mesh.set_cell_gradient_BC(bc)
+    A = mesh.face_divergence @ mesh.cell_gradient
+    Ainv = FastPoissonSolver(mesh)
+
+    # build a right hand side in the range of A (A is singular for pure neumann)
+    q = A @ rng.random(mesh.n_cells)
+    u = Ainv @ q
+    np.testing.assert_allclose(A @ u, q, atol=1e-10 * np.abs(q).max())
+
+    Q = np.c_[q, 2 * q]
+    np.testing.assert_allclose(Ainv @ Q, np.c_[u, 2 * u])
+
+    x = rng.random(mesh.n_cells)
+    y = rng.random(mesh.n_cells)
+    np.testing.assert_allclose(y @ (Ainv @ x), x @ (Ainv.T @ y))
+
+
+@pytest.mark.parametrize("uniform", [True, False])
+@pytest.mark.parametrize("dim, bc", CASES)
+def test_nodal(dim, bc, uniform):
+    rng = np.random.default_rng(5)
+    mesh = get_mesh(dim, uniform)
+    G = mesh.nodal_gradient
+    A = G.T @ mesh.get_edge_inner_product() @ G
+    Ainv = FastPoissonSolver(mesh, "nodes", bc=bc)
+
+    # nodes on the dirichlet boundaries are fixed to zero
+    bcs = [bc] * dim if isinstance(bc, str) else bc
+    free = np.ones(1, dtype=bool)
+    for bc_i, n in zip(bcs, mesh.shape_nodes):
+        if isinstance(bc_i, str):
+            bc_i = [bc_i, bc_i]
+        free_i = np.ones(n, dtype=bool)
+        free_i[0] = bc_i[0] == "neumann"
+        free_i[-1] = bc_i[1] == "neumann"
+        free = np.kron(free_i, free).astype(bool)
+
+    q = A @ rng.random(mesh.n_nodes)
+    u = Ainv @ q
+    np.testing.assert_allclose(u[~free], 0.0)
+    np.testing.assert_allclose((A @ u)[free], q[free], atol=1e-10 * np.abs(q).max())
+
+
+def test_errors():
+    mesh = discretize.TensorMesh([4, 4])
+    with pytest.raises(ValueError):
+        FastPoissonSolver(mesh, "faces")
+    with pytest.raises(ValueError):
+        FastPoissonSolver(mesh, bc=["neumann"])
+    with pytest.raises(TypeError):
+        FastPoissonSolver(discretize.CylindricalMesh([4, 1, 4]))
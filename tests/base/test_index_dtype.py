@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from discretize.utils import (
+    sdiag,
+    speye,
+    kron3,
+    ddx,
+    av,
+    av_extrap,
+)
+from discretize.utils.matrix_utils import _downcast_indices
+
+OPERATORS = [
+    "face_divergence",
+    "nodal_gradient",
+    "edge_curl",
+    "cell_gradient",
+    "average_face_to_cell",
+    "average_face_to_cell_vector",
+    "average_cell_to_face",
+    "average_cell_vector_to_face",
+    "average_edge_to_cell",
+    "average_node_to_cell",
+    "average_node_to_edge",
+    "average_node_to_face",
+]
+
+
+def assert_int32(A):
+    assert A.indices.dtype == np.int32
+    assert A.indptr.dtype == np.int32
+
+
+@pytest.mark.parametrize(
+    "A",
+    [
+        sdiag(np.arange(5.0)),
+        speye(5),
+        kron3(ddx(3), av(4), av_extrap(5)),
+        ddx(5),
+        av(5),
+        av_extrap(5),
+    ],
+)
+def test_matrix_utils_int32(A):
+    assert_int32(A)
+
+
+def test_downcast_indices():
+    A = sp.random(20, 30, density=0.2, format="csr")
+    A.indices = A.indices.astype(np.int64)
+    A.indptr = A.indptr.astype(np.int64)
+    B = A.copy()
+    _downcast_indices(A)
+    assert_int32(A)
+    np.testing.assert_equal(A.toarray(), B.toarray())
+
+    A = A.tocoo()
+    A.row = A.row.astype(np.int64)
+    A.col = A.col.astype(np.int64)
+    _downcast_indices(A)
+    assert A.row.dtype == np.int32
+    assert A.col.dtype == np.int32
+
+
+@pytest.mark.parametrize("mesh_type", ["tensor", "tree", "cylindrical", "simplex"])
+def test_operators_int32(make_mesh, mesh_type):
+    mesh = make_mesh(mesh_type)
+    for name in OPERATORS:
+        try:
+            A = getattr(mesh, name)
+        except (NotImplementedError, AttributeError, ValueError):
+            # operator not supported by this mesh type
+            continue
+        assert_int32(A.tocsr())
+    model = np.random.rand(mesh.n_cells)
+    Mf = mesh.get_face_inner_product(model)
+    Me = mesh.get_edge_inner_product(model)
+    assert_int32(Mf)
+    assert_int32(Me)
+
+    # products of the operators keep 32 bit indices
+    D = mesh.face_divergence
+    assert_int32(D @ Mf @ D.T)
+    C = mesh.edge_curl
+    assert_int32(C.T @ Mf @ C + Me)
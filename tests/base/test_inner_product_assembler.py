@@ -0,0 +1,208 @@
+import numpy as np
+import pytest
+
+import discretize
+from discretize.operators.inner_product_assembler import InnerProductAssembler
+
+
+MESHES = {
+    "tensor1D": ("tensor", 1),
+    "tensor2D": ("tensor", 2),
+    "tensor3D": ("tensor", 3),
+    "tree2D": ("tree", 2),
+    "tree3D": ("tree", 3),
+    "curv2D": ("curvilinear", 2),
+    "curv3D": ("curvilinear", 3),
+}
+
+
+def random_model(mesh, tensor_type):
+    n_params = {1: 1, 2: mesh.dim, 3: 3 if mesh.dim == 2 else 6}[tensor_type]
+    model = np.random.rand(mesh.n_cells, n_params)
+    if tensor_type == 3:
+        # keep the full tensor positive definite
+        model[:, : mesh.dim] += 2
+    return model if n_params > 1 else model[:, 0]
+
+
+@pytest.mark.parametrize("mesh_type", MESHES.keys())
+@pytest.mark.parametrize("projection_type", ["F", "E"])
+@pytest.mark.parametrize("tensor_type", [1, 2, 3])
+def test_assembler(make_mesh, mesh_type, projection_type, tensor_type):
+    mesh = make_mesh(*MESHES[mesh_type])
+    if mesh.dim == 1 and tensor_type == 3:
+        with pytest.raises(ValueError):
+            InnerProductAssembler(mesh, projection_type, tensor_type)
+        return
+    if projection_type == "F":
+        assembler = mesh.get_face_inner_product_assembler(tensor_type)
+        get_inner_product = mesh.get_face_inner_product
+    else:
+        assembler = mesh.get_edge_inner_product_assembler(tensor_type)
+        get_inner_product = mesh.get_edge_inner_product
+    assert assembler.tensor_type == tensor_type
+
+    model = random_model(mesh, tensor_type)
+    for invert_model in [False, True]:
+        M = assembler(model, invert_model=invert_model)
+        M_true = get_inner_product(model, invert_model=invert_model, do_fast=False)
+        np.testing.assert_allclose(M.toarray(), M_true.toarray(), atol=1e-12)
+        assert M.indices.dtype == np.int32
+
+    # the matrix is filled in place for a new model
+    M = assembler(model)
+    data = M.data
+    M2 = assembler(2 * model, out=M)
+    assert M2 is M and M.data is data
+    M_true = get_inner_product(2 * model, do_fast=False)
+    np.testing.assert_allclose(M.toarray(), M_true.toarray(), atol=1e-12)
+
+    if tensor_type == 3:
+        with pytest.raises(NotImplementedError):
+            assembler(model, invert_matrix=True)
+    elif mesh._meshType == "TENSOR":
+        Minv = assembler(model, invert_matrix=True)
+        Minv_true = get_inner_product(model, invert_matrix=True)
+        np.testing.assert_allclose(Minv.toarray(), Minv_true.toarray())
+
+
+def test_assembler_cache():
+    mesh = discretize.TensorMesh([4, 5])
+    assembler = mesh.get_face_inner_product_assembler()
+    assert mesh.get_face_inner_product_assembler(1) is assembler
+    assert mesh.get_face_inner_product_assembler(np.ones(mesh.n_cells)) is assembler
+    assert mesh.get_edge_inner_product_assembler() is not assembler
+    assert mesh.get_face_inner_product_assembler(2) is not assembler
+
+
+def test_assembler_scalar_model():
+    mesh = discretize.TensorMesh([4, 5])
+    assembler = mesh.get_edge_inner_product_assembler()
+    np.testing.assert_allclose(
+        assembler().toarray(), mesh.get_edge_inner_product().toarray()
+    )
+    np.testing.assert_allclose(
+        assembler(3.0).toarray(), mesh.get_edge_inner_product(3.0).toarray()
+    )
+
+
+def test_assembler_errors():
+    mesh = discretize.TensorMesh([4, 5])
+    with pytest.raises(TypeError):
+        InnerProductAssembler(mesh, "N")
+    with pytest.raises(ValueError):
+        InnerProductAssembler(mesh, "F", 4)
+
+    assembler = InnerProductAssembler(mesh, "F", 2)
+    with pytest.raises(ValueError):
+        assembler(np.ones(mesh.n_cells))
+    with pytest.raises(ValueError):
+        assembler(1.0)
+    with pytest.raises(ValueError):
+        # the output must be a CSR matrix from this assembler
+        out = assembler(np.ones(2 * mesh.n_cells)).tocsc()
+        assembler(np.ones(2 * mesh.n_cells), out=out)
+
+    with pytest.raises(NotImplementedError):
+        InnerProductAssembler(discretize.CylindricalMesh([3, 1, 4]), "F")
+
+
+def test_assembler_independent_matrices():
+    mesh = discretize.TensorMesh([4, 5])
+    assembler = mesh.get_face_inner_product_assembler()
+    M = assembler(np.ones(mesh.n_cells))
+    M_ref = assembler(np.ones(mesh.n_cells)).toarray()
+
+    # modifying a returned matrix in place leaves the assembler untouched
+    M.indices[:] = 0
+    M.sum_duplicates()
+    np.testing.assert_equal(assembler().toarray(), M_ref)
+    with pytest.raises(ValueError):
+        assembler.indices[0] = 1
+    with pytest.raises(ValueError):
+        assembler.indptr[0] = 1
+
+
+def test_assembler_single_precision(make_mesh):
+    mesh = make_mesh("tree", 2, dtype=np.float32)
+    assembler = mesh.get_face_inner_product_assembler()
+    model = np.random.rand(mesh.n_cells)
+    M = assembler(model)
+    assert M.dtype == np.float32
+    assert assembler(model + 1j * model).dtype == np.complex64
+    np.testing.assert_allclose(
+        M.toarray(), mesh.get_face_inner_product(model).toarray(), rtol=1e-5
+    )
+
+
+@pytest.mark.parametrize("mesh_type", ["tensor3D", "tree2D"])
+@pytest.mark.parametrize("tensor_type", [1, 3])
+def test_assembler_batch(make_mesh, mesh_type, tensor_type):
+    mesh = make_mesh(*MESHES[mesh_type])
+    assembler = mesh.get_edge_inner_product_assembler(tensor_type)
+    models = [random_model(mesh, tensor_type) for _ in range(4)]
+    models[1] = models[1] * (1 + 1j)
+
+    data = assembler.batch_data(models)
+    assert data.shape == (4, assembler.data_map.shape[0])
+    assert data.dtype == np.complex128
+
+    for invert_model in [False, True]:
+        Ms = assembler.batch(models, invert_model=invert_model)
+        assert len(Ms) == 4
+        for M, model in zip(Ms, models):
+            assert not np.shares_memory(M.indices, assembler.indices)
+            M_true = mesh.get_edge_inner_product(model, invert_model=invert_model)
+            np.testing.assert_allclose(M.toarray(), M_true.toarray(), atol=1e-12)
+        assert not np.shares_memory(Ms[0].indptr, Ms[1].indptr)
+
+    if tensor_type == 1:
+        Minvs = assembler.batch(np.stack(models), invert_matrix=True)
+        for Minv, model in zip(Minvs, models):
+            np.testing.assert_allclose(
+                Minv.diagonal(), 1 / assembler(model).diagonal(), rtol=1e-12
+            )
+
+
+@pytest.mark.parametrize("mesh_type", ["tensor2D", "tensor3D", "tree2D", "tree3D"])
+@pytest.mark.parametrize("projection_type", ["F", "E"])
+@pytest.mark.parametrize("tensor_type", [1, 2, 3])
+def test_assembler_deriv(make_mesh, mesh_type, projection_type, tensor_type):
+    mesh = make_mesh(*MESHES[mesh_type])
+    if projection_type == "F":
+        assembler = mesh.get_face_inner_product_assembler(tensor_type)
+        get_deriv = mesh.get_face_inner_product_deriv
+    else:
+        assembler = mesh.get_edge_inner_product_assembler(tensor_type)
+        get_deriv = mesh.get_edge_inner_product_deriv
+    model = random_model(mesh, tensor_type)
+    n = assembler.shape[0]
+    v = np.random.rand(n)
+    w = np.random.rand(assembler.n_parameters)
+    u = np.random.rand(n) + 1j * np.random.rand(n)
+
+    dMdm = assembler.deriv(v)
+    dMdm_true = get_deriv(model, do_fast=False)(v)
+    np.testing.assert_allclose(dMdm @ w, dMdm_true @ w, atol=1e-12)
+    np.testing.assert_allclose(dMdm.T @ u, dMdm_true.T @ u, atol=1e-12)
+    np.testing.assert_allclose(dMdm.H @ u, dMdm_true.T.conj() @ u, atol=1e-12)
+    W = np.random.rand(assembler.n_parameters, 3)
+    np.testing.assert_allclose(dMdm @ W, dMdm_true @ W, atol=1e-12)
+    np.testing.assert_allclose(dMdm.tocsr().toarray(), dMdm_true.toarray(), atol=1e-12)
+
+    # the derivative of M(m) @ v is M(w) @ v, as M is linear in m
+    np.testing.assert_allclose(dMdm @ w, assembler(w) @ v)
+
+    if tensor_type == 3:
+        with pytest.raises(NotImplementedError):
+            assembler.deriv(v, model, invert_model=True)
+    elif mesh._meshType == "TENSOR":
+        # the fast derivatives are exact on tensor meshes
+        for invert_model, invert_matrix in [(True, False), (False, True), (True, True)]:
+            dMdm = assembler.deriv(v, model, invert_model, invert_matrix)
+            dMdm_true = get_deriv(
+                model, invert_model=invert_model, invert_matrix=invert_matrix
+            )(v)
+            np.testing.assert_allclose(dMdm @ w, dMdm_true @ w)
+            np.testing.assert_allclose(dMdm.T @ v, dMdm_true.T @ v)
+            np.testing.assert_allclose(dMdm.tocsr().toarray(), dMdm_true.toarray())
@@ -392,5 +392,53 @@ class TestInterpolation3D(discretize.tests.OrderTest):
         self.orderTest()
 
 
+class TestChunkedInterpolation(unittest.TestCase):
+    def setUp(self):
+        h = [np.random.rand(8), np.random.rand(6), np.random.rand(7)]
+        self.mesh = discretize.TensorMesh(h)
+        self.locs = np.random.rand(1001, 3) * self.mesh.nodes.max(axis=0)
+
+    def test_iter_blocks(self):
+        for location_type in ["CC", "N", "Fy", "Ez"]:
+            Q = self.mesh.get_interpolation_matrix(self.locs, location_type)
+            blocks = list(
+                self.mesh.iter_interpolation_matrix(
+                    self.locs, location_type, chunk_size=100
+                )
+            )
+            self.assertEqual(len(blocks), 11)
+            for rows, Q_block in blocks:
+                np.testing.assert_allclose(Q_block.toarray(), Q[rows].toarray())
+
+    def test_interpolate(self):
+        values = np.random.rand(self.mesh.n_faces, 2)
+        true = self.mesh.get_interpolation_matrix(self.locs, "Fx") @ values
+        for n_workers in [None, 3]:
+            out = self.mesh.interpolate(
+                values, self.locs, "Fx", chunk_size=64, n_workers=n_workers
+            )
+            np.testing.assert_allclose(out, true)
+
+    def test_interpolate_zeros_outside(self):
+        locs = self.locs.copy()
+        locs[::7] += 10.0
+        values = np.random.rand(self.mesh.n_nodes)
+        true = (
+            self.mesh.get_interpolation_matrix(locs, "N", zeros_outside=True) @ values
+        )
+        out = self.mesh.interpolate(
+            values, locs, "N", zeros_outside=True, chunk_size=50
+        )
+        np.testing.assert_allclose(out, true)
+        # the locations passed in must not be modified
+        np.testing.assert_equal(locs[::7], self.locs[::7] + 10.0)
+
+    def test_bad_chunk_size(self):
+        with self.assertRaises(ValueError):
+            self.mesh.interpolate(np.ones(self.mesh.n_cells), self.locs, chunk_size=0)
+        with self.assertRaises(ValueError):
+            next(self.mesh.iter_interpolation_matrix(self.locs, chunk_size=0))
+
+
 if __name__ == "__main__":
     unittest.main()
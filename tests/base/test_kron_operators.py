@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+import discretize
+from discretize.utils import ddx, av, kron3, speye
+from discretize.operators.kron_operators import (
+    TensorProductOperator,
+    DiagonalOperator,
+    BlockOperator,
+)
+
+KEYS = [
+    "face_divergence",
+    "nodal_gradient",
+    "edge_curl",
+    "cell_gradient",
+    "average_face_to_cell",
+    "average_face_to_cell_vector",
+    "average_cell_to_face",
+    "average_cell_vector_to_face",
+    "average_cell_to_edge",
+    "average_edge_to_cell",
+    "average_edge_to_cell_vector",
+    "average_node_to_cell",
+    "average_node_to_edge",
+    "average_node_to_face",
+]
+
+BCS = {
+    1: ["dirichlet"],
+    2: [["neumann", "dirichlet"], "dirichlet"],
+    3: ["dirichlet", ["dirichlet", "neumann"], "neumann"],
+}
+
+
+@pytest.mark.parametrize("dim", [1, 2, 3])
+@pytest.mark.parametrize("key", KEYS)
+def test_operator_matches_assembled(dim, key):
+    if dim == 1 and key == "edge_curl":
+        pytest.skip("Edge curl is not defined in 1D")
+    rng = np.random.default_rng(4421)
+    mesh = discretize.TensorMesh([rng.random(n) + 0.5 for n in [5, 6, 7][:dim]])
+    mesh.set_cell_gradient_BC(BCS[dim])
+
+    op = mesh.get_kron_operator(key)
+    A = getattr(mesh, key)
+    assert op.shape == A.shape
+
+    x = rng.random(A.shape[1])
+    y = rng.random(A.shape[0])
+    X = rng.random((A.shape[1], 3))
+    np.testing.assert_allclose(op @ x, A @ x)
+    np.testing.assert_allclose(op @ X, A @ X)
+    np.testing.assert_allclose(op.rmatvec(y), A.T @ y)
+    np.testing.assert_allclose(op.T @ y, A.T @ y)
+
+    A_op = op.tocsr()
+    assert sp.isspmatrix_csr(A_op)
+    np.testing.assert_allclose(A_op.toarray(), A.toarray())
+
+
+def test_composition():
+    mesh = discretize.TensorMesh([4, 5, 6])
+    D = mesh.get_kron_operator("face_divergence")
+    C = mesh.get_kron_operator("edge_curl")
+    G = mesh.get_kron_operator("nodal_gradient")
+
+    e = np.random.rand(mesh.n_edges)
+    n = np.random.rand(mesh.n_nodes)
+    np.testing.assert_allclose(D @ (C @ e), 0.0, atol=1e-10)
+    np.testing.assert_allclose((D @ C) @ e, 0.0, atol=1e-10)
+    np.testing.assert_allclose(C @ (G @ n), 0.0, atol=1e-10)
+    np.testing.assert_allclose((C @ G).tocsr().toarray(), 0.0, atol=1e-10)
+
+    # composed and scaled operators keep their structure
+    L = -2.0 * (D @ D.T)
+    np.testing.assert_allclose(
+        L.tocsr().toarray(),
+        (-2.0 * mesh.face_divergence @ mesh.face_divergence.T).toarray(),
+    )
+    np.testing.assert_allclose(L.T.tocsr().toarray(), L.tocsr().toarray().T)
+
+
+def test_tensor_product_factors():
+    A = TensorProductOperator([ddx(3), 4, av(5)])
+    assert A.shape == (3 * 4 * 5, 4 * 4 * 6)
+    np.testing.assert_allclose(
+        A.tocsr().toarray(), kron3(av(5), speye(4), ddx(3)).toarray()
+    )
+
+
+def test_block_operator_validation():
+    D = DiagonalOperator(np.ones(3))
+    with pytest.raises(ValueError):
+        BlockOperator([[D, None], [None, None]])
+    with pytest.raises(ValueError):
+        BlockOperator([[D, DiagonalOperator(np.ones(4))], [D, D]])
+
+
+def test_bad_key():
+    mesh = discretize.TensorMesh([4, 5])
+    with pytest.raises(KeyError):
+        mesh.get_kron_operator("not_an_operator")
@@ -0,0 +1,138 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+import discretize
+
+GEOMETRY = ["cell_centers", "nodes", "faces", "edges", "cell_volumes", "face_areas"]
+OPERATORS = [
+    "face_divergence",
+    "nodal_gradient",
+    "edge_curl",
+    "average_face_to_cell",
+    "average_node_to_cell",
+]
+STENCILS = [
+    "stencil_cell_gradient",
+    "stencil_cell_gradient_x",
+    "stencil_cell_gradient_y",
+    "stencil_cell_gradient_z",
+]
+
+
+MESHES = ["tensor", "tree", "cylindrical", "simplex"]
+
+
+def assert_single(value):
+    assert value.dtype == np.float32
+    if sp.issparse(value):
+        assert value.indices.dtype == np.int32
+        assert value.indptr.dtype == np.int32
+
+
+@pytest.mark.parametrize("mesh_type", MESHES)
+def test_default_dtype(make_mesh, mesh_type):
+    mesh = make_mesh(mesh_type, dtype=None)
+    assert mesh.dtype == np.float64
+    assert mesh.cell_volumes.dtype == np.float64
+    assert mesh.face_divergence.dtype == np.float64
+
+
+@pytest.mark.parametrize("mesh_type", MESHES)
+def test_single_precision(make_mesh, mesh_type):
+    mesh64 = make_mesh(mesh_type, dtype=np.float64)
+    mesh32 = make_mesh(mesh_type, dtype=np.float32)
+    assert mesh32.dtype == np.float32
+    for name in GEOMETRY:
+        value = getattr(mesh32, name)
+        if name in mesh32._items:
+            # the defining nodes of a SimplexMesh are kept in double precision
+            assert value.dtype == np.float64
+            continue
+        assert_single(value)
+        np.testing.assert_allclose(value, getattr(mesh64, name), rtol=1e-6)
+    for name in OPERATORS:
+        value = getattr(mesh32, name)
+        assert_single(value)
+        np.testing.assert_allclose(
+            value.toarray(), getattr(mesh64, name).toarray(), rtol=1e-6, atol=1e-6
+        )
+        if not isinstance(mesh32, discretize.SimplexMesh):
+            # the cast operators are cached on the mesh
+            assert getattr(mesh32, name) is value
+
+
+@pytest.mark.parametrize("mesh_type", MESHES[:-1])
+def test_cached_once(make_mesh, mesh_type):
+    # the caches hold the single precision values themselves, not a double
+    # precision copy that is cast on every access
+    mesh32 = make_mesh(mesh_type, dtype=np.float32)
+    for name in ["cell_centers", "cell_volumes"] + OPERATORS:
+        value = getattr(mesh32, name)
+        assert getattr(mesh32, name) is value
+    defining = ["_origin", "_orientation", "_cartesian_origin"]
+    for name, value in vars(mesh32).items():
+        if isinstance(value, np.ndarray) and name not in defining:
+            assert value.dtype != np.float64, name
+
+    # and double precision meshes are untouched
+    mesh64 = make_mesh(mesh_type, dtype=np.float64)
+    value = mesh64.cell_volumes
+    assert mesh64._to_dtype(value) is value
+    assert mesh64.face_divergence is mesh64.face_divergence
+
+
+@pytest.mark.parametrize("mesh_type", ["tensor", "tree"])
+def test_single_precision_stencils(make_mesh, mesh_type):
+    mesh64 = make_mesh(mesh_type, dtype=np.float64)
+    mesh32 = make_mesh(mesh_type, dtype=np.float32)
+    for name in STENCILS:
+        value = getattr(mesh32, name)
+        assert_single(value)
+        np.testing.assert_array_equal(value.toarray(), getattr(mesh64, name).toarray())
+
+
+@pytest.mark.parametrize("mesh_type", MESHES)
+def test_single_precision_inner_products(make_mesh, mesh_type):
+    mesh64 = make_mesh(mesh_type, dtype=np.float64)
+    mesh32 = make_mesh(mesh_type, dtype=np.float32)
+    sigma = np.random.rand(mesh32.n_cells)
+    for method in ["get_face_inner_product", "get_edge_inner_product"]:
+        M32 = getattr(mesh32, method)(sigma)
+        assert_single(M32)
+        M64 = getattr(mesh64, method)(sigma)
+        np.testing.assert_allclose(M32.toarray(), M64.toarray(), rtol=1e-5)
+
+    deriv = mesh32.get_face_inner_product_deriv(sigma)
+    v = np.random.rand(mesh32.n_faces)
+    assert_single(deriv(v))
+
+
+@pytest.mark.parametrize("mesh_type", MESHES)
+def test_single_precision_interpolation(make_mesh, mesh_type):
+    mesh64 = make_mesh(mesh_type, dtype=np.float64)
+    mesh32 = make_mesh(mesh_type, dtype=np.float32)
+    locs = np.random.rand(20, 3) * 0.8 + 0.1
+    for location_type in ["cell_centers", "nodes"]:
+        P32 = mesh32.get_interpolation_matrix(locs, location_type)
+        assert_single(P32)
+        P64 = mesh64.get_interpolation_matrix(locs, location_type)
+        np.testing.assert_allclose(P32.toarray(), P64.toarray(), rtol=1e-6)
+
+
+@pytest.mark.parametrize("mesh_type", MESHES)
+def test_dtype_serialization(make_mesh, mesh_type):
+    mesh = make_mesh(mesh_type, dtype="float32")
+    mesh_dict = mesh.to_dict()
+    assert mesh_dict["dtype"] == "float32"
+    mesh2 = type(mesh).deserialize(mesh_dict)
+    assert mesh2.dtype == np.float32
+    assert mesh2.equals(mesh)
+    assert not mesh2.equals(make_mesh(mesh_type, dtype=np.float64))
+
+
+def test_bad_dtype():
+    with pytest.raises(ValueError):
+        discretize.TensorMesh([4, 5], dtype=np.int32)
+    with pytest.raises(ValueError):
+        discretize.TreeMesh([4, 4], dtype=np.float16)
@@ -0,0 +1,33 @@
+import warnings
+
+import numpy as np
+import pytest
+
+import discretize
+from discretize.utils import example_simplex_mesh
+from discretize._extensions.matrix_ext import _count_threads, _openmp_enabled
+
+
+def test_threads_used():
+    # the prange loops either run on the requested threads, or run serially
+    # in a build without OpenMP
+    if _openmp_enabled():
+        assert _count_threads(3) == 3
+    else:
+        assert _count_threads(3) == 1
+
+
+def test_serial_build_warns():
+    mesh = discretize.SimplexMesh(*example_simplex_mesh((4, 4)))
+    locs = np.array([[0.1, 0.2], [0.3, 0.4]])
+    if _openmp_enabled():
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            mesh.point2index(locs, n_threads=2)
+    else:
+        with pytest.warns(RuntimeWarning, match="without OpenMP"):
+            mesh.point2index(locs, n_threads=2)
+    # a single thread never warns
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        mesh.point2index(locs, n_threads=1)
@@ -351,6 +351,134 @@ class TestInnerProducts1D(discretize.tests.OrderTest):
         self.orderTest()
 
 
+class TestFullTensorFastPath(unittest.TestCase):
+    def compare(self, mesh):
+        n_params = 3 if mesh.dim == 2 else 6
+        sigma = np.random.rand(mesh.n_cells, n_params)
+        sigma[:, : mesh.dim] += 2
+        for projection_type in ["F", "E"]:
+            for invert_model in [False, True]:
+                M = mesh._fastInnerProduct(
+                    projection_type, sigma, invert_model=invert_model
+                )
+                M_true = mesh._getInnerProduct(
+                    projection_type, sigma, invert_model=invert_model, do_fast=False
+                )
+                np.testing.assert_allclose(
+                    M.toarray(), M_true.toarray(), rtol=1e-12, atol=1e-14
+                )
+        with self.assertRaises(NotImplementedError):
+            mesh.get_face_inner_product(sigma, invert_matrix=True)
+
+    def test_tensor_2D(self):
+        self.compare(discretize.TensorMesh([5, 6]))
+
+    def test_tensor_3D(self):
+        self.compare(discretize.TensorMesh([[1, 2, 3], 4, [2, 1, 1, 2, 3]]))
+
+    def test_tree_2D(self):
+        mesh = discretize.TreeMesh([16, 16])
+        mesh.refine_ball([0.5, 0.5], 0.2, -1)
+        self.compare(mesh)
+
+    def test_tree_3D(self):
+        mesh = discretize.TreeMesh([8, 8, 8])
+        mesh.refine_ball([0.5, 0.5, 0.5], 0.2, -1)
+        self.compare(mesh)
+
+
+class TestApproximateInverse(unittest.TestCase):
+    def check_approx_inverse(self, mesh):
+        n_params = 3 if mesh.dim == 2 else 6
+        sigma = 0.3 * np.random.rand(mesh.n_cells, n_params)
+        sigma[:, : mesh.dim] += 1
+        for projection_type in ["F", "E"]:
+            M = mesh._getInnerProduct(projection_type, sigma)
+            for method in ["lumped", "block_diagonal"]:
+                M_inv = mesh._get_inner_product_approx_inverse(
+                    projection_type, sigma, False, method
+                )
+                np.testing.assert_allclose(
+                    M_inv.toarray(), M_inv.T.toarray(), rtol=1e-12, atol=1e-14
+                )
+                # the preconditioned matrix is well conditioned
+                eigs = np.linalg.eigvals((M_inv @ M).toarray()).real
+                self.assertGreater(eigs.min(), 0.5)
+                self.assertLess(eigs.max(), 2.0)
+
+                M_inv2 = mesh._get_inner_product_approx_inverse(
+                    projection_type,
+                    discretize.utils.inverse_property_tensor(mesh, sigma),
+                    True,
+                    method,
+                )
+                np.testing.assert_allclose(M_inv2.toarray(), M_inv.toarray())
+
+            M_inv = mesh._get_inner_product_approx_inverse(
+                projection_type, sigma, False, "lumped"
+            )
+            M_diag = mesh._fastInnerProduct(projection_type, sigma[:, : mesh.dim])
+            np.testing.assert_allclose(M_inv.diagonal(), 1 / M_diag.diagonal())
+
+    def test_tensor_2D(self):
+        self.check_approx_inverse(discretize.TensorMesh([[1, 2, 3, 1, 1], 7]))
+
+    def test_tensor_3D(self):
+        mesh = discretize.TensorMesh([4, [1, 2, 1, 3, 1], 6])
+        self.check_approx_inverse(mesh)
+
+        # exact for homogeneous isotropic properties
+        M = mesh.get_face_inner_product(2.0)
+        M_inv = mesh.get_face_inner_product_approx_inverse(2.0, method="block_diagonal")
+        np.testing.assert_allclose((M_inv @ M).diagonal(), 1)
+
+    def test_tree(self):
+        for dim in [2, 3]:
+            mesh = discretize.TreeMesh([8] * dim)
+            mesh.refine_ball([0.5] * dim, 0.2, -1)
+            self.check_approx_inverse(mesh)
+
+    def test_cyl(self):
+        for mesh in [
+            discretize.CylindricalMesh([4, 1, 5]),
+            discretize.CylindricalMesh([4, 4, 5]),
+        ]:
+            sigma = 0.3 * np.random.rand(mesh.n_cells, 6)
+            sigma[:, :3] += 1
+            Mf_inv = mesh.get_face_inner_product_approx_inverse(sigma)
+            Me_inv = mesh.get_edge_inner_product_approx_inverse(sigma)
+            self.assertEqual(Mf_inv.shape, (mesh.n_faces, mesh.n_faces))
+            self.assertEqual(Me_inv.shape, (mesh.n_edges, mesh.n_edges))
+            self.assertTrue(np.all(Me_inv.diagonal() > 0))
+            # only the lumped approximation is available
+            with self.assertRaises(NotImplementedError):
+                mesh.get_face_inner_product_approx_inverse(
+                    sigma, method="block_diagonal"
+                )
+            with self.assertRaises(NotImplementedError):
+                mesh.get_edge_inner_product_approx_inverse(
+                    sigma, method="block_diagonal"
+                )
+
+    def test_curvilinear(self):
+        mesh = discretize.CurvilinearMesh(
+            discretize.utils.example_curvilinear_grid([4, 5, 3], "rotate")
+        )
+        Mf_inv = mesh.get_face_inner_product_approx_inverse(2.0)
+        np.testing.assert_allclose(
+            Mf_inv.diagonal(), 1 / mesh.get_face_inner_product(2.0).diagonal()
+        )
+        with self.assertRaises(NotImplementedError):
+            mesh.get_face_inner_product_approx_inverse(method="block_diagonal")
+        with self.assertRaises(NotImplementedError):
+            mesh.get_edge_inner_product_approx_inverse(method="block_diagonal")
+
+    def test_bad_method(self):
+        mesh = discretize.TensorMesh([3, 4])
+        with self.assertRaises(ValueError):
+            mesh.get_edge_inner_product_approx_inverse(method="exact")
+
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -11,6 +11,10 @@ from discretize.utils import (
     inv3X3BlockDiagonal,
     invPropertyTensor,
     makePropertyTensor,
+    inverse_2x2_block_diagonal,
+    inverse_3x3_block_diagonal,
+    invert_blocks,
+    solve_blocks,
     indexCube,
     ind2sub,
     asArray_N_x_Dim,
@@ -176,6 +180,71 @@ class TestSequenceFunctions(unittest.TestCase):
 
         self.assertTrue(np.linalg.norm(Z3.todense().ravel(), 2) < TOL)
 
+    def test_invXXXBlockDiagonal_out(self):
+        A = np.random.rand(5, 3, 3) + 3 * np.eye(3)
+        a = [A[:, i, j].copy() for i in range(3) for j in range(3)]
+        b = inverse_3x3_block_diagonal(*a, return_matrix=False)
+
+        # invert in place
+        out = inverse_3x3_block_diagonal(*a, return_matrix=False, out=a)
+        for b_i, a_i, out_i in zip(b, a, out):
+            self.assertIs(out_i, a_i)
+            np.testing.assert_allclose(a_i, b_i)
+        np.testing.assert_allclose(
+            np.reshape(b, (3, 3, 5)).transpose((2, 0, 1)), np.linalg.inv(A)
+        )
+
+    def test_invertBlocks(self):
+        for n in [2, 3]:
+            for dtype in [np.float32, np.float64, np.complex128]:
+                A = (np.random.rand(4, 5, n, n) + 3 * np.eye(n)).astype(dtype)
+                A_inv = invert_blocks(A)
+                self.assertEqual(A_inv.dtype, dtype)
+                np.testing.assert_allclose(A_inv, np.linalg.inv(A), rtol=1e-5)
+
+                b = np.random.rand(4, 5, n).astype(dtype)
+                x = solve_blocks(A, b)
+                np.testing.assert_allclose(
+                    x, np.linalg.solve(A, b[..., None])[..., 0], rtol=1e-5
+                )
+
+            # integers are inverted in double precision
+            A = np.random.randint(1, 3, (5, n, n)) + 9 * np.eye(n, dtype=int)
+            np.testing.assert_allclose(invert_blocks(A), np.linalg.inv(A))
+
+            # in place, and as a block diagonal matrix
+            A = np.random.rand(5, n, n) + 3 * np.eye(n)
+            A_inv = np.linalg.inv(A)
+            M = invert_blocks(A, return_matrix=True)
+            self.assertEqual(M.format, "bsr")
+            np.testing.assert_allclose(M.toarray(), sp.block_diag(A_inv).toarray())
+            b = np.random.rand(5, n)
+            x = A_inv @ b[..., None]
+            self.assertIs(solve_blocks(A, b, out=b), b)
+            np.testing.assert_allclose(b, x[..., 0])
+            self.assertIs(invert_blocks(A, out=A), A)
+            np.testing.assert_allclose(A, A_inv)
+
+        # the blocks are independent, so threads give the same results
+        for n in [2, 3]:
+            A = np.random.rand(1000, n, n) + 3 * np.eye(n)
+            b = np.random.rand(1000, n)
+            np.testing.assert_equal(invert_blocks(A, n_threads=3), invert_blocks(A))
+            np.testing.assert_equal(solve_blocks(A, b, n_threads=3), solve_blocks(A, b))
+            inverse = [inverse_2x2_block_diagonal, inverse_3x3_block_diagonal][n - 2]
+            a = [A[:, i, j] for i in range(n) for j in range(n)]
+            np.testing.assert_equal(
+                inverse(*a, return_matrix=False, n_threads=3),
+                inverse(*a, return_matrix=False),
+            )
+
+        self.assertRaises(ValueError, invert_blocks, np.ones((5, 3, 2)))
+        self.assertRaises(NotImplementedError, invert_blocks, np.ones((5, 4, 4)))
+        self.assertRaises(ValueError, solve_blocks, np.ones((5, 3, 3)), np.ones(5))
+        self.assertRaises(
+            ValueError, invert_blocks, np.ones((5, 3, 3)), out=np.ones((3, 3))
+        )
+
     def test_invPropertyTensor2D(self):
         M = discretize.TensorMesh([6, 6])
         a1 = np.random.rand(M.nC)
@@ -252,6 +321,35 @@ class TestSequenceFunctions(unittest.TestCase):
             Z = B2 * A - sp.identity(M.nC * 3)
             self.assertTrue(np.linalg.norm(Z.todense().ravel(), 2) < TOL)
 
+    def test_propertyTensorFormat(self):
+        M = discretize.TensorMesh([3, 4, 5])
+        prop = np.random.rand(M.nC, 6)
+        prop[:, :3] += 2
+
+        # compare against stacking the diagonal blocks
+        parameter = [[0, 3, 4], [3, 1, 5], [4, 5, 2]]
+        A_true = sp.bmat(
+            [[sdiag(prop[:, parameter[i][j]]) for j in range(3)] for i in range(3)]
+        )
+        A = makePropertyTensor(M, prop)
+        self.assertEqual(A.format, "csr")
+        self.assertTrue(A.has_sorted_indices)
+        self.assertEqual(A.indices.dtype, np.int32)
+        np.testing.assert_equal(A.toarray(), A_true.toarray())
+
+        for sparse_format in ["csc", "coo", "bsr"]:
+            A = makePropertyTensor(M, prop, sparse_format=sparse_format)
+            self.assertEqual(A.format, sparse_format)
+            np.testing.assert_equal(A.toarray(), A_true.toarray())
+            B = invPropertyTensor(
+                M, prop, return_matrix=True, sparse_format=sparse_format
+            )
+            self.assertEqual(B.format, sparse_format)
+
+        # complex values keep their dtype
+        A = makePropertyTensor(M, prop[:, :3] * (1 + 1j))
+        self.assertEqual(A.dtype, np.complex128)
+
     def test_isScalar(self):
         self.assertTrue(isScalar(1.0))
         self.assertTrue(isScalar(1))
@@ -0,0 +1,54 @@
+import pytest
+
+import discretize
+from discretize.utils import example_curvilinear_grid, example_simplex_mesh
+
+TENSOR_SHAPES = {1: [7], 2: [5, 6], 3: [4, 5, 6]}
+
+
+def _tensor_mesh(dim, **kwargs):
+    return discretize.TensorMesh(TENSOR_SHAPES[dim], **kwargs)
+
+
+def _tree_mesh(dim, **kwargs):
+    mesh = discretize.TreeMesh([8] * dim, **kwargs)
+    mesh.refine_ball([0.5] * dim, 0.2, -1)
+    return mesh
+
+
+def _cylindrical_mesh(dim, **kwargs):
+    return discretize.CylindricalMesh([4] * dim, **kwargs)
+
+
+def _curvilinear_mesh(dim, **kwargs):
+    grid = example_curvilinear_grid(TENSOR_SHAPES[dim], "rotate")
+    return discretize.CurvilinearMesh(grid, **kwargs)
+
+
+def _simplex_mesh(dim, **kwargs):
+    return discretize.SimplexMesh(*example_simplex_mesh((4,) * dim), **kwargs)
+
+
+MESH_FACTORIES = {
+    "tensor": _tensor_mesh,
+    "tree": _tree_mesh,
+    "cylindrical": _cylindrical_mesh,
+    "curvilinear": _curvilinear_mesh,
+    "simplex": _simplex_mesh,
+}
+
+
+@pytest.fixture
+def make_mesh():
+    """Return a function building a small test mesh.
+
+    The function is called as ``make_mesh(mesh_type, dim=3, **kwargs)`` where
+    `mesh_type` is one of the keys of ``MESH_FACTORIES`` and the keyword
+    arguments are passed on to the mesh class (e.g. ``dtype``). Tree meshes
+    are refined around a ball in the center of the unit domain.
+    """
+
+    def make_mesh(mesh_type, dim=3, **kwargs):
+        return MESH_FACTORIES[mesh_type](dim, **kwargs)
+
+    return make_mesh
@@ -1,4 +1,5 @@
 import unittest
+import pytest
 import numpy as np
 
 import discretize
@@ -371,6 +372,214 @@ class Deflation(unittest.TestCase):
         )
         self.assertTrue(np.all(mesh._edge_lengths_full[~hangingE] == mesh.edge))
 
+    def test_deflation_matrix(self):
+        mesh = discretize.CylindricalMesh([2, 5, 3])
+
+        def to_cartesian(grid):
+            return utils.cylindrical_to_cartesian(grid)
+
+        # hanging items are copies of the items they are merged with
+        for location, full in [
+            ("nodes", mesh._nodes_full),
+            (
+                "faces_y",
+                utils.ndgrid(
+                    mesh.cell_centers_x, mesh._nodes_y_full, mesh.cell_centers_z
+                ),
+            ),
+            ("edges_z", mesh._edges_z_full),
+        ]:
+            P = mesh._expansion_matrix(location)
+            self.assertEqual(P.format, "csr")
+            self.assertIs(mesh._expansion_matrix(location), P)
+            grid = getattr(mesh, location)
+            np.testing.assert_allclose(
+                to_cartesian(P @ grid), to_cartesian(full), atol=1e-14
+            )
+
+            R = mesh._deflation_matrix(location)
+            self.assertIs(mesh._deflation_matrix(location), R)
+            np.testing.assert_allclose(R.sum(axis=1), 1)
+            np.testing.assert_allclose(R @ (P @ grid), grid, atol=1e-14)
+
+            hanging = getattr(mesh, "_hanging_{}".format(location))
+            self.assertEqual(hanging.dtype, np.int64)
+            is_hanging = getattr(mesh, "_ishanging_{}".format(location))
+            self.assertEqual(len(hanging), is_hanging.sum())
+            self.assertFalse(np.any(is_hanging[hanging]))
+
+        # eliminated faces are dropped
+        R = mesh._deflation_matrix("faces_x", as_ones=True)
+        self.assertEqual(R.shape, (mesh.n_faces_x, mesh._n_total_faces_x))
+        np.testing.assert_equal(mesh._hanging_faces_x, -1)
+
+
+class TestCartesianRemap(unittest.TestCase):
+    def setUp(self):
+        self.mesh = discretize.CylindricalMesh(
+            [np.ones(10) / 5, 12, np.ones(10) / 5],
+            origin=[0, 0.2, -1],
+            cartesian_origin=[0.1, -0.1, 0],
+        )
+
+    def test_vector_fields(self):
+        mesh = self.mesh
+        mesh_to = discretize.TensorMesh([40, 40, 20], origin="CCC")
+
+        # a constant cartesian vector (1, 2, 3) on the cylindrical mesh
+        def cyl_vector(location):
+            theta = getattr(mesh, location + "_x")[:, 1]
+            v_r = np.cos(theta) + 2 * np.sin(theta)
+            theta = getattr(mesh, location + "_y")[:, 1]
+            v_t = -np.sin(theta) + 2 * np.cos(theta)
+            return np.r_[v_r, v_t, 3 * np.ones(getattr(mesh, f"n_{location}_z"))]
+
+        for location in ["faces", "edges"]:
+            for location_to in ["faces", "edges"]:
+                P = mesh.get_interpolation_matrix_cartesian_mesh(
+                    mesh_to, location, location_to
+                )
+                # the cached matrix is not changed through the returned copies
+                P.data[:] = 0
+                P = mesh.get_interpolation_matrix_cartesian_mesh(
+                    mesh_to, location, location_to
+                )
+                self.assertGreater(abs(P).sum(), 0)
+                out = P @ cyl_vector(location)
+                start = 0
+                for comp, value in zip("xyz", [1, 2, 3]):
+                    grid = getattr(mesh_to, f"{location_to}_{comp}")
+                    part = out[start : start + len(grid)]
+                    start += len(grid)
+                    r = np.hypot(grid[:, 0] - 0.1, grid[:, 1] + 0.1)
+                    inside = (r > 0.3) & (r < 1.8) & (np.abs(grid[:, 2]) < 0.9)
+                    np.testing.assert_allclose(part[inside], value, atol=0.1)
+
+    def test_volume_average(self):
+        mesh = self.mesh
+        model = np.random.rand(mesh.n_cells)
+        tree = discretize.TreeMesh([[(0.1, 64)]] * 3, origin="CCC")
+        tree.refine_ball([0, 0, 0], 0.5, 6)
+        meshes = [
+            discretize.TensorMesh([[(0.1, 42)], [(0.1, 42)], [(0.1, 22)]], "CCC"),
+            discretize.TensorMesh([[(0.37, 14)], [(0.29, 16)], [(0.3, 8)]], "CCC"),
+            tree,
+        ]
+        for mesh_to in meshes:
+            P = mesh.get_interpolation_matrix_cartesian_mesh(
+                mesh_to, volume_average=True
+            )
+            # the cylindrical mesh is entirely within the other mesh
+            np.testing.assert_allclose(
+                mesh_to.cell_volumes @ (P @ model), mesh.cell_volumes @ model
+            )
+            # cells entirely within the cylindrical mesh preserve constants
+            cc, h = mesh_to.cell_centers, mesh_to.h_gridded / 2
+            r_max = np.hypot(
+                np.abs(cc[:, 0] - 0.1) + h[:, 0], np.abs(cc[:, 1] + 0.1) + h[:, 1]
+            )
+            inside = (r_max <= 2) & (np.abs(cc[:, 2]) + h[:, 2] <= 1)
+            self.assertTrue(np.any(inside))
+            np.testing.assert_allclose((P @ np.ones(mesh.n_cells))[inside], 1)
+
+        # a symmetric mesh
+        mesh = discretize.CylindricalMesh([np.ones(10) / 5, 1, np.ones(10) / 5])
+        P = mesh.get_interpolation_matrix_cartesian_mesh(tree, volume_average=True)
+        np.testing.assert_allclose(
+            tree.cell_volumes @ (P @ np.ones(mesh.n_cells)), mesh.cell_volumes.sum()
+        )
+
+        with self.assertRaises(ValueError):
+            mesh.get_interpolation_matrix_cartesian_mesh(tree, "F", volume_average=True)
+
+
+class TestPeriodicInterpolation(unittest.TestCase):
+    def setUp(self):
+        self.mesh = discretize.CylindricalMesh(
+            [np.ones(5) / 5, np.ones(8) * 2 * np.pi / 8, np.ones(4) / 4],
+            origin=[0, 0.3, 0],
+            cartesian_origin=[0.1, -0.2, 0],
+        )
+        n = 100
+        self.locs = np.c_[
+            np.random.uniform(0, 1, n),
+            np.random.uniform(-np.pi, np.pi, n),
+            np.random.uniform(0, 1, n),
+        ]
+        self.location_types = ["CC", "N", "Fx", "Fy", "Fz", "Ex", "Ey", "Ez", "CCVx"]
+
+    def test_periodic(self):
+        mesh, locs = self.mesh, self.locs
+        shifted = locs + np.r_[0, 2 * np.pi, 0]
+        for location_type in self.location_types:
+            Q1 = mesh.get_interpolation_matrix(locs, location_type)
+            Q2 = mesh.get_interpolation_matrix(shifted, location_type)
+            np.testing.assert_allclose(Q1.toarray(), Q2.toarray(), atol=1e-12)
+            if location_type in ["CC", "N", "Fz", "Ez"]:
+                # radial and azimuthal components change sign across the axis
+                np.testing.assert_allclose(Q1.sum(axis=1), 1)
+
+    def test_cartesian_locations(self):
+        mesh, locs = self.mesh, self.locs
+        xyz = utils.cyl2cart(locs) + mesh.cartesian_origin
+        for location_type in self.location_types:
+            Q1 = mesh.get_interpolation_matrix(locs, location_type)
+            Q2 = mesh.get_interpolation_matrix(
+                xyz, location_type, reference_system="cart"
+            )
+            np.testing.assert_allclose(Q1.toarray(), Q2.toarray(), atol=1e-12)
+
+        with self.assertRaises(ValueError):
+            mesh.get_interpolation_matrix(xyz, "CC", reference_system="spherical")
+
+    def test_axis(self):
+        mesh = self.mesh
+        # a uniform cartesian field is continuous across the axis
+        theta = np.random.uniform(-np.pi, np.pi, 20)
+        r_first = mesh.nodes_x[1]
+        near = np.c_[np.random.uniform(0, r_first, 20), theta, np.full(20, 0.5)]
+        first = np.c_[np.full(20, r_first), theta, np.full(20, 0.5)]
+        Q_near = mesh.get_interpolation_matrix(near, "Fx")
+        Q_first = mesh.get_interpolation_matrix(first, "Fx")
+        f = np.cos(mesh.faces[:, 1])
+        np.testing.assert_allclose(Q_near @ f, Q_first @ f)
+
+        # the nodes on the axis are a single item per z position
+        Q = mesh.get_interpolation_matrix(np.c_[0, 1.0, 0.5], "N")
+        self.assertEqual(Q.nnz, 1)
+        np.testing.assert_allclose(mesh.nodes[Q.indices[0]], [0, 0.3, 0.5])
+
+    def test_zeros_outside(self):
+        mesh = self.mesh
+        locs = np.r_[self.locs, [[1.5, 0.0, 0.5], [0.5, 0.0, 1.5]]]
+        for location_type in ["CC", "Fx"]:
+            Q = mesh.get_interpolation_matrix(locs, location_type, zeros_outside=True)
+            inside = mesh.is_inside(locs)
+            self.assertFalse(inside[-2:].any())
+            np.testing.assert_equal(np.diff(Q.indptr)[~inside], 0)
+            Q_all = mesh.get_interpolation_matrix(locs, location_type)
+            np.testing.assert_allclose(
+                Q.toarray()[inside], Q_all.toarray()[inside], atol=1e-12
+            )
+
+
+@pytest.mark.parametrize("n_threads", [None, 4])
+def test_periodic_interpolation_independent_points(n_threads):
+    # each location of a single large call is filled independently
+    mesh = discretize.CylindricalMesh(
+        [np.ones(5) / 5, np.ones(8) * 2 * np.pi / 8, np.ones(4) / 4]
+    )
+    rng = np.random.default_rng(44)
+    n = 20000
+    locs = np.c_[
+        rng.uniform(0, 1, n), rng.uniform(-np.pi, np.pi, n), rng.uniform(0, 1, n)
+    ]
+    for location_type in ["N", "Fx", "Ez"]:
+        Q = mesh.get_interpolation_matrix(locs, location_type, n_threads=n_threads)
+        for i in rng.choice(n, 50, replace=False):
+            Q_i = mesh.get_interpolation_matrix(locs[i : i + 1], location_type)
+            np.testing.assert_equal(Q[i].toarray(), Q_i.toarray())
+
 
 if __name__ == "__main__":
     unittest.main()
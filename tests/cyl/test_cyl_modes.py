@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+import discretize
+from discretize.operators.cylindrical_modes import (
+    CylindricalModeDecomposition,
+    CylindricalModeSolver,
+)
+
+
+@pytest.fixture(params=[6, 7], ids=["even", "odd"])
+def mesh(request):
+    return discretize.CylindricalMesh([4, request.param, 3], origin=[0, 0.3, -1])
+
+
+def axisymmetric_model(mesh):
+    r, z = mesh.cell_centers[:, 0], mesh.cell_centers[:, 2]
+    return 1 + r + z**2
+
+
+@pytest.mark.parametrize(
+    "location_type",
+    ["cell_centers", "nodes", "faces", "edges", "faces_y", "edges_z"],
+)
+def test_round_trip(mesh, location_type):
+    modes = CylindricalModeDecomposition(mesh)
+    n = len(getattr(mesh, location_type))
+    v = np.random.rand(n, 2)
+    v_k = modes.to_modes(v, location_type)
+    assert len(v_k) == modes.n_modes
+    for k, v_mode in enumerate(v_k):
+        assert v_mode.shape == (modes.mode_size(k, location_type), 2)
+    np.testing.assert_allclose(modes.from_modes(v_k, location_type), v)
+    # the transform is unitary
+    norm = sum(np.linalg.norm(v_mode) ** 2 for v_mode in v_k)
+    np.testing.assert_allclose(norm, np.linalg.norm(v) ** 2)
+
+
+@pytest.mark.parametrize(
+    "operator, location_out, location_in",
+    [
+        ("edge_curl", "faces", "edges"),
+        ("face_divergence", "cell_centers", "faces"),
+        ("nodal_gradient", "edges", "nodes"),
+        ("edge_inner_product", "edges", "edges"),
+        ("face_inner_product", "faces", "faces"),
+    ],
+)
+def test_mode_operators(mesh, operator, location_out, location_in):
+    if operator.endswith("inner_product"):
+        A = getattr(mesh, f"get_{operator}")(axisymmetric_model(mesh))
+    else:
+        A = getattr(mesh, operator)
+    modes = CylindricalModeDecomposition(mesh)
+    A_k = modes.mode_operators(A, location_out, location_in)
+    v = np.random.rand(A.shape[1])
+    Av_k = [M @ v_mode for M, v_mode in zip(A_k, modes.to_modes(v, location_in))]
+    np.testing.assert_allclose(modes.from_modes(Av_k, location_out), A @ v, atol=1e-12)
+    assert not np.iscomplexobj(A_k[0].data)
+
+    subset = modes.mode_operators(A, location_out, location_in, modes=[1, -1])
+    np.testing.assert_allclose(subset[0].toarray(), A_k[1].toarray())
+    np.testing.assert_allclose(subset[1].toarray(), A_k[-1].toarray())
+
+
+@pytest.mark.parametrize("location_type", ["edges", "nodes"])
+@pytest.mark.parametrize("is_complex", [False, True])
+def test_mode_solver(mesh, location_type, is_complex):
+    sigma = axisymmetric_model(mesh)
+    if location_type == "edges":
+        C = mesh.edge_curl
+        A = C.T @ mesh.get_face_inner_product() @ C
+        M = mesh.get_edge_inner_product(sigma)
+    else:
+        G = mesh.nodal_gradient
+        A = G.T @ mesh.get_edge_inner_product(sigma) @ G
+        M = sp.identity(mesh.n_nodes)
+    A = A + (1j if is_complex else 1) * M
+    Ainv = CylindricalModeSolver(mesh, A, location_type, n_threads=2)
+    assert Ainv.dtype == A.dtype
+
+    b = np.random.rand(A.shape[0], 2)
+    x = Ainv @ b
+    assert np.isrealobj(x) != is_complex
+    np.testing.assert_allclose(A @ x, b, atol=1e-10)
+    b = b[:, 0] + 1j * b[:, 1]
+    np.testing.assert_allclose(A @ (Ainv @ b), b, atol=1e-10)
+    np.testing.assert_allclose(A.conj().T @ (Ainv.H @ b), b, atol=1e-10)
+    np.testing.assert_allclose(A.T @ (Ainv.T @ b), b, atol=1e-10)
+
+
+def test_errors():
+    with pytest.raises(TypeError):
+        CylindricalModeDecomposition(discretize.TensorMesh([4, 4, 4]))
+    with pytest.raises(TypeError):
+        CylindricalModeDecomposition(discretize.CylindricalMesh([4, 4]))
+    with pytest.raises(ValueError):
+        CylindricalModeDecomposition(discretize.CylindricalMesh([4, 1, 4]))
+    h_theta = np.r_[1, 1, 2] / 4 * 2 * np.pi
+    with pytest.raises(ValueError):
+        CylindricalModeDecomposition(discretize.CylindricalMesh([4, h_theta, 4]))
+    mesh = discretize.CylindricalMesh([4, 4, 4])
+    modes = CylindricalModeDecomposition(mesh)
+    with pytest.raises(ValueError):
+        modes.mode_operators(mesh.edge_curl, "edges", "faces")
+    # a model varying with theta breaks the rotation invariance
+    sigma = 1 + mesh.cell_centers[:, 1]
+    A = mesh.get_edge_inner_product(sigma)
+    with pytest.raises(ValueError, match="not invariant"):
+        modes.mode_operators(A, "edges")
+    with pytest.raises(ValueError, match="not invariant"):
+        CylindricalModeSolver(mesh, A, "edges")
@@ -499,3 +499,68 @@ class TestBadModels(unittest.TestCase):
             mesh.get_edge_inner_product_deriv(good_model, invert_matrix=True)
         with self.assertRaises(NotImplementedError):
             mesh.get_edge_inner_product_deriv(good_model, invert_model=True)
+
+
+class TestInnerProductAssembler(unittest.TestCase):
+    def test_constant_field(self):
+        # the inner products integrate constant fields exactly
+        for h in [(5, 6), (4, 5, 6)]:
+            mesh = discretize.SimplexMesh(*example_simplex_mesh(h))
+            field = np.arange(1.0, mesh.dim + 1)
+            for i_type in ["F", "E"]:
+                if i_type == "F":
+                    assembler = mesh.get_face_inner_product_assembler()
+                    vecs = mesh.face_normals
+                else:
+                    assembler = mesh.get_edge_inner_product_assembler()
+                    vecs = mesh.edge_tangents
+                x = vecs @ field
+                sigma = np.random.rand(mesh.n_cells)
+                np.testing.assert_allclose(
+                    x @ assembler(sigma) @ x,
+                    field @ field * (sigma @ mesh.cell_volumes),
+                )
+
+    def test_cached_and_deriv(self):
+        mesh = discretize.SimplexMesh(*example_simplex_mesh((4, 5, 6)))
+        assembler = mesh.get_edge_inner_product_assembler(3)
+        self.assertIs(mesh.get_edge_inner_product_assembler(3), assembler)
+        self.assertIsNot(mesh.get_face_inner_product_assembler(3), assembler)
+
+        model = np.random.rand(mesh.n_cells, 6)
+        model[:, :3] += 2
+        M = mesh.get_edge_inner_product(model)
+        np.testing.assert_allclose(M.toarray(), assembler(model).toarray())
+        self.assertEqual(M.indices.dtype, np.int32)
+
+        v = np.random.rand(mesh.n_edges)
+        w = np.random.rand(assembler.n_parameters)
+        dMdm = assembler.deriv(v)
+        np.testing.assert_allclose(dMdm @ w, assembler(w) @ v)
+        np.testing.assert_allclose(
+            (dMdm.T @ v) @ w, v @ (mesh.get_edge_inner_product_deriv(model)(v) @ w)
+        )
+        np.testing.assert_allclose(dMdm.tocsr() @ w, dMdm @ w)
+        # the sparsity of the derivatives is only built once
+        dMdm2 = assembler.deriv(2 * v)
+        self.assertTrue(
+            np.shares_memory(dMdm2._data_map.indices, dMdm._data_map.indices)
+        )
+        np.testing.assert_allclose(dMdm2 @ w, 2 * (dMdm @ w))
+
+        # the data map is only built when requested
+        params = discretize.utils.mkvc(model)
+        np.testing.assert_allclose(
+            assembler.data_map @ params, assembler.data(params), atol=1e-12
+        )
+
+    def test_batch(self):
+        mesh = discretize.SimplexMesh(*example_simplex_mesh((4, 5, 6)))
+        for tensor_type in [2, 3]:
+            assembler = mesh.get_face_inner_product_assembler(tensor_type)
+            models = np.random.rand(3, assembler.n_parameters)
+            models[:, : 3 * mesh.n_cells] += 2
+            models = models + 1j * np.random.rand(*models.shape)
+            data = assembler.batch_data(models)
+            for d, model in zip(data, models):
+                np.testing.assert_allclose(d, assembler.data(model), atol=1e-12)
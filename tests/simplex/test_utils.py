@@ -1,9 +1,11 @@
 import unittest
 import numpy as np
+import scipy.sparse as sp
 import discretize
 from discretize.utils import example_simplex_mesh
 import os
 import pickle
+import warnings
 
 try:
     import vtk  # NOQA F401
@@ -53,6 +55,156 @@ class SimplexTests(unittest.TestCase):
         inds = mesh.point2index(x)
         np.testing.assert_equal(inds, [16, 5])
 
+    def test_find_containing_coherent(self):
+        points, simplices = example_simplex_mesh((8, 8, 8))
+        mesh = discretize.SimplexMesh(points, simplices)
+
+        # a profile line that does not touch any of the simplex faces
+        t = np.linspace(0, 1, 200)
+        x = np.c_[0.0101 + 0.98 * t, 0.3013 + 0.4 * t, np.full_like(t, 0.4937)]
+        inds = mesh.point2index(x)
+        for n_threads in [None, 3]:
+            np.testing.assert_equal(
+                mesh.point2index(x, n_threads=n_threads, coherent=True), inds
+            )
+            np.testing.assert_equal(mesh.point2index(x, n_threads=n_threads), inds)
+            Q = mesh.get_interpolation_matrix(
+                x, "nodes", n_threads=n_threads, coherent=True
+            )
+            np.testing.assert_allclose(Q @ mesh.nodes, x)
+            # the options of the search are forwarded by interpolate
+            out = mesh.interpolate(
+                mesh.nodes,
+                x,
+                "nodes",
+                chunk_size=64,
+                n_workers=2,
+                n_threads=n_threads,
+                coherent=True,
+            )
+            np.testing.assert_allclose(out, x)
+
+        # points outside of the mesh do not interrupt the walk
+        x_out = np.r_[x[:100], [[2.0, 2.0, 2.0]], x[100:]]
+        inds_out = mesh.point2index(x_out, coherent=True)
+        np.testing.assert_equal(np.delete(inds_out, 100), inds)
+        Q = mesh.get_interpolation_matrix(
+            x_out, "nodes", zeros_outside=True, coherent=True
+        )
+        np.testing.assert_allclose(Q.sum(axis=1)[100], 0)
+
+    def test_find_containing_threads(self):
+        from discretize._extensions.matrix_ext import _openmp_enabled
+
+        points, simplices = example_simplex_mesh((8, 8, 8))
+        mesh = discretize.SimplexMesh(points, simplices)
+        x = np.random.default_rng(47).uniform(-0.1, 1.1, (5000, 3))
+        inds = mesh.point2index(x)
+        Q = mesh.get_interpolation_matrix(x, "nodes", zeros_outside=True)
+        for coherent in [False, True]:
+            # the threads either run, or a serial build says they do not
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always")
+                inds_t = mesh.point2index(x, n_threads=4, coherent=coherent)
+                Q_t = mesh.get_interpolation_matrix(
+                    x, "nodes", zeros_outside=True, n_threads=4, coherent=coherent
+                )
+            self.assertEqual(len(caught) == 0, _openmp_enabled())
+            # outside points end wherever their walk left the mesh
+            inside = Q.sum(axis=1).A1 > 0
+            np.testing.assert_equal(inds_t[inside], inds[inside])
+            np.testing.assert_allclose(Q_t.toarray(), Q.toarray(), atol=1e-12)
+
+    def test_build_topology(self):
+        from discretize._extensions.simplex_helpers import (
+            _build_faces_edges,
+            _build_adjacency,
+        )
+
+        for shape in [(6, 5), (4, 5, 3)]:
+            points, simplices = example_simplex_mesh(shape)
+            simplices = np.sort(simplices, axis=1)
+            items = [np.asarray(item) for item in _build_faces_edges(simplices)]
+            neighbors = _build_adjacency(items[0], len(items[1]))
+            for n_threads in [None, 3]:
+                mesh = discretize.SimplexMesh(points, simplices, n_threads=n_threads)
+                self.assertEqual(mesh._simplex_edges.dtype, np.int32)
+                np.testing.assert_equal(mesh._simplex_faces, items[0])
+                np.testing.assert_equal(mesh._faces, items[1])
+                np.testing.assert_equal(mesh._simplex_edges, items[2])
+                np.testing.assert_equal(mesh._edges, items[3])
+                np.testing.assert_equal(mesh.neighbors, neighbors)
+                if mesh.dim == 3:
+                    np.testing.assert_equal(mesh._face_edges, items[4])
+
+    def test_reorder(self):
+        rng = np.random.default_rng(4)
+        for shape in [(6, 5), (4, 5, 3)]:
+            points, simplices = example_simplex_mesh(shape)
+            # shuffle the nodes and the simplices
+            perm = rng.permutation(len(points))
+            points = points[perm]
+            simplices = np.argsort(perm)[simplices]
+            simplices = simplices[rng.permutation(len(simplices))]
+            mesh0 = discretize.SimplexMesh(points, simplices)
+            for reorder in ["rcm", "hilbert"]:
+                mesh = discretize.SimplexMesh(points, simplices, reorder=reorder)
+                np.testing.assert_equal(mesh.nodes, points[mesh.node_permutation])
+                np.testing.assert_equal(
+                    np.sort(mesh.node_permutation[mesh.simplices], axis=1),
+                    np.sort(simplices[mesh.cell_permutation], axis=1),
+                )
+                np.testing.assert_allclose(
+                    mesh.faces, mesh0.faces[mesh.face_permutation]
+                )
+                np.testing.assert_allclose(
+                    mesh.edges, mesh0.edges[mesh.edge_permutation]
+                )
+                np.testing.assert_allclose(
+                    mesh.face_normals,
+                    mesh0.face_normals[mesh.face_permutation]
+                    * mesh.face_orientation[:, None],
+                )
+                np.testing.assert_allclose(
+                    mesh.edge_tangents,
+                    mesh0.edge_tangents[mesh.edge_permutation]
+                    * mesh.edge_orientation[:, None],
+                )
+                # the operators are permuted with the orientation of the items,
+                # up to the rounding of the areas and volumes
+                D0 = mesh0.face_divergence[mesh.cell_permutation]
+                D0 = D0[:, mesh.face_permutation] @ sp.diags(mesh.face_orientation)
+                np.testing.assert_allclose(
+                    mesh.face_divergence.toarray(), D0.toarray(), rtol=1e-12
+                )
+
+        np.testing.assert_equal(mesh0.face_permutation, np.arange(mesh0.n_faces))
+        np.testing.assert_equal(mesh0.face_orientation, np.ones(mesh0.n_faces))
+        with self.assertRaises(ValueError):
+            discretize.SimplexMesh(points, simplices, reorder="random")
+
+    def test_lazy_tables(self):
+        points, simplices = example_simplex_mesh((4, 5, 3))
+        mesh = discretize.SimplexMesh(points, simplices)
+        # only the cell volumes are needed for cell centered quantities
+        mesh.average_node_to_cell
+        self.assertEqual(list(mesh.table_nbytes), ["cell_volumes"])
+
+        D = mesh.face_divergence
+        nbytes = mesh.table_nbytes
+        self.assertEqual(nbytes["neighbors"], mesh.neighbors.nbytes)
+        self.assertNotIn("transform", nbytes)
+        mesh.point2index([[0.5, 0.5, 0.5]])
+        self.assertIn("transform", mesh.table_nbytes)
+
+        mesh.drop_tables("topology", "transform_and_shift")
+        self.assertEqual(list(mesh.table_nbytes), ["cell_volumes"])
+        np.testing.assert_equal(mesh.face_divergence.toarray(), D.toarray())
+        mesh.drop_tables()
+        self.assertEqual(mesh.table_nbytes, {})
+        with self.assertRaises(ValueError):
+            mesh.drop_tables("edges")
+
     def test_pickle2D(self):
         n = 5
         points, simplices = discretize.utils.example_simplex_mesh((n, n))
@@ -469,5 +469,28 @@ class TestWrapAroundLevels(unittest.TestCase):
         self.assertEqual(mesh1.nC, mesh2.nC)
 
 
+class TestProjectionCache(unittest.TestCase):
+    def test_cached_projections(self):
+        for dim in [2, 3]:
+            mesh = discretize.TreeMesh([16] * dim)
+            mesh.refine_ball([0.5] * dim, 0.2, -1)
+            self.assertEqual(mesh.projection_cache_nbytes, 0)
+
+            sigma = np.random.rand(mesh.n_cells)
+            Me = mesh.get_edge_inner_product(sigma, do_fast=False)
+            nbytes = mesh.projection_cache_nbytes
+            self.assertGreater(nbytes, 0)
+            self.assertEqual(mesh._cell_total_edge_indices().dtype, np.int32)
+            self.assertIs(mesh._deflate_edges(), mesh._deflate_edges())
+
+            # reusing the cache gives the same matrices, without growing it
+            Me2 = mesh.get_edge_inner_product(sigma, do_fast=False)
+            self.assertEqual(np.abs(Me - Me2).max(), 0)
+            self.assertEqual(mesh.projection_cache_nbytes, nbytes)
+
+            mesh.get_face_inner_product(sigma, do_fast=False)
+            self.assertGreater(mesh.projection_cache_nbytes, nbytes)
+
+
 if __name__ == "__main__":
     unittest.main()